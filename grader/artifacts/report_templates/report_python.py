@@ -2,9 +2,29 @@
 Purpose:
     Holds python object of the python report template. Allows for string replacement
     .md and .html generation
+
+    The results of each tool are rendered as sections of their own, put in place
+    of the {<section>_section} fields of the report. Sections of tools that were
+    not run are rendered with the skipped template instead
 """
 
 
+###
+# Section Definition
+###
+
+
+# (section, title, tool the section shows the results of), in report order
+report_python_sections = (
+    ("tests", "Tests", "pytest"),
+    ("coverage", "Coverage", "pytest"),
+    ("mypy", "Mypy", "mypy"),
+    ("pylint", "Pylint", "pylint"),
+    ("pycodestyle", "Pycodestyle", "pycodestyle"),
+    ("flake8", "Flake8", "flake8"),
+)
+
+
 ###
 # HTML Definition
 ###
@@ -108,7 +128,19 @@ The following shows the memory usage during the execution of the assessment code
 TODO
 </pre>
 
-<h2 id="Tests">Tests</h2>
+{tests_section}
+{coverage_section}
+{mypy_section}
+{pylint_section}
+{pycodestyle_section}
+{flake8_section}
+
+</body>
+</html>
+"""
+
+report_python_html_section_templates = {
+    "tests": """<h2 id="Tests">Tests</h2>
 
 <p>
 The following details results from python testing report:
@@ -121,12 +153,15 @@ The following section details performance profiling of the solutions:
 </p>
 
 <p>
-<b>Total Tests</b>: {pytest[tests][metrics][total_tests]}
+<b>Total Tests</b>: {pytest[tests][metrics][total_tests]}</br>
+<b>Timed Out</b>: {pytest[timed_out]}</br>
+<b>Mode</b>: {pytest[mode]}
 </p>
 
 <p>
 <b>Total Errors</b>: {pytest[tests][metrics][error_tests]}</br>
-<b>Percentage Errors</b>: {pytest[tests][metrics][percentage_error]}%
+<b>Percentage Errors</b>: {pytest[tests][metrics][percentage_error]}%</br>
+<b>Timed Out Tests</b>: {pytest[tests][metrics][timed_out_tests]}
 </p>
 
 <p>
@@ -150,6 +185,11 @@ The following shows the memory usage during the execution of the assessment code
 {pytest[tests][error_tests_str]}
 </pre>
 
+<b>Timed Out Tests</b>:
+<pre>
+{pytest[tests][timed_out_tests_str]}
+</pre>
+
 <b>Failed Tests</b>:
 <pre>
 {pytest[tests][failed_tests_str]}
@@ -159,8 +199,8 @@ The following shows the memory usage during the execution of the assessment code
 <pre>
 {pytest[tests][passed_tests_str]}
 </pre>
-
-<h2 id="Coverage">Coverage</h2>
+""",
+    "coverage": """<h2 id="Coverage">Coverage</h2>
 
 The following details results from python coverage report:
 
@@ -173,7 +213,8 @@ The following details results from python coverage report:
 <p>
 <b>Total Statements</b>: {pytest[coverage][metrics][statements_percentage]}</br>
 <b>Missing Statements</b>: {pytest[coverage][metrics][statements_missing]}</br>
-<b>Branching Statements</b>: {pytest[coverage][metrics][statements_branching]}
+<b>Branching Statements</b>: {pytest[coverage][metrics][statements_branching]}</br>
+<b>Coverage Engine</b>: {pytest[coverage][metrics][engine]}
 </p>
 
 <h3 id="Coverage_Details">Details</h2>
@@ -182,15 +223,16 @@ The following details results from python coverage report:
 <pre>
 {pytest[coverage][details_str]}
 </pre>
-
-<h2 id="Mypy">Mypy</h2>
+""",
+    "mypy": """<h2 id="Mypy">Mypy</h2>
 
 The following details results from python static type checking:
 
 <h3 id="Mypy_Summary">Summary</h2>
 
 <p>
-<b>Total Issues</b>: {mypy[metrics][total]}
+<b>Total Issues</b>: {mypy[metrics][total]}</br>
+<b>Timed Out</b>: {mypy[timed_out]}
 </p>
 
 <p>
@@ -219,8 +261,8 @@ The following details results from python static type checking:
 <pre>
 {mypy[notes_str]}
 </pre>
-
-<h2 id="Pylint">Pylint</h2>
+""",
+    "pylint": """<h2 id="Pylint">Pylint</h2>
 
 The following details results from the Flake8 tool:
 
@@ -228,7 +270,9 @@ The following details results from the Flake8 tool:
 
 <p>
 <b>Total Issues</b>: {pylint[metrics][total]}</br>
-<b>Overall Score</b>: {pylint[score]} / 10
+<b>Overall Score</b>: {pylint[score]} / 10</br>
+<b>Timed Out</b>: {pylint[timed_out]}</br>
+<b>Mode</b>: {pylint[mode]}
 </p>
 
 <p>
@@ -269,15 +313,16 @@ The following details results from the Flake8 tool:
 <pre>
 {pylint[design_issues_str]}
 </pre>
-
-<h2 id="Pycodestyle">Pycodestyle</h2>
+""",
+    "pycodestyle": """<h2 id="Pycodestyle">Pycodestyle</h2>
 
 The following details results from the Flake8 tool:
 
 <h3 id="Pycodestyle_Summary">Summary</h2>
 
 <p>
-<b>Total Issues</b>: {pycodestyle[metrics][total]}
+<b>Total Issues</b>: {pycodestyle[metrics][total]}</br>
+<b>Timed Out</b>: {pycodestyle[timed_out]}
 </p>
 
 <p>
@@ -300,15 +345,16 @@ The following details results from the Flake8 tool:
 <pre>
 {pycodestyle[warnings_str]}
 </pre>
-
-<h2 id="Flake8">Flake8</h2>
+""",
+    "flake8": """<h2 id="Flake8">Flake8</h2>
 
 The following details results from the Flake8 tool:
 
 <h3 id="Flake8_Summary">Summary</h2>
 
 <p>
-<b>Total Issues</b>: {flake8[metrics][total]}
+<b>Total Issues</b>: {flake8[metrics][total]}</br>
+<b>Timed Out</b>: {flake8[timed_out]}
 </p>
 
 <p>
@@ -349,12 +395,17 @@ The following details results from the Flake8 tool:
 <pre>
 {flake8[flakes_str]}
 </pre>
+""",
+}
 
+report_python_html_skipped_template = """<h2 id="{section_title}">{section_title}</h2>
 
-</body>
-</html>
+<p>
+Skipped, {tool_name} was not run for this report
+</p>
 """
 
+
 ###
 # Markdown Definition
 ###
@@ -409,16 +460,27 @@ The following shows the memory usage during the execution of the assessment code
 TODO
 ```
 
-## Tests
+{tests_section}
+{coverage_section}
+{mypy_section}
+{pylint_section}
+{pycodestyle_section}
+{flake8_section}"""
+
+report_python_md_section_templates = {
+    "tests": """## Tests
 
 The following details results from python testing report:
 
 ### Summary
 
 **Total Tests**: {pytest[tests][metrics][total_tests]}
+**Timed Out**: {pytest[timed_out]}
+**Mode**: {pytest[mode]}
 
 **Total Errors**: {pytest[tests][metrics][error_tests]}
 **Percentage Errors**: {pytest[tests][metrics][percentage_error]}%
+**Timed Out Tests**: {pytest[tests][metrics][timed_out_tests]}
 
 **Total Failures**: {pytest[tests][metrics][failed_tests]}
 **Percentage Failing**: {pytest[tests][metrics][percentage_failed]}%
@@ -433,6 +495,11 @@ The following details results from python testing report:
 {pytest[tests][error_tests_str]}
 ```
 
+**Timed Out Tests**:
+```bash
+{pytest[tests][timed_out_tests_str]}
+```
+
 **Failed Tests**:
 ```bash
 {pytest[tests][failed_tests_str]}
@@ -442,8 +509,8 @@ The following details results from python testing report:
 ```bash
 {pytest[tests][passed_tests_str]}
 ```
-
-## Coverage
+""",
+    "coverage": """## Coverage
 
 The following details results from python coverage report:
 
@@ -454,6 +521,7 @@ The following details results from python coverage report:
 **Total Statements**: {pytest[coverage][metrics][statements_percentage]}
 **Missing Statements**: {pytest[coverage][metrics][statements_missing]}
 **Branching Statements**: {pytest[coverage][metrics][statements_branching]}
+**Coverage Engine**: {pytest[coverage][metrics][engine]}
 
 ### Details
 
@@ -461,14 +529,15 @@ The following details results from python coverage report:
 ```bash
 {pytest[coverage][details_str]}
 ```
-
-## Mypy
+""",
+    "mypy": """## Mypy
 
 The following details results from python static type checking:
 
 ### Summary
 
 **Total Issues**: {mypy[metrics][total]}
+**Timed Out**: {mypy[timed_out]}
 
 **Errors**: {mypy[metrics][errors]}
 **Warnings**: {mypy[metrics][warnings]}
@@ -494,8 +563,8 @@ The following details results from python static type checking:
 ```bash
 {mypy[notes_str]}
 ```
-
-## Pylint
+""",
+    "pylint": """## Pylint
 
 The following details results from the Flake8 tool:
 
@@ -503,6 +572,8 @@ The following details results from the Flake8 tool:
 
 **Total Issues**: {pylint[metrics][total]}
 **Overall Score**: {pylint[score]} / 10
+**Timed Out**: {pylint[timed_out]}
+**Mode**: {pylint[mode]}
 
 **Errors**: {pylint[metrics][errors]}
 **Warnings**: {pylint[metrics][warnings]}
@@ -540,14 +611,15 @@ The following details results from the Flake8 tool:
 ```bash
 {pylint[design_issues_str]}
 ```
-
-## Pycodestyle
+""",
+    "pycodestyle": """## Pycodestyle
 
 The following details results from the Flake8 tool:
 
 ### Summary
 
 **Total Issues**: {pycodestyle[metrics][total]}
+**Timed Out**: {pycodestyle[timed_out]}
 
 **Errors**: {pycodestyle[metrics][errors]}
 **Warnings**: {pycodestyle[metrics][warnings]}
@@ -567,14 +639,15 @@ The following details results from the Flake8 tool:
 ```bash
 {pycodestyle[warnings_str]}
 ```
-
-## Flake8
+""",
+    "flake8": """## Flake8
 
 The following details results from the Flake8 tool:
 
 ### Summary
 
 **Total Issues**: {flake8[metrics][total]}
+**Timed Out**: {flake8[timed_out]}
 
 **Errors**: {flake8[metrics][errors]}
 **Warnings**: {flake8[metrics][warnings]}
@@ -612,4 +685,10 @@ The following details results from the Flake8 tool:
 ```bash
 {flake8[flakes_str]}
 ```
+""",
+}
+
+report_python_md_skipped_template = """## {section_title}
+
+Skipped, {tool_name} was not run for this report
 """
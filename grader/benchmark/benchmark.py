@@ -0,0 +1,586 @@
+#!/usr/bin/env python3
+"""
+Purpose:
+    Benchmark Class Definition
+
+    Measure the grader itself against synthetic candidate packages of increasing
+    size, and compare the results against a saved baseline
+"""
+
+# Python Library Imports
+import json
+import os
+import pathlib
+import platform
+import random
+import resource
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Local Python Library Imports
+from grader.flake8.flake8 import Flake8
+from grader.mypy.mypy import Mypy
+from grader.pycodestyle.pycodestyle import Pycodestyle
+from grader.pylint.pylint import Pylint
+from grader.pytest.pytest import Pytest
+from grader.report.report_python import ReportPython
+from grader.tool.tool import Tool
+
+
+###
+# Constants
+###
+
+
+# Version of the results file layout, bumped when it changes
+BENCHMARK_RESULTS_VERSION = 1
+
+# Candidate sizes (number of modules) and what to run against each of them
+DEFAULT_BENCHMARK_SIZES = (10, 100, 1000, 10000)
+BENCHMARK_TOOLS = {
+    "flake8": Flake8,
+    "mypy": Mypy,
+    "pycodestyle": Pycodestyle,
+    "pylint": Pylint,
+    "pytest": Pytest,
+}
+BENCHMARK_TARGETS = ("report",) + tuple(BENCHMARK_TOOLS)
+
+# Measured for every case, all lower is better. Results list the metrics they
+# have, so other benchmarks can be compared the same way
+BENCHMARK_METRICS = ("wall_seconds", "cpu_seconds", "peak_rss_kib")
+DEFAULT_REGRESSION_THRESHOLD = 0.1
+
+# Layout of a synthetic candidate
+SYNTHETIC_PACKAGE = "candidate"
+SYNTHETIC_FUNCTIONS_PER_MODULE = 5
+SYNTHETIC_LINT_ERRORS = (
+    "    import os\n",
+    "    unused_value = 1\n",
+    "    spacing=value  +1\n",
+    "    typed_value: int = 'text'\n",
+    "    long_line = '" + "x" * 100 + "'\n",
+)
+
+
+###
+# Synthetic Candidates
+###
+
+
+def generate_synthetic_candidate(
+    candidate_path: str,
+    module_count: int,
+    error_density: float = 0.1,
+    test_count: int = 10,
+    seed: int = 0,
+) -> str:
+    """
+    Purpose:
+        Write a synthetic candidate package. Every module has the same handful of
+        functions; error_density of them get a lint/type error injected, and the
+        tests call functions across the package. The same arguments always
+        produce the same candidate
+    Args:
+        candidate_path: directory to write the candidate in
+        module_count: number of modules in the package
+        error_density: fraction of functions (0 to 1) with an injected error
+        test_count: number of tests
+        seed: seed for choosing where errors go
+    Returns:
+        candidate_path: the candidate's source code directory
+    Raises:
+        N/A
+    """
+
+    candidate_random = random.Random(seed)
+    package_path = pathlib.Path(candidate_path, SYNTHETIC_PACKAGE)
+    (package_path / "tests").mkdir(parents=True, exist_ok=True)
+    (package_path / "__init__.py").write_text('"""\nSynthetic candidate\n"""\n')
+
+    for module_index in range(module_count):
+        module_source = [f'"""\nSynthetic module {module_index}\n"""\n']
+        for function_index in range(SYNTHETIC_FUNCTIONS_PER_MODULE):
+            module_source.append(
+                f"\n\ndef function_{function_index}(value: int) -> int:\n"
+                f'    """\n    Return value plus {function_index}\n    """\n\n'
+            )
+            if candidate_random.random() < error_density:
+                module_source.append(candidate_random.choice(SYNTHETIC_LINT_ERRORS))
+            module_source.append(f"    return value + {function_index}\n")
+
+        (package_path / f"module_{module_index:05d}.py").write_text(
+            "".join(module_source)
+        )
+
+    test_source = ['"""\nSynthetic tests\n"""\n']
+    for test_index in range(test_count):
+        module_index = test_index % max(module_count, 1)
+        function_index = test_index % SYNTHETIC_FUNCTIONS_PER_MODULE
+        test_source.append(
+            f"\n\ndef test_{test_index}() -> None:\n"
+            f"    from {SYNTHETIC_PACKAGE}.module_{module_index:05d} import (\n"
+            f"        function_{function_index},\n"
+            f"    )\n\n"
+            f"    assert function_{function_index}(1) == {1 + function_index}\n"
+        )
+    (package_path / "tests" / "test_candidate.py").write_text("".join(test_source))
+
+    return candidate_path
+
+
+###
+# Measurement
+###
+
+
+def get_benchmark_tool(tool_name: str, candidate_path: str, report_path: str) -> Tool:
+    """
+    Purpose:
+        Get a tool set up to run against a synthetic candidate
+    Args:
+        tool_name: name of the tool, a key of BENCHMARK_TOOLS
+        candidate_path: source code of the synthetic candidate
+        report_path: path to save reports in, used by pytest
+    Returns:
+        tool: the tool, ready to run
+    Raises:
+        Exception: if the candidate does not exist
+    """
+
+    if tool_name == "pytest":
+        return Pytest(candidate_path, report_path, python_package=SYNTHETIC_PACKAGE)
+
+    return BENCHMARK_TOOLS[tool_name](candidate_path, python_package=SYNTHETIC_PACKAGE)
+
+
+def get_cpu_seconds() -> float:
+    """
+    Purpose:
+        Get CPU time used so far by this process and the children it has waited on
+    Args:
+        N/A
+    Returns:
+        cpu_seconds: user plus system time
+    Raises:
+        N/A
+    """
+
+    return sum(
+        resource_usage.ru_utime + resource_usage.ru_stime
+        for resource_usage in (
+            resource.getrusage(resource.RUSAGE_SELF),
+            resource.getrusage(resource.RUSAGE_CHILDREN),
+        )
+    )
+
+
+def get_peak_rss_kib() -> int:
+    """
+    Purpose:
+        Get the largest resident set size of this process or any child it waited
+        on. A high-water mark, which is why every case runs in its own process
+    Args:
+        N/A
+    Returns:
+        peak_rss_kib: peak RSS in KiB
+    Raises:
+        N/A
+    """
+
+    peak_rss = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+
+    # macOS reports bytes, Linux KiB
+    if platform.system() == "Darwin":
+        peak_rss //= 1024
+
+    return peak_rss
+
+
+def run_benchmark_case(
+    benchmark_case: Dict[str, Any], candidate_path: str, report_path: str
+) -> Dict[str, Any]:
+    """
+    Purpose:
+        Run a single target against a candidate and measure it. Runs in a fresh
+        process, so failures are captured in the result instead of raised
+    Args:
+        benchmark_case: target, modules, error_density and tests of the case
+        candidate_path: source code of the synthetic candidate
+        report_path: path to save reports in
+    Returns:
+        benchmark_result: the case with status, error and every metric
+    Raises:
+        N/A
+    """
+
+    benchmark_result = dict(benchmark_case)
+    benchmark_result.update({"status": "success", "error": None})
+
+    start_wall = time.perf_counter()
+    start_cpu = get_cpu_seconds()
+    try:
+        if benchmark_case["target"] == "report":
+            ReportPython(
+                f"benchmark_{benchmark_case['modules']}",
+                "benchmark",
+                candidate_path,
+                SYNTHETIC_PACKAGE,
+                base_report_path=report_path,
+            ).generate_report(overwrite=True)
+        else:
+            get_benchmark_tool(
+                benchmark_case["target"], candidate_path, report_path
+            ).run()
+    except Exception as benchmark_error:
+        benchmark_result["status"] = "failed"
+        benchmark_result["error"] = "".join(
+            traceback.format_exception_only(type(benchmark_error), benchmark_error)
+        ).strip()
+
+    benchmark_result["wall_seconds"] = round(time.perf_counter() - start_wall, 3)
+    benchmark_result["cpu_seconds"] = round(get_cpu_seconds() - start_cpu, 3)
+    benchmark_result["peak_rss_kib"] = get_peak_rss_kib()
+
+    return benchmark_result
+
+
+###
+# Results
+###
+
+
+def read_benchmark_results(results_path: str) -> Dict[str, Any]:
+    """
+    Purpose:
+        Read a results file stored by Benchmark.store_results
+    Args:
+        results_path: path to the results file
+    Returns:
+        benchmark_results: environment details and every case's metrics
+    Raises:
+        Exception: if the file is missing or from another results version
+    """
+
+    if not os.path.isfile(results_path):
+        raise Exception(f"{results_path} is not a valid path to benchmark results")
+
+    with open(results_path, "r") as results_file_obj:
+        benchmark_results = json.load(results_file_obj)
+
+    if benchmark_results.get("version") != BENCHMARK_RESULTS_VERSION:
+        raise Exception(f"{results_path} is not a v{BENCHMARK_RESULTS_VERSION} result")
+
+    return benchmark_results
+
+
+def get_benchmark_case_key(benchmark_case: Dict[str, Any]) -> Tuple[Any, ...]:
+    """
+    Purpose:
+        Get what identifies a case across runs
+    Args:
+        benchmark_case: a case or its result
+    Returns:
+        case_key: target, modules, error_density and tests
+    Raises:
+        N/A
+    """
+
+    return (
+        benchmark_case["target"],
+        benchmark_case["modules"],
+        benchmark_case["error_density"],
+        benchmark_case["tests"],
+    )
+
+
+def compare_benchmark_results(
+    baseline_results: Dict[str, Any],
+    current_results: Dict[str, Any],
+    threshold: float = DEFAULT_REGRESSION_THRESHOLD,
+) -> List[Dict[str, Any]]:
+    """
+    Purpose:
+        Compare every case found in both results, on the metrics the current
+        results list. A metric regressed when it is more than threshold (a
+        fraction) worse than the baseline
+    Args:
+        baseline_results: results to compare against
+        current_results: results to check
+        threshold: allowed slowdown/growth before a metric counts as regressed
+    Returns:
+        benchmark_comparisons: per case baseline, current and relative change of
+            every metric, plus the compared and regressed metrics, ordered by
+            target and size
+    Raises:
+        N/A
+    """
+
+    benchmark_metrics = current_results.get("metrics", BENCHMARK_METRICS)
+    baseline_cases = {
+        get_benchmark_case_key(baseline_case): baseline_case
+        for baseline_case in baseline_results["cases"]
+        if baseline_case["status"] == "success"
+    }
+
+    benchmark_comparisons = []
+    for current_case in current_results["cases"]:
+        baseline_case = baseline_cases.get(get_benchmark_case_key(current_case))
+        if not baseline_case or current_case["status"] != "success":
+            continue
+
+        benchmark_comparison = {
+            field: current_case[field]
+            for field in ("target", "modules", "error_density", "tests")
+        }
+        benchmark_comparison["metrics"] = list(benchmark_metrics)
+        benchmark_comparison["regressions"] = []
+        for metric in benchmark_metrics:
+            metric_change = None
+            if baseline_case[metric]:
+                metric_change = current_case[metric] / baseline_case[metric] - 1
+            benchmark_comparison[metric] = {
+                "baseline": baseline_case[metric],
+                "current": current_case[metric],
+                "change": metric_change,
+            }
+            if metric_change is not None and metric_change > threshold:
+                benchmark_comparison["regressions"].append(metric)
+
+        benchmark_comparisons.append(benchmark_comparison)
+
+    return sorted(benchmark_comparisons, key=get_benchmark_case_key)
+
+
+###
+# Class Definition
+###
+
+
+class Benchmark:
+    """
+    Purpose:
+        The Benchmark Class runs the full report and every tool against synthetic
+        candidates of each size, one fresh process per case
+    """
+
+    ###
+    # Reserved Methods
+    ###
+
+    def __init__(
+        self,
+        benchmark_path: str = f"{os.path.abspath('./')}/benchmarks",
+        sizes: Tuple[int, ...] = DEFAULT_BENCHMARK_SIZES,
+        targets: Tuple[str, ...] = BENCHMARK_TARGETS,
+        error_density: float = 0.1,
+        test_count: int = 10,
+        seed: int = 0,
+    ) -> None:
+        """
+        Purpose:
+            Constructor for a Benchmark
+        Args:
+            benchmark_path: path to keep candidates and reports in. Candidates are
+                reused between runs. Defaults to ./benchmarks
+            sizes: number of modules of each candidate
+            targets: "report" and/or tool names to run against every candidate
+            error_density: fraction of functions (0 to 1) with an injected error
+            test_count: number of tests in every candidate
+            seed: seed for choosing where errors go
+        Returns:
+            N/A
+        Raises:
+            Exception: If a target is not known
+        """
+
+        unknown_targets = set(targets) - set(BENCHMARK_TARGETS)
+        if unknown_targets:
+            raise Exception(f"Unknown benchmark targets: {sorted(unknown_targets)}")
+
+        # Benchmark Data
+        self.benchmark_path = benchmark_path
+        self.sizes = tuple(sizes)
+        self.targets = tuple(targets)
+
+        # Candidate Data
+        self.error_density = error_density
+        self.test_count = test_count
+        self.seed = seed
+
+    def __repr__(self) -> str:
+        """
+        Purpose:
+            String Representation for a Benchmark
+        Args:
+            N/A
+        Returns:
+            benchmark_repr: sizes and targets of the benchmark
+        Raises:
+            N/A
+        """
+
+        return f"<Benchmark {list(self.sizes)} x {list(self.targets)}>"
+
+    ###
+    # Properties
+    ###
+
+    @property
+    def benchmark_cases(self) -> List[Dict[str, Any]]:
+        """
+        Purpose:
+            Every case to run, by size then target
+        Args:
+            N/A
+        Returns:
+            benchmark_cases: target, modules, error_density and tests of each case
+        Raises:
+            N/A
+        """
+
+        return [
+            {
+                "target": target,
+                "modules": size,
+                "error_density": self.error_density,
+                "tests": self.test_count,
+            }
+            for size in self.sizes
+            for target in self.targets
+        ]
+
+    @property
+    def report_path(self) -> str:
+        """
+        Purpose:
+            Get the path reports of benchmarked runs are saved to
+        Args:
+            N/A
+        Returns:
+            report_path: path to the reports
+        Raises:
+            N/A
+        """
+
+        return f"{self.benchmark_path}/reports"
+
+    def get_candidate_path(self, size: int) -> str:
+        """
+        Purpose:
+            Get the path of the synthetic candidate of a size
+        Args:
+            size: number of modules of the candidate
+        Returns:
+            candidate_path: source code of the candidate
+        Raises:
+            N/A
+        """
+
+        return (
+            f"{self.benchmark_path}/candidates/modules_{size}_density_"
+            f"{self.error_density}_tests_{self.test_count}_seed_{self.seed}"
+        )
+
+    ###
+    # Benchmark Operations
+    ###
+
+    def generate_candidates(self) -> None:
+        """
+        Purpose:
+            Write the synthetic candidate of every size, skipping those that were
+            completely written by an earlier run
+        Args:
+            N/A
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        for size in self.sizes:
+            candidate_path = self.get_candidate_path(size)
+            candidate_marker_path = f"{candidate_path}/.benchmark_candidate"
+            if os.path.isfile(candidate_marker_path):
+                continue
+
+            generate_synthetic_candidate(
+                candidate_path,
+                size,
+                error_density=self.error_density,
+                test_count=self.test_count,
+                seed=self.seed,
+            )
+            pathlib.Path(candidate_marker_path).touch()
+
+    def run(
+        self, progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Purpose:
+            Run every case, one at a time so they don't compete for the machine
+        Args:
+            progress_callback: called with each case's result once it finishes
+        Returns:
+            benchmark_results: environment details and every case's metrics
+        Raises:
+            N/A
+        """
+
+        self.generate_candidates()
+        pathlib.Path(self.report_path).mkdir(parents=True, exist_ok=True)
+
+        benchmark_case_results = []
+        for benchmark_case in self.benchmark_cases:
+            # A fresh process per case keeps peak RSS and CPU time to that case
+            with ProcessPoolExecutor(max_workers=1) as benchmark_executor:
+                benchmark_result = benchmark_executor.submit(
+                    run_benchmark_case,
+                    benchmark_case,
+                    self.get_candidate_path(benchmark_case["modules"]),
+                    self.report_path,
+                ).result()
+
+            benchmark_case_results.append(benchmark_result)
+            if progress_callback:
+                progress_callback(benchmark_result)
+
+        return {
+            "version": BENCHMARK_RESULTS_VERSION,
+            "created_at": time.time(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "seed": self.seed,
+            "metrics": list(BENCHMARK_METRICS),
+            "cases": benchmark_case_results,
+        }
+
+    @staticmethod
+    def store_results(benchmark_results: Dict[str, Any], results_path: str) -> None:
+        """
+        Purpose:
+            Store benchmark results to compare later runs against
+        Args:
+            benchmark_results: results returned by run
+            results_path: file to store the results in
+        Returns:
+            N/A
+        Raises:
+            Exception: if results storing fails
+        """
+
+        with open(results_path, "w") as results_file_obj:
+            json.dump(
+                benchmark_results,
+                results_file_obj,
+                sort_keys=True,
+                indent=2,
+                separators=(",", ": "),
+            )
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Purpose:
+    Import Time Benchmark
+
+    Measure how long the grader's entrypoints take to import with -X importtime,
+    and check them against a budget. The CLI is started thousands of times a day,
+    so whatever it imports before parsing its arguments is paid on every call
+"""
+
+# Python Library Imports
+import os
+import shlex
+import sys
+from typing import Any, Dict, List, Tuple
+
+# Local Python Library Imports
+import grader.subprocess.subprocess as subprocess
+
+
+###
+# Constants
+###
+
+
+# Microseconds each entrypoint may spend importing, on top of the third party
+# IMPORT_BASELINE_MODULES it cannot start without
+IMPORT_TIME_BUDGETS = {"grader.cli.cli": 20000}
+IMPORT_BASELINE_MODULES = ("click",)
+
+# Line prefix of -X importtime output, on stderr
+IMPORT_TIME_PREFIX = "import time:"
+
+
+###
+# Functions
+###
+
+
+def parse_import_times(importtime_lines: List[str]) -> List[Tuple[str, int, int]]:
+    """
+    Purpose:
+        Parse -X importtime output
+    Args:
+        importtime_lines: stderr of the interpreter, split by newline
+    Returns:
+        import_times: (module, self microseconds, cumulative microseconds) for
+            every module imported, in the order their imports finished
+    Raises:
+        N/A
+    """
+
+    import_times = []
+    for importtime_line in importtime_lines:
+        if not importtime_line.startswith(IMPORT_TIME_PREFIX):
+            continue
+
+        import_columns = importtime_line.replace(IMPORT_TIME_PREFIX, "", 1).split("|")
+        if len(import_columns) != 3 or not import_columns[0].strip().isdigit():
+            # The header row
+            continue
+
+        import_times.append(
+            (import_columns[2].strip(), int(import_columns[0]), int(import_columns[1]),)
+        )
+
+    return import_times
+
+
+def measure_import_time(module_name: str, runs: int = 5) -> Dict[str, Any]:
+    """
+    Purpose:
+        Import a module in fresh interpreters (this one's executable) and measure
+        how long it takes. Timings are the best of runs
+    Args:
+        module_name: module to import
+        runs: number of interpreters to import it in
+    Returns:
+        import_metrics: module, import_us (cumulative), own_import_us (without
+            IMPORT_BASELINE_MODULES), budget_us (None if it has no budget) and
+            grader_modules, the grader modules it imported
+    Raises:
+        Exception: if the module cannot be imported
+    """
+
+    grader_path = os.path.dirname(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    )
+    import_command = (
+        f"{shlex.quote(sys.executable)} -X importtime "
+        f"-c {shlex.quote(f'import {module_name}')}"
+    )
+
+    import_timings = []
+    own_import_timings = []
+    grader_modules = []
+    for _ in range(runs):
+        (_, importtime_lines, _) = subprocess.run_subprocess_call(
+            import_command, env={"PYTHONPATH": grader_path}, cwd=grader_path
+        )
+        import_times = {
+            imported_module: cumulative_us
+            for (imported_module, _, cumulative_us) in parse_import_times(
+                importtime_lines
+            )
+        }
+        if module_name not in import_times:
+            raise Exception(f"Could not import {module_name}: {importtime_lines}")
+
+        import_timings.append(import_times[module_name])
+        own_import_timings.append(
+            import_times[module_name]
+            - sum(
+                import_times.get(baseline_module, 0)
+                for baseline_module in IMPORT_BASELINE_MODULES
+            )
+        )
+        grader_modules = sorted(
+            imported_module
+            for imported_module in import_times
+            if imported_module.split(".")[0] == "grader"
+        )
+
+    return {
+        "module": module_name,
+        "import_us": min(import_timings),
+        "own_import_us": min(own_import_timings),
+        "budget_us": IMPORT_TIME_BUDGETS.get(module_name),
+        "grader_modules": grader_modules,
+    }
@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Purpose:
+    ParserBenchmark Class Definition
+
+    Record real tool output into a corpus, and replay it through each tool's
+    output parser to measure parsing alone
+"""
+
+# Python Library Imports
+import gc
+import gzip
+import json
+import os
+import pathlib
+import platform
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Local Python Library Imports
+import grader.subprocess.subprocess as subprocess
+from grader.benchmark.benchmark import (
+    BENCHMARK_RESULTS_VERSION,
+    BENCHMARK_TOOLS,
+    generate_synthetic_candidate,
+    get_benchmark_tool,
+)
+
+
+###
+# Constants
+###
+
+
+# Metrics compared between parser benchmark results, all lower is better
+PARSER_BENCHMARK_METRICS = ("wall_seconds", "cpu_seconds", "peak_allocated_kib")
+
+# Corpus layout: a manifest plus one gzipped stdout capture per tool and size
+PARSER_CORPUS_MANIFEST = "corpus.json"
+DEFAULT_PARSER_CORPUS_SIZES = (10, 100, 1000, 10000)
+
+
+###
+# Functions
+###
+
+
+def read_corpus_lines(corpus_file_path: str) -> List[str]:
+    """
+    Purpose:
+        Read a recorded capture back into the lines the parser originally saw
+    Args:
+        corpus_file_path: gzipped capture
+    Returns:
+        output_lines: stdout split by newline, as run_subprocess_call returns it
+    Raises:
+        N/A
+    """
+
+    with gzip.open(corpus_file_path, "rt", encoding="utf-8") as corpus_file_obj:
+        return corpus_file_obj.read().split("\n")
+
+
+def measure_parser(
+    parse_output: Callable[[List[str]], Any], output_lines: List[str], repeat: int = 5
+) -> Dict[str, Any]:
+    """
+    Purpose:
+        Measure a parser on captured output. Timings are the best of repeat
+        passes; allocations are measured on a separate pass so tracing does not
+        skew the timings
+    Args:
+        parse_output: the parser, called with every line
+        output_lines: captured output
+        repeat: number of timed passes
+    Returns:
+        parser_metrics: wall_seconds, cpu_seconds, lines_per_second,
+            peak_allocated_kib and retained_kib
+    Raises:
+        N/A
+    """
+
+    wall_timings = []
+    cpu_timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start_wall = time.perf_counter()
+        start_cpu = time.process_time()
+        parse_output(output_lines)
+        cpu_timings.append(time.process_time() - start_cpu)
+        wall_timings.append(time.perf_counter() - start_wall)
+
+    # Memory still allocated once parsing is done is what the parsed output holds
+    gc.collect()
+    tracemalloc.start()
+    try:
+        parsed_output = parse_output(output_lines)
+        (retained_bytes, peak_allocated_bytes) = tracemalloc.get_traced_memory()
+        del parsed_output
+    finally:
+        tracemalloc.stop()
+
+    wall_seconds = min(wall_timings)
+    lines_per_second = None
+    if wall_seconds:
+        lines_per_second = round(len(output_lines) / wall_seconds)
+
+    return {
+        "wall_seconds": round(wall_seconds, 6),
+        "cpu_seconds": round(min(cpu_timings), 6),
+        "lines_per_second": lines_per_second,
+        "peak_allocated_kib": round(peak_allocated_bytes / 1024, 1),
+        "retained_kib": round(retained_bytes / 1024, 1),
+    }
+
+
+###
+# Class Definition
+###
+
+
+class ParserBenchmark:
+    """
+    Purpose:
+        The ParserBenchmark Class keeps a corpus of real tool output at several
+        sizes, recorded from runs against synthetic candidates, and replays it
+        through the tools' _parse_output without running any tool
+    """
+
+    ###
+    # Reserved Methods
+    ###
+
+    def __init__(
+        self,
+        corpus_path: str = f"{os.path.abspath('./')}/benchmarks/parser_corpus",
+        tools: Tuple[str, ...] = tuple(BENCHMARK_TOOLS),
+        repeat: int = 5,
+    ) -> None:
+        """
+        Purpose:
+            Constructor for a ParserBenchmark
+        Args:
+            corpus_path: directory the corpus is recorded to and replayed from.
+                Defaults to ./benchmarks/parser_corpus
+            tools: names of the tools to record/replay
+            repeat: number of timed passes over every capture
+        Returns:
+            N/A
+        Raises:
+            Exception: If a tool is not known
+        """
+
+        unknown_tools = set(tools) - set(BENCHMARK_TOOLS)
+        if unknown_tools:
+            raise Exception(f"Unknown benchmark tools: {sorted(unknown_tools)}")
+
+        self.corpus_path = corpus_path
+        self.tools = tuple(tools)
+        self.repeat = repeat
+
+    def __repr__(self) -> str:
+        """
+        Purpose:
+            String Representation for a ParserBenchmark
+        Args:
+            N/A
+        Returns:
+            parser_benchmark_repr: corpus and tools of the benchmark
+        Raises:
+            N/A
+        """
+
+        return f"<ParserBenchmark {self.corpus_path} ({', '.join(self.tools)})>"
+
+    ###
+    # Properties
+    ###
+
+    @property
+    def corpus_manifest_path(self) -> str:
+        """
+        Purpose:
+            Corpus Manifest Filename
+        Args:
+            N/A
+        Returns:
+            corpus_manifest_path: name of the manifest listing every capture
+        Raises:
+            N/A
+        """
+
+        return f"{self.corpus_path}/{PARSER_CORPUS_MANIFEST}"
+
+    def read_corpus_manifest(self) -> List[Dict[str, Any]]:
+        """
+        Purpose:
+            Read the captures in the corpus
+        Args:
+            N/A
+        Returns:
+            corpus_entries: tool, modules, error_density, lines and file of every
+                capture
+        Raises:
+            Exception: if there is no corpus
+        """
+
+        if not os.path.isfile(self.corpus_manifest_path):
+            raise Exception(f"{self.corpus_path} is not a parser corpus, record one")
+
+        with open(self.corpus_manifest_path, "r") as corpus_manifest_file_obj:
+            return json.load(corpus_manifest_file_obj)["captures"]
+
+    ###
+    # Benchmark Operations
+    ###
+
+    def record(
+        self,
+        sizes: Tuple[int, ...] = DEFAULT_PARSER_CORPUS_SIZES,
+        error_density: float = 1.0,
+        test_count: int = 100,
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Purpose:
+            Run every tool against a synthetic candidate of each size and store
+            its raw stdout. A high error density gives large, realistic outputs
+        Args:
+            sizes: number of modules of each candidate
+            error_density: fraction of functions (0 to 1) with an injected error
+            test_count: number of tests in every candidate
+            progress_callback: called with each capture once it is stored
+        Returns:
+            corpus_entries: tool, modules, error_density, lines and file of every
+                capture
+        Raises:
+            Exception: if a tool fails to run
+        """
+
+        pathlib.Path(self.corpus_path).mkdir(parents=True, exist_ok=True)
+
+        corpus_entries = []
+        for size in sizes:
+            candidate_path = f"{self.corpus_path}/candidates/modules_{size}"
+            generate_synthetic_candidate(
+                candidate_path,
+                size,
+                error_density=error_density,
+                test_count=test_count,
+            )
+
+            for tool_name in self.tools:
+                tool = get_benchmark_tool(
+                    tool_name, candidate_path, f"{self.corpus_path}/reports"
+                )
+                (output_lines, error_lines, _) = subprocess.run_subprocess_call(
+                    tool.command, env=tool.command_env, cwd=candidate_path, timeout=None
+                )
+                if not any(output_lines) and any(error_lines):
+                    raise Exception(
+                        f"{tool_name} failed to run: {' '.join(error_lines).strip()}"
+                    )
+
+                corpus_file = f"{tool_name}_{size}.txt.gz"
+                with gzip.open(
+                    f"{self.corpus_path}/{corpus_file}", "wt", encoding="utf-8"
+                ) as corpus_file_obj:
+                    corpus_file_obj.write("\n".join(output_lines))
+
+                corpus_entry = {
+                    "tool": tool_name,
+                    "version": tool.version,
+                    "modules": size,
+                    "error_density": error_density,
+                    "tests": test_count,
+                    "lines": len(output_lines),
+                    "file": corpus_file,
+                }
+                corpus_entries.append(corpus_entry)
+                if progress_callback:
+                    progress_callback(corpus_entry)
+
+        with open(self.corpus_manifest_path, "w") as corpus_manifest_file_obj:
+            json.dump(
+                {"recorded_at": time.time(), "captures": corpus_entries},
+                corpus_manifest_file_obj,
+                sort_keys=True,
+                indent=2,
+                separators=(",", ": "),
+            )
+
+        return corpus_entries
+
+    def run(
+        self, progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Purpose:
+            Replay every capture in the corpus through its tool's parser
+        Args:
+            progress_callback: called with each capture's result once it finishes
+        Returns:
+            benchmark_results: environment details and every capture's metrics, in
+                the same format as Benchmark.run
+        Raises:
+            Exception: if there is no corpus
+        """
+
+        benchmark_case_results = []
+        for corpus_entry in self.read_corpus_manifest():
+            if corpus_entry["tool"] not in self.tools:
+                continue
+
+            # Parsing never touches the code, the corpus is just a valid path
+            tool = get_benchmark_tool(
+                corpus_entry["tool"], self.corpus_path, self.corpus_path
+            )
+            output_lines = read_corpus_lines(
+                f"{self.corpus_path}/{corpus_entry['file']}"
+            )
+
+            benchmark_result = {
+                "target": f"parser:{corpus_entry['tool']}",
+                "modules": corpus_entry["modules"],
+                "error_density": corpus_entry["error_density"],
+                "tests": corpus_entry["tests"],
+                "lines": len(output_lines),
+                "status": "success",
+                "error": None,
+            }
+            benchmark_result.update(
+                measure_parser(tool._parse_output, output_lines, repeat=self.repeat)
+            )
+
+            benchmark_case_results.append(benchmark_result)
+            if progress_callback:
+                progress_callback(benchmark_result)
+
+        return {
+            "version": BENCHMARK_RESULTS_VERSION,
+            "created_at": time.time(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "metrics": list(PARSER_BENCHMARK_METRICS),
+            "cases": benchmark_case_results,
+        }
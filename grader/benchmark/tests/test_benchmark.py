@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Purpose:
+    Test File for benchmark.py
+"""
+
+# Python Library Imports
+import copy
+
+# Local Python Library Imports
+from grader.benchmark.benchmark import (
+    SYNTHETIC_PACKAGE,
+    Benchmark,
+    compare_benchmark_results,
+    generate_synthetic_candidate,
+    read_benchmark_results,
+)
+
+
+###########
+# Mocks/Fixtures
+###########
+
+
+BENCHMARK_RESULTS = {
+    "version": 1,
+    "cases": [
+        {
+            "target": "flake8",
+            "modules": 10,
+            "error_density": 0.1,
+            "tests": 10,
+            "status": "success",
+            "error": None,
+            "wall_seconds": 1.0,
+            "cpu_seconds": 0.5,
+            "peak_rss_kib": 20000,
+        },
+        {
+            "target": "flake8",
+            "modules": 100,
+            "error_density": 0.1,
+            "tests": 10,
+            "status": "success",
+            "error": None,
+            "wall_seconds": 2.0,
+            "cpu_seconds": 0.0,
+            "peak_rss_kib": 20000,
+        },
+    ],
+}
+
+
+###########
+# Tests: Benchmark
+###########
+
+
+###
+# generate_synthetic_candidate()
+###
+
+
+def test_generate_synthetic_candidate(tmp_path: object) -> int:
+    """
+    Purpose:
+        Test synthetic candidates have the requested shape and are reproducible
+    Args:
+        tmp_path: pytest tmp_path fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    generate_synthetic_candidate(f"{tmp_path}/a", 3, error_density=1, test_count=4)
+    generate_synthetic_candidate(f"{tmp_path}/b", 3, error_density=1, test_count=4)
+
+    test_package_path = tmp_path / "a" / SYNTHETIC_PACKAGE
+    assert sorted(path.name for path in test_package_path.glob("*.py")) == [
+        "__init__.py",
+        "module_00000.py",
+        "module_00001.py",
+        "module_00002.py",
+    ]
+    test_tests_source = (test_package_path / "tests" / "test_candidate.py").read_text()
+    assert test_tests_source.count("def test_") == 4
+
+    # Every module compiles, and every function got an error at density 1
+    for test_module_path in test_package_path.glob("module_*.py"):
+        test_module_source = test_module_path.read_text()
+        compile(test_module_source, str(test_module_path), "exec")
+        assert test_module_source.count("    return") == 5
+        assert len(test_module_source.splitlines()) == 3 + 5 * 9
+
+        test_other_module_path = (
+            tmp_path / "b" / SYNTHETIC_PACKAGE / test_module_path.name
+        )
+        assert test_other_module_path.read_text() == test_module_source
+
+
+###
+# Benchmark.run()
+###
+
+
+def test_Benchmark_run(tmp_path: object) -> int:
+    """
+    Purpose:
+        Test a benchmark run measures every case and its results can be read back
+    Args:
+        tmp_path: pytest tmp_path fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    test_benchmark = Benchmark(
+        str(tmp_path), sizes=(2, 4), targets=("pycodestyle",), test_count=1
+    )
+    test_results = test_benchmark.run()
+
+    assert [
+        (test_case["target"], test_case["modules"], test_case["status"])
+        for test_case in test_results["cases"]
+    ] == [("pycodestyle", 2, "success"), ("pycodestyle", 4, "success")]
+    for test_case in test_results["cases"]:
+        assert test_case["wall_seconds"] >= 0
+        assert test_case["cpu_seconds"] >= 0
+        assert test_case["peak_rss_kib"] > 0
+
+    test_results_path = f"{tmp_path}/results.json"
+    test_benchmark.store_results(test_results, test_results_path)
+    assert read_benchmark_results(test_results_path) == test_results
+
+
+###
+# compare_benchmark_results()
+###
+
+
+def test_compare_benchmark_results() -> int:
+    """
+    Purpose:
+        Test metrics over the threshold are reported as regressions
+    Args:
+        N/A
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    test_current_results = copy.deepcopy(BENCHMARK_RESULTS)
+    test_current_results["cases"][0]["wall_seconds"] = 1.05
+    test_current_results["cases"][1]["wall_seconds"] = 3.0
+    test_current_results["cases"][1]["peak_rss_kib"] = 10000
+
+    test_comparisons = compare_benchmark_results(
+        BENCHMARK_RESULTS, test_current_results, threshold=0.1
+    )
+    assert [test_comparison["modules"] for test_comparison in test_comparisons] == [
+        10,
+        100,
+    ]
+    assert test_comparisons[0]["regressions"] == []
+    assert test_comparisons[1]["regressions"] == ["wall_seconds"]
+    assert test_comparisons[1]["wall_seconds"]["change"] == 0.5
+    assert test_comparisons[1]["peak_rss_kib"]["change"] == -0.5
+
+    # No relative change from a zero baseline
+    assert test_comparisons[1]["cpu_seconds"]["change"] is None
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Purpose:
+    Test File for import_benchmark.py
+"""
+
+# Python Library Imports
+# N/A
+
+# Local Python Library Imports
+import grader.subprocess.subprocess as subprocess
+from grader.benchmark.import_benchmark import (
+    IMPORT_TIME_BUDGETS,
+    measure_import_time,
+    parse_import_times,
+)
+
+
+###########
+# Mocks/Fixtures
+###########
+
+
+IMPORTTIME_OUTPUT = [
+    "import time: self [us] | cumulative | imported package",
+    "import time:       120 |        120 |   _io",
+    "import time:       305 |      21154 |   click",
+    "import time:       210 |        210 |     grader.cli.lazy_group",
+    "import time:      1769 |      23133 | grader.cli.cli",
+    "",
+]
+
+# Modules the CLI may import before it knows which command is run
+CLI_STARTUP_MODULES = (
+    "grader",
+    "grader.cli",
+    "grader.cli.cli",
+    "grader.cli.lazy_group",
+)
+
+
+def mock_run_subprocess_call(
+    command: str, env: dict, cwd: str, timeout: int = 60
+) -> tuple:
+    """
+    Purpose:
+        Stand in for an interpreter importing grader.cli.cli, returning
+        IMPORTTIME_OUTPUT on stderr
+    Args:
+        command: command to run
+        env: environment variables for shell
+        cwd: working directory to run command from
+        timeout: timeout for command to complete
+    Return:
+        process_stdout: nothing
+        process_stderr: IMPORTTIME_OUTPUT
+        timed_out: always False
+    Raises:
+        N/A
+    """
+
+    return ([""], IMPORTTIME_OUTPUT, False)
+
+
+###########
+# Tests: Import Benchmark
+###########
+
+
+###
+# parse_import_times()
+###
+
+
+def test_parse_import_times() -> int:
+    """
+    Purpose:
+        Test -X importtime rows are parsed and the header is skipped
+    Args:
+        N/A
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    assert parse_import_times(IMPORTTIME_OUTPUT) == [
+        ("_io", 120, 120),
+        ("click", 305, 21154),
+        ("grader.cli.lazy_group", 210, 210),
+        ("grader.cli.cli", 1769, 23133),
+    ]
+
+
+###
+# measure_import_time()
+###
+
+
+def test_measure_import_time(monkeypatch: object) -> int:
+    """
+    Purpose:
+        Test the import time is measured without the baseline modules
+    Args:
+        monkeypatch: pytest monkeypatch fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    monkeypatch.setattr(subprocess, "run_subprocess_call", mock_run_subprocess_call)
+
+    assert measure_import_time("grader.cli.cli", runs=2) == {
+        "module": "grader.cli.cli",
+        "import_us": 23133,
+        "own_import_us": 23133 - 21154,
+        "budget_us": IMPORT_TIME_BUDGETS["grader.cli.cli"],
+        "grader_modules": ["grader.cli.cli", "grader.cli.lazy_group"],
+    }
+
+
+def test_measure_import_time_budgets() -> int:
+    """
+    Purpose:
+        Test every entrypoint with a budget imports within it, and that the CLI
+        imports no command or tool before it parses its arguments
+    Args:
+        N/A
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    for (test_module_name, test_budget_us) in IMPORT_TIME_BUDGETS.items():
+        test_import_metrics = measure_import_time(test_module_name)
+        assert (
+            test_import_metrics["own_import_us"] <= test_budget_us
+        ), test_import_metrics
+
+    test_import_metrics = measure_import_time("grader.cli.cli", runs=1)
+    assert set(test_import_metrics["grader_modules"]) <= set(CLI_STARTUP_MODULES)
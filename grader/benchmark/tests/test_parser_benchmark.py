@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Purpose:
+    Test File for parser_benchmark.py
+"""
+
+# Python Library Imports
+import pytest
+
+# Local Python Library Imports
+import grader.subprocess.subprocess as subprocess
+from grader.benchmark.parser_benchmark import ParserBenchmark, read_corpus_lines
+
+
+###########
+# Mocks/Fixtures
+###########
+
+
+FLAKE8_OUTPUT = [
+    "candidate/module_00000.py:1:1: F401 'os' imported but unused",
+    "candidate/module_00000.py:9:5: F841 local variable 'x' is never used",
+    "candidate/module_00001.py:9:12: E225 missing whitespace around operator",
+    "",
+]
+
+
+def mock_run_subprocess_call(
+    command: str, env: dict, cwd: str, timeout: int = 60
+) -> tuple:
+    """
+    Purpose:
+        Stand in for a tool run, returning FLAKE8_OUTPUT for any command
+    Args:
+        command: command to run
+        env: environment variables for shell
+        cwd: working directory to run command from
+        timeout: timeout for command to complete
+    Return:
+        process_stdout: FLAKE8_OUTPUT
+        process_stderr: no errors
+        timed_out: always False
+    Raises:
+        N/A
+    """
+
+    return (FLAKE8_OUTPUT, [""], False)
+
+
+###########
+# Tests: Parser Benchmark
+###########
+
+
+###
+# ParserBenchmark.record()
+###
+
+
+def test_ParserBenchmark_record(tmp_path: object, monkeypatch: object) -> int:
+    """
+    Purpose:
+        Test recorded captures replay as exactly the lines the tool printed
+    Args:
+        tmp_path: pytest tmp_path fixture
+        monkeypatch: pytest monkeypatch fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    monkeypatch.setattr(subprocess, "run_subprocess_call", mock_run_subprocess_call)
+
+    test_parser_benchmark = ParserBenchmark(str(tmp_path), tools=("flake8",))
+    test_corpus_entries = test_parser_benchmark.record(sizes=(2,), test_count=1)
+
+    assert test_corpus_entries == test_parser_benchmark.read_corpus_manifest()
+    assert test_corpus_entries[0]["tool"] == "flake8"
+    assert test_corpus_entries[0]["lines"] == len(FLAKE8_OUTPUT)
+    assert (
+        read_corpus_lines(f"{tmp_path}/{test_corpus_entries[0]['file']}")
+        == FLAKE8_OUTPUT
+    )
+
+
+def test_ParserBenchmark_record_failed(tmp_path: object, monkeypatch: object) -> int:
+    """
+    Purpose:
+        Test a tool that fails to run is not recorded as an empty capture
+    Args:
+        tmp_path: pytest tmp_path fixture
+        monkeypatch: pytest monkeypatch fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    monkeypatch.setattr(
+        subprocess,
+        "run_subprocess_call",
+        lambda *args, **kwargs: ([""], ["No module named flake8", ""], False),
+    )
+
+    test_parser_benchmark = ParserBenchmark(str(tmp_path), tools=("flake8",))
+    with pytest.raises(Exception, match="No module named flake8"):
+        test_parser_benchmark.record(sizes=(2,), test_count=1)
+
+
+###
+# ParserBenchmark.run()
+###
+
+
+def test_ParserBenchmark_run(tmp_path: object, monkeypatch: object) -> int:
+    """
+    Purpose:
+        Test replaying a corpus measures every capture through its parser
+    Args:
+        tmp_path: pytest tmp_path fixture
+        monkeypatch: pytest monkeypatch fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    monkeypatch.setattr(subprocess, "run_subprocess_call", mock_run_subprocess_call)
+    ParserBenchmark(str(tmp_path), tools=("flake8",)).record(sizes=(2,), test_count=1)
+
+    # No corpus for the other tools is not an error, they are just skipped
+    test_results = ParserBenchmark(
+        str(tmp_path), tools=("flake8", "mypy"), repeat=2
+    ).run()
+
+    assert test_results["metrics"] == [
+        "wall_seconds",
+        "cpu_seconds",
+        "peak_allocated_kib",
+    ]
+    (test_case,) = test_results["cases"]
+    assert test_case["target"] == "parser:flake8"
+    assert test_case["lines"] == len(FLAKE8_OUTPUT)
+    assert test_case["lines_per_second"] > 0
+    assert test_case["peak_allocated_kib"] > 0
+    assert 0 < test_case["retained_kib"] <= test_case["peak_allocated_kib"]
+
+    with pytest.raises(Exception, match="is not a parser corpus"):
+        ParserBenchmark(f"{tmp_path}/missing").run()
@@ -0,0 +1,534 @@
+"""
+Purpose:
+    ResultCache Class Definition
+
+    Content addressed, size bounded on-disk cache of parsed tool output
+"""
+
+# Python Library Imports
+import hashlib
+import json
+import os
+import pathlib
+import re
+import shlex
+import tempfile
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+# Local Python Library Imports
+from grader.tool.tool import Tool
+
+
+###
+# Constants
+###
+
+
+# Default upper bound for everything stored in a cache directory
+DEFAULT_MAX_CACHE_SIZE = 1024 * 1024 * 1024
+
+# Writes between scans of the cache directory. Between scans its size is tracked
+# from this cache's own writes, other graders sharing the directory are picked up
+# by the next scan
+EVICT_SCAN_INTERVAL = 256
+
+# Directories and files never included in a source tree hash (tool and VCS state)
+SOURCE_HASH_IGNORED_DIRECTORIES = (
+    ".eggs",
+    ".git",
+    ".mypy_cache",
+    ".pytest_cache",
+    ".tox",
+    ".venv",
+    "__pycache__",
+    "htmlcov",
+    "venv",
+)
+SOURCE_HASH_IGNORED_FILES = (".coverage",)
+
+# File a line of per-file linter output belongs to (path:row:col: message)
+LINT_FINDING_PATH_REGEX = re.compile(r"^(?P<path>.*?\.py):\d+:\d+: ")
+
+
+###
+# Functions
+###
+
+
+def hash_source_tree(source_code: str, excluded_paths: Iterable[str] = ()) -> str:
+    """
+    Purpose:
+        Hash every file under the source code (relative path and contents), so any
+        added, removed, renamed or edited file changes the hash
+    Args:
+        source_code: path to the code to hash
+        excluded_paths: directories the grader writes to (reports, the cache),
+            left out wherever they are under the source code
+    Returns:
+        source_hash: hex sha256 of the tree
+    Raises:
+        N/A
+    """
+
+    source_hash = hashlib.sha256()
+    for (relative_path, file_path) in walk_source_tree(source_code, excluded_paths):
+        source_hash.update(relative_path.encode("utf-8") + b"\0")
+        with open(file_path, "rb") as source_file_obj:
+            for file_chunk in iter(lambda: source_file_obj.read(1024 * 1024), b""):
+                source_hash.update(file_chunk)
+        source_hash.update(b"\0")
+
+    return source_hash.hexdigest()
+
+
+def walk_source_tree(
+    source_code: str, excluded_paths: Iterable[str] = ()
+) -> Iterator[Tuple[str, str]]:
+    """
+    Purpose:
+        Walk the source code in a stable order, skipping tool and VCS state
+    Args:
+        source_code: path to the code to walk
+        excluded_paths: directories to skip, wherever they are under source_code
+    Yields:
+        relative_path: path of the file relative to source_code
+        file_path: path of the file
+    Raises:
+        N/A
+    """
+
+    excluded_real_paths = get_real_paths(excluded_paths)
+    for (dir_path, dir_names, file_names) in os.walk(source_code):
+        dir_names[:] = sorted(
+            get_source_dir_names(dir_path, dir_names, excluded_real_paths)
+        )
+        for file_name in sorted(file_names):
+            if file_name in SOURCE_HASH_IGNORED_FILES:
+                continue
+            file_path = os.path.join(dir_path, file_name)
+            yield (os.path.relpath(file_path, source_code), file_path)
+
+
+def get_real_paths(paths: Iterable[str]) -> Set[str]:
+    """
+    Purpose:
+        Resolve paths to compare directories however they were named
+    Args:
+        paths: paths to resolve
+    Returns:
+        real_paths: the paths with symlinks, "." and ".." resolved
+    Raises:
+        N/A
+    """
+
+    return {os.path.realpath(path) for path in paths}
+
+
+def get_source_dir_names(
+    dir_path: str, dir_names: List[str], excluded_real_paths: Set[str]
+) -> List[str]:
+    """
+    Purpose:
+        Get the directories of a source tree directory to descend into, leaving
+        out tool and VCS state and the excluded directories
+    Args:
+        dir_path: directory being walked
+        dir_names: names of the directories in it
+        excluded_real_paths: get_real_paths of the directories to skip
+    Returns:
+        source_dir_names: names of the directories to descend into
+    Raises:
+        N/A
+    """
+
+    return [
+        dir_name
+        for dir_name in dir_names
+        if dir_name not in SOURCE_HASH_IGNORED_DIRECTORIES
+        and not (
+            excluded_real_paths
+            and os.path.realpath(os.path.join(dir_path, dir_name))
+            in excluded_real_paths
+        )
+    ]
+
+
+def hash_config_files(source_code: str, config_files: Tuple[str, ...]) -> str:
+    """
+    Purpose:
+        Hash the configuration files a tool reads from the top of the source code,
+        so editing, adding or removing one changes the hash
+    Args:
+        source_code: path to the code the tool checks
+        config_files: names of the configuration files
+    Returns:
+        config_hash: hex sha256 of the names and contents of the files that exist
+    Raises:
+        N/A
+    """
+
+    config_hash = hashlib.sha256()
+    for config_file in sorted(set(config_files)):
+        config_path = os.path.join(source_code, config_file)
+        if not os.path.isfile(config_path):
+            continue
+        config_hash.update(config_file.encode("utf-8") + b"\0")
+        with open(config_path, "rb") as config_file_obj:
+            config_hash.update(config_file_obj.read())
+        config_hash.update(b"\0")
+
+    return config_hash.hexdigest()
+
+
+def hash_cache_key(key_data: Dict[str, Any]) -> str:
+    """
+    Purpose:
+        Turn JSON serializable key data into a cache key
+    Args:
+        key_data: everything the cached value depends on
+    Returns:
+        cache_key: hex sha256 of the key data
+    Raises:
+        N/A
+    """
+
+    return hashlib.sha256(
+        json.dumps(key_data, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+###
+# Class Definition
+###
+
+
+class ResultCache:
+    """
+    Purpose:
+        Stores JSON serializable results on disk by cache key. Entries are evicted
+        least recently used first once the directory grows past max_size.
+
+        Writes are atomic renames, so caches can be shared by concurrent graders.
+    """
+
+    ###
+    # Reserved Methods
+    ###
+
+    def __init__(self, cache_dir: str, max_size: int = DEFAULT_MAX_CACHE_SIZE) -> None:
+        """
+        Purpose:
+            Constructor for a ResultCache
+        Args:
+            cache_dir: directory to store entries in, created if missing
+            max_size: upper bound in bytes for all entries
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+
+        # Size of the entries as of the last scan plus what was written since,
+        # None until the first write scans the directory
+        self.cache_size = None
+        self.writes_since_scan = 0
+        self.cache_size_lock = threading.Lock()
+
+        pathlib.Path(self.cache_dir).mkdir(parents=True, exist_ok=True)
+
+    def __repr__(self) -> str:
+        """
+        Purpose:
+            String Representation for a ResultCache
+        Args:
+            N/A
+        Returns:
+            result_cache_repr: directory of the cache
+        Raises:
+            N/A
+        """
+
+        return f"<ResultCache {self.cache_dir}>"
+
+    ###
+    # Cache Operations
+    ###
+
+    def get_entry_path(self, cache_key: str) -> str:
+        """
+        Purpose:
+            Get the path an entry is stored at
+        Args:
+            cache_key: key of the entry
+        Returns:
+            entry_path: path of the entry file
+        Raises:
+            N/A
+        """
+
+        return f"{self.cache_dir}/{cache_key[:2]}/{cache_key}.json"
+
+    def get(self, cache_key: str) -> Optional[Any]:
+        """
+        Purpose:
+            Get a cached value, marking it as recently used
+        Args:
+            cache_key: key of the entry
+        Returns:
+            cached_value: the stored value, or None on a miss
+        Raises:
+            N/A
+        """
+
+        entry_path = self.get_entry_path(cache_key)
+        try:
+            with open(entry_path, "r") as entry_file_obj:
+                cached_value = json.load(entry_file_obj)
+            os.utime(entry_path)
+        except (OSError, ValueError):
+            # Missing, evicted by another grader, or half written by a crash
+            return None
+
+        return cached_value
+
+    def set(self, cache_key: str, value: Any) -> None:
+        """
+        Purpose:
+            Store a value, evicting old entries if the cache is now too large.
+            The directory is only scanned once it may have grown past max_size,
+            or every EVICT_SCAN_INTERVAL writes
+        Args:
+            cache_key: key of the entry
+            value: JSON serializable value to store
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        entry_path = self.get_entry_path(cache_key)
+        pathlib.Path(os.path.dirname(entry_path)).mkdir(parents=True, exist_ok=True)
+
+        entry_data = json.dumps(value)
+        (entry_fd, entry_tmp_path) = tempfile.mkstemp(
+            dir=os.path.dirname(entry_path), suffix=".tmp"
+        )
+        with os.fdopen(entry_fd, "w") as entry_file_obj:
+            entry_file_obj.write(entry_data)
+        os.replace(entry_tmp_path, entry_path)
+
+        with self.cache_size_lock:
+            self.writes_since_scan += 1
+            if self.cache_size is not None:
+                # Overwritten entries count twice, which only scans sooner
+                self.cache_size += len(entry_data.encode("utf-8"))
+            if (
+                self.cache_size is None
+                or self.cache_size > self.max_size
+                or self.writes_since_scan >= EVICT_SCAN_INTERVAL
+            ):
+                self.evict()
+
+    def run_tool(self, tool: Tool, source_hash: str) -> Tuple[Dict[str, Any], str]:
+        """
+        Purpose:
+            Run a tool through the cache. Results are keyed by the source tree hash
+            and the tool's configuration (name, version, args, flags, package).
+            On a miss, tools that lint files independently only lint the files
+            missing from the per-file cache. Timed out (partial) results and
+            results of runs that failed (wrote to stderr) are never stored
+        Args:
+            tool: tool to run on a miss
+            source_hash: hash_source_tree of the tool's source code
+        Returns:
+            parsed_output: parsed output from the tool
+            cache_status: "hit", "miss" or "incremental (N/M files cached)"
+        Raises:
+            N/A
+        """
+
+        cache_key = hash_cache_key(
+            {"source_hash": source_hash, "tool": tool.cache_config}
+        )
+
+        cached_output = self.get(cache_key)
+        if cached_output is not None:
+            return (cached_output, "hit")
+
+        cache_status = "miss"
+        if tool.lint_files_independently:
+            (parsed_output, cached_files, total_files) = self.run_tool_per_file(tool)
+            if cached_files:
+                cache_status = (
+                    f"incremental ({cached_files}/{total_files} files cached)"
+                )
+        else:
+            parsed_output = tool.run()
+
+        if not parsed_output.get("timed_out") and not tool.failed:
+            self.set(cache_key, parsed_output)
+
+        return (parsed_output, cache_status)
+
+    def run_tool_per_file(self, tool: Tool) -> Tuple[Dict[str, Any], int, int]:
+        """
+        Purpose:
+            Run a per-file linter on only the files whose findings are not cached,
+            then merge cached and new findings in the tool's own file order so the
+            parsed output matches a full run exactly.
+
+            Findings are keyed by file path, file contents, tool configuration and
+            the contents of the tool's configuration files, so unchanged files
+            (including starter files shared by candidates) are never linted twice.
+            The lint command and parsing are traced like a full run's
+        Args:
+            tool: tool that lint_files_independently
+        Returns:
+            parsed_output: parsed output from the tool
+            cached_files: number of files whose findings came from the cache
+            total_files: number of files checked
+        Raises:
+            N/A
+        """
+
+        lint_files = tool.get_lint_files()
+        config_hash = hash_config_files(tool.source_code, tool.config_files)
+
+        # Look up every file, missing ones are linted below
+        file_cache_keys = {}
+        file_findings = {}
+        for lint_file in lint_files:
+            with open(os.path.join(tool.source_code, lint_file), "rb") as lint_file_obj:
+                content_hash = hashlib.sha256(lint_file_obj.read()).hexdigest()
+            file_cache_keys[lint_file] = hash_cache_key(
+                {
+                    "config_hash": config_hash,
+                    "content_hash": content_hash,
+                    "path": lint_file,
+                    "tool": tool.cache_config,
+                }
+            )
+            cached_findings = self.get(file_cache_keys[lint_file])
+            if cached_findings is not None:
+                file_findings[lint_file] = cached_findings
+
+        uncached_files = [
+            lint_file for lint_file in lint_files if lint_file not in file_findings
+        ]
+        parse_timer = tool.new_parse_timer()
+        timed_out = False
+        tool.failed = False
+        if uncached_files:
+            uncached_findings = self._lint_files(tool, uncached_files, parse_timer)
+            if uncached_findings is None:
+                # Output we can't attribute to a file, don't risk a wrong merge
+                return (tool.run(), 0, len(lint_files))
+
+            # Partial output, or output next to a crash, is used but not stored
+            (uncached_findings, timed_out, failed) = uncached_findings
+            tool.failed = failed
+            for lint_file in uncached_files:
+                file_findings[lint_file] = uncached_findings[lint_file]
+                if not timed_out and not failed:
+                    self.set(file_cache_keys[lint_file], uncached_findings[lint_file])
+
+        with parse_timer:
+            parsed_output = tool._parse_output(
+                [
+                    finding_line
+                    for lint_file in lint_files
+                    for finding_line in file_findings[lint_file]
+                ]
+            )
+        if tool.tracer:
+            tool.tracer.add_timer("parse", tool.name, parse_timer)
+
+        # Output is partial if the tool was killed at its deadline
+        parsed_output["timed_out"] = timed_out
+
+        return (parsed_output, len(lint_files) - len(uncached_files), len(lint_files))
+
+    @staticmethod
+    def _lint_files(
+        tool: Tool, lint_files: List[str], parse_timer: Any
+    ) -> Optional[Tuple[Dict[str, List[str]], bool, bool]]:
+        """
+        Purpose:
+            Run a per-file linter on specific files and split its findings by file,
+            adding the command's spawn and decode timers to the tool's trace
+        Args:
+            tool: tool that lint_files_independently
+            lint_files: paths relative to the tool's source_code
+            parse_timer: tool's new_parse_timer, splitting is timed with it a
+                chunk of lines at a time
+        Returns:
+            file_findings: finding lines for every file (empty if clean), or None if
+                a finding names a file that was not requested
+            timed_out: whether the tool was killed at its deadline
+            failed: whether the tool wrote to stderr (a crash, not findings)
+        Raises:
+            N/A
+        """
+
+        file_findings = {lint_file: [] for lint_file in lint_files}
+
+        output_stream = tool.stream_command(
+            tool.get_command(" ".join(map(shlex.quote, lint_files)))
+        )
+        for output_lines in output_stream.iter_line_chunks():
+            with parse_timer:
+                for output_line in output_lines:
+                    finding_path = LINT_FINDING_PATH_REGEX.match(output_line)
+                    if not finding_path:
+                        # Statistics and other non-finding lines never reach
+                        # parsed output
+                        continue
+                    if finding_path.group("path") not in file_findings:
+                        tool.trace_command(output_stream)
+                        return None
+                    file_findings[finding_path.group("path")].append(output_line)
+        tool.trace_command(output_stream)
+
+        return (
+            file_findings,
+            output_stream.timed_out,
+            any(output_stream.stderr_lines),
+        )
+
+    def evict(self) -> None:
+        """
+        Purpose:
+            Remove least recently used entries until the cache fits in max_size,
+            scanning every entry in the directory
+        Args:
+            N/A
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        cache_entries = []
+        for entry_path in pathlib.Path(self.cache_dir).glob("*/*.json"):
+            try:
+                entry_stat = entry_path.stat()
+            except OSError:
+                continue
+            cache_entries.append((entry_stat.st_mtime, entry_stat.st_size, entry_path))
+
+        cache_size = sum(entry_size for (_, entry_size, _) in cache_entries)
+        for (_, entry_size, entry_path) in sorted(cache_entries):
+            if cache_size <= self.max_size:
+                break
+            try:
+                entry_path.unlink()
+            except OSError:
+                pass
+            cache_size -= entry_size
+
+        self.cache_size = cache_size
+        self.writes_since_scan = 0
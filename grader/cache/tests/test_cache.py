@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Purpose:
+    Test File for cache.py
+"""
+
+# Python Library Imports
+import os
+
+# Local Python Library Imports
+from grader.cache.cache import ResultCache, hash_source_tree
+from grader.mypy.mypy import Mypy
+from grader.pycodestyle.pycodestyle import Pycodestyle
+from grader.trace.trace import Tracer
+
+
+###########
+# Mocks/Fixtures
+###########
+
+
+def mock_lint_files(tool: object, lint_files: list, parse_timer: object) -> tuple:
+    """
+    Purpose:
+        Stand in for a per-file linter: one finding per file, naming the file
+    Args:
+        tool: tool being run
+        lint_files: files the linter was asked to check
+        parse_timer: timer splitting the findings is timed with
+    Return:
+        file_findings: finding lines for every file
+        timed_out: always False
+        failed: always False
+    Raises:
+        N/A
+    """
+
+    mock_lint_files.calls.append(lint_files)
+    file_findings = {
+        lint_file: [f"{lint_file}:1:1: E501 line too long"] for lint_file in lint_files
+    }
+
+    return (file_findings, False, False)
+
+
+###########
+# Tests: Result Cache
+###########
+
+
+###
+# hash_source_tree()
+###
+
+
+def test_hash_source_tree(tmp_path: object) -> int:
+    """
+    Purpose:
+        Test the source hash changes with file contents but not with tool state
+    Args:
+        tmp_path: pytest tmp_path fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    # Example Data
+    (tmp_path / "example.py").write_text("x = 1\n")
+    test_source_hash = hash_source_tree(str(tmp_path))
+
+    # Tool state is ignored, edits are not
+    (tmp_path / "__pycache__").mkdir()
+    (tmp_path / "__pycache__" / "example.pyc").write_bytes(b"\0")
+    assert hash_source_tree(str(tmp_path)) == test_source_hash
+    (tmp_path / "example.py").write_text("x = 2\n")
+    assert hash_source_tree(str(tmp_path)) != test_source_hash
+    test_source_hash = hash_source_tree(str(tmp_path))
+
+    # Reports written under the code are ignored when excluded
+    (tmp_path / "reports" / "example").mkdir(parents=True)
+    (tmp_path / "reports" / "example" / "report_data.json").write_text("{}")
+    assert hash_source_tree(str(tmp_path)) != test_source_hash
+    assert (
+        hash_source_tree(str(tmp_path), excluded_paths=[f"{tmp_path}/./reports"])
+        == test_source_hash
+    )
+
+
+###
+# run_tool()
+###
+
+
+def test_ResultCache_run_tool(tmp_path: object, monkeypatch: object) -> int:
+    """
+    Purpose:
+        Test a tool only runs on a miss and timed out or failed output is not
+        stored
+    Args:
+        tmp_path: pytest tmp_path fixture
+        monkeypatch: pytest monkeypatch fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    # Example Data
+    test_runs = []
+    monkeypatch.setattr(
+        Mypy, "run", lambda tool: test_runs.append(1) or {"timed_out": False}
+    )
+    test_result_cache = ResultCache(str(tmp_path / "cache"))
+    test_mypy = Mypy("./")
+
+    # Miss, then Hit
+    test_output = {"timed_out": False}
+    assert test_result_cache.run_tool(test_mypy, "abc") == (test_output, "miss")
+    assert test_result_cache.run_tool(test_mypy, "abc") == (test_output, "hit")
+    assert len(test_runs) == 1
+
+    # Different flags are a different entry
+    test_mypy.flags = ["--quiet"]
+    assert test_result_cache.run_tool(test_mypy, "abc")[1] == "miss"
+
+    # Timed out output is never reused
+    monkeypatch.setattr(Mypy, "run", lambda tool: {"timed_out": True})
+    assert test_result_cache.run_tool(test_mypy, "def")[1] == "miss"
+    assert test_result_cache.run_tool(test_mypy, "def")[1] == "miss"
+
+    # Failed runs are never reused
+    monkeypatch.setattr(
+        Mypy, "run", lambda tool: setattr(tool, "failed", True) or {"timed_out": False}
+    )
+    assert test_result_cache.run_tool(test_mypy, "ghi")[1] == "miss"
+    assert test_result_cache.run_tool(test_mypy, "ghi")[1] == "miss"
+
+
+###
+# evict()
+###
+
+
+def test_ResultCache_evict(tmp_path: object) -> int:
+    """
+    Purpose:
+        Test the least recently used entries are evicted past max_size
+    Args:
+        tmp_path: pytest tmp_path fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    # Example Data: room for two entries
+    test_result_cache = ResultCache(str(tmp_path), max_size=2 * len('"xxxxxxxx"'))
+    test_result_cache.set("aa01", "xxxxxxxx")
+    test_result_cache.set("aa02", "xxxxxxxx")
+    os.utime(test_result_cache.get_entry_path("aa01"), (1, 1))
+    os.utime(test_result_cache.get_entry_path("aa02"), (2, 2))
+
+    # Using aa01 makes aa02 the oldest
+    assert test_result_cache.get("aa01") == "xxxxxxxx"
+    test_result_cache.set("aa03", "xxxxxxxx")
+    assert test_result_cache.get("aa01") == "xxxxxxxx"
+    assert test_result_cache.get("aa02") is None
+    assert test_result_cache.get("aa03") == "xxxxxxxx"
+
+
+def test_ResultCache_evict_tracked_size(tmp_path: object, monkeypatch: object) -> int:
+    """
+    Purpose:
+        Test the cache directory is only scanned on the first write and once the
+        tracked size passes max_size
+    Args:
+        tmp_path: pytest tmp_path fixture
+        monkeypatch: pytest monkeypatch fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    # Example Data: room for two entries
+    test_result_cache = ResultCache(str(tmp_path), max_size=2 * len('"xxxxxxxx"'))
+    test_scans = []
+    test_evict = test_result_cache.evict
+    monkeypatch.setattr(
+        test_result_cache, "evict", lambda: test_scans.append(1) or test_evict()
+    )
+
+    # First write scans, the second fits in the tracked size
+    test_result_cache.set("aa01", "xxxxxxxx")
+    test_result_cache.set("aa02", "xxxxxxxx")
+    assert len(test_scans) == 1
+    assert test_result_cache.cache_size == 2 * len('"xxxxxxxx"')
+
+    # Going past max_size scans and evicts
+    test_result_cache.set("aa03", "xxxxxxxx")
+    assert len(test_scans) == 2
+    assert test_result_cache.cache_size == 2 * len('"xxxxxxxx"')
+
+
+###
+# run_tool_per_file()
+###
+
+
+def test_ResultCache_run_tool_per_file(tmp_path: object, monkeypatch: object) -> int:
+    """
+    Purpose:
+        Test only changed files are linted and merged findings keep the tool's order,
+        and changing a config file lints every file again
+    Args:
+        tmp_path: pytest tmp_path fixture
+        monkeypatch: pytest monkeypatch fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    # Example Data
+    (tmp_path / "example").mkdir()
+    (tmp_path / "example" / "b.py").write_text("b = 1\n")
+    (tmp_path / "example" / "a.py").write_text("a = 1\n")
+    (tmp_path / "example" / "__pycache__").mkdir()
+    (tmp_path / "example" / "__pycache__" / "c.py").write_text("c = 1\n")
+    mock_lint_files.calls = []
+    monkeypatch.setattr(ResultCache, "_lint_files", staticmethod(mock_lint_files))
+    test_result_cache = ResultCache(str(tmp_path / "cache"))
+    test_pycodestyle = Pycodestyle(
+        str(tmp_path), python_package="example", args=[("--exclude", "__pycache__")]
+    )
+
+    # First run lints everything, pycodestyle sorts files and prunes excludes
+    (
+        test_output,
+        test_cached_files,
+        test_total_files,
+    ) = test_result_cache.run_tool_per_file(test_pycodestyle)
+    assert mock_lint_files.calls == [["example/a.py", "example/b.py"]]
+    assert (test_cached_files, test_total_files) == (0, 2)
+    assert test_output["errors"] == [
+        "example/a.py:1:1: E501 line too long",
+        "example/b.py:1:1: E501 line too long",
+    ]
+
+    # Second run only lints the edited file, output is unchanged
+    (tmp_path / "example" / "b.py").write_text("b = 2\n")
+    assert test_result_cache.run_tool_per_file(test_pycodestyle) == (test_output, 1, 2,)
+    assert mock_lint_files.calls[-1] == ["example/b.py"]
+
+    # Changing a style config file lints everything again
+    (tmp_path / ".pycodestyle").write_text("[pycodestyle]\nmax-line-length = 100\n")
+    assert test_result_cache.run_tool_per_file(test_pycodestyle)[1:] == (0, 2)
+    assert mock_lint_files.calls[-1] == ["example/a.py", "example/b.py"]
+    assert test_result_cache.run_tool_per_file(test_pycodestyle)[1:] == (2, 2)
+    (tmp_path / "setup.cfg").write_text("[pycodestyle]\nmax-line-length = 90\n")
+    assert test_result_cache.run_tool_per_file(test_pycodestyle)[1:] == (0, 2)
+
+
+def test_ResultCache_run_tool_per_file_trace(
+    tmp_path: object, monkeypatch: object
+) -> int:
+    """
+    Purpose:
+        Test linting only the uncached files traces the command's spawn, decode
+        and parse phases like a full run
+    Args:
+        tmp_path: pytest tmp_path fixture
+        monkeypatch: pytest monkeypatch fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    # Example Data
+    (tmp_path / "example").mkdir()
+    (tmp_path / "example" / "a.py").write_text("a = 1\n")
+    monkeypatch.setattr(
+        Pycodestyle,
+        "get_command",
+        lambda tool, lint_targets: "echo 'example/a.py:1:1: E501 line too long'",
+    )
+    test_result_cache = ResultCache(str(tmp_path / "cache"))
+    test_pycodestyle = Pycodestyle(str(tmp_path), python_package="example")
+    test_pycodestyle.tracer = Tracer("test")
+
+    # Lint Files
+    (test_output, _, _) = test_result_cache.run_tool_per_file(test_pycodestyle)
+    assert test_output["errors"] == ["example/a.py:1:1: E501 line too long"]
+    test_phase_timings = test_pycodestyle.tracer.get_phase_timings()
+    assert {"spawn", "decode", "parse"} <= set(test_phase_timings["pycodestyle"])
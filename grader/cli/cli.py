@@ -2,13 +2,16 @@
 """
 Purpose:
     Entrypoint for running the Python Grader Tool
+
+    Commands are registered by import path and only imported once they are run,
+    so --help, --version and each command load no more of the grader than needed
 """
 
 # Python Library Imports
 import click
 
 # Local Python Library Imports
-import grader.commands.report_commands as report_commands
+from grader.cli.lazy_group import LazyGroup
 
 
 ###
@@ -16,7 +19,7 @@ import grader.commands.report_commands as report_commands
 ###
 
 
-@click.group(invoke_without_command=True)
+@click.group(cls=LazyGroup, invoke_without_command=True)
 @click.version_option("0.0.1")
 @click.pass_context
 def pygrader_cli(cli_context):
@@ -32,7 +35,7 @@ def pygrader_cli(cli_context):
 ###
 
 
-@pygrader_cli.group("report")
+@pygrader_cli.group("report", cls=LazyGroup)
 @click.pass_context
 def report_command_group(cli_context):
     """
@@ -42,6 +45,16 @@ def report_command_group(cli_context):
     pass
 
 
+@pygrader_cli.group("benchmark", cls=LazyGroup)
+@click.pass_context
+def benchmark_command_group(cli_context):
+    """
+    Benchmark Command Group measures the performance of the grader itself
+    """
+
+    pass
+
+
 ###
 # CLI Setup
 ###
@@ -59,4 +72,18 @@ def setup_grader_cli() -> None:
         N/A
     """
 
-    report_command_group.add_command(report_commands.generate)
+    report_commands = "grader.commands.report_commands"
+    report_command_group.add_lazy_command("generate", f"{report_commands}:generate")
+    report_command_group.add_lazy_command("watch", f"{report_commands}:watch")
+    report_command_group.add_lazy_command("batch", f"{report_commands}:batch")
+    report_command_group.add_lazy_command("render", f"{report_commands}:render")
+    report_command_group.add_lazy_command("serve", f"{report_commands}:serve")
+
+    benchmark_commands = "grader.commands.benchmark_commands"
+    benchmark_command_group.add_lazy_command("run", f"{benchmark_commands}:run")
+    benchmark_command_group.add_lazy_command(
+        "record-parsers", f"{benchmark_commands}:record_parsers"
+    )
+    benchmark_command_group.add_lazy_command("parsers", f"{benchmark_commands}:parsers")
+    benchmark_command_group.add_lazy_command("compare", f"{benchmark_commands}:compare")
+    benchmark_command_group.add_lazy_command("imports", f"{benchmark_commands}:imports")
@@ -0,0 +1,107 @@
+"""
+Purpose:
+    LazyGroup Class Definition
+
+    Click group whose subcommands are imported only once they are needed
+"""
+
+# Python Library Imports
+import importlib
+from typing import Dict, List, Optional
+import click
+
+# Local Python Library Imports
+# N/A
+
+
+###
+# Class Definition
+###
+
+
+class LazyGroup(click.Group):
+    """
+    Purpose:
+        Click group that registers subcommands by import path instead of by object.
+        A subcommand's module is imported when the subcommand is run, or when the
+        group's help lists it, so the CLI only loads the commands (and the tools
+        they use) that the invocation needs
+    """
+
+    ###
+    # Reserved Methods
+    ###
+
+    def __init__(
+        self, *args, lazy_commands: Optional[Dict[str, str]] = None, **kwargs
+    ) -> None:
+        """
+        Purpose:
+            Constructor for a LazyGroup
+        Args:
+            args: click.Group args
+            lazy_commands: subcommand name to "module:attribute" of the command
+            kwargs: click.Group keyword args
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        super().__init__(*args, **kwargs)
+
+        self.lazy_commands = dict(lazy_commands or {})
+
+    ###
+    # Command Registration
+    ###
+
+    def add_lazy_command(self, command_name: str, import_path: str) -> None:
+        """
+        Purpose:
+            Register a subcommand to import when it is needed
+        Args:
+            command_name: name the subcommand is invoked by
+            import_path: "module:attribute" of the click command
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        self.lazy_commands[command_name] = import_path
+
+    def list_commands(self, cli_context: click.Context) -> List[str]:
+        """
+        Purpose:
+            List every subcommand, without importing the lazy ones
+        Args:
+            cli_context: click context
+        Returns:
+            command_names: sorted names of the subcommands
+        Raises:
+            N/A
+        """
+
+        return sorted(set(super().list_commands(cli_context)) | set(self.lazy_commands))
+
+    def get_command(
+        self, cli_context: click.Context, command_name: str
+    ) -> Optional[click.Command]:
+        """
+        Purpose:
+            Get a subcommand, importing it if it is lazy
+        Args:
+            cli_context: click context
+            command_name: name the subcommand is invoked by
+        Returns:
+            command: the click command, None if there is no such subcommand
+        Raises:
+            ImportError: if a lazy subcommand's module cannot be imported
+        """
+
+        if command_name not in self.lazy_commands:
+            return super().get_command(cli_context, command_name)
+
+        (module_name, attribute_name) = self.lazy_commands[command_name].split(":")
+        return getattr(importlib.import_module(module_name), attribute_name)
@@ -4,7 +4,9 @@ Purpose:
 """
 
 # Python Library Imports
-# N/A
+import subprocess
+import sys
+from click.testing import CliRunner
 
 # Local Python Library Imports
 import grader.cli.cli
@@ -37,3 +39,50 @@ def test_pygrader_cli() -> int:
 
     # TODO
     assert True
+
+
+def test_pygrader_cli_lazy_commands() -> int:
+    """
+    Purpose:
+        Test the CLI lists every command, and --help does not import any of them
+    Args:
+        N/A
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    grader.cli.cli.setup_grader_cli()
+
+    test_result = CliRunner().invoke(grader.cli.cli.pygrader_cli, ["report", "--help"])
+    assert test_result.exit_code == 0
+    for test_command_name in ("batch", "generate", "render", "serve", "watch"):
+        assert test_command_name in test_result.output
+
+    test_result = CliRunner().invoke(
+        grader.cli.cli.pygrader_cli, ["benchmark", "--help"]
+    )
+    assert test_result.exit_code == 0
+    for test_command_name in ("compare", "imports", "parsers", "record-parsers", "run"):
+        assert test_command_name in test_result.output
+
+    # In a fresh interpreter, other tests have imported everything here
+    test_loaded_modules = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, grader.cli.cli as cli\n"
+            "cli.setup_grader_cli()\n"
+            "try:\n"
+            "    cli.pygrader_cli(['--help'])\n"
+            "except SystemExit:\n"
+            "    print(' '.join(sorted(sys.modules)))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.split()
+    assert "grader.cli.cli" in test_loaded_modules
+    assert "grader.commands.report_commands" not in test_loaded_modules
+    assert "grader.report.report_python" not in test_loaded_modules
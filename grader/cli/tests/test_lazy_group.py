@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Purpose:
+    Test File for lazy_group.py
+"""
+
+# Python Library Imports
+import click
+from click.testing import CliRunner
+
+# Local Python Library Imports
+from grader.cli.lazy_group import LazyGroup
+
+
+###########
+# Mocks/Fixtures
+###########
+
+
+@click.command("eager")
+def eager_command() -> None:
+    """
+    Eager command
+    """
+
+    click.echo("eager ran")
+
+
+###########
+# Tests: LazyGroup
+###########
+
+
+def test_LazyGroup_get_command() -> int:
+    """
+    Purpose:
+        Test lazy subcommands are listed by name, imported when run, and mixed
+        with eagerly added ones
+    Args:
+        N/A
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    test_group = LazyGroup("test", lazy_commands={"lazy": f"{__name__}:eager_command"})
+    test_group.add_command(eager_command)
+    test_group.add_lazy_command("compare", "grader.commands.benchmark_commands:compare")
+
+    assert test_group.list_commands(None) == ["compare", "eager", "lazy"]
+    assert test_group.get_command(None, "lazy") is eager_command
+    assert test_group.get_command(None, "missing") is None
+    assert test_group.get_command(None, "compare").name == "compare"
+
+    test_result = CliRunner().invoke(test_group, ["lazy"])
+    assert test_result.exit_code == 0
+    assert test_result.output == "eager ran\n"
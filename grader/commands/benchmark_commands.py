@@ -0,0 +1,423 @@
+"""
+    Purpose:
+        Benchmark Command Group is responsible for measuring the grader itself
+"""
+
+# Python Library Imports
+import click
+import sys
+from typing import Any, Dict, Tuple
+
+# Local Python Library Imports
+from grader.benchmark.benchmark import (
+    BENCHMARK_TARGETS,
+    BENCHMARK_TOOLS,
+    DEFAULT_BENCHMARK_SIZES,
+    DEFAULT_REGRESSION_THRESHOLD,
+    Benchmark,
+    compare_benchmark_results,
+    read_benchmark_results,
+)
+from grader.benchmark.import_benchmark import IMPORT_TIME_BUDGETS, measure_import_time
+from grader.benchmark.parser_benchmark import (
+    DEFAULT_PARSER_CORPUS_SIZES,
+    ParserBenchmark,
+)
+
+
+###
+# Benchmark Commands
+###
+
+
+@click.command("run")
+@click.option(
+    "--output",
+    "results_path",
+    required=True,
+    default=None,
+    type=str,
+    help="File to store the results in (JSON)",
+)
+@click.option(
+    "--sizes",
+    required=False,
+    default=",".join(map(str, DEFAULT_BENCHMARK_SIZES)),
+    type=str,
+    help="Comma separated number of modules of each candidate",
+)
+@click.option(
+    "--targets",
+    required=False,
+    default=",".join(BENCHMARK_TARGETS),
+    type=str,
+    help="Comma separated targets to run: report and/or tool names",
+)
+@click.option(
+    "--error-density",
+    "error_density",
+    required=False,
+    default=0.1,
+    type=float,
+    help="Fraction of functions with an injected lint/type error",
+)
+@click.option(
+    "--tests",
+    "test_count",
+    required=False,
+    default=10,
+    type=int,
+    help="Number of tests in every candidate",
+)
+@click.option(
+    "--benchmark-dir",
+    "benchmark_path",
+    required=False,
+    default="./benchmarks",
+    type=str,
+    help="Directory to keep synthetic candidates and reports in",
+)
+@click.option(
+    "--baseline",
+    "baseline_path",
+    required=False,
+    default=None,
+    type=str,
+    help="Results to compare against once the run finishes",
+)
+@click.pass_context
+def run(
+    cli_context: object,
+    results_path: str,
+    sizes: str,
+    targets: str,
+    error_density: float,
+    test_count: int,
+    benchmark_path: str,
+    baseline_path: str,
+) -> None:
+    """
+    Benchmark the grader against synthetic candidates
+    """
+
+    # Build benchmark object
+    grader_benchmark = Benchmark(
+        benchmark_path,
+        sizes=tuple(int(size) for size in sizes.split(",")),
+        targets=tuple(target.strip() for target in targets.split(",")),
+        error_density=error_density,
+        test_count=test_count,
+    )
+    click.echo(f"Running {len(grader_benchmark.benchmark_cases)} Benchmarks")
+
+    # Run the benchmark
+    benchmark_results = grader_benchmark.run(progress_callback=echo_benchmark_result)
+    grader_benchmark.store_results(benchmark_results, results_path)
+    click.echo(f"Benchmark Results Created: {results_path}")
+
+    if baseline_path:
+        echo_benchmark_comparison(read_benchmark_results(baseline_path), results_path)
+
+
+@click.command("record-parsers")
+@click.option(
+    "--corpus",
+    "corpus_path",
+    required=False,
+    default="./benchmarks/parser_corpus",
+    type=str,
+    help="Directory to record tool output into",
+)
+@click.option(
+    "--sizes",
+    required=False,
+    default=",".join(map(str, DEFAULT_PARSER_CORPUS_SIZES)),
+    type=str,
+    help="Comma separated number of modules of each candidate",
+)
+@click.option(
+    "--tools",
+    required=False,
+    default=",".join(BENCHMARK_TOOLS),
+    type=str,
+    help="Comma separated tools to record",
+)
+@click.option(
+    "--error-density",
+    "error_density",
+    required=False,
+    default=1.0,
+    type=float,
+    help="Fraction of functions with an injected lint/type error",
+)
+@click.option(
+    "--tests",
+    "test_count",
+    required=False,
+    default=100,
+    type=int,
+    help="Number of tests in every candidate",
+)
+@click.pass_context
+def record_parsers(
+    cli_context: object,
+    corpus_path: str,
+    sizes: str,
+    tools: str,
+    error_density: float,
+    test_count: int,
+) -> None:
+    """
+    Record real tool output into a corpus for the parser benchmarks
+    """
+
+    # Build parser benchmark object
+    parser_benchmark = ParserBenchmark(
+        corpus_path, tools=tuple(tool.strip() for tool in tools.split(","))
+    )
+
+    # Record the corpus
+    parser_benchmark.record(
+        sizes=tuple(int(size) for size in sizes.split(",")),
+        error_density=error_density,
+        test_count=test_count,
+        progress_callback=lambda corpus_entry: click.echo(
+            f"{corpus_entry['tool']:<12} {corpus_entry['modules']:>6} modules: "
+            f"{corpus_entry['lines']} lines"
+        ),
+    )
+    click.echo(f"Parser Corpus Created: {parser_benchmark.corpus_manifest_path}")
+
+
+@click.command("parsers")
+@click.option(
+    "--output",
+    "results_path",
+    required=True,
+    default=None,
+    type=str,
+    help="File to store the results in (JSON)",
+)
+@click.option(
+    "--corpus",
+    "corpus_path",
+    required=False,
+    default="./benchmarks/parser_corpus",
+    type=str,
+    help="Corpus recorded with record-parsers",
+)
+@click.option(
+    "--tools",
+    required=False,
+    default=",".join(BENCHMARK_TOOLS),
+    type=str,
+    help="Comma separated tools whose parsers to benchmark",
+)
+@click.option(
+    "--repeat",
+    required=False,
+    default=5,
+    type=int,
+    help="Number of timed passes over every capture (the best is kept)",
+)
+@click.option(
+    "--baseline",
+    "baseline_path",
+    required=False,
+    default=None,
+    type=str,
+    help="Results to compare against once the run finishes",
+)
+@click.pass_context
+def parsers(
+    cli_context: object,
+    results_path: str,
+    corpus_path: str,
+    tools: str,
+    repeat: int,
+    baseline_path: str,
+) -> None:
+    """
+    Benchmark the tool output parsers against a recorded corpus
+    """
+
+    # Build parser benchmark object
+    parser_benchmark = ParserBenchmark(
+        corpus_path,
+        tools=tuple(tool.strip() for tool in tools.split(",")),
+        repeat=repeat,
+    )
+
+    # Run the benchmark
+    benchmark_results = parser_benchmark.run(
+        progress_callback=lambda benchmark_result: click.echo(
+            f"{benchmark_result['target']:<20} {benchmark_result['lines']:>8} lines: "
+            f"{benchmark_result['lines_per_second'] or 0:>10} lines/s "
+            f"{benchmark_result['peak_allocated_kib']:>10.1f}KiB peak allocated "
+            f"{benchmark_result['retained_kib']:>10.1f}KiB retained"
+        )
+    )
+    Benchmark.store_results(benchmark_results, results_path)
+    click.echo(f"Benchmark Results Created: {results_path}")
+
+    if baseline_path:
+        echo_benchmark_comparison(read_benchmark_results(baseline_path), results_path)
+
+
+@click.command("compare")
+@click.option(
+    "--baseline",
+    "baseline_path",
+    required=True,
+    default=None,
+    type=str,
+    help="Results to compare against",
+)
+@click.option(
+    "--current",
+    "current_path",
+    required=True,
+    default=None,
+    type=str,
+    help="Results to check for regressions",
+)
+@click.option(
+    "--threshold",
+    required=False,
+    default=DEFAULT_REGRESSION_THRESHOLD,
+    type=float,
+    help="Allowed relative increase of a metric before it is a regression",
+)
+@click.pass_context
+def compare(
+    cli_context: object, baseline_path: str, current_path: str, threshold: float
+) -> None:
+    """
+    Compare benchmark results against a baseline, failing on regressions
+    """
+
+    echo_benchmark_comparison(
+        read_benchmark_results(baseline_path), current_path, threshold=threshold
+    )
+
+
+@click.command("imports")
+@click.option(
+    "--module",
+    "module_names",
+    required=False,
+    default=tuple(IMPORT_TIME_BUDGETS),
+    multiple=True,
+    type=str,
+    help="Module to import, repeatable (default: every module with a budget)",
+)
+@click.option(
+    "--runs",
+    required=False,
+    default=5,
+    type=int,
+    help="Number of fresh interpreters to import in, the best run is reported",
+)
+@click.pass_context
+def imports(cli_context: object, module_names: Tuple[str, ...], runs: int) -> None:
+    """
+    Benchmark how long modules take to import, failing on ones over budget
+    """
+
+    over_budget_count = 0
+    for module_name in module_names:
+        import_metrics = measure_import_time(module_name, runs=runs)
+        over_budget = (
+            import_metrics["budget_us"] is not None
+            and import_metrics["own_import_us"] > import_metrics["budget_us"]
+        )
+        over_budget_count += over_budget
+
+        budget_str = "no budget"
+        if import_metrics["budget_us"] is not None:
+            budget_str = f"budget {import_metrics['budget_us'] / 1000:.1f}ms"
+        click.echo(
+            f"{module_name}: {import_metrics['import_us'] / 1000:.1f}ms, "
+            f"{import_metrics['own_import_us'] / 1000:.1f}ms own ({budget_str}), "
+            f"{len(import_metrics['grader_modules'])} grader modules"
+            f"{' OVER BUDGET' if over_budget else ''}"
+        )
+
+    if over_budget_count:
+        sys.exit(1)
+
+
+###
+# Helper Functions
+###
+
+
+def echo_benchmark_result(benchmark_result: Dict[str, Any]) -> None:
+    """
+    Purpose:
+        Echo the metrics of a case once it finishes
+    Args:
+        benchmark_result: result of a single case
+    Returns:
+        N/A
+    Raises:
+        N/A
+    """
+
+    click.echo(
+        f"{benchmark_result['target']:<12} {benchmark_result['modules']:>6} modules: "
+        f"{benchmark_result['wall_seconds']:>8.3f}s wall "
+        f"{benchmark_result['cpu_seconds']:>8.3f}s cpu "
+        f"{benchmark_result['peak_rss_kib'] / 1024:>8.1f}MiB peak "
+        f"({benchmark_result['status']})"
+    )
+    if benchmark_result["error"]:
+        click.echo(f"    {benchmark_result['error']}")
+
+
+def echo_benchmark_comparison(
+    baseline_results: Dict[str, Any],
+    current_path: str,
+    threshold: float = DEFAULT_REGRESSION_THRESHOLD,
+) -> None:
+    """
+    Purpose:
+        Echo the change of every metric against the baseline, and exit non-zero if
+        any of them regressed
+    Args:
+        baseline_results: results to compare against
+        current_path: path of the results to check
+        threshold: allowed relative increase of a metric
+    Returns:
+        N/A
+    Raises:
+        SystemExit: if there are regressions
+    """
+
+    benchmark_comparisons = compare_benchmark_results(
+        baseline_results, read_benchmark_results(current_path), threshold=threshold
+    )
+
+    regression_count = 0
+    for benchmark_comparison in benchmark_comparisons:
+        metric_changes = []
+        for metric in benchmark_comparison["metrics"]:
+            metric_change = benchmark_comparison[metric]["change"]
+            if metric_change is None:
+                metric_changes.append(f"{metric} n/a")
+            else:
+                metric_changes.append(f"{metric} {metric_change:+.1%}")
+        regression_count += len(benchmark_comparison["regressions"])
+        click.echo(
+            f"{benchmark_comparison['target']:<12} "
+            f"{benchmark_comparison['modules']:>6} modules: "
+            f"{', '.join(metric_changes)}"
+            f"{' REGRESSED' if benchmark_comparison['regressions'] else ''}"
+        )
+
+    click.echo(
+        f"Compared {len(benchmark_comparisons)} Benchmarks: "
+        f"{regression_count} regressions over {threshold:.0%}"
+    )
+    if regression_count:
+        sys.exit(1)
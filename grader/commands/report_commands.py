@@ -5,10 +5,203 @@
 
 # Python Library Imports
 import click
+import functools
 import getpass
+import os
+import signal
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 # Local Python Library Imports
-from grader.report.report_python import ReportPython
+# N/A
+
+
+###
+# Report Options
+###
+
+
+# Report options that set a tool's constructor argument: (tool, argument). They
+# default to None, so any value given (the tool's default included) takes
+# precedence over the profile's
+TOOL_OPTION_ARGUMENTS = {
+    "pylint_json": ("pylint", "structured"),
+    "pytest_junit": ("pytest", "structured"),
+    "pycodestyle_from_flake8": ("pycodestyle", "from_flake8"),
+    "mypy_cache_dir": ("mypy", "cache_dir"),
+    "mypy_daemon": ("mypy", "daemon"),
+    "pylint_jobs": ("pylint", "jobs"),
+    "pytest_workers": ("pytest", "workers"),
+    "pytest_test_timeout": ("pytest", "test_timeout"),
+    "pytest_coverage_core": ("pytest", "coverage_core"),
+    "pytest_coverage_branch": ("pytest", "coverage_branch"),
+}
+
+# Options of every command that generates reports, in --help order
+REPORT_OPTIONS = [
+    click.option(
+        "--overwrite",
+        flag_value=True,
+        type=bool,
+        default=False,
+        help="Overwrite reports if they already exist?",
+    ),
+    click.option(
+        "--concurrent",
+        flag_value=True,
+        type=bool,
+        default=False,
+        help="Run each candidate's grading tools at the same time?",
+    ),
+    click.option(
+        "--cache-dir",
+        "cache_dir",
+        required=False,
+        default=None,
+        type=str,
+        help="Directory to cache tool results in, reused when the code is unchanged",
+    ),
+    click.option(
+        "--warm-workers",
+        "warm_workers",
+        flag_value=True,
+        type=bool,
+        default=False,
+        help="Run the grading tools in-process on pre-imported workers?",
+    ),
+    click.option(
+        "--pylint-json/--no-pylint-json",
+        "pylint_json",
+        default=None,
+        help="Build pylint results from its JSON messages instead of parseable text?",
+    ),
+    click.option(
+        "--pytest-junit/--no-pytest-junit",
+        "pytest_junit",
+        default=None,
+        help="Build pytest results from JUnit XML and coverage JSON instead of text?",
+    ),
+    click.option(
+        "--pycodestyle-from-flake8/--no-pycodestyle-from-flake8",
+        "pycodestyle_from_flake8",
+        default=None,
+        help="Fill the pycodestyle section from flake8 instead of running it?",
+    ),
+    click.option(
+        "--mypy-cache-dir",
+        "mypy_cache_dir",
+        required=False,
+        default=None,
+        type=str,
+        help="Directory for a pre-warmed mypy cache shared by every grader",
+    ),
+    click.option(
+        "--mypy-daemon/--no-mypy-daemon",
+        "mypy_daemon",
+        default=None,
+        help="Check with a dmypy server per worker, reused across candidates?",
+    ),
+    click.option(
+        "--pylint-jobs",
+        "pylint_jobs",
+        required=False,
+        default=None,
+        type=int,
+        help="Number of pylint processes to split the files across, 0 for one per "
+        "core (default: 1)",
+    ),
+    click.option(
+        "--pytest-workers",
+        "pytest_workers",
+        required=False,
+        default=None,
+        type=int,
+        help="Number of pytest-xdist workers to run tests on, 0 for one per core "
+        "(default: 1)",
+    ),
+    click.option(
+        "--pytest-test-timeout",
+        "pytest_test_timeout",
+        required=False,
+        default=None,
+        type=float,
+        help="Seconds each phase of a test may run for before it errors, 0 for none "
+        "(default: 0)",
+    ),
+    click.option(
+        "--pytest-coverage-core",
+        "pytest_coverage_core",
+        required=False,
+        default=None,
+        type=click.Choice(["auto", "sysmon", "ctrace", "pytrace"]),
+        help="Coverage engine, auto for the lowest overhead one on this Python "
+        "(default: auto)",
+    ),
+    click.option(
+        "--pytest-coverage-branch/--no-pytest-coverage-branch",
+        "pytest_coverage_branch",
+        default=None,
+        help="Measure branch coverage as well as statements?",
+    ),
+    click.option(
+        "--tools",
+        "tools",
+        required=False,
+        default=None,
+        type=str,
+        help="Comma separated tools to run (default: the profile's, or every tool)",
+    ),
+    click.option(
+        "--profile",
+        "profile_name",
+        required=False,
+        default=None,
+        type=str,
+        help="Grading profile choosing the tools and their options (screen/full/deep)",
+    ),
+    click.option(
+        "--profile-file",
+        "profile_path",
+        required=False,
+        default=None,
+        type=str,
+        help="JSON file of grading profiles by name, adding to the built in ones",
+    ),
+]
+
+
+def report_options(command_function: Callable) -> Callable:
+    """
+    Purpose:
+        Add the report options to a command. The tool options, --tools and the
+        profile are resolved into the command's tool_names and tool_options
+    Args:
+        command_function: command taking overwrite, concurrent, cache_dir,
+            warm_workers, tool_names and tool_options
+    Returns:
+        report_command: the command with the report options
+    Raises:
+        N/A
+    """
+
+    @functools.wraps(command_function)
+    def report_command(*args: Any, **kwargs: Any) -> Any:
+        tool_option_values = {
+            option_name: kwargs.pop(option_name)
+            for option_name in TOOL_OPTION_ARGUMENTS
+        }
+        (kwargs["tool_names"], kwargs["tool_options"]) = get_report_tools(
+            kwargs.pop("tools"),
+            kwargs.pop("profile_name"),
+            kwargs.pop("profile_path"),
+            get_tool_options(**tool_option_values),
+        )
+
+        return command_function(*args, **kwargs)
+
+    for report_option in reversed(REPORT_OPTIONS):
+        report_command = report_option(report_command)
+
+    return report_command
 
 
 ###
@@ -50,12 +243,14 @@ from grader.report.report_python import ReportPython
     help="Name of the Candidate",
 )
 @click.option(
-    "--overwrite",
-    flag_value=True,
-    type=bool,
-    default=False,
-    help="Overwrite report if it already exists?",
+    "--workers",
+    "max_workers",
+    required=False,
+    default=None,
+    type=int,
+    help="Number of tools to run at once with --concurrent (default: all)",
 )
+@report_options
 @click.pass_context
 def generate(
     cli_context: object,
@@ -64,18 +259,514 @@ def generate(
     source_code: str,
     python_package: str,
     overwrite: bool,
+    concurrent: bool,
+    max_workers: int,
+    cache_dir: str,
+    warm_workers: bool,
+    tool_names: Optional[List[str]],
+    tool_options: Dict[str, Dict[str, Any]],
 ) -> None:
     """
     Generate a pygrade report
     """
+    # Loads every tool, so only imported once a report is being generated
+    from grader.report.report_python import ReportPython
+
     click.echo("Generating Report")
 
     # Build base report object
     pygrade_report = ReportPython(
-        report_name, candidate_name, source_code, python_package
+        report_name,
+        candidate_name,
+        source_code,
+        python_package,
+        concurrent=concurrent,
+        max_workers=max_workers,
+        cache_dir=cache_dir,
+        warm_workers=warm_workers,
+        tool_options=tool_options,
+        tool_names=tool_names,
     )
 
     # Generate the report
     pygrade_report.generate_report(overwrite=overwrite)
 
     click.echo(f"Report Created: {pygrade_report.report_path}")
+
+
+@click.command("watch")
+@click.option(
+    "--source",
+    "source_code",
+    required=True,
+    default=None,
+    type=str,
+    help="Source Code to Grade",
+)
+@click.option(
+    "--package",
+    "python_package",
+    required=False,
+    default="assessment_python_proficiency",
+    type=str,
+    help="Package to Grade",
+)
+@click.option(
+    "--report",
+    "report_name",
+    required=True,
+    default=None,
+    type=str,
+    help="Name of the Report",
+)
+@click.option(
+    "--candidate",
+    "candidate_name",
+    required=True,
+    default=None,
+    type=str,
+    help="Name of the Candidate",
+)
+@click.option(
+    "--workers",
+    "max_workers",
+    required=False,
+    default=None,
+    type=int,
+    help="Number of tools to run at once with --concurrent (default: all)",
+)
+@click.option(
+    "--debounce",
+    "debounce_seconds",
+    required=False,
+    default=0.5,
+    type=float,
+    help="Seconds without changes before a burst of edits is graded",
+)
+@click.option(
+    "--polling",
+    flag_value=True,
+    type=bool,
+    default=False,
+    help="Poll the source for changes instead of using inotify?",
+)
+@report_options
+@click.pass_context
+def watch(
+    cli_context: object,
+    report_name: str,
+    candidate_name: str,
+    source_code: str,
+    python_package: str,
+    overwrite: bool,
+    concurrent: bool,
+    max_workers: int,
+    cache_dir: str,
+    warm_workers: bool,
+    tool_names: Optional[List[str]],
+    tool_options: Dict[str, Dict[str, Any]],
+    debounce_seconds: float,
+    polling: bool,
+) -> None:
+    """
+    Generate a pygrade report and refresh it as the source changes
+    """
+
+    # Loads every tool, so only imported once a report is being generated
+    from grader.report.report_python import ReportPython
+    from grader.report.report_watch import ReportWatch
+
+    click.echo("Generating Report")
+
+    # Build base report object
+    pygrade_report = ReportPython(
+        report_name,
+        candidate_name,
+        source_code,
+        python_package,
+        concurrent=concurrent,
+        max_workers=max_workers,
+        cache_dir=cache_dir,
+        warm_workers=warm_workers,
+        tool_options=tool_options,
+        tool_names=tool_names,
+    )
+
+    # Generate the report, then refresh it until interrupted
+    report_watch = ReportWatch(
+        pygrade_report, debounce_seconds=debounce_seconds, polling=polling
+    )
+    try:
+        report_watch.run(overwrite=overwrite, progress_callback=echo_watch_progress)
+    except KeyboardInterrupt:
+        click.echo("Stopped Watching")
+
+
+@click.command("batch")
+@click.option(
+    "--manifest",
+    "manifest_path",
+    required=True,
+    default=None,
+    type=str,
+    help="CSV/JSONL of report, candidate, source and (optional) package to grade",
+)
+@click.option(
+    "--workers",
+    "max_workers",
+    required=False,
+    default=None,
+    type=int,
+    help="Number of candidates to grade at once (default: number of cores)",
+)
+@report_options
+@click.pass_context
+def batch(
+    cli_context: object,
+    manifest_path: str,
+    max_workers: int,
+    overwrite: bool,
+    concurrent: bool,
+    cache_dir: str,
+    warm_workers: bool,
+    tool_names: Optional[List[str]],
+    tool_options: Dict[str, Dict[str, Any]],
+) -> None:
+    """
+    Generate pygrade reports for every candidate in a manifest
+    """
+
+    # Loads every tool, so only imported once reports are being generated
+    from grader.report.report_batch import ReportBatch
+
+    # Build batch object
+    pygrade_batch = ReportBatch(
+        manifest_path,
+        max_workers=max_workers,
+        overwrite=overwrite,
+        concurrent=concurrent,
+        cache_dir=cache_dir,
+        warm_workers=warm_workers,
+        tool_options=tool_options,
+        tool_names=tool_names,
+    )
+    click.echo(
+        f"Generating {len(pygrade_batch.batch_jobs)} Reports "
+        f"({pygrade_batch.max_workers} workers)"
+    )
+
+    # Generate the reports
+    batch_summary = pygrade_batch.run(progress_callback=echo_batch_progress)
+
+    click.echo(
+        f"Batch Complete: {batch_summary['succeeded']} succeeded, "
+        f"{batch_summary['failed']} failed in {batch_summary['duration_seconds']}s"
+    )
+    click.echo(f"Batch Summary Created: {pygrade_batch.batch_summary_path}")
+
+
+@click.command("render")
+@click.option(
+    "--reports-dir",
+    "base_report_path",
+    required=False,
+    default="./reports",
+    type=str,
+    help="Directory the reports were generated in",
+)
+@click.option(
+    "--report",
+    "report_names",
+    required=False,
+    multiple=True,
+    type=str,
+    help="Name of a Report to render (default: every report in --reports-dir)",
+)
+@click.option(
+    "--workers",
+    "max_workers",
+    required=False,
+    default=None,
+    type=int,
+    help="Number of processes to render with (default: number of cores)",
+)
+@click.option(
+    "--force",
+    flag_value=True,
+    type=bool,
+    default=False,
+    help="Render reports even if their summaries are current?",
+)
+@click.pass_context
+def render(
+    cli_context: object,
+    base_report_path: str,
+    report_names: Tuple[str, ...],
+    max_workers: int,
+    force: bool,
+) -> None:
+    """
+    Render pygrade report summaries again from their raw data
+    """
+
+    # Loads every tool, so only imported once reports are being rendered
+    from grader.report.report_render import ReportRender
+
+    # Build render object
+    pygrade_render = ReportRender(
+        os.path.abspath(base_report_path),
+        report_names=list(report_names),
+        max_workers=max_workers,
+        force=force,
+    )
+    click.echo(f"Rendering {len(pygrade_render.report_paths)} Reports")
+
+    # Render the reports
+    render_summary = pygrade_render.run()
+    for render_result in render_summary["reports"]:
+        if render_result["error"]:
+            click.echo(f"{render_result['report']} failed: {render_result['error']}")
+
+    click.echo(
+        f"Render Complete: {render_summary['rendered']} rendered, "
+        f"{render_summary['current']} current, {render_summary['failed']} failed "
+        f"in {render_summary['duration_seconds']}s"
+    )
+
+
+@click.command("serve")
+@click.option(
+    "--queue-dir",
+    "queue_dir",
+    required=True,
+    default=None,
+    type=str,
+    help="Directory to keep the job queue in, picked back up after a restart",
+)
+@click.option(
+    "--socket",
+    "socket_path",
+    required=False,
+    default=None,
+    type=str,
+    help="Unix domain socket to serve the job API on",
+)
+@click.option(
+    "--host",
+    "host",
+    required=False,
+    default="127.0.0.1",
+    type=str,
+    help="Interface to serve the job API on with --port",
+)
+@click.option(
+    "--port",
+    "port",
+    required=False,
+    default=None,
+    type=int,
+    help="Port to serve the job API on over HTTP",
+)
+@click.option(
+    "--workers",
+    "max_workers",
+    required=False,
+    default=None,
+    type=int,
+    help="Number of jobs to grade at once (default: number of cores)",
+)
+@report_options
+@click.pass_context
+def serve(
+    cli_context: object,
+    queue_dir: str,
+    socket_path: str,
+    host: str,
+    port: int,
+    max_workers: int,
+    overwrite: bool,
+    concurrent: bool,
+    cache_dir: str,
+    warm_workers: bool,
+    tool_names: Optional[List[str]],
+    tool_options: Dict[str, Dict[str, Any]],
+) -> None:
+    """
+    Serve a grading daemon taking jobs over a local socket
+    """
+
+    # Loads every tool, so only imported once the server is started
+    from grader.server.report_server import ReportServer
+
+    if socket_path is None and port is None:
+        raise click.UsageError("Serve needs --socket and/or --port")
+
+    # Build server object
+    report_server = ReportServer(
+        queue_dir,
+        socket_path=socket_path,
+        host=host,
+        port=port,
+        max_workers=max_workers,
+        overwrite=overwrite,
+        concurrent=concurrent,
+        cache_dir=cache_dir,
+        warm_workers=warm_workers,
+        tool_options=tool_options,
+        tool_names=tool_names,
+    )
+
+    # Serve until interrupted, SIGTERM included
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    report_server.start()
+    click.echo(
+        f"Serving Grading Jobs on {', '.join(report_server.addresses)} "
+        f"({report_server.max_workers} workers)"
+    )
+    try:
+        while True:
+            signal.pause()
+    except KeyboardInterrupt:
+        click.echo("Shutting Down, Running Jobs Are Requeued")
+    finally:
+        report_server.shutdown()
+
+
+###
+# Helper Functions
+###
+
+
+def get_tool_options(**option_values: Any) -> Dict[str, Dict[str, Any]]:
+    """
+    Purpose:
+        Build the per tool constructor arguments from the report options given on
+        the command line
+    Args:
+        option_values: value of each of TOOL_OPTION_ARGUMENTS, None if not given
+    Returns:
+        tool_options: extra constructor arguments for each tool, by tool name
+    Raises:
+        N/A
+    """
+
+    tool_options = {}
+    for (option_name, option_value) in option_values.items():
+        if option_value is None:
+            # Not given, the profile's value or the tool's default applies
+            continue
+        (tool_name, argument_name) = TOOL_OPTION_ARGUMENTS[option_name]
+        tool_options.setdefault(tool_name, {})[argument_name] = option_value
+
+    return tool_options
+
+
+def get_report_tools(
+    tools: Optional[str],
+    profile_name: Optional[str],
+    profile_path: Optional[str],
+    tool_options: Dict[str, Dict[str, Any]],
+) -> Tuple[Optional[List[str]], Dict[str, Dict[str, Any]]]:
+    """
+    Purpose:
+        Choose the tools to run and their options from the grading profile and
+        the report options, the report options taking precedence
+    Args:
+        tools: comma separated tools to run, None for the profile's
+        profile_name: grading profile, None for every tool with its defaults
+        profile_path: JSON file of grading profiles by name
+        tool_options: extra constructor arguments for each tool from the report
+            options, see get_tool_options
+    Returns:
+        tool_names: tools to run, None for every tool
+        tool_options: extra constructor arguments for each tool, by tool name
+    Raises:
+        click.UsageError: if the profile or a tool is unknown, or no tools are
+            named
+    """
+
+    # Loads every tool, so only imported once reports are being generated
+    from grader.report.report_profile import (
+        get_profile_tool_options,
+        get_report_profile,
+    )
+    from grader.report.report_python import TOOL_CLASSES
+
+    tool_names = None
+    if profile_name or profile_path:
+        try:
+            report_profile = get_report_profile(profile_name or "full", profile_path)
+        except Exception as profile_error:
+            raise click.UsageError(str(profile_error))
+        tool_names = report_profile["tools"]
+        tool_options = get_profile_tool_options(report_profile, tool_options)
+
+    if tools is not None:
+        tool_names = [tool.strip() for tool in tools.split(",") if tool.strip()]
+        if not tool_names:
+            raise click.UsageError(
+                f"--tools names no tools, expected some of: {', '.join(TOOL_CLASSES)}"
+            )
+        unknown_tool_names = sorted(set(tool_names) - set(TOOL_CLASSES))
+        if unknown_tool_names:
+            raise click.UsageError(
+                f"Unknown tools: {', '.join(unknown_tool_names)}, expected some of: "
+                f"{', '.join(TOOL_CLASSES)}"
+            )
+
+    return (tool_names, tool_options)
+
+
+def echo_watch_progress(watch_result: Dict[str, Any]) -> None:
+    """
+    Purpose:
+        Echo what was graded each time a watched report is generated or refreshed
+    Args:
+        watch_result: result reported by ReportWatch.run
+    Returns:
+        N/A
+    Raises:
+        N/A
+    """
+
+    if not watch_result["changed_paths"]:
+        click.echo(
+            f"Report Created ({watch_result['duration_seconds']}s), "
+            f"Watching for Changes ({watch_result['watcher']})"
+        )
+        return
+
+    changed_files = f"{len(watch_result['changed_paths'])} files changed"
+    if watch_result["status"] == "unchanged":
+        click.echo(f"{changed_files}, no tool reads them")
+        return
+
+    click.echo(
+        f"{changed_files}, re-ran {', '.join(watch_result['tools'])}: "
+        f"{watch_result['status']} ({watch_result['duration_seconds']}s)"
+    )
+    if watch_result["error"]:
+        click.echo(f"    {watch_result['error']}")
+
+
+def echo_batch_progress(batch_progress: Dict[str, Any]) -> None:
+    """
+    Purpose:
+        Echo progress and ETA after each candidate in a batch finishes
+    Args:
+        batch_progress: progress reported by ReportBatch.run
+    Returns:
+        N/A
+    Raises:
+        N/A
+    """
+
+    batch_result = batch_progress["result"]
+    click.echo(
+        f"[{batch_progress['completed']}/{batch_progress['total']}] "
+        f"{batch_result['report']} {batch_result['status']} "
+        f"({batch_result['duration_seconds']}s, "
+        f"ETA {batch_progress['eta_seconds']:.0f}s)"
+    )
+    if batch_result["error"]:
+        click.echo(f"    {batch_result['error']}")
@@ -4,7 +4,9 @@ Purpose:
 """
 
 # Python Library Imports
-# N/A
+import click
+import pytest
+from click.testing import CliRunner
 
 # Local Python Library Imports
 import grader.commands.report_commands
@@ -28,4 +30,95 @@ import grader.commands.report_commands
 ###
 
 
-# TODO
+def test_generate_report_options() -> int:
+    """
+    Purpose:
+        Test generate takes the shared report options, and rejects --tools that
+        names no tools before generating anything
+    Args:
+        N/A
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    generate = grader.commands.report_commands.generate
+
+    test_help = CliRunner().invoke(generate, ["--help"]).output
+    for test_option in ("--no-mypy-daemon", "--pylint-jobs", "--profile-file"):
+        assert test_option in test_help
+
+    test_result = CliRunner().invoke(
+        generate,
+        ["--source", "./", "--report", "test", "--candidate", "test", "--tools", ","],
+    )
+    assert test_result.exit_code == 2
+    assert "--tools names no tools" in test_result.output
+
+
+###
+# get_tool_options()
+###
+
+
+def test_get_tool_options() -> int:
+    """
+    Purpose:
+        Test only the report options given are set, including ones given with the
+        tool's default value, so they can override a profile
+    Args:
+        N/A
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    get_tool_options = grader.commands.report_commands.get_tool_options
+    get_report_tools = grader.commands.report_commands.get_report_tools
+
+    assert get_tool_options(pylint_json=None, pytest_workers=None) == {}
+
+    test_tool_options = get_tool_options(
+        pytest_coverage_branch=False, pytest_workers=1, mypy_daemon=None
+    )
+    assert test_tool_options == {"pytest": {"coverage_branch": False, "workers": 1}}
+
+    (_, test_tool_options) = get_report_tools(None, "deep", None, test_tool_options)
+    assert test_tool_options["pytest"]["coverage_branch"] is False
+
+
+###
+# get_report_tools()
+###
+
+
+def test_get_report_tools() -> int:
+    """
+    Purpose:
+        Test --tools takes precedence over the profile's tools, and the report
+        options over the profile's tool options
+    Args:
+        N/A
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    get_report_tools = grader.commands.report_commands.get_report_tools
+
+    test_report_tools = get_report_tools(None, None, None, {"pytest": {"workers": 2}})
+    assert test_report_tools == (None, {"pytest": {"workers": 2}})
+
+    (test_tool_names, test_tool_options) = get_report_tools(
+        "pytest, pylint", "screen", None, {"pylint": {"jobs": 2}}
+    )
+    assert test_tool_names == ["pytest", "pylint"]
+    assert test_tool_options["pylint"]["jobs"] == 2
+    assert ("--disable", "duplicate-code") in test_tool_options["pylint"]["args"]
+
+    for test_arguments in (("pytest,nope", None), (None, "nope"), (",", None)):
+        with pytest.raises(click.UsageError):
+            get_report_tools(*test_arguments, None, {})
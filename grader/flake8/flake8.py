@@ -7,11 +7,10 @@ Purpose:
 
 # Python Library Imports
 import os
-import re
 from typing import Any, Dict, List, Optional
 
 # Local Python Library Imports
-import grader.subprocess.subprocess as subprocess
+from grader.tool.line_classifier import LineClassifier
 from grader.tool.tool import Tool
 
 
@@ -26,9 +25,47 @@ class Flake8(Tool):
         Responsible for interacting with Flake8
     """
 
+    name = "flake8"
     default_args = [("--max-complexity", 10), ("--max-line-length", 88)]
     default_flags = ["--statistics"]
 
+    # Message types in the order they are checked
+    line_classifier = LineClassifier(
+        (
+            ("errors", r"^.*\.py\:\d+\:\d+\: E"),
+            ("warnings", r"^.*\.py\:\d+\:\d+\: W"),
+            ("namings", r"^.*\.py\:\d+\:\d+\: N"),
+            ("flakes", r"^.*\.py\:\d+\:\d+\: F"),
+            ("complexities", r"^.*\.py\:\d+\:\d+\: C"),
+            ("summary", r"^[0-9]"),
+        ),
+        finding_prefix=(
+            r"(?P<path>.*\.py):(?P<line>\d+):(?P<column>\d+): (?=(?P<code>\w*))"
+        ),
+        finding_types={
+            "E": "errors",
+            "W": "warnings",
+            "N": "namings",
+            "F": "flakes",
+            "C": "complexities",
+        },
+    )
+
+    # Findings are per file, walked like flake8 walks (and excludes) directories
+    lint_files_independently = True
+    lint_files_sorted = False
+    default_lint_exclude = [
+        ".svn",
+        "CVS",
+        ".bzr",
+        ".hg",
+        ".git",
+        "__pycache__",
+        ".tox",
+        ".eggs",
+        "*.egg",
+    ]
+
     ###
     # Reserved Methods
     ###
@@ -39,15 +76,17 @@ class Flake8(Tool):
         python_package: str = None,
         args: Optional[Dict[str, str]] = None,
         flags: Optional[List[str]] = None,
+        timeout: Optional[int] = None,
     ) -> None:
         """
         Purpose:
-            Constructor for a Mypy
+            Constructor for a Flake8
         Args:
-            source_code: code to run mypy on
+            source_code: code to run flake8 on
             python_package: python_package to assess
-            args: argument overrides for mypy
-            flags: flag overrides for mypy
+            args: argument overrides for flake8
+            flags: flag overrides for flake8
+            timeout: seconds before flake8 is killed, defaults to 60. 0 waits forever
         Returns:
             N/A
         Raises:
@@ -55,7 +94,11 @@ class Flake8(Tool):
         """
 
         super().__init__(
-            source_code, python_package=python_package, args=args, flags=flags
+            source_code,
+            python_package=python_package,
+            args=args,
+            flags=flags,
+            timeout=timeout,
         )
 
     def __repr__(self) -> str:
@@ -89,10 +132,7 @@ class Flake8(Tool):
             N/A
         """
 
-        parsed_args = " ".join([f"{arg}={value}" for (arg, value) in self.args])
-        parsed_flags = " ".join(self.flags)
-
-        return f"python3 -m flake8 {parsed_flags} {parsed_args} {self.python_package}"
+        return self.get_command(self.python_package)
 
     ###
     # Flake8 Operations
@@ -110,27 +150,39 @@ class Flake8(Tool):
             N/A
         """
 
-        # Run Flake8 command with pexpect and capture output
-        (raw_flake8_stdout, _) = subprocess.run_subprocess_call(
-            command=self.command, env={}, cwd=self.source_code, timeout=60
-        )
-
-        return self._parse_output(raw_flake8_stdout)
+        # Run Flake8 command, parsing output as it is produced
+        return self._run_command()
 
-    def _parse_output(self, raw_flake8_stdout: bytes) -> Dict[str, Any]:
+    def get_command(self, lint_targets: str) -> str:
         """
         Purpose:
-            Parse the Flake8 output to get standarized results for reporting
+            Get the Flake8 command for specific files/directories
         Args:
-            raw_flake8_stdout: raw output from the flake8 command
+            lint_targets: shell words naming the files/directories to check
         Returns:
+            command: flake8 command
+        Raises:
             N/A
+        """
+
+        parsed_args = " ".join([f"{arg}={value}" for (arg, value) in self.args])
+        parsed_flags = " ".join(self.flags)
+
+        return f"python3 -m flake8 {parsed_flags} {parsed_args} {lint_targets}"
+
+    def _new_parsed_output(self) -> Dict[str, Any]:
+        """
+        Purpose:
+            Get the empty Flake8 output that results are accumulated into
+        Args:
+            N/A
+        Returns:
+            parsed_output: parsed output with every metric at zero
         Raises:
             N/A
         """
 
-        # Set up return objects
-        parsed_output = {
+        return {
             "metrics": {
                 "errors": 0,
                 "warnings": 0,
@@ -146,49 +198,52 @@ class Flake8(Tool):
             "summary": [],
         }
 
-        # Set up Regex for parsing
-        error_regex = r"^.*\.py\:\d+\:\d+\: E"
-        warning_regex = r"^.*\.py\:\d+\:\d+\: W"
-        naming_regex = r"^.*\.py\:\d+\:\d+\: N"
-        flake_regex = r"^.*\.py\:\d+\:\d+\: F"
-        complexity_regex = r"^.*\.py\:\d+\:\d+\: C"
-        summary_regex = r"^[0-9]"
-
-        for output_line in raw_flake8_stdout:
-
-            # Getting the Message Type
-            message_type = None
-            if re.match(error_regex, output_line):
-                message_type = "errors"
-            elif re.match(warning_regex, output_line):
-                message_type = "warnings"
-            elif re.match(naming_regex, output_line):
-                message_type = "namings"
-            elif re.match(flake_regex, output_line):
-                message_type = "flakes"
-            elif re.match(complexity_regex, output_line):
-                message_type = "complexities"
-            elif re.match(summary_regex, output_line):
-                message_type = "summary"
-
-            # Updating Report
-            if not message_type:
-                # non-matching line
-                continue
-            elif message_type in (
-                "errors",
-                "warnings",
-                "namings",
-                "flakes",
-                "complexities",
-            ):
-                # If error detail, append to data
-                parsed_output["metrics"][message_type] += 1
-            else:
-                # non-matching line
-                continue
-
-            parsed_output[message_type].append(output_line)
+    def _parse_line(self, parsed_output: Dict[str, Any], output_line: str) -> None:
+        """
+        Purpose:
+            Parse a line of Flake8 output to get standarized results for reporting
+        Args:
+            parsed_output: parsed output being accumulated
+            output_line: raw line of output from the flake8 command
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        # Getting the Message Type
+        (message_type, _) = self.line_classifier.classify(output_line)
+
+        # Updating Report
+        if not message_type:
+            # non-matching line
+            return
+        elif message_type in (
+            "errors",
+            "warnings",
+            "namings",
+            "flakes",
+            "complexities",
+        ):
+            # If error detail, append to data
+            parsed_output["metrics"][message_type] += 1
+        else:
+            # non-matching line
+            return
+
+        parsed_output[message_type].append(output_line)
+
+    def _finalize_output(self, parsed_output: Dict[str, Any]) -> None:
+        """
+        Purpose:
+            Compute Flake8 totals and report strings once every line is parsed
+        Args:
+            parsed_output: parsed output being accumulated
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
 
         # Set Total for Reporting
         parsed_output["metrics"]["total"] = sum(parsed_output["metrics"].values())
@@ -207,5 +262,3 @@ class Flake8(Tool):
             )
             if not parsed_output[f"{message_type}_str"]:
                 parsed_output[f"{message_type}_str"] = "N/A"
-
-        return parsed_output
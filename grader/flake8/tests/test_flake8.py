@@ -51,6 +51,7 @@ def test_Flake8___init___base() -> int:
     assert test_flake8.python_package == "*"
     assert test_flake8.args == [("--max-complexity", 10), ("--max-line-length", 88)]
     assert test_flake8.flags == ["--statistics"]
+    assert test_flake8.timeout == 60
 
 
 def test_Flake8___init___override() -> int:
@@ -77,9 +78,42 @@ def test_Flake8___init___override() -> int:
         python_package=test_python_package,
         args=test_args,
         flags=test_flags,
+        timeout=0,
     )
     assert test_flake8.source_code == test_source_code
     assert test_flake8.python_package == test_python_package
     assert test_flake8.code_dir == f"{test_source_code}/{test_python_package}"
     assert test_flake8.args == test_args
     assert test_flake8.flags == test_flags
+    assert test_flake8.timeout == 0
+
+
+###
+# is_input_path()
+###
+
+
+def test_Flake8_is_input_path() -> int:
+    """
+    Purpose:
+        Test only files flake8 would check (or configure it with) are its inputs
+    Args:
+        N/A
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    test_flake8 = Flake8("./", python_package="example")
+    assert test_flake8.is_input_path("example/module.py")
+    assert test_flake8.is_input_path("example/nested/module.py")
+    assert test_flake8.is_input_path("setup.cfg")
+    assert not test_flake8.is_input_path("other/module.py")
+    assert not test_flake8.is_input_path("example/data.json")
+    assert not test_flake8.is_input_path("example/.tox/module.py")
+
+    test_flake8 = Flake8("./", args=[("--exclude", "tests,build")])
+    assert test_flake8.is_input_path("example/module.py")
+    assert not test_flake8.is_input_path("tests/test_module.py")
+    assert not test_flake8.is_input_path("example/tests/test_module.py")
@@ -6,15 +6,71 @@ Purpose:
 """
 
 # Python Library Imports
+import configparser
+import fcntl
+import glob
+import hashlib
+import json
 import os
 import re
+import shlex
+import shutil
+import tempfile
+import time
 from typing import Any, Dict, List, Optional
 
 # Local Python Library Imports
-import grader.subprocess.subprocess as subprocess
+from grader.subprocess import subprocess
+from grader.tool.line_classifier import LineClassifier
 from grader.tool.tool import Tool
 
 
+###
+# Constants
+###
+
+
+# Stdlib modules type checked into a new shared cache, so candidates importing
+# them start from cached builtins, typing, etc.
+MYPY_CACHE_WARM_MODULES = (
+    "abc",
+    "collections",
+    "dataclasses",
+    "datetime",
+    "enum",
+    "functools",
+    "itertools",
+    "json",
+    "math",
+    "os",
+    "pathlib",
+    "random",
+    "re",
+    "sys",
+    "typing",
+    "unittest",
+)
+
+# Seconds an idle dmypy server waits for another check before it exits
+MYPY_DAEMON_IDLE_TIMEOUT = 600
+
+# Seconds a worker cache copy (or leftover state of another grader) can go unused
+# before it is removed
+MYPY_WORKER_STALE_SECONDS = 60 * 60
+
+# Config files mypy reads from its working directory, in order, with the section
+# a shared config file must have to be used
+MYPY_CONFIG_FILES = (
+    ("mypy.ini", None),
+    (".mypy.ini", None),
+    ("pyproject.toml", "[tool.mypy]"),
+    ("setup.cfg", "mypy"),
+)
+
+# Daemon state files named for a worker slot, anything else is left over
+MYPY_DAEMON_SLOT_FILE_REGEX = re.compile(r"^\d+(\.roots)?\.json$")
+
+
 ###
 # Class Definition
 ###
@@ -26,6 +82,7 @@ class Mypy(Tool):
         Responsible for interacting with Mypy
     """
 
+    name = "mypy"
     default_args = []
     default_flags = [
         "--disallow-untyped-defs",
@@ -36,6 +93,19 @@ class Mypy(Tool):
         "--no-color-output",
     ]
 
+    # Message types in the order they are checked
+    line_classifier = LineClassifier(
+        (
+            ("errors", r"^.*\.py\:\d+\: error\:"),
+            ("warnings", r"^.*\.py\:\d+\: warning\:"),
+            ("notes", r"^.*\.py\:\d+\: note\:"),
+            ("summary", r"^Found \d+ errors"),
+            ("summary", r"^Success: no issues"),
+        ),
+        finding_prefix=r"(?P<path>.*\.py):(?P<line>\d+): ",
+        finding_types={"error:": "errors", "warning:": "warnings", "note:": "notes"},
+    )
+
     ###
     # Reserved Methods
     ###
@@ -46,6 +116,9 @@ class Mypy(Tool):
         python_package: str = None,
         args: Optional[Dict[str, str]] = None,
         flags: Optional[List[str]] = None,
+        timeout: Optional[int] = None,
+        cache_dir: Optional[str] = None,
+        daemon: bool = False,
     ) -> None:
         """
         Purpose:
@@ -55,6 +128,11 @@ class Mypy(Tool):
             python_package: python_package to assess
             args: argument overrides for mypy
             flags: flag overrides for mypy
+            timeout: seconds before mypy is killed, defaults to 60. 0 waits forever
+            cache_dir: directory for a mypy cache shared by every grader. It is
+                pre-warmed once and each worker checks with its own copy of it
+            daemon: check with a dmypy server kept per worker and reused across
+                candidates instead of a new mypy process
         Returns:
             N/A
         Raises:
@@ -62,9 +140,20 @@ class Mypy(Tool):
         """
 
         super().__init__(
-            source_code, python_package=python_package, args=args, flags=flags
+            source_code,
+            python_package=python_package,
+            args=args,
+            flags=flags,
+            timeout=timeout,
         )
 
+        self.cache_dir = os.path.abspath(cache_dir) if cache_dir else None
+        self.daemon = daemon
+
+        # Worker slot (and its lock) held while checking with a cache copy or daemon
+        self.worker_slot = 0
+        self.worker_slot_file_obj = None
+
     def __repr__(self) -> str:
         """
         Purpose:
@@ -98,9 +187,180 @@ class Mypy(Tool):
 
         parsed_args = " ".join([f"{arg}={value}" for (arg, value) in self.args])
         parsed_flags = " ".join(self.flags)
+        if self.cache_dir:
+            parsed_args = f"{parsed_args} --cache-dir={self.worker_cache_dir}"
+
+        if self.daemon:
+            # The server outlives the candidate, so paths (and the config file,
+            # none if it is empty) must not depend on cwd
+            config_file = shlex.quote(self.config_file or "")
+            return (
+                f"python3 -m mypy.dmypy --status-file={self.daemon_status_file} "
+                f"run --timeout={MYPY_DAEMON_IDLE_TIMEOUT} -- {parsed_flags} "
+                f"--show-absolute-path --config-file={config_file} {parsed_args} "
+                f"{self.source_root}/{self.python_package}"
+            )
 
         return f"python3 -m mypy {parsed_flags} {parsed_args} {self.python_package}"
 
+    @property
+    def source_root(self) -> str:
+        """
+        Purpose:
+            Get the absolute path to the code being checked
+        Args:
+            N/A
+        Returns:
+            source_root: absolute path to source_code
+        Raises:
+            N/A
+        """
+
+        return os.path.abspath(self.source_code)
+
+    @property
+    def config_file(self) -> Optional[str]:
+        """
+        Purpose:
+            Get the config file mypy would read from the candidate's directory
+        Args:
+            N/A
+        Returns:
+            config_file: absolute path to the first of MYPY_CONFIG_FILES that
+                exists (and has its section), None if there is none
+        Raises:
+            N/A
+        """
+
+        for (config_name, config_section) in MYPY_CONFIG_FILES:
+            config_path = f"{self.source_root}/{config_name}"
+            if not os.path.isfile(config_path):
+                continue
+            if config_section is None:
+                return config_path
+
+            if config_name.endswith(".toml"):
+                with open(config_path, "r", errors="replace") as config_file_obj:
+                    if any(
+                        config_line.strip() == config_section
+                        for config_line in config_file_obj
+                    ):
+                        return config_path
+                continue
+
+            config_parser = configparser.RawConfigParser()
+            try:
+                config_parser.read(config_path)
+            except configparser.Error:
+                continue
+            if config_parser.has_section(config_section):
+                return config_path
+
+        return None
+
+    @property
+    def config_hash(self) -> Optional[str]:
+        """
+        Purpose:
+            Get a hash of the config file's contents
+        Args:
+            N/A
+        Returns:
+            config_hash: sha256 hex digest, None without a config file
+        Raises:
+            N/A
+        """
+
+        config_file = self.config_file
+        if config_file is None:
+            return None
+
+        with open(config_file, "rb") as config_file_obj:
+            return hashlib.sha256(config_file_obj.read()).hexdigest()
+
+    @property
+    def state_dir(self) -> str:
+        """
+        Purpose:
+            Get the directory for worker slots and dmypy servers
+        Args:
+            N/A
+        Returns:
+            state_dir: cache_dir, or the temp dir without one
+        Raises:
+            N/A
+        """
+
+        return self.cache_dir or f"{tempfile.gettempdir()}/grader_mypy"
+
+    @property
+    def cache_template_dir(self) -> str:
+        """
+        Purpose:
+            Get the pre-warmed cache workers copy from. Caches are only valid for
+            the mypy version and flags that wrote them, so each gets its own
+        Args:
+            N/A
+        Returns:
+            cache_template_dir: path in cache_dir
+        Raises:
+            N/A
+        """
+
+        template_key = hashlib.sha256(
+            json.dumps([self.version, self.flags, self.args]).encode("utf-8")
+        ).hexdigest()[:16]
+
+        return f"{self.cache_dir}/templates/{template_key}"
+
+    @property
+    def worker_cache_dir(self) -> str:
+        """
+        Purpose:
+            Get this worker's copy of the shared cache
+        Args:
+            N/A
+        Returns:
+            worker_cache_dir: path in cache_dir
+        Raises:
+            N/A
+        """
+
+        template_key = os.path.basename(self.cache_template_dir)
+
+        return f"{self.cache_dir}/workers/{template_key}/{self.worker_slot}"
+
+    @property
+    def daemon_status_file(self) -> str:
+        """
+        Purpose:
+            Get the status file of this worker's dmypy server
+        Args:
+            N/A
+        Returns:
+            daemon_status_file: path in state_dir
+        Raises:
+            N/A
+        """
+
+        return f"{self.state_dir}/daemons/{self.worker_slot}.json"
+
+    @property
+    def daemon_roots_file(self) -> str:
+        """
+        Purpose:
+            Get the file recording the source roots this worker's dmypy server
+            has checked, and the config file it last checked with
+        Args:
+            N/A
+        Returns:
+            daemon_roots_file: path in state_dir
+        Raises:
+            N/A
+        """
+
+        return f"{self.state_dir}/daemons/{self.worker_slot}.roots.json"
+
     ###
     # Mypy Operations
     ###
@@ -117,27 +377,232 @@ class Mypy(Tool):
             N/A
         """
 
-        # Run Mypy command with pexpect and capture output
-        (raw_mypy_stdout, _) = subprocess.run_subprocess_call(
-            command=self.command, env={}, cwd=self.source_code, timeout=60
-        )
+        if not self.cache_dir and not self.daemon:
+            # Run Mypy command, parsing output as it is produced
+            return self._run_command()
+
+        self.claim_worker_slot()
+        try:
+            self.prune_worker_state()
+            if self.cache_dir:
+                self.prepare_cache()
+            if self.daemon:
+                self.prepare_daemon()
+
+            # Run Mypy command, parsing output as it is produced
+            return self._run_command()
+        finally:
+            self.release_worker_slot()
+
+    def claim_worker_slot(self) -> None:
+        """
+        Purpose:
+            Lock the lowest worker slot no other check (in any grader sharing
+            state_dir) holds. A slot has one cache copy and one dmypy server, so
+            there are never more of them than checks that ran at the same time
+        Args:
+            N/A
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        os.makedirs(f"{self.state_dir}/slots", exist_ok=True)
+
+        worker_slot = 0
+        while True:
+            slot_file_obj = open(f"{self.state_dir}/slots/{worker_slot}.lock", "a")
+            try:
+                fcntl.flock(slot_file_obj, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                slot_file_obj.close()
+                worker_slot += 1
+                continue
+            break
+
+        self.worker_slot = worker_slot
+        self.worker_slot_file_obj = slot_file_obj
+
+    def release_worker_slot(self) -> None:
+        """
+        Purpose:
+            Unlock the worker slot for the next check
+        Args:
+            N/A
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        if self.worker_slot_file_obj:
+            self.worker_slot_file_obj.close()
+            self.worker_slot_file_obj = None
+
+    def prune_worker_state(self) -> None:
+        """
+        Purpose:
+            Remove worker cache copies unused for MYPY_WORKER_STALE_SECONDS (copies
+            for other mypy versions and flags, or partial copies of a crashed
+            grader) and daemon files not named for a worker slot
+        Args:
+            N/A
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        stale_before = time.time() - MYPY_WORKER_STALE_SECONDS
+        stale_paths = glob.glob(f"{self.state_dir}/workers/*/*") + [
+            daemon_path
+            for daemon_path in glob.glob(f"{self.state_dir}/daemons/*")
+            if not MYPY_DAEMON_SLOT_FILE_REGEX.match(os.path.basename(daemon_path))
+        ]
+        for stale_path in stale_paths:
+            try:
+                if os.path.getmtime(stale_path) >= stale_before:
+                    continue
+                if os.path.isdir(stale_path):
+                    shutil.rmtree(stale_path, ignore_errors=True)
+                else:
+                    os.remove(stale_path)
+            except OSError:
+                # Removed by another grader
+                pass
+
+    def prepare_cache(self) -> None:
+        """
+        Purpose:
+            Make sure this worker has a copy of the shared cache, pre-warming the
+            shared cache first if no grader has yet. Both are written to a temp dir
+            and renamed into place, so concurrent graders never see a partial cache
+        Args:
+            N/A
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        if os.path.isdir(self.worker_cache_dir):
+            # In use, so not pruned
+            os.utime(self.worker_cache_dir)
+            return
 
-        return self._parse_output(raw_mypy_stdout)
+        if not os.path.isdir(self.cache_template_dir):
+            os.makedirs(os.path.dirname(self.cache_template_dir), exist_ok=True)
+            warm_cache_dir = tempfile.mkdtemp(
+                dir=os.path.dirname(self.cache_template_dir)
+            )
+
+            # Run from the empty cache dir, so no candidate config is picked up
+            parsed_args = " ".join([f"{arg}={value}" for (arg, value) in self.args])
+            warm_program = f"import {', '.join(MYPY_CACHE_WARM_MODULES)}"
+            subprocess.run_subprocess_call(
+                f"python3 -m mypy {' '.join(self.flags)} {parsed_args} "
+                f"--cache-dir={warm_cache_dir}/cache -c {shlex.quote(warm_program)}",
+                env=self.command_env,
+                cwd=warm_cache_dir,
+                timeout=self.timeout,
+            )
+            self._publish_dir(f"{warm_cache_dir}/cache", self.cache_template_dir)
+            shutil.rmtree(warm_cache_dir, ignore_errors=True)
 
-    def _parse_output(self, raw_mypy_stdout: bytes) -> Dict[str, Any]:
+        if os.path.isdir(self.cache_template_dir):
+            os.makedirs(os.path.dirname(self.worker_cache_dir), exist_ok=True)
+            worker_copy_dir = tempfile.mkdtemp(
+                dir=os.path.dirname(self.worker_cache_dir)
+            )
+            shutil.copytree(
+                self.cache_template_dir, f"{worker_copy_dir}/cache", symlinks=True
+            )
+            self._publish_dir(f"{worker_copy_dir}/cache", self.worker_cache_dir)
+            shutil.rmtree(worker_copy_dir, ignore_errors=True)
+
+    def prepare_daemon(self) -> None:
         """
         Purpose:
-            Parse the Mypy output to get standarized results for reporting
+            Make sure this worker's dmypy server will check the candidate from
+            scratch. The server tracks changes by path but keeps module state by
+            name, so checking a tree again after another tree with the same modules
+            would report stale results. Stop the server in that case, when the
+            candidate's config file (or its contents) differs from the last one
+            checked, and when the slot has no record of the roots its server checked
         Args:
-            raw_mypy_stdout: raw output from the mypy command
+            N/A
         Returns:
             N/A
         Raises:
             N/A
         """
 
-        # Set up return objects
-        parsed_output = {
+        os.makedirs(os.path.dirname(self.daemon_status_file), exist_ok=True)
+
+        try:
+            with open(self.daemon_roots_file, "r") as roots_file_obj:
+                checked_roots = json.load(roots_file_obj)
+        except (OSError, ValueError):
+            checked_roots = None
+        config = {"file": self.config_file, "hash": self.config_hash}
+        if (
+            checked_roots is None
+            or checked_roots.get("config") != config
+            or (
+                self.source_root in checked_roots["seen"]
+                and self.source_root != checked_roots["last"]
+            )
+        ):
+            subprocess.run_subprocess_call(
+                f"python3 -m mypy.dmypy --status-file={self.daemon_status_file} stop",
+                env=self.command_env,
+                cwd=self.source_code,
+                timeout=self.timeout,
+            )
+            checked_roots = {"seen": [], "last": None}
+
+        if self.source_root not in checked_roots["seen"]:
+            checked_roots["seen"].append(self.source_root)
+        checked_roots["last"] = self.source_root
+        checked_roots["config"] = config
+        with open(self.daemon_roots_file, "w") as roots_file_obj:
+            json.dump(checked_roots, roots_file_obj)
+
+    @staticmethod
+    def _publish_dir(built_dir: str, target_dir: str) -> None:
+        """
+        Purpose:
+            Atomically move a fully written directory into place. If another
+            grader got there first, theirs is kept
+        Args:
+            built_dir: directory to publish
+            target_dir: where to publish it
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        try:
+            os.rename(built_dir, target_dir)
+        except OSError:
+            # target_dir already exists and is not empty
+            pass
+
+    def _new_parsed_output(self) -> Dict[str, Any]:
+        """
+        Purpose:
+            Get the empty Mypy output that results are accumulated into
+        Args:
+            N/A
+        Returns:
+            parsed_output: parsed output with every metric at zero
+        Raises:
+            N/A
+        """
+
+        return {
             "metrics": {"warnings": 0, "notes": 0, "errors": 0},
             "errors": [],
             "warnings": [],
@@ -145,42 +610,49 @@ class Mypy(Tool):
             "summary": "",
         }
 
-        # Set up Regex for parsing
-        error_regex = r"^.*\.py\:\d+\: error\:"
-        note_regex = r"^.*\.py\:\d+\: note\:"
-        warning_regex = r"^.*\.py\:\d+\: warning\:"
-        found_errors_regex = r"^Found \d+ errors"
-        no_errors_regex = r"^Success: no issues"
-
-        for output_line in raw_mypy_stdout:
-
-            # Getting the Message Type
-            message_type = None
-            if re.match(error_regex, output_line):
-                message_type = "errors"
-            elif re.match(warning_regex, output_line):
-                message_type = "warnings"
-            elif re.match(note_regex, output_line):
-                message_type = "notes"
-            elif re.match(found_errors_regex, output_line) or re.match(
-                no_errors_regex, output_line
-            ):
-                message_type = "summary"
-
-            # Updating Report
-            if not message_type:
-                # non-matching line
-                continue
-            if message_type in ("errors", "warnings", "notes"):
-                # If error detail, append to data
-                parsed_output["metrics"][message_type] += 1
-                parsed_output[message_type].append(output_line)
-            elif message_type == "summary":
-                # Else, update summary data
-                parsed_output["summary"] = output_line
-            else:
-                # non-matching line
-                continue
+    def _parse_line(self, parsed_output: Dict[str, Any], output_line: str) -> None:
+        """
+        Purpose:
+            Parse a line of Mypy output to get standarized results for reporting
+        Args:
+            parsed_output: parsed output being accumulated
+            output_line: raw line of output from the mypy command
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        # The server reports absolute paths, report them like mypy from cwd
+        if self.daemon and output_line.startswith(f"{self.source_root}/"):
+            output_line = output_line.replace(f"{self.source_root}/", "", 1)
+
+        # Getting the Message Type
+        (message_type, _) = self.line_classifier.classify(output_line)
+
+        # Updating Report
+        if not message_type:
+            # non-matching line
+            return
+        if message_type in ("errors", "warnings", "notes"):
+            # If error detail, append to data
+            parsed_output["metrics"][message_type] += 1
+            parsed_output[message_type].append(output_line)
+        elif message_type == "summary":
+            # Else, update summary data
+            parsed_output["summary"] = output_line
+
+    def _finalize_output(self, parsed_output: Dict[str, Any]) -> None:
+        """
+        Purpose:
+            Compute Mypy totals and report strings once every line is parsed
+        Args:
+            parsed_output: parsed output being accumulated
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
 
         # Set Total for Reporting
         parsed_output["metrics"]["total"] = sum(parsed_output["metrics"].values())
@@ -192,5 +664,3 @@ class Mypy(Tool):
             )
             if not parsed_output[f"{message_type}_str"]:
                 parsed_output[f"{message_type}_str"] = "N/A"
-
-        return parsed_output
@@ -5,9 +5,10 @@ Purpose:
 """
 
 # Python Library Imports
-# N/A
+import os
 
 # Local Python Library Imports
+import grader.subprocess.subprocess as subprocess
 from grader.mypy.mypy import Mypy
 
 
@@ -16,7 +17,33 @@ from grader.mypy.mypy import Mypy
 ###########
 
 
-# N/A
+def mock_run_subprocess_call(
+    command: str, env: dict, cwd: str, timeout: int = 60
+) -> tuple:
+    """
+    Purpose:
+        Stand in for mypy, writing a cache file into any --cache-dir
+    Args:
+        command: command to run
+        env: environment variables for shell
+        cwd: working directory to run command from
+        timeout: timeout for command to complete
+    Return:
+        process_stdout: no output
+        process_stderr: no errors
+        timed_out: always False
+    Raises:
+        N/A
+    """
+
+    for command_word in command.split():
+        if command_word.startswith("--cache-dir="):
+            cache_dir = command_word.split("=", 1)[1]
+            os.makedirs(cache_dir)
+            with open(f"{cache_dir}/builtins.meta.json", "w") as cache_file_obj:
+                cache_file_obj.write("{}")
+
+    return ([""], [""], False)
 
 
 ###########
@@ -58,6 +85,7 @@ def test_Mypy___init___base() -> int:
         "--namespace-packages",
         "--no-color-output",
     ]
+    assert test_mypy.timeout == 60
 
 
 def test_Mypy___init___override() -> int:
@@ -90,3 +118,288 @@ def test_Mypy___init___override() -> int:
     assert test_mypy.code_dir == f"{test_source_code}/{test_python_package}"
     assert test_mypy.args == test_args
     assert test_mypy.flags == test_flags
+
+
+###
+# command
+###
+
+
+def test_Mypy_command_daemon(tmp_path: object) -> int:
+    """
+    Purpose:
+        Test the daemon and shared cache commands check absolute paths with a
+        per worker status file and cache copy
+    Args:
+        tmp_path: pytest tmp_path fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    test_mypy = Mypy(str(tmp_path), python_package="example")
+    assert test_mypy.command.startswith("python3 -m mypy --disallow-untyped-defs")
+    assert "--cache-dir" not in test_mypy.command
+
+    test_mypy = Mypy(
+        str(tmp_path),
+        python_package="example",
+        cache_dir=f"{tmp_path}/cache",
+        daemon=True,
+    )
+    assert test_mypy.command.startswith(
+        f"python3 -m mypy.dmypy --status-file={tmp_path}/cache/daemons/"
+        f"{test_mypy.worker_slot}.json run --timeout="
+    )
+    assert f"--cache-dir={test_mypy.worker_cache_dir}" in test_mypy.command
+    assert test_mypy.command.endswith(
+        f"--show-absolute-path --config-file=''  "
+        f"--cache-dir={test_mypy.worker_cache_dir} {tmp_path}/example"
+    )
+    assert test_mypy.worker_cache_dir.startswith(f"{tmp_path}/cache/workers/")
+
+    # The cache config, and so cached results, don't depend on how mypy is run
+    assert test_mypy.cache_config == {
+        **Mypy(str(tmp_path)).cache_config,
+        "python_package": "example",
+    }
+
+
+###
+# prepare_cache()
+###
+
+
+def test_Mypy_prepare_cache(tmp_path: object, monkeypatch: object) -> int:
+    """
+    Purpose:
+        Test the shared cache is warmed once and copied for each worker
+    Args:
+        tmp_path: pytest tmp_path fixture
+        monkeypatch: pytest monkeypatch fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    test_commands = []
+
+    def mock_record_call(command: str, **kwargs: object) -> tuple:
+        test_commands.append(command)
+        return mock_run_subprocess_call(command, **kwargs)
+
+    monkeypatch.setattr(subprocess, "run_subprocess_call", mock_record_call)
+
+    test_mypy = Mypy(str(tmp_path), cache_dir=f"{tmp_path}/cache")
+    test_mypy.prepare_cache()
+    test_mypy.prepare_cache()
+
+    assert len(test_commands) == 1
+    assert "-c 'import abc, collections" in test_commands[0]
+    for test_cache_dir in [test_mypy.cache_template_dir, test_mypy.worker_cache_dir]:
+        assert os.listdir(test_cache_dir) == ["builtins.meta.json"]
+
+    # A worker whose copy is missing copies the existing template
+    os.rename(test_mypy.worker_cache_dir, f"{tmp_path}/moved")
+    test_mypy.prepare_cache()
+    assert len(test_commands) == 1
+    assert os.listdir(test_mypy.worker_cache_dir) == ["builtins.meta.json"]
+
+    # Nothing but the template and the copy is left behind
+    assert os.listdir(f"{tmp_path}/cache/templates") == [
+        os.path.basename(test_mypy.cache_template_dir)
+    ]
+    assert os.listdir(os.path.dirname(test_mypy.worker_cache_dir)) == [
+        str(test_mypy.worker_slot)
+    ]
+
+
+###
+# claim_worker_slot()
+###
+
+
+def test_Mypy_claim_worker_slot(tmp_path: object) -> int:
+    """
+    Purpose:
+        Test concurrent checks hold different slots and released slots are reused
+    Args:
+        tmp_path: pytest tmp_path fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    test_mypys = [Mypy(str(tmp_path), cache_dir=f"{tmp_path}/cache") for _ in range(3)]
+    for test_mypy in test_mypys[:2]:
+        test_mypy.claim_worker_slot()
+    assert [test_mypy.worker_slot for test_mypy in test_mypys[:2]] == [0, 1]
+
+    # The lowest free slot is taken, so the number of slots stays bounded
+    test_mypys[0].release_worker_slot()
+    test_mypys[2].claim_worker_slot()
+    assert test_mypys[2].worker_slot == 0
+    for test_mypy in test_mypys:
+        test_mypy.release_worker_slot()
+
+
+###
+# prune_worker_state()
+###
+
+
+def test_Mypy_prune_worker_state(tmp_path: object) -> int:
+    """
+    Purpose:
+        Test unused cache copies and leftover daemon files are removed, while
+        recently used copies and slot daemon files are kept
+    Args:
+        tmp_path: pytest tmp_path fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    # Example Data
+    for test_path in ["workers/aa/0", "workers/aa/1", "workers/aa/123-456"]:
+        (tmp_path / test_path).mkdir(parents=True)
+    (tmp_path / "daemons").mkdir()
+    for test_path in ["0.json", "0.roots.json", "123-456.json"]:
+        (tmp_path / "daemons" / test_path).write_text("{}")
+    for test_path in ["workers/aa/1", "workers/aa/123-456", "daemons/0.json"]:
+        os.utime(tmp_path / test_path, (1, 1))
+    os.utime(tmp_path / "daemons" / "123-456.json", (1, 1))
+
+    Mypy(str(tmp_path), cache_dir=str(tmp_path)).prune_worker_state()
+    assert os.listdir(tmp_path / "workers" / "aa") == ["0"]
+    assert sorted(os.listdir(tmp_path / "daemons")) == ["0.json", "0.roots.json"]
+
+
+###
+# prepare_daemon()
+###
+
+
+def test_Mypy_prepare_daemon(tmp_path: object, monkeypatch: object) -> int:
+    """
+    Purpose:
+        Test the daemon is stopped on first use of a slot and when a tree is
+        checked again after another one, but kept for new trees and repeated checks
+    Args:
+        tmp_path: pytest tmp_path fixture
+        monkeypatch: pytest monkeypatch fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    test_commands = []
+
+    def mock_record_call(command: str, **kwargs: object) -> tuple:
+        test_commands.append(command)
+        return ([""], [""], False)
+
+    monkeypatch.setattr(subprocess, "run_subprocess_call", mock_record_call)
+
+    for test_candidate in ["c1", "c2"]:
+        (tmp_path / test_candidate).mkdir()
+
+    test_stops = []
+    for test_candidate in ["c1", "c1", "c2", "c2", "c1", "c2"]:
+        test_mypy = Mypy(
+            f"{tmp_path}/{test_candidate}", cache_dir=f"{tmp_path}/cache", daemon=True
+        )
+        test_mypy.prepare_daemon()
+        test_stops.append(len(test_commands))
+
+    # After the restart, the server has only seen c1
+    assert test_stops == [1, 1, 1, 1, 2, 2]
+    assert test_commands[0].endswith(f"{test_mypy.daemon_status_file} stop")
+
+    # A new config file, or a change to it, restarts the server too
+    test_stops = []
+    for test_config in ["[mypy]\n", "[mypy]\n", "[mypy]\nstrict = True\n"]:
+        (tmp_path / "c2" / "mypy.ini").write_text(test_config)
+        test_mypy = Mypy(f"{tmp_path}/c2", cache_dir=f"{tmp_path}/cache", daemon=True)
+        test_mypy.prepare_daemon()
+        test_stops.append(len(test_commands))
+    assert test_stops == [3, 3, 4]
+    assert f"--config-file={tmp_path}/c2/mypy.ini " in test_mypy.command
+
+
+###
+# config_file
+###
+
+
+def test_Mypy_config_file(tmp_path: object) -> int:
+    """
+    Purpose:
+        Test the config file is the one mypy would read from the candidate's
+        directory, skipping shared config files without a mypy section
+    Args:
+        tmp_path: pytest tmp_path fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    test_mypy = Mypy(str(tmp_path))
+    assert test_mypy.config_file is None
+    assert test_mypy.config_hash is None
+
+    (tmp_path / "setup.cfg").write_text("[flake8]\nmax-line-length = 88\n")
+    (tmp_path / "pyproject.toml").write_text("[tool.black]\nline-length = 88\n")
+    assert test_mypy.config_file is None
+
+    (tmp_path / "setup.cfg").write_text("[mypy]\nstrict = True\n")
+    assert test_mypy.config_file == f"{tmp_path}/setup.cfg"
+
+    (tmp_path / "pyproject.toml").write_text("[tool.mypy]\nstrict = true\n")
+    assert test_mypy.config_file == f"{tmp_path}/pyproject.toml"
+
+    (tmp_path / ".mypy.ini").write_text("[mypy]\n")
+    assert test_mypy.config_file == f"{tmp_path}/.mypy.ini"
+    test_config_hash = test_mypy.config_hash
+
+    (tmp_path / ".mypy.ini").write_text("[mypy]\nstrict = True\n")
+    assert test_mypy.config_hash != test_config_hash
+
+
+###
+# _parse_line()
+###
+
+
+def test_Mypy__parse_line_daemon(tmp_path: object) -> int:
+    """
+    Purpose:
+        Test the daemon's absolute paths are reported relative to the source code
+    Args:
+        tmp_path: pytest tmp_path fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    test_mypy = Mypy(str(tmp_path), daemon=True)
+    test_parsed_output = test_mypy._parse_output(
+        [
+            "Daemon started",
+            f"{tmp_path}/example/module.py:3: error: Name 'x' is not defined",
+            "Found 1 error in 1 file (checked 2 source files)",
+            "",
+        ]
+    )
+
+    assert test_parsed_output["errors"] == [
+        "example/module.py:3: error: Name 'x' is not defined"
+    ]
+    assert test_parsed_output["metrics"]["total"] == 1
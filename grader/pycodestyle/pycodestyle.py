@@ -6,12 +6,13 @@ Purpose:
 """
 
 # Python Library Imports
+import configparser
 import os
 import re
 from typing import Any, Dict, List, Optional
 
 # Local Python Library Imports
-import grader.subprocess.subprocess as subprocess
+from grader.tool.line_classifier import LineClassifier
 from grader.tool.tool import Tool
 
 
@@ -26,9 +27,59 @@ class Pycodestyle(Tool):
         Responsible for interacting with Pycodestyle
     """
 
+    name = "pycodestyle"
     default_args = [("--max-line-length", 88), ("--exclude", "'.eggs tests .venv'")]
     default_flags = ["--statistics"]
 
+    # Message types in the order they are checked
+    line_classifier = LineClassifier(
+        (
+            ("errors", r"^.*\.py\:\d+\:\d+\: E"),
+            ("warnings", r"^.*\.py\:\d+\:\d+\: W"),
+            ("summary", r"^[0-9]"),
+        ),
+        finding_prefix=(
+            r"(?P<path>.*\.py):(?P<line>\d+):(?P<column>\d+): (?=(?P<code>\w*))"
+        ),
+        finding_types={"E": "errors", "W": "warnings"},
+    )
+
+    # Findings are per file, walked like pycodestyle walks (and excludes) directories
+    lint_files_independently = True
+    lint_files_sorted = True
+    default_lint_exclude = [".svn", "CVS", ".bzr", ".hg", ".git", "__pycache__", ".tox"]
+
+    # Options both tools pass to the pycodestyle checkers, which must match for
+    # flake8's findings to be pycodestyle's. Selecting/ignoring codes means
+    # different things to the two, so derived results are not used with them
+    flake8_shared_options = [
+        "--max-line-length",
+        "--max-doc-length",
+        "--hang-closing",
+        "--indent-size",
+    ]
+    flake8_incompatible_options = [
+        "--select",
+        "--ignore",
+        "--extend-select",
+        "--extend-ignore",
+        "--config",
+    ]
+
+    # Codes flake8 reports for files pycodestyle reports differently
+    flake8_unparsable_codes = ["E902", "E999"]
+
+    # Config files and sections either tool would read settings from
+    style_config_files = ["setup.cfg", "tox.ini", ".flake8", ".pycodestyle"]
+    style_config_sections = ["flake8", "pycodestyle", "pep8"]
+
+    # Configuration files pycodestyle reads, on top of every tool's
+    config_files = Tool.config_files + tuple(
+        config_file
+        for config_file in style_config_files
+        if config_file not in Tool.config_files
+    )
+
     ###
     # Reserved Methods
     ###
@@ -39,15 +90,21 @@ class Pycodestyle(Tool):
         python_package: str = None,
         args: Optional[Dict[str, str]] = None,
         flags: Optional[List[str]] = None,
+        timeout: Optional[int] = None,
+        from_flake8: bool = False,
     ) -> None:
         """
         Purpose:
-            Constructor for a Mypy
+            Constructor for a Pycodestyle
         Args:
-            source_code: code to run mypy on
+            source_code: code to run pycodestyle on
             python_package: python_package to assess
-            args: argument overrides for mypy
-            flags: flag overrides for mypy
+            args: argument overrides for pycodestyle
+            flags: flag overrides for pycodestyle
+            timeout: seconds before pycodestyle is killed, defaults to 60. 0 waits
+                forever
+            from_flake8: build results from the flake8 run's E/W findings (see
+                derive_from_flake8) instead of running pycodestyle when possible
         Returns:
             N/A
         Raises:
@@ -55,9 +112,15 @@ class Pycodestyle(Tool):
         """
 
         super().__init__(
-            source_code, python_package=python_package, args=args, flags=flags
+            source_code,
+            python_package=python_package,
+            args=args,
+            flags=flags,
+            timeout=timeout,
         )
 
+        self.from_flake8 = from_flake8
+
     def __repr__(self) -> str:
         """
         Purpose:
@@ -89,13 +152,22 @@ class Pycodestyle(Tool):
             N/A
         """
 
-        parsed_args = " ".join([f"{arg}={value}" for (arg, value) in self.args])
-        parsed_flags = " ".join(self.flags)
+        return self.get_command(self.python_package)
 
-        return (
-            f"python3 -m pycodestyle {parsed_flags} "
-            f"{parsed_args} {self.python_package}"
-        )
+    @property
+    def command_env(self) -> Dict[str, str]:
+        """
+        Purpose:
+            Get the Pycodestyle command environment, with the code importable
+        Args:
+            N/A
+        Returns:
+            command_env: environment for the pycodestyle shell
+        Raises:
+            N/A
+        """
+
+        return {"PYTHONPATH": self.source_code}
 
     ###
     # Pycodestyle Operations
@@ -113,64 +185,246 @@ class Pycodestyle(Tool):
             N/A
         """
 
-        # Run Pycodestyle command with pexpect and capture output
-        (raw_pycodestyle_stdout, _) = subprocess.run_subprocess_call(
-            command=self.command,
-            env={"PYTHONPATH": self.source_code},
-            cwd=self.source_code,
-            timeout=60,
+        # Run Pycodestyle command, parsing output as it is produced
+        return self._run_command()
+
+    def derive_from_flake8(
+        self, flake8_runner: Tool, flake8_output: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Purpose:
+            Build the results a pycodestyle run would give from the E/W findings
+            of a flake8 run over the same code, which runs the same checkers.
+
+            Findings are limited to the files pycodestyle would check and put in
+            its order (its file walk, then line, column and code). Returns None,
+            so pycodestyle has to be run, if the two could disagree: flake8 timed
+            out, crashed or could not parse a file, the style options differ, or
+            the code has noqa comments or its own style config
+        Args:
+            flake8_runner: the Flake8 that was run
+            flake8_output: parsed output from flake8_runner
+        Returns:
+            parsed_output: parsed output as if from pycodestyle, or None
+        Raises:
+            N/A
+        """
+
+        lint_files = self.get_lint_files()
+        if not self.can_derive_from_flake8(flake8_runner, flake8_output, lint_files):
+            return None
+
+        file_findings = {lint_file: [] for lint_file in lint_files}
+        for output_line in flake8_output["errors"] + flake8_output["warnings"]:
+            (message_type, line_match) = self.line_classifier.classify(output_line)
+            if message_type not in ("errors", "warnings"):
+                return None
+            if "path" not in line_match.groupdict():
+                # Location was ambiguous, matched without the finding groups
+                return None
+            if line_match.group("code") in self.flake8_unparsable_codes:
+                return None
+
+            if line_match.group("path") in file_findings:
+                file_findings[line_match.group("path")].append(
+                    (
+                        int(line_match.group("line")),
+                        int(line_match.group("column")),
+                        line_match.group("code"),
+                        output_line,
+                    )
+                )
+
+        parsed_output = self._new_parsed_output()
+        for lint_file in lint_files:
+            for (_, _, _, output_line) in sorted(file_findings[lint_file]):
+                self._parse_line(parsed_output, output_line)
+        self._finalize_output(parsed_output)
+        parsed_output["timed_out"] = False
+
+        return parsed_output
+
+    def can_derive_from_flake8(
+        self, flake8_runner: Tool, flake8_output: Dict[str, Any], lint_files: List[str],
+    ) -> bool:
+        """
+        Purpose:
+            Check a flake8 run's findings are exactly what pycodestyle would find
+            in lint_files, other than the order they are in
+        Args:
+            flake8_runner: the Flake8 that was run
+            flake8_output: parsed output from flake8_runner
+            lint_files: files pycodestyle would check
+        Returns:
+            can_derive_from_flake8: whether results can be derived
+        Raises:
+            N/A
+        """
+
+        if flake8_output.get("timed_out") or flake8_runner.failed:
+            # Findings are partial, or flake8 crashed
+            return False
+        if not self.shares_flake8_options(flake8_runner) or self.has_style_config():
+            return False
+        if not set(lint_files) <= set(flake8_runner.get_lint_files()):
+            # flake8 excluded files pycodestyle checks
+            return False
+
+        return not any(self.has_noqa_comment(lint_file) for lint_file in lint_files)
+
+    def shares_flake8_options(self, flake8_runner: Tool) -> bool:
+        """
+        Purpose:
+            Check flake8 runs the pycodestyle checkers exactly as we would
+        Args:
+            flake8_runner: the Flake8 that was run
+        Returns:
+            shares_flake8_options: whether the style options are the same
+        Raises:
+            N/A
+        """
+
+        def get_style_options(tool_runner: Tool) -> Optional[Dict[str, str]]:
+            style_options = {}
+            tool_options = list(tool_runner.args) + [
+                (flag, True) for flag in tool_runner.flags
+            ]
+            for (option, value) in tool_options:
+                if option in self.flake8_incompatible_options:
+                    return None
+                if option in self.flake8_shared_options:
+                    style_options[option] = str(value)
+            return style_options
+
+        pycodestyle_options = get_style_options(self)
+        return (
+            pycodestyle_options is not None
+            and pycodestyle_options == get_style_options(flake8_runner)
         )
 
-        return self._parse_output(raw_pycodestyle_stdout)
+    def has_style_config(self) -> bool:
+        """
+        Purpose:
+            Check the code has config either tool would read style settings from
+        Args:
+            N/A
+        Returns:
+            has_style_config: whether any config file has a style section
+        Raises:
+            N/A
+        """
+
+        for config_file in self.style_config_files:
+            config_path = os.path.join(self.source_code, config_file)
+            if not os.path.isfile(config_path):
+                continue
+
+            config_parser = configparser.RawConfigParser()
+            try:
+                config_parser.read(config_path)
+            except configparser.Error:
+                # Unreadable config, let the tools decide what it means
+                return True
+            if any(
+                config_parser.has_section(config_section)
+                for config_section in self.style_config_sections
+            ):
+                return True
+
+        return False
+
+    def has_noqa_comment(self, lint_file: str) -> bool:
+        """
+        Purpose:
+            Check a file has noqa comments, which flake8 applies to every check
+            but pycodestyle only to some
+        Args:
+            lint_file: path relative to source_code
+        Returns:
+            has_noqa_comment: whether the file mentions noqa
+        Raises:
+            N/A
+        """
+
+        with open(os.path.join(self.source_code, lint_file), "rb") as lint_file_obj:
+            return re.search(rb"(?i)noqa", lint_file_obj.read()) is not None
 
-    def _parse_output(self, raw_pycodestyle_stdout: bytes) -> Dict[str, Any]:
+    def get_command(self, lint_targets: str) -> str:
         """
         Purpose:
-            Parse the Pycodestyle output to get standarized results for reporting
+            Get the Pycodestyle command for specific files/directories
         Args:
-            raw_pycodestyle_stdout: raw output from the pycodestyle command
+            lint_targets: shell words naming the files/directories to check
         Returns:
+            command: pycodestyle command
+        Raises:
+            N/A
+        """
+
+        parsed_args = " ".join([f"{arg}={value}" for (arg, value) in self.args])
+        parsed_flags = " ".join(self.flags)
+
+        return f"python3 -m pycodestyle {parsed_flags} {parsed_args} {lint_targets}"
+
+    def _new_parsed_output(self) -> Dict[str, Any]:
+        """
+        Purpose:
+            Get the empty Pycodestyle output that results are accumulated into
+        Args:
             N/A
+        Returns:
+            parsed_output: parsed output with every metric at zero
         Raises:
             N/A
         """
 
-        # Set up return objects
-        parsed_output = {
+        return {
             "metrics": {"errors": 0, "warnings": 0},
             "errors": [],
             "warnings": [],
             "summary": [],
         }
 
-        # Set up Regex for parsing
-        error_regex = r"^.*\.py\:\d+\:\d+\: E"
-        warning_regex = r"^.*\.py\:\d+\:\d+\: W"
-        summary_regex = r"^[0-9]"
-
-        for output_line in raw_pycodestyle_stdout:
-
-            # Getting the Message Type
-            message_type = None
-            if re.match(error_regex, output_line):
-                message_type = "errors"
-            elif re.match(warning_regex, output_line):
-                message_type = "warnings"
-            elif re.match(summary_regex, output_line):
-                message_type = "summary"
-
-            # Updating Report
-            if not message_type:
-                # non-matching line
-                continue
-            elif message_type in ("errors", "warnings"):
-                # If error detail, append to data
-                parsed_output["metrics"][message_type] += 1
-            else:
-                # non-matching line
-                continue
+    def _parse_line(self, parsed_output: Dict[str, Any], output_line: str) -> None:
+        """
+        Purpose:
+            Parse a line of Pycodestyle output to get standarized results
+        Args:
+            parsed_output: parsed output being accumulated
+            output_line: raw line of output from the pycodestyle command
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        # Getting the Message Type
+        (message_type, _) = self.line_classifier.classify(output_line)
+
+        # Updating Report
+        if not message_type:
+            # non-matching line
+            return
+        elif message_type in ("errors", "warnings"):
+            # If error detail, append to data
+            parsed_output["metrics"][message_type] += 1
+        else:
+            # non-matching line
+            return
+
+        parsed_output[message_type].append(output_line)
 
-            parsed_output[message_type].append(output_line)
+    def _finalize_output(self, parsed_output: Dict[str, Any]) -> None:
+        """
+        Purpose:
+            Compute Pycodestyle totals and report strings once every line is parsed
+        Args:
+            parsed_output: parsed output being accumulated
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
 
         # Set Total for Reporting
         parsed_output["metrics"]["total"] = sum(parsed_output["metrics"].values())
@@ -182,5 +436,3 @@ class Pycodestyle(Tool):
             )
             if not parsed_output[f"{message_type}_str"]:
                 parsed_output[f"{message_type}_str"] = "N/A"
-
-        return parsed_output
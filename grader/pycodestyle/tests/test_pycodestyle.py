@@ -8,6 +8,7 @@ Purpose:
 # N/A
 
 # Local Python Library Imports
+from grader.flake8.flake8 import Flake8
 from grader.pycodestyle.pycodestyle import Pycodestyle
 
 
@@ -16,7 +17,26 @@ from grader.pycodestyle.pycodestyle import Pycodestyle
 ###########
 
 
-# N/A
+FLAKE8_OUTPUT = [
+    "example/b.py:2:1: E302 expected 2 blank lines, found 0",
+    "example/b.py:1:1: F401 'os' imported but unused",
+    "example/b.py:1:10: E401 multiple imports on one line",
+    "example/b.py:1:10: E231 missing whitespace after ','",
+    "example/a.py:3:5: W291 trailing whitespace",
+    "example/tests/test_a.py:1:1: E265 block comment should start with '# '",
+    "1     E231 missing whitespace after ','",
+]
+
+
+def write_example_package(source_code) -> None:
+    """
+    Purpose:
+        Write the package FLAKE8_OUTPUT was reported for
+    """
+
+    (source_code / "example" / "tests").mkdir(parents=True)
+    for example_file in ("a.py", "b.py", "tests/test_a.py"):
+        (source_code / "example" / example_file).write_text("import os,sys\n")
 
 
 ###########
@@ -54,6 +74,7 @@ def test_Pycodestyle___init___base() -> int:
         ("--exclude", "'.eggs tests .venv'"),
     ]
     assert test_pycodestyle.flags == ["--statistics"]
+    assert test_pycodestyle.timeout == 60
 
 
 def test_Pycodestyle___init___override() -> int:
@@ -86,3 +107,95 @@ def test_Pycodestyle___init___override() -> int:
     assert test_pycodestyle.code_dir == f"{test_source_code}/{test_python_package}"
     assert test_pycodestyle.args == test_args
     assert test_pycodestyle.flags == test_flags
+
+
+###
+# derive_from_flake8()
+###
+
+
+def test_Pycodestyle_derive_from_flake8(tmp_path) -> int:
+    """
+    Purpose:
+        Test pycodestyle results are derived from flake8's E/W findings, limited
+        to pycodestyle's files and in pycodestyle's order
+    Args:
+        N/A
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    # Example Data
+    write_example_package(tmp_path)
+    test_flake8 = Flake8(str(tmp_path), python_package="example")
+    test_flake8_output = test_flake8._parse_output(FLAKE8_OUTPUT)
+    test_pycodestyle = Pycodestyle(
+        str(tmp_path),
+        python_package="example",
+        args=[("--max-line-length", 88), ("--exclude", "tests")],
+        from_flake8=True,
+    )
+
+    # Derive Output
+    test_parsed_output = test_pycodestyle.derive_from_flake8(
+        test_flake8, test_flake8_output
+    )
+    assert test_parsed_output == {
+        **test_pycodestyle._parse_output(
+            [FLAKE8_OUTPUT[4], FLAKE8_OUTPUT[3], FLAKE8_OUTPUT[2], FLAKE8_OUTPUT[0]]
+        ),
+        "timed_out": False,
+    }
+    assert test_parsed_output["metrics"] == {"errors": 3, "warnings": 1, "total": 4}
+
+
+def test_Pycodestyle_derive_from_flake8_fallback(tmp_path) -> int:
+    """
+    Purpose:
+        Test pycodestyle results are not derived when flake8 might disagree
+    Args:
+        N/A
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    # Example Data
+    write_example_package(tmp_path)
+    test_flake8 = Flake8(str(tmp_path), python_package="example")
+    test_flake8_output = test_flake8._parse_output(FLAKE8_OUTPUT)
+    test_pycodestyle = Pycodestyle(str(tmp_path), python_package="example")
+    assert test_pycodestyle.derive_from_flake8(test_flake8, test_flake8_output)
+
+    # Different line length
+    test_long_pycodestyle = Pycodestyle(
+        str(tmp_path), python_package="example", args=[("--max-line-length", 99)]
+    )
+    assert not test_long_pycodestyle.derive_from_flake8(test_flake8, test_flake8_output)
+
+    # Timed out or crashed
+    assert not test_pycodestyle.derive_from_flake8(
+        test_flake8, {**test_flake8_output, "timed_out": True}
+    )
+    test_flake8.failed = True
+    assert not test_pycodestyle.derive_from_flake8(test_flake8, test_flake8_output)
+    test_flake8.failed = False
+
+    # Syntax errors
+    assert not test_pycodestyle.derive_from_flake8(
+        test_flake8,
+        test_flake8._parse_output(["example/a.py:1:2: E999 SyntaxError: invalid"]),
+    )
+
+    # Style config
+    (tmp_path / "setup.cfg").write_text("[flake8]\nignore = E231\n")
+    assert not test_pycodestyle.derive_from_flake8(test_flake8, test_flake8_output)
+    (tmp_path / "setup.cfg").write_text("[metadata]\nname = example\n")
+    assert test_pycodestyle.derive_from_flake8(test_flake8, test_flake8_output)
+
+    # noqa comments
+    (tmp_path / "example" / "a.py").write_text("import os  # NOQA\n")
+    assert not test_pycodestyle.derive_from_flake8(test_flake8, test_flake8_output)
@@ -6,13 +6,23 @@ Purpose:
 """
 
 # Python Library Imports
+import json
 import os
 import re
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Optional
 
 # Local Python Library Imports
-import grader.subprocess.subprocess as subprocess
+from grader.pylint.pylint_shards import (
+    CROSS_MODULE_SHARD,
+    SHARD_ARG,
+    evaluate_score,
+    get_score_stats,
+)
+from grader.tool.line_classifier import LineClassifier
 from grader.tool.tool import Tool
+from grader.trace.trace import PhaseTimer
 
 
 ###
@@ -26,12 +36,39 @@ class Pylint(Tool):
         Responsible for interacting with Pylint
     """
 
+    name = "pylint"
     default_args = [
         ("--output-format", "parseable"),
         ("--ignore", "'./docs .eggs/ .git/ ./venv ./tests'"),
     ]
     default_flags = []
 
+    # Message category (first letter of the message id) to message type
+    message_categories = {
+        "E": "errors",
+        "W": "warnings",
+        "I": "ignored",
+        "C": "style_issues",
+        "R": "design_issues",
+    }
+
+    # How --output-format=parseable renders a message, rebuilt from JSON records
+    parseable_format = "{path}:{line}: [{message_id}({symbol}), {obj}] {message}"
+
+    # Message types in the order they are checked
+    line_classifier = LineClassifier(
+        (
+            ("errors", r"^.*\.py\:\d+\: \[E"),
+            ("warnings", r"^.*\.py\:\d+\: \[W"),
+            ("ignored", r"^.*\.py\:\d+\: \[I"),
+            ("style_issues", r"^.*\.py\:\d+\: \[C"),
+            ("design_issues", r"^.*\.py\:\d+\: \[R"),
+            ("summary", r"^Your code has been rated at"),
+        ),
+        finding_prefix=r"(?P<path>.*\.py):(?P<line>\d+): \[(?=(?P<code>[^(,\]]*))",
+        finding_types=message_categories,
+    )
+
     ###
     # Reserved Methods
     ###
@@ -42,15 +79,23 @@ class Pylint(Tool):
         python_package: str = None,
         args: Optional[Dict[str, str]] = None,
         flags: Optional[List[str]] = None,
+        timeout: Optional[int] = None,
+        structured: bool = False,
+        jobs: int = 1,
     ) -> None:
         """
         Purpose:
-            Constructor for a Mypy
+            Constructor for a Pylint
         Args:
-            source_code: code to run mypy on
+            source_code: code to run pylint on
             python_package: python_package to assess
-            args: argument overrides for mypy
-            flags: flag overrides for mypy
+            args: argument overrides for pylint
+            flags: flag overrides for pylint
+            timeout: seconds before pylint is killed, defaults to 60. 0 waits forever
+            structured: run pylint with a JSON reporter (grader.pylint.pylint_json)
+                and build the results from its records instead of parsing text
+            jobs: number of shards the files are split across, each checked by its
+                own pylint process at the same time. 0 uses one per core
         Returns:
             N/A
         Raises:
@@ -58,9 +103,16 @@ class Pylint(Tool):
         """
 
         super().__init__(
-            source_code, python_package=python_package, args=args, flags=flags
+            source_code,
+            python_package=python_package,
+            args=args,
+            flags=flags,
+            timeout=timeout,
         )
 
+        self.structured = structured
+        self.jobs = jobs or os.cpu_count() or 1
+
     def __repr__(self) -> str:
         """
         Purpose:
@@ -92,10 +144,106 @@ class Pylint(Tool):
             N/A
         """
 
-        parsed_args = " ".join([f"{arg}={value}" for (arg, value) in self.args])
+        pylint_module = "pylint"
+        pylint_args = self.args
+        if self.reads_records:
+            # The JSON reporter replaces whatever output format was asked for
+            pylint_module = "grader.pylint.pylint_json"
+            pylint_args = [
+                (arg, value) for (arg, value) in self.args if arg != "--output-format"
+            ]
+
+        parsed_args = " ".join([f"{arg}={value}" for (arg, value) in pylint_args])
         parsed_flags = " ".join(self.flags)
 
-        return f"python3 -m pylint {parsed_flags} {parsed_args} {self.python_package}"
+        return (
+            f"python3 -m {pylint_module} {parsed_flags} {parsed_args} "
+            f"{self.python_package}"
+        )
+
+    @property
+    def command_env(self) -> Dict[str, str]:
+        """
+        Purpose:
+            Get the Pylint command environment, with the code importable
+        Args:
+            N/A
+        Returns:
+            command_env: environment for the pylint shell
+        Raises:
+            N/A
+        """
+
+        return {"PYTHONPATH": self.source_code}
+
+    @property
+    def reads_records(self) -> bool:
+        """
+        Purpose:
+            Whether results are built from grader.pylint.pylint_json records.
+            Shards are always merged from records
+        Args:
+            N/A
+        Returns:
+            reads_records: True in structured or parallel mode
+        Raises:
+            N/A
+        """
+
+        return self.structured or self.jobs > 1
+
+    @property
+    def mode(self) -> str:
+        """
+        Purpose:
+            Get how pylint is run, for the report
+        Args:
+            N/A
+        Returns:
+            mode: "single process" or "parallel ({jobs} shards)"
+        Raises:
+            N/A
+        """
+
+        if self.jobs > 1:
+            return f"parallel ({self.jobs} shards)"
+
+        return "single process"
+
+    def get_shard_command(self, shard: str) -> str:
+        """
+        Purpose:
+            Get the command checking one shard of the files. Each shard is a single
+            process, whatever jobs the configuration asks for
+        Args:
+            shard: INDEX/COUNT or CROSS_MODULE_SHARD
+        Returns:
+            command: command to run
+        Raises:
+            N/A
+        """
+
+        return f"{self.command} --jobs=1 {SHARD_ARG}={shard}"
+
+    @property
+    def cache_config(self) -> Dict[str, Any]:
+        """
+        Purpose:
+            Get the Pylint cache configuration, keyed on the output mode and jobs
+            as well
+        Args:
+            N/A
+        Returns:
+            cache_config: JSON serializable tool configuration
+        Raises:
+            N/A
+        """
+
+        return {
+            **super().cache_config,
+            "structured": self.structured,
+            "jobs": self.jobs,
+        }
 
     ###
     # Pylint Operations
@@ -113,29 +261,162 @@ class Pylint(Tool):
             N/A
         """
 
-        # Run Pylint command with pexpect and capture output
-        (raw_pylint_stdout, _) = subprocess.run_subprocess_call(
-            command=self.command,
-            env={"PYTHONPATH": self.source_code},
-            cwd=self.source_code,
-            timeout=60,
+        if self.jobs > 1:
+            return self._run_shards()
+
+        # Run Pylint command, parsing output as it is produced
+        return self._run_command()
+
+    def _run_shards(self) -> Dict[str, Any]:
+        """
+        Purpose:
+            Check every shard at the same time, plus the cross-module shard, and
+            merge their records into the output of a single run: the same messages
+            and metrics, and the score rated from the merged counts
+        Args:
+            N/A
+        Returns:
+            parsed_output: parsed output from every shard
+        Raises:
+            N/A
+        """
+
+        shards = [f"{shard_index}/{self.jobs}" for shard_index in range(self.jobs)]
+        shards.append(CROSS_MODULE_SHARD)
+        with ThreadPoolExecutor(max_workers=len(shards)) as shard_executor:
+            shard_outputs = list(shard_executor.map(self._run_shard, shards))
+
+        merge_timer = PhaseTimer()
+        with merge_timer:
+            parsed_output = self._merge_shard_outputs(shard_outputs)
+
+        if self.tracer:
+            for shard_output in shard_outputs:
+                for (phase, phase_timer) in shard_output["timers"].items():
+                    self.tracer.add_timer(phase, self.name, phase_timer)
+            self.tracer.add_timer("parse", self.name, merge_timer)
+
+        # Output is partial if any shard was killed at its deadline
+        parsed_output["timed_out"] = any(
+            shard_output["timed_out"] for shard_output in shard_outputs
         )
+        self.failed = any(shard_output["failed"] for shard_output in shard_outputs)
 
-        return self._parse_output(raw_pylint_stdout)
+        return parsed_output
 
-    def _parse_output(self, raw_pylint_stdout: bytes) -> Dict[str, Any]:
+    def _run_shard(self, shard: str) -> Dict[str, Any]:
         """
         Purpose:
-            Parse the Pylint output to get standarized results for reporting
+            Check a shard, collecting its records
         Args:
-            raw_pylint_stdout: raw output from the pylint command
+            shard: INDEX/COUNT or CROSS_MODULE_SHARD
         Returns:
-            parsed_output: parsed output from pylint
+            shard_output: message records, the stats record (None if the shard
+                did not finish), timers and whether it timed out or failed
+        Raises:
+            N/A
+        """
+
+        output_stream = self.stream_command(self.get_shard_command(shard))
+
+        parse_timer = PhaseTimer()
+        shard_output = {"records": [], "stats": None}
+        for output_line in output_stream:
+            if not output_line.startswith("{"):
+                continue
+            with parse_timer:
+                output_record = json.loads(output_line)
+            if "stats" in output_record:
+                shard_output["stats"] = output_record["stats"]
+            else:
+                shard_output["records"].append(output_record)
+
+        shard_output["timers"] = {
+            "spawn": output_stream.spawn_timer,
+            "decode": output_stream.decode_timer,
+            "parse": parse_timer,
+        }
+        shard_output["timed_out"] = output_stream.timed_out
+        shard_output["failed"] = any(output_stream.stderr_lines)
+
+        return shard_output
+
+    def _merge_shard_outputs(
+        self, shard_outputs: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Purpose:
+            Merge the shards' records. Messages are ordered like a single run's:
+            each file's in the order the shards list the files (messages of args
+            that could not be expanded first), followed by the cross-module
+            messages, which a single run reports once every file is checked.
+            Shards without a file order keep the order they were emitted in
+        Args:
+            shard_outputs: output of every shard, the cross-module shard last
+        Returns:
+            parsed_output: merged parsed output
+        Raises:
+            N/A
+        """
+
+        parsed_output = self._new_parsed_output()
+
+        file_records = [
+            output_record
+            for shard_output in shard_outputs[:-1]
+            for output_record in shard_output["records"]
+        ]
+        file_order = next(
+            (
+                shard_output["stats"]["files"]
+                for shard_output in shard_outputs[:-1]
+                if shard_output["stats"] and shard_output["stats"].get("files")
+            ),
+            None,
+        )
+        if file_order:
+            file_indexes = {
+                file_path: file_index
+                for (file_index, file_path) in enumerate(file_order)
+            }
+            file_records.sort(
+                key=lambda output_record: file_indexes.get(output_record["path"], -1)
+            )
+
+        message_categories = Counter()
+        for output_record in file_records + shard_outputs[-1]["records"]:
+            self._add_message_record(parsed_output, output_record)
+            message_categories[output_record["category"]] += 1
+
+        # Rate the code from the merged counts, if every shard finished
+        shard_stats = [shard_output["stats"] for shard_output in shard_outputs]
+        if all(shard_stats):
+            # The cross-module shard checked every statement again
+            statement = sum(stats["statement"] for stats in shard_stats[:-1])
+            self._add_score(
+                parsed_output,
+                evaluate_score(
+                    shard_stats[0]["evaluation"],
+                    get_score_stats(message_categories, statement),
+                ),
+            )
+
+        self._finalize_output(parsed_output)
+
+        return parsed_output
+
+    def _new_parsed_output(self) -> Dict[str, Any]:
+        """
+        Purpose:
+            Get the empty Pylint output that results are accumulated into
+        Args:
+            N/A
+        Returns:
+            parsed_output: parsed output with every metric at zero
         Raises:
             N/A
         """
 
-        # Set up return objects
         parsed_output = {
             "score": 0,
             "metrics": {
@@ -151,56 +432,134 @@ class Pylint(Tool):
             "style_issues": [],
             "design_issues": [],
             "summary": "",
+            "mode": self.mode,
         }
+        if self.structured:
+            parsed_output["messages"] = []
 
-        # Set up Regex for parsing
-        error_regex = r"^.*\.py\:\d+\: \[E"
-        warning_regex = r"^.*\.py\:\d+\: \[W"
-        ignored_regex = r"^.*\.py\:\d+\: \[I"
-        style_regex = r"^.*\.py\:\d+\: \[C"
-        design_regex = r"^.*\.py\:\d+\: \[R"
-        summary_regex = r"^Your code has been rated at"
-
-        for output_line in raw_pylint_stdout:
-
-            # Getting the Message Type
-            message_type = None
-            if re.match(error_regex, output_line):
-                message_type = "errors"
-            elif re.match(warning_regex, output_line):
-                message_type = "warnings"
-            elif re.match(ignored_regex, output_line):
-                message_type = "ignored"
-            elif re.match(style_regex, output_line):
-                message_type = "style_issues"
-            elif re.match(design_regex, output_line):
-                message_type = "design_issues"
-            elif re.match(summary_regex, output_line):
-                message_type = "summary"
-
-            # Updating Report
-            if not message_type:
-                # non-matching line
-                continue
-            elif message_type in (
-                "errors",
-                "warnings",
-                "ignored",
-                "style_issues",
-                "design_issues",
-            ):
-                # If error detail, append to data
-                parsed_output["metrics"][message_type] += 1
-                parsed_output[message_type].append(output_line)
-            elif message_type == "summary":
-                # Else, update summary data
-                parsed_output["summary"] = output_line
-                parsed_output["score"] = re.findall(
-                    r"-{0,1}\d\.\d{2}\/10", parsed_output["summary"]
-                )[0].split("/")[0]
-            else:
-                # non-matching line
-                continue
+        return parsed_output
+
+    def _parse_line(self, parsed_output: Dict[str, Any], output_line: str) -> None:
+        """
+        Purpose:
+            Parse a line of Pylint output to get standarized results for reporting
+        Args:
+            parsed_output: parsed output being accumulated
+            output_line: raw line of output from the pylint command
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        if self.reads_records:
+            self._parse_record(parsed_output, output_line)
+            return
+
+        # Getting the Message Type
+        (message_type, _) = self.line_classifier.classify(output_line)
+
+        # Updating Report
+        if not message_type:
+            # non-matching line
+            return
+        elif message_type in (
+            "errors",
+            "warnings",
+            "ignored",
+            "style_issues",
+            "design_issues",
+        ):
+            # If error detail, append to data
+            parsed_output["metrics"][message_type] += 1
+            parsed_output[message_type].append(output_line)
+        elif message_type == "summary":
+            # Else, update summary data
+            parsed_output["summary"] = output_line
+            parsed_output["score"] = re.findall(
+                r"-{0,1}\d\.\d{2}\/10", parsed_output["summary"]
+            )[0].split("/")[0]
+
+    def _parse_record(self, parsed_output: Dict[str, Any], output_line: str) -> None:
+        """
+        Purpose:
+            Parse a JSON record from grader.pylint.pylint_json, updating the same
+            metrics, lists and score as the equivalent parseable text would
+        Args:
+            parsed_output: parsed output being accumulated
+            output_line: raw line of output from the pylint_json command
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        if not output_line.startswith("{"):
+            # Blank line or anything pylint printed besides records
+            return
+        output_record = json.loads(output_line)
+
+        if "stats" in output_record:
+            self._add_score(parsed_output, output_record["stats"]["global_note"])
+        else:
+            self._add_message_record(parsed_output, output_record)
+
+    def _add_message_record(
+        self, parsed_output: Dict[str, Any], output_record: Dict[str, Any]
+    ) -> None:
+        """
+        Purpose:
+            Add a message record to the metrics and lists, as its parseable text
+        Args:
+            parsed_output: parsed output being accumulated
+            output_record: message record from grader.pylint.pylint_json
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        if "messages" in parsed_output:
+            parsed_output["messages"].append(output_record)
+
+        message_type = self.message_categories.get(output_record["category"])
+        if message_type:
+            parsed_output["metrics"][message_type] += 1
+            parsed_output[message_type].append(
+                self.parseable_format.format(**output_record)
+            )
+
+    @staticmethod
+    def _add_score(parsed_output: Dict[str, Any], global_note: Optional[float]) -> None:
+        """
+        Purpose:
+            Set the score and summary like pylint's evaluation renders them
+        Args:
+            parsed_output: parsed output being accumulated
+            global_note: the run's score, None if pylint did not rate the code
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        if global_note is not None:
+            parsed_output["score"] = f"{global_note:.2f}"
+            parsed_output[
+                "summary"
+            ] = f"Your code has been rated at {parsed_output['score']}/10"
+
+    def _finalize_output(self, parsed_output: Dict[str, Any]) -> None:
+        """
+        Purpose:
+            Compute Pylint totals and report strings once every line is parsed
+        Args:
+            parsed_output: parsed output being accumulated
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
 
         # Set Total for Reporting
         parsed_output["metrics"]["total"] = sum(parsed_output["metrics"].values())
@@ -218,5 +577,3 @@ class Pylint(Tool):
             )
             if not parsed_output[f"{message_type}_str"]:
                 parsed_output[f"{message_type}_str"] = "N/A"
-
-        return parsed_output
@@ -0,0 +1,374 @@
+"""
+Purpose:
+    Pylint JSON Lines Driver
+
+    Run pylint with a reporter that writes one JSON record per message, followed
+    by a record with the run's score, instead of rendering parseable text. Run
+    as python3 -m grader.pylint.pylint_json with the same args as pylint
+
+    With --shard=INDEX/COUNT only that share of the files pylint finds is checked,
+    without the checks that need every module. --shard=cross-module runs just
+    those checks over every file. The records of all shards add up to those of a
+    single run, and each shard's stats record lists every file in the order a
+    single run checks them, to merge the messages in that order
+
+    Sharding hooks into pylint's private file iteration. On a pylint without those
+    hooks the first shard runs a single run and the others check nothing
+"""
+
+# Python Library Imports
+import json
+import os
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+from pylint.lint import PyLinter, Run
+from pylint.reporters import BaseReporter
+
+# Local Python Library Imports
+from grader.pylint.pylint_shards import (
+    CROSS_MODULE_MESSAGES,
+    CROSS_MODULE_SHARD,
+    SHARD_ARG,
+    get_shard_files,
+)
+
+
+###
+# Functions
+###
+
+
+def get_message_record(message: Any) -> Dict[str, Any]:
+    """
+    Purpose:
+        Get the JSON record for a pylint message
+    Args:
+        message: pylint Message
+    Returns:
+        message_record: path, module, obj, line, column, message_id, symbol,
+            category (the message_id's first letter) and message
+    Raises:
+        N/A
+    """
+
+    return {
+        "path": message.path,
+        "module": message.module,
+        "obj": message.obj,
+        "line": message.line,
+        "column": message.column,
+        "message_id": message.msg_id,
+        "symbol": message.symbol,
+        "category": message.C,
+        "message": message.msg,
+    }
+
+
+def get_stats_record(
+    linter_stats: Any,
+    evaluation: str = None,
+    checked_files: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Purpose:
+        Get the JSON record for a finished pylint run's stats
+    Args:
+        linter_stats: the linter's stats, a dict (pylint < 2.12) or LinterStats
+        evaluation: the linter's score expression, to rate merged shards with
+        checked_files: paths of every file a single run checks, in its order, as
+            messages report them. None if the run was not sharded
+    Returns:
+        stats_record: {"stats": {"statement", "global_note", "evaluation",
+            "files"}}. global_note is None if pylint did not rate the code (no
+            statements)
+    Raises:
+        N/A
+    """
+
+    if isinstance(linter_stats, dict):
+        statement = linter_stats.get("statement", 0)
+        global_note = linter_stats.get("global_note")
+    else:
+        statement = getattr(linter_stats, "statement", 0)
+        global_note = getattr(linter_stats, "global_note", None)
+
+    if not statement:
+        global_note = None
+
+    return {
+        "stats": {
+            "statement": statement,
+            "global_note": global_note,
+            "evaluation": evaluation,
+            "files": checked_files,
+        }
+    }
+
+
+def has_shard_hooks() -> bool:
+    """
+    Purpose:
+        Whether this pylint has the private hooks ShardLinter overrides
+    Args:
+        N/A
+    Returns:
+        has_shard_hooks: True if files can be sharded
+    Raises:
+        N/A
+    """
+
+    return (
+        hasattr(PyLinter, "_iterate_file_descrs")
+        and hasattr(PyLinter, "_expand_files")
+        and hasattr(Run, "LinterClass")
+    )
+
+
+def split_shard_arg(pylint_args: List[str]) -> Tuple[Optional[str], List[str]]:
+    """
+    Purpose:
+        Take the shard to check out of the args
+    Args:
+        pylint_args: args for this driver
+    Returns:
+        shard: INDEX/COUNT, CROSS_MODULE_SHARD or None to check everything
+        pylint_args: args for pylint
+    Raises:
+        N/A
+    """
+
+    shard = None
+    remaining_args = []
+    for pylint_arg in pylint_args:
+        if pylint_arg.startswith(f"{SHARD_ARG}="):
+            shard = pylint_arg.split("=", 1)[1]
+        else:
+            remaining_args.append(pylint_arg)
+
+    return (shard, remaining_args)
+
+
+def main(pylint_args: Optional[List[str]] = None) -> int:
+    """
+    Purpose:
+        Run pylint, writing JSON records to stdout
+    Args:
+        pylint_args: args for pylint, and optionally SHARD_ARG. Defaults to this
+            process's args
+    Returns:
+        exit_code: pylint's exit code
+    Raises:
+        N/A
+    """
+
+    if pylint_args is None:
+        pylint_args = sys.argv[1:]
+    (shard, pylint_args) = split_shard_arg(pylint_args)
+
+    if shard and not has_shard_hooks():
+        # Without the hooks the first shard checks everything like a single run
+        if not shard.startswith("0/"):
+            print(json.dumps(get_stats_record({})), flush=True)
+            return 0
+        shard = None
+
+    run_class = Run
+    if shard:
+        run_class = type("ShardRun", (Run,), {"LinterClass": ShardLinter})
+        ShardLinter.shard = shard
+
+    pylint_run = run_class(pylint_args, reporter=JsonLinesReporter(), exit=False)
+
+    stats_record = get_stats_record(
+        pylint_run.linter.stats,
+        evaluation=pylint_run.linter.config.evaluation,
+        checked_files=getattr(pylint_run.linter, "checked_files", None),
+    )
+    print(json.dumps(stats_record), flush=True)
+
+    return pylint_run.linter.msg_status
+
+
+###
+# Class Definition
+###
+
+
+class ShardLinter(PyLinter):
+    """
+    Purpose:
+        PyLinter checking one shard of the files a single run would check
+    """
+
+    # INDEX/COUNT or CROSS_MODULE_SHARD, set before the linter is created
+    shard = None
+
+    # Every file a single run checks, in its order, once they are found
+    checked_files = None
+
+    @property
+    def is_cross_module_shard(self) -> bool:
+        """
+        Purpose:
+            Whether this linter only runs the CROSS_MODULE_MESSAGES checks
+        Args:
+            N/A
+        Returns:
+            is_cross_module_shard: True for the cross-module shard
+        Raises:
+            N/A
+        """
+
+        return self.shard == CROSS_MODULE_SHARD
+
+    def check(self, files_or_modules: Any) -> None:
+        """
+        Purpose:
+            Restrict the enabled messages to this shard's, once the configuration
+            is loaded, then check. The cross-module shard keeps only the
+            CROSS_MODULE_MESSAGES the configuration enabled, every other shard
+            all the others
+        Args:
+            files_or_modules: files/modules pylint was asked to check
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        cross_module_messages = [
+            message
+            for message in CROSS_MODULE_MESSAGES
+            if self.is_message_enabled(message)
+        ]
+        if self.is_cross_module_shard:
+            if not cross_module_messages:
+                return
+            self.disable("all")
+            for message in cross_module_messages:
+                self.enable(message)
+        else:
+            for message in cross_module_messages:
+                self.disable(message)
+
+        super().check(files_or_modules)
+
+    def _iterate_file_descrs(self, files_or_modules: Any, **kwargs: Any) -> Any:
+        """
+        Purpose:
+            Yield only the files of this shard, recording every file in the order
+            pylint checks them with the path its messages report
+        Args:
+            files_or_modules: files/modules pylint was asked to check
+            kwargs: any other arguments of this pylint version
+        Yields:
+            file_descr: pylint's description of a file to check, with the path
+                second
+        Raises:
+            N/A
+        """
+
+        file_descrs = list(super()._iterate_file_descrs(files_or_modules, **kwargs))
+        self.checked_files = [
+            os.path.abspath(file_descr[1]).replace(
+                self.reporter.path_strip_prefix, "", 1
+            )
+            for file_descr in file_descrs
+        ]
+        if self.is_cross_module_shard:
+            yield from file_descrs
+            return
+
+        (shard_index, shard_count) = [int(part) for part in self.shard.split("/")]
+        shard_files = set(
+            get_shard_files(
+                {
+                    file_descr[1]: os.path.getsize(file_descr[1])
+                    for file_descr in file_descrs
+                },
+                shard_count,
+            )[shard_index]
+        )
+        for file_descr in file_descrs:
+            if file_descr[1] in shard_files:
+                yield file_descr
+
+    def _expand_files(self, modules: Any, **kwargs: Any) -> Any:
+        """
+        Purpose:
+            Expand the args into the files to check. Args that cannot be expanded
+            are only reported by the first shard
+        Args:
+            modules: files/modules pylint was asked to check
+            kwargs: any other arguments of this pylint version
+        Returns:
+            expanded_files: pylint's expanded files
+        Raises:
+            N/A
+        """
+
+        if self.shard.startswith("0/"):
+            return super()._expand_files(modules, **kwargs)
+
+        self.add_message = lambda *args, **kwargs: None
+        try:
+            return super()._expand_files(modules, **kwargs)
+        finally:
+            del self.add_message
+
+
+class JsonLinesReporter(BaseReporter):
+    """
+    Purpose:
+        Pylint reporter writing each message as a JSON record as soon as it is
+        emitted. Reports and the evaluation are not rendered
+    """
+
+    name = "json-lines"
+    extension = "jsonl"
+
+    def handle_message(self, message: Any) -> None:
+        """
+        Purpose:
+            Write a message's JSON record
+        Args:
+            message: pylint Message
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        self.writeln(json.dumps(get_message_record(message)))
+
+    def display_messages(self, layout: Any) -> None:
+        """
+        Purpose:
+            Messages are written as they are handled, nothing is left to display
+        Args:
+            layout: pylint report layout
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        pass
+
+    def _display(self, layout: Any) -> None:
+        """
+        Purpose:
+            Skip rendering reports and the evaluation
+        Args:
+            layout: pylint report layout
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        pass
+
+
+if __name__ == "__main__":
+    sys.exit(main())
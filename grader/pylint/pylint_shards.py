@@ -0,0 +1,243 @@
+"""
+Purpose:
+    Pylint Shards
+
+    Split the files of a pylint run into shards, and rate the merged results with
+    pylint's evaluation expression like pylint does at the end of a run. The
+    expression comes from the checked code's configuration, so it is evaluated as
+    arithmetic over the stats only, never with eval()
+
+    Kept free of pylint imports, the grader uses it without pylint installed
+"""
+
+# Python Library Imports
+import ast
+import operator
+from typing import Any, Callable, Dict, List, Optional
+
+# Local Python Library Imports
+# N/A
+
+
+###
+# Constants
+###
+
+
+# Arg selecting the shard to check, removed before pylint sees the args
+SHARD_ARG = "--shard"
+
+# Shard running only the CROSS_MODULE_MESSAGES checks
+CROSS_MODULE_SHARD = "cross-module"
+
+# Messages found by comparing modules with each other, when checking finishes
+CROSS_MODULE_MESSAGES = ("cyclic-import", "duplicate-code")
+
+# Message category (first letter of the message id) to pylint's stats key
+PYLINT_STATS_KEYS = {
+    "F": "fatal",
+    "E": "error",
+    "W": "warning",
+    "R": "refactor",
+    "C": "convention",
+    "I": "info",
+}
+
+# Functions and operators an evaluation expression can use
+EVALUATION_FUNCTIONS: Dict[str, Callable[..., Any]] = {
+    "abs": abs,
+    "float": float,
+    "int": int,
+    "max": max,
+    "min": min,
+    "round": round,
+}
+EVALUATION_OPERATORS: Dict[type, Callable[..., Any]] = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+    ast.Not: operator.not_,
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+}
+
+
+###
+# Functions
+###
+
+
+def get_shard_files(file_sizes: Dict[str, int], shard_count: int) -> List[List[str]]:
+    """
+    Purpose:
+        Split files into shards of about the same total size, largest files first.
+        Every shard process computes the same split from the same files
+    Args:
+        file_sizes: bytes in each file to check, by path
+        shard_count: number of shards
+    Returns:
+        shard_files: paths each shard checks
+    Raises:
+        N/A
+    """
+
+    shard_files = [[] for _ in range(shard_count)]
+    shard_sizes = [0] * shard_count
+    for (file_path, file_size) in sorted(
+        file_sizes.items(), key=lambda file_item: (-file_item[1], file_item[0])
+    ):
+        smallest_shard = shard_sizes.index(min(shard_sizes))
+        shard_files[smallest_shard].append(file_path)
+        shard_sizes[smallest_shard] += file_size
+
+    return shard_files
+
+
+def get_score_stats(
+    message_categories: Dict[str, int], statement: int
+) -> Dict[str, int]:
+    """
+    Purpose:
+        Get the stats an evaluation expression is evaluated against
+    Args:
+        message_categories: number of messages by category letter
+        statement: number of statements checked
+    Returns:
+        score_stats: fatal, error, warning, refactor, convention, info and
+            statement counts
+    Raises:
+        N/A
+    """
+
+    score_stats = {
+        stats_key: message_categories.get(category, 0)
+        for (category, stats_key) in PYLINT_STATS_KEYS.items()
+    }
+    score_stats["statement"] = statement
+
+    return score_stats
+
+
+def evaluate_score(evaluation: str, score_stats: Dict[str, int]) -> Optional[float]:
+    """
+    Purpose:
+        Rate code with pylint's evaluation expression
+    Args:
+        evaluation: pylint's evaluation option
+        score_stats: stats from get_score_stats
+    Returns:
+        global_note: the score, or None if pylint would not rate the code (no
+            statements, or the expression cannot be evaluated)
+    Raises:
+        N/A
+    """
+
+    if not score_stats.get("statement"):
+        return None
+
+    try:
+        return evaluate_node(ast.parse(evaluation, mode="eval").body, score_stats)
+    except (ArithmeticError, SyntaxError, TypeError, ValueError):
+        return None
+
+
+def evaluate_node(node: ast.AST, score_stats: Dict[str, int]) -> Any:
+    """
+    Purpose:
+        Evaluate a node of an evaluation expression
+    Args:
+        node: parsed node
+        score_stats: stats from get_score_stats, the only names available
+    Returns:
+        value: the node's value
+    Raises:
+        ValueError: if the node is not arithmetic over the stats
+    """
+
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+        return node.value
+    if isinstance(node, ast.Name) and node.id in score_stats:
+        return score_stats[node.id]
+    if isinstance(node, (ast.BinOp, ast.UnaryOp, ast.Compare)):
+        return evaluate_operator(node, score_stats)
+    if isinstance(node, ast.IfExp):
+        if evaluate_node(node.test, score_stats):
+            return evaluate_node(node.body, score_stats)
+        return evaluate_node(node.orelse, score_stats)
+    if isinstance(node, ast.BoolOp):
+        # Short-circuits and returns the deciding value, like and/or
+        for value_node in node.values:
+            value = evaluate_node(value_node, score_stats)
+            if bool(value) != isinstance(node.op, ast.And):
+                break
+        return value
+    if (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Name)
+        and node.func.id in EVALUATION_FUNCTIONS
+        and not node.keywords
+    ):
+        return EVALUATION_FUNCTIONS[node.func.id](
+            *[evaluate_node(arg, score_stats) for arg in node.args]
+        )
+
+    raise ValueError(f"Unsupported evaluation expression: {ast.dump(node)}")
+
+
+def evaluate_operator(node: ast.AST, score_stats: Dict[str, int]) -> Any:
+    """
+    Purpose:
+        Evaluate an arithmetic, unary or comparison node
+    Args:
+        node: parsed BinOp, UnaryOp or Compare node
+        score_stats: stats from get_score_stats, the only names available
+    Returns:
+        value: the node's value
+    Raises:
+        ValueError: if an operator is not in EVALUATION_OPERATORS
+    """
+
+    if isinstance(node, ast.BinOp):
+        return get_operator(node.op)(
+            evaluate_node(node.left, score_stats),
+            evaluate_node(node.right, score_stats),
+        )
+    if isinstance(node, ast.UnaryOp):
+        return get_operator(node.op)(evaluate_node(node.operand, score_stats))
+
+    # Comparisons chain, like a < b <= c
+    left_value = evaluate_node(node.left, score_stats)
+    for (node_operator, comparator) in zip(node.ops, node.comparators):
+        right_value = evaluate_node(comparator, score_stats)
+        if not get_operator(node_operator)(left_value, right_value):
+            return False
+        left_value = right_value
+
+    return True
+
+
+def get_operator(node_operator: ast.AST) -> Callable[..., Any]:
+    """
+    Purpose:
+        Get the function for an operator of an evaluation expression
+    Args:
+        node_operator: parsed operator
+    Returns:
+        operator_function: function applying the operator
+    Raises:
+        ValueError: if the operator is not in EVALUATION_OPERATORS
+    """
+
+    if type(node_operator) not in EVALUATION_OPERATORS:
+        raise ValueError(f"Unsupported operator: {type(node_operator).__name__}")
+
+    return EVALUATION_OPERATORS[type(node_operator)]
@@ -5,7 +5,11 @@ Purpose:
 """
 
 # Python Library Imports
-# N/A
+import json
+import os
+import shlex
+import sys
+import pytest
 
 # Local Python Library Imports
 from grader.pylint.pylint import Pylint
@@ -16,7 +20,162 @@ from grader.pylint.pylint import Pylint
 ###########
 
 
-# N/A
+PYLINT_OUTPUT = [
+    "************* Module example.module",
+    "example/module.py:1: [C0114(missing-module-docstring), ] Missing docstring",
+    "example/module.py:3: [E0602(undefined-variable), run] Undefined variable 'x'",
+    "example/module.py:4: [W0612(unused-variable), run] Unused variable 'y'",
+    "example/module.py:9: [R0903(too-few-public-methods), Job] Too few methods",
+    "",
+    "------------------------------------------------------------------",
+    "Your code has been rated at 2.50/10 (previous run: 2.50/10, +0.00)",
+    "",
+]
+
+PYLINT_JSON_RECORDS = [
+    {
+        "path": "example/module.py",
+        "module": "example.module",
+        "obj": "",
+        "line": 1,
+        "column": 0,
+        "message_id": "C0114",
+        "symbol": "missing-module-docstring",
+        "category": "C",
+        "message": "Missing docstring",
+    },
+    {
+        "path": "example/module.py",
+        "module": "example.module",
+        "obj": "run",
+        "line": 3,
+        "column": 4,
+        "message_id": "E0602",
+        "symbol": "undefined-variable",
+        "category": "E",
+        "message": "Undefined variable 'x'",
+    },
+    {
+        "path": "example/module.py",
+        "module": "example.module",
+        "obj": "run",
+        "line": 4,
+        "column": 4,
+        "message_id": "W0612",
+        "symbol": "unused-variable",
+        "category": "W",
+        "message": "Unused variable 'y'",
+    },
+    {
+        "path": "example/module.py",
+        "module": "example.module",
+        "obj": "Job",
+        "line": 9,
+        "column": 0,
+        "message_id": "R0903",
+        "symbol": "too-few-public-methods",
+        "category": "R",
+        "message": "Too few methods",
+    },
+    {"stats": {"statement": 8, "global_note": 2.5}},
+]
+
+PYLINT_EVALUATION = (
+    "10.0 - ((float(5 * error + warning + refactor + convention) / statement) * 10)"
+)
+
+
+def get_shard_outputs() -> list:
+    """
+    Purpose:
+        Get the outputs of two shards and the cross-module shard, together the
+        records of PYLINT_JSON_RECORDS plus one other file and a cyclic import.
+        The shard checking the other file finishes first
+    Args:
+        N/A
+    Return:
+        shard_outputs: output of every shard, the cross-module shard last
+    Raises:
+        N/A
+    """
+
+    test_other_record = dict(
+        PYLINT_JSON_RECORDS[0], path="example/other.py", module="example.other"
+    )
+    test_cyclic_record = dict(
+        PYLINT_JSON_RECORDS[3],
+        message_id="R0401",
+        symbol="cyclic-import",
+        message="Cyclic import (example.module -> example.other)",
+    )
+
+    return [
+        {
+            "records": test_records,
+            "stats": {
+                "statement": test_statement,
+                "global_note": None,
+                "evaluation": PYLINT_EVALUATION,
+                "files": ["example/module.py", "example/other.py"],
+            },
+        }
+        for (test_records, test_statement) in [
+            ([test_other_record], 6),
+            (PYLINT_JSON_RECORDS[:4], 10),
+            ([test_cyclic_record], 16),
+        ]
+    ]
+
+
+# Fixture package with per-file messages in every module, messages for an arg
+# pylint cannot expand, and cyclic imports and duplicate code across modules
+PYLINT_PACKAGE_FILES = {
+    "__init__.py": "",
+    "first.py": (
+        "import os\n"
+        "from example import second\n\n\n"
+        "def run(value):\n"
+        "    unused = value * 2\n"
+        "    total = 0\n"
+        "    for item in range(value):\n"
+        "        total += item * 3\n"
+        "        total -= item // 2\n"
+        "        total %= 1000\n"
+        "    return undefined_name + total\n"
+    ),
+    "second.py": (
+        "from example import first\n\n\n"
+        "def walk(value):\n"
+        "    total = 0\n"
+        "    for item in range(value):\n"
+        "        total += item * 3\n"
+        "        total -= item // 2\n"
+        "        total %= 1000\n"
+        "    return total\n"
+    ),
+    "third.py": "class Job:\n    x = 1\n",
+    "fourth.py": "def go(a, b):\n    return a\n",
+    "fifth.py": "import sys\nimport json\n",
+}
+
+
+class PylintFromSource(Pylint):
+    """
+    Purpose:
+        Pylint running grader.pylint.pylint_json with this test's interpreter and
+        the grader importable, as the grader's own environment would
+    """
+
+    # Directory grader is imported from
+    grader_path = os.path.abspath(f"{os.path.dirname(__file__)}/../../..")
+
+    @property
+    def command(self) -> str:
+        return super().command.replace("python3", shlex.quote(sys.executable), 1)
+
+    @property
+    def command_env(self) -> dict:
+        return {"PYTHONPATH": os.pathsep.join([self.source_code, self.grader_path])}
 
 
 ###########
@@ -54,6 +213,7 @@ def test_Pylint___init___base() -> int:
         ("--ignore", "'./docs .eggs/ .git/ ./venv ./tests'"),
     ]
     assert test_pylint.flags == []
+    assert test_pylint.timeout == 60
 
 
 def test_Pylint___init___override() -> int:
@@ -86,3 +246,260 @@ def test_Pylint___init___override() -> int:
     assert test_pylint.code_dir == f"{test_source_code}/{test_python_package}"
     assert test_pylint.args == test_args
     assert test_pylint.flags == test_flags
+
+
+###
+# command
+###
+
+
+def test_Pylint_command_structured() -> int:
+    """
+    Purpose:
+        Test structured Pylint runs the JSON driver without an output format
+    Args:
+        N/A
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    test_pylint = Pylint("./", python_package="example", structured=True)
+    assert test_pylint.command.startswith("python3 -m grader.pylint.pylint_json ")
+    assert "--output-format" not in test_pylint.command
+    assert test_pylint.command.endswith(" example")
+    assert test_pylint.cache_config["structured"] is True
+
+
+def test_Pylint_command_parallel() -> int:
+    """
+    Purpose:
+        Test parallel Pylint shards run the JSON driver one process each
+    Args:
+        N/A
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    test_pylint = Pylint("./", python_package="example")
+    assert test_pylint.jobs == 1
+    assert test_pylint.mode == "single process"
+    assert test_pylint.command.startswith("python3 -m pylint ")
+
+    test_pylint = Pylint("./", python_package="example", jobs=3)
+    assert test_pylint.mode == "parallel (3 shards)"
+    assert test_pylint.cache_config["jobs"] == 3
+    assert test_pylint.get_shard_command("1/3") == (
+        f"{test_pylint.command} --jobs=1 --shard=1/3"
+    )
+    assert test_pylint.command.startswith("python3 -m grader.pylint.pylint_json ")
+    assert "--output-format" not in test_pylint.command
+
+
+###
+# _parse_output()
+###
+
+
+def test_Pylint__parse_output() -> int:
+    """
+    Purpose:
+        Test Pylint output is parsed into categories, metrics and score
+    Args:
+        N/A
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    # Parse Output
+    test_parsed_output = Pylint("./")._parse_output(PYLINT_OUTPUT)
+    assert test_parsed_output["score"] == "2.50"
+    assert test_parsed_output["summary"] == PYLINT_OUTPUT[7]
+    assert test_parsed_output["metrics"] == {
+        "errors": 1,
+        "warnings": 1,
+        "ignored": 0,
+        "style_issues": 1,
+        "design_issues": 1,
+        "total": 4,
+    }
+    assert test_parsed_output["errors"] == [PYLINT_OUTPUT[2]]
+    assert test_parsed_output["style_issues_str"] == PYLINT_OUTPUT[1]
+    assert test_parsed_output["ignored_str"] == "N/A"
+
+
+def test_Pylint__parse_output_structured() -> int:
+    """
+    Purpose:
+        Test structured Pylint output gives the same results as the parseable text
+        it stands in for, plus every message's fields
+    Args:
+        N/A
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    # Parse Output
+    test_json_output = [
+        json.dumps(test_record) for test_record in PYLINT_JSON_RECORDS
+    ] + [""]
+    test_parsed_output = Pylint("./", structured=True)._parse_output(test_json_output)
+    test_text_output = Pylint("./")._parse_output(PYLINT_OUTPUT)
+
+    for test_key in ("score", "metrics", "errors", "style_issues_str", "ignored_str"):
+        assert test_parsed_output[test_key] == test_text_output[test_key]
+    assert test_parsed_output["summary"] == "Your code has been rated at 2.50/10"
+    assert test_parsed_output["messages"] == PYLINT_JSON_RECORDS[:4]
+    assert test_parsed_output["messages"][1]["symbol"] == "undefined-variable"
+    assert "messages" not in test_text_output
+
+
+###
+# run()
+###
+
+
+def test_Pylint_run_parallel(monkeypatch: object) -> int:
+    """
+    Purpose:
+        Test parallel Pylint checks every shard plus the cross-module shard, and
+        reports the merged output with its mode
+    Args:
+        monkeypatch: pytest monkeypatch fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    test_shard_outputs = dict(zip(["0/2", "1/2", "cross-module"], get_shard_outputs()))
+    for test_shard_output in test_shard_outputs.values():
+        test_shard_output.update({"timers": {}, "timed_out": False, "failed": False})
+    test_shard_outputs["1/2"]["timed_out"] = True
+
+    monkeypatch.setattr(
+        Pylint, "_run_shard", lambda tool, shard: test_shard_outputs[shard]
+    )
+
+    test_pylint = Pylint("./", jobs=2)
+    test_parsed_output = test_pylint.run()
+    assert test_parsed_output["mode"] == "parallel (2 shards)"
+    assert test_parsed_output["metrics"]["total"] == 6
+    assert test_parsed_output["timed_out"] is True
+    assert test_pylint.failed is False
+
+
+###
+# _merge_shard_outputs()
+###
+
+
+def test_Pylint__merge_shard_outputs() -> int:
+    """
+    Purpose:
+        Test shard records are merged in the order the shards list the files,
+        cross-module messages last, and the score is rated from the merged counts
+    Args:
+        N/A
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    test_shard_outputs = get_shard_outputs()
+    test_parsed_output = Pylint("./", structured=True, jobs=2)._merge_shard_outputs(
+        test_shard_outputs
+    )
+
+    assert test_parsed_output["messages"] == (
+        PYLINT_JSON_RECORDS[:4]
+        + test_shard_outputs[0]["records"]
+        + test_shard_outputs[2]["records"]
+    )
+    assert test_parsed_output["metrics"] == {
+        "errors": 1,
+        "warnings": 1,
+        "ignored": 0,
+        "style_issues": 2,
+        "design_issues": 2,
+        "total": 6,
+    }
+
+    # 10 - (5 * 1 + 1 + 2 + 2) / (6 + 10) * 10, the cross-module statements are
+    # not counted again
+    assert test_parsed_output["score"] == "3.75"
+    assert test_parsed_output["summary"] == "Your code has been rated at 3.75/10"
+    assert test_parsed_output["design_issues"][-1].startswith(
+        "example/module.py:9: [R0401(cyclic-import), Job] Cyclic import"
+    )
+
+    # Shards that do not list the files keep the order they were emitted in
+    for test_shard_output in test_shard_outputs:
+        test_shard_output["stats"]["files"] = None
+    test_parsed_output = Pylint("./", structured=True, jobs=2)._merge_shard_outputs(
+        test_shard_outputs
+    )
+    assert test_parsed_output["messages"] == (
+        test_shard_outputs[0]["records"]
+        + PYLINT_JSON_RECORDS[:4]
+        + test_shard_outputs[2]["records"]
+    )
+
+    # A shard that did not finish leaves the code unrated, like a killed run
+    test_shard_outputs[1]["stats"] = None
+    test_parsed_output = Pylint("./", jobs=2)._merge_shard_outputs(test_shard_outputs)
+    assert test_parsed_output["score"] == 0
+    assert test_parsed_output["summary"] == ""
+    assert test_parsed_output["metrics"]["total"] == 6
+    assert "messages" not in test_parsed_output
+
+
+def test_Pylint_run_parallel_matches_single(tmp_path: object) -> int:
+    """
+    Purpose:
+        Test sharded Pylint reports the same messages, in the same order, and
+        the same score as a single run of the same pylint on a package
+    Args:
+        tmp_path: pytest tmp_path fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    pytest.importorskip("pylint")
+
+    (tmp_path / "example").mkdir()
+    for (test_file_name, test_source) in PYLINT_PACKAGE_FILES.items():
+        (tmp_path / "example" / test_file_name).write_text(test_source)
+
+    test_outputs = [
+        PylintFromSource(
+            str(tmp_path),
+            python_package="example missing_module",
+            structured=True,
+            jobs=test_jobs,
+        ).run()
+        for test_jobs in (1, 3)
+    ]
+    (test_single_output, test_parallel_output) = test_outputs
+
+    test_symbols = [
+        test_message["symbol"] for test_message in test_single_output["messages"]
+    ]
+    assert test_symbols[0] == "fatal"
+    assert {"cyclic-import", "duplicate-code", "undefined-variable"} <= set(
+        test_symbols
+    )
+    assert test_parallel_output["mode"] == "parallel (3 shards)"
+    assert test_parallel_output["messages"] == test_single_output["messages"]
+    assert test_parallel_output["score"] == test_single_output["score"]
+    assert test_parallel_output["metrics"] == test_single_output["metrics"]
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Purpose:
+    Test File for pylint_json.py
+"""
+
+# Python Library Imports
+import json
+import pytest
+
+# Local Python Library Imports
+# N/A
+
+
+###########
+# Mocks/Fixtures
+###########
+
+
+# N/A
+
+
+###########
+# Tests: Pylint JSON Lines Driver
+###########
+
+
+###
+# main()
+###
+
+
+def test_main_without_shard_hooks(
+    tmp_path: object, monkeypatch: object, capsys: object
+) -> int:
+    """
+    Purpose:
+        Test a pylint without the private hooks sharding needs checks everything
+        in the first shard, like a single run, and nothing in the others
+    Args:
+        tmp_path: pytest tmp_path fixture
+        monkeypatch: pytest monkeypatch fixture
+        capsys: pytest capsys fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    pytest.importorskip("pylint")
+    from grader.pylint import pylint_json
+
+    (tmp_path / "example.py").write_text("import os\n")
+    monkeypatch.chdir(tmp_path)
+    assert pylint_json.has_shard_hooks()
+    monkeypatch.setattr(pylint_json, "has_shard_hooks", lambda: False)
+
+    pylint_json.main(["--shard=1/2", "example.py"])
+    test_records = [
+        json.loads(test_line) for test_line in capsys.readouterr().out.splitlines()
+    ]
+    assert test_records == [pylint_json.get_stats_record({})]
+
+    pylint_json.main(["--shard=0/2", "example.py"])
+    test_records = [
+        json.loads(test_line) for test_line in capsys.readouterr().out.splitlines()
+    ]
+    assert [test_record.get("symbol") for test_record in test_records] == [
+        "missing-module-docstring",
+        "unused-import",
+        None,
+    ]
+    assert test_records[-1]["stats"]["statement"] == 1
+    assert test_records[-1]["stats"]["files"] is None
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Purpose:
+    Test File for pylint_shards.py
+"""
+
+# Python Library Imports
+# N/A
+
+# Local Python Library Imports
+from grader.pylint.pylint_shards import (
+    evaluate_score,
+    get_score_stats,
+    get_shard_files,
+)
+
+
+###########
+# Mocks/Fixtures
+###########
+
+
+PYLINT_EVALUATIONS = [
+    # pylint < 2.14
+    "10.0 - ((float(5 * error + warning + refactor + convention) / statement) * 10)",
+    # pylint >= 2.14
+    "max(0, 0 if fatal else 10.0 - ((float(5 * error + warning + refactor + "
+    "convention) / statement) * 10))",
+    "fatal and 0 or round(10 - error / statement, 1)",
+    "-min(error, warning) % 3 if not info <= 1 != 2 else abs(refactor // 2)",
+]
+
+
+###########
+# Tests: Pylint Shards
+###########
+
+
+###
+# get_shard_files()
+###
+
+
+def test_get_shard_files() -> int:
+    """
+    Purpose:
+        Test files are split into shards of about the same size, the same way
+        every time
+    Args:
+        N/A
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    test_file_sizes = {"a.py": 10, "b.py": 70, "c.py": 40, "d.py": 40, "e.py": 30}
+
+    test_shard_files = get_shard_files(test_file_sizes, 2)
+    assert test_shard_files == [["b.py", "e.py"], ["c.py", "d.py", "a.py"]]
+    assert get_shard_files(dict(reversed(test_file_sizes.items())), 2) == (
+        test_shard_files
+    )
+
+    # More shards than files leaves shards empty
+    assert get_shard_files({"a.py": 1}, 3) == [["a.py"], [], []]
+
+
+###
+# evaluate_score()
+###
+
+
+def test_evaluate_score() -> int:
+    """
+    Purpose:
+        Test evaluation expressions are rated like pylint's eval() would
+    Args:
+        N/A
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    test_score_stats = get_score_stats({"E": 2, "W": 3, "C": 7, "R": 1}, 40)
+    assert test_score_stats == {
+        "fatal": 0,
+        "error": 2,
+        "warning": 3,
+        "refactor": 1,
+        "convention": 7,
+        "info": 0,
+        "statement": 40,
+    }
+
+    for test_evaluation in PYLINT_EVALUATIONS:
+        assert evaluate_score(test_evaluation, test_score_stats) == eval(
+            test_evaluation, {}, dict(test_score_stats)
+        )
+
+
+def test_evaluate_score_unrated() -> int:
+    """
+    Purpose:
+        Test code is left unrated without statements or with an expression that
+        is not arithmetic over the stats
+    Args:
+        N/A
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    test_score_stats = get_score_stats({"E": 1}, 10)
+
+    assert evaluate_score(PYLINT_EVALUATIONS[0], get_score_stats({}, 0)) is None
+    assert evaluate_score("error / fatal", test_score_stats) is None
+    assert evaluate_score("__import__('os').getcwd()", test_score_stats) is None
+    assert evaluate_score("error.__class__", test_score_stats) is None
+    assert evaluate_score("9 ** 9 ** 9", test_score_stats) is None
+    assert evaluate_score("statement +", test_score_stats) is None
@@ -6,12 +6,16 @@ Purpose:
 """
 
 # Python Library Imports
+import json
 import os
+import pathlib
 import re
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
+from xml.etree import ElementTree
 
 # Local Python Library Imports
-import grader.subprocess.subprocess as subprocess
+from grader.subprocess import subprocess
+from grader.tool.line_classifier import LineClassifier
 from grader.tool.tool import Tool
 
 
@@ -26,6 +30,7 @@ class Pytest(Tool):
         Responsible for interacting with Pytest
     """
 
+    name = "pytest"
     default_args = [
         ("--maxfail", 999),
         ("--color", "no"),
@@ -34,6 +39,50 @@ class Pytest(Tool):
     ]
     default_flags = ["--doctest-modules", "--self-contained-html", "--verbose"]
 
+    # Flags only needed to scrape results from text, dropped in structured mode
+    text_only_flags = ["--verbose", "-v"]
+
+    # JUnit XML child element to test outcome, the first present one wins
+    junit_outcomes = {
+        "error": "error_tests",
+        "failure": "failed_tests",
+        "skipped": "skipped_tests",
+    }
+
+    # Plugin limiting each test, and the testcase property it marks timeouts with
+    watchdog_plugin = "grader.pytest.pytest_watchdog"
+    junit_timeout_property = "watchdog_timeout"
+
+    # Directory grader is imported from, put on the path of runs loading the
+    # plugin as the candidate's interpreter may not have grader installed
+    grader_path = os.path.dirname(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    )
+
+    # Coverage engines (cores) that can be asked for, and the one coverage
+    # defaults to where sysmon is not used
+    coverage_cores = ("sysmon", "ctrace", "pytrace")
+    default_coverage_core = "ctrace"
+
+    # Python versions sys.monitoring measures lines, and branches, from
+    sysmon_python_version = (3, 12)
+    sysmon_branch_python_version = (3, 14)
+
+    # Coverage version COVERAGE_CORE is read from, older ones always use ctrace
+    coverage_core_version = (7, 4)
+
+    # Message types in the order they are checked
+    line_classifier = LineClassifier(
+        (
+            ("fatal", r".*ModuleNotFoundError"),
+            ("error_tests", r".*ERROR"),
+            ("passed_tests", r".*PASSED +\[[ 0-9]{3}\%\]"),
+            ("failed_tests", r".*FAILED +\[[ 0-9]{3}\%\]"),
+            ("coverage_details", r".*\.py.*\d{1,3}\%$"),
+            ("coverage_totals", r"TOTAL.*\d{1,3}\%$"),
+        )
+    )
+
     ###
     # Reserved Methods
     ###
@@ -45,33 +94,80 @@ class Pytest(Tool):
         python_package: str = None,
         args: Optional[Dict[str, str]] = None,
         flags: Optional[List[str]] = None,
+        timeout: Optional[int] = None,
+        structured: bool = False,
+        workers: int = 1,
+        test_timeout: Optional[float] = None,
+        coverage_core: str = "auto",
+        coverage_branch: bool = False,
     ) -> None:
         """
         Purpose:
-            Constructor for a Mypy
+            Constructor for a Pytest
         Args:
-            source_code: code to run mypy on
+            source_code: code to run pytest on
             python_package: python_package to assess
             base_report_path: path to store reports
-            args: argument overrides for mypy
-            flags: flag overrides for mypy
+            args: argument overrides for pytest
+            flags: flag overrides for pytest
+            timeout: seconds before pytest is killed, defaults to 60. 0 waits forever
+            structured: read results from JUnit XML and coverage JSON reports
+                instead of parsing --verbose and coverage table text
+            workers: number of pytest-xdist processes to distribute test modules
+                across, 0 for one per core. Runs serially without pytest-xdist
+            test_timeout: seconds each phase (setup, call, teardown) of a test may
+                run for before the test errors with a stack dump. None for no limit
+            coverage_core: coverage engine to measure with, one of coverage_cores
+                or auto for the lowest overhead one this interpreter supports
+            coverage_branch: measure branch coverage as well as statements
         Returns:
             N/A
         Raises:
-            Exception: If the path to code is not valid
+            Exception: If the path to code is not valid or the coverage engine is
+                unknown
         """
 
         super().__init__(
-            source_code, python_package=python_package, args=args, flags=flags
+            source_code,
+            python_package=python_package,
+            args=args,
+            flags=flags,
+            timeout=timeout,
         )
 
         # Add Report Path for Storing Results
         self.base_report_path = base_report_path
-
-        # Add Extra Args for Pytest
+        self.structured = structured
+        self.requested_workers = workers
+        self.test_timeout = test_timeout
+        if coverage_core != "auto" and coverage_core not in self.coverage_cores:
+            raise Exception(f"{coverage_core} is not a known coverage engine")
+        self.requested_coverage_core = coverage_core
+        self.coverage_branch = coverage_branch
+
+        # Details of the python3 the tests run on, probed once pytest runs
+        self.test_interpreter = None
+
+        # Add Extra Args for Pytest, without appending to the shared defaults
+        self.args = list(self.args)
         self.args.append(("--html", f"{self.base_report_path}/pytest/index.html"))
         self.args.append(("--cov-report", f"html:{self.base_report_path}/pytest-cov/"))
-        self.args.append(("--cov-report", "term"))
+        if self.test_timeout:
+            # -p only takes its plugin attached or as the next word, never after =
+            self.flags = list(self.flags) + [f"-p{self.watchdog_plugin}"]
+            self.args.append(("--watchdog-timeout", self.test_timeout))
+        if self.coverage_branch:
+            self.flags = list(self.flags) + ["--cov-branch"]
+        if self.reads_reports:
+            # xunit1 records each test's file, so node ids can be rebuilt
+            self.args.append(("--junitxml", self.junit_xml_path))
+            self.args.append(("--override-ini", "junit_family=xunit1"))
+            self.args.append(("--cov-report", f"json:{self.coverage_json_path}"))
+            self.flags = [
+                flag for flag in self.flags if flag not in self.text_only_flags
+            ]
+        else:
+            self.args.append(("--cov-report", "term"))
 
     def __repr__(self) -> str:
         """
@@ -104,11 +200,206 @@ class Pytest(Tool):
             N/A
         """
 
-        parsed_args = " ".join([f"{arg}={value}" for (arg, value) in self.args])
+        pytest_args = list(self.args)
+        if self.workers != 1:
+            # A module's tests run in order on one worker, sharing its fixtures
+            pytest_args.append(("--numprocesses", self.workers or "auto"))
+            pytest_args.append(("--dist", "loadfile"))
+
+        parsed_args = " ".join([f"{arg}={value}" for (arg, value) in pytest_args])
         parsed_flags = " ".join(self.flags)
 
         return f"python3 -m pytest {parsed_flags} {parsed_args}"
 
+    @property
+    def junit_xml_path(self) -> str:
+        """
+        Purpose:
+            Get the path pytest writes JUnit XML results to in structured mode
+        Args:
+            N/A
+        Returns:
+            junit_xml_path: path to the JUnit XML file
+        Raises:
+            N/A
+        """
+
+        return f"{self.base_report_path}/pytest/junit.xml"
+
+    @property
+    def coverage_json_path(self) -> str:
+        """
+        Purpose:
+            Get the path pytest-cov writes the coverage JSON report to in
+            structured mode
+        Args:
+            N/A
+        Returns:
+            coverage_json_path: path to the coverage JSON file
+        Raises:
+            N/A
+        """
+
+        return f"{self.base_report_path}/pytest-cov/coverage.json"
+
+    @property
+    def python_env(self) -> Dict[str, str]:
+        """
+        Purpose:
+            Get the environment the test interpreter runs with, before the
+            coverage engine is chosen. With a test timeout grader is importable,
+            for the watchdog plugin
+        Args:
+            N/A
+        Returns:
+            python_env: environment for the test interpreter
+        Raises:
+            N/A
+        """
+
+        if self.test_timeout:
+            return {"PYTHONPATH": self.grader_path}
+
+        return {}
+
+    @property
+    def command_env(self) -> Dict[str, str]:
+        """
+        Purpose:
+            Get the Pytest command environment, selecting the coverage engine
+            (xdist workers inherit it)
+        Args:
+            N/A
+        Returns:
+            command_env: environment for the pytest shell
+        Raises:
+            N/A
+        """
+
+        command_env = dict(self.python_env)
+        if self.coverage_core:
+            command_env["COVERAGE_CORE"] = self.coverage_core
+
+        return command_env
+
+    @property
+    def python_version(self) -> Optional[Tuple[int, int]]:
+        """
+        Purpose:
+            Get the version of the interpreter the tests run on
+        Args:
+            N/A
+        Returns:
+            python_version: (major, minor), None if it could not be run
+        Raises:
+            N/A
+        """
+
+        return self.probe_test_interpreter()["python_version"]
+
+    @property
+    def coverage_core(self) -> Optional[str]:
+        """
+        Purpose:
+            Get the coverage engine to measure with, resolving auto against the
+            interpreter the tests run on
+        Args:
+            N/A
+        Returns:
+            coverage_core: one of coverage_cores, None for coverage's default
+        Raises:
+            N/A
+        """
+
+        if self.requested_coverage_core != "auto":
+            return self.requested_coverage_core
+
+        return self.get_coverage_core(
+            self.requested_coverage_core, self.coverage_branch, self.python_version
+        )
+
+    @property
+    def workers(self) -> int:
+        """
+        Purpose:
+            Get the number of pytest-xdist workers the tests run on. Runs are
+            serial if the interpreter the tests run on does not have pytest-xdist
+        Args:
+            N/A
+        Returns:
+            workers: number of workers, 0 for one per core, 1 for a serial run
+        Raises:
+            N/A
+        """
+
+        if self.requested_workers == 1 or not self.probe_test_interpreter()["xdist"]:
+            return 1
+
+        return self.requested_workers
+
+    @property
+    def reads_reports(self) -> bool:
+        """
+        Purpose:
+            Whether results are read from the JUnit XML and coverage JSON reports.
+            Runs asking for workers always are, xdist reports text in completion
+            order, and so are runs with a test timeout, which the text does not
+            show
+        Args:
+            N/A
+        Returns:
+            reads_reports: True in structured mode, with workers asked for, or
+                with a test timeout
+        Raises:
+            N/A
+        """
+
+        return self.structured or self.requested_workers != 1 or bool(self.test_timeout)
+
+    @property
+    def mode(self) -> str:
+        """
+        Purpose:
+            Get how the tests are run, for the report
+        Args:
+            N/A
+        Returns:
+            mode: "serial", "parallel ({workers} workers)", or why a parallel run
+                was asked for but the tests ran serially
+        Raises:
+            N/A
+        """
+
+        if self.workers != 1:
+            return f"parallel ({self.workers or 'auto'} workers)"
+        if self.requested_workers != 1:
+            return "serial (pytest-xdist is not installed)"
+
+        return "serial"
+
+    @property
+    def cache_config(self) -> Dict[str, Any]:
+        """
+        Purpose:
+            Get the Pytest cache configuration, keyed on the output mode, workers,
+            test timeout and coverage engine asked for as well
+        Args:
+            N/A
+        Returns:
+            cache_config: JSON serializable tool configuration
+        Raises:
+            N/A
+        """
+
+        return {
+            **super().cache_config,
+            "structured": self.structured,
+            "workers": self.requested_workers,
+            "test_timeout": self.test_timeout,
+            "coverage_core": self.requested_coverage_core,
+            "coverage_branch": self.coverage_branch,
+        }
+
     ###
     # Pytest Operations
     ###
@@ -125,83 +416,123 @@ class Pytest(Tool):
             N/A
         """
 
-        # Run Pytest command with pexpect and capture output
-        (raw_pytest_stdout, _) = subprocess.run_subprocess_call(
-            command=self.command, env={}, cwd=self.source_code, timeout=60
-        )
+        # Never read results left behind by an earlier run
+        if self.reads_reports:
+            for report_path in (self.junit_xml_path, self.coverage_json_path):
+                pathlib.Path(report_path).parent.mkdir(parents=True, exist_ok=True)
+                if os.path.isfile(report_path):
+                    os.remove(report_path)
 
-        return self._parse_output(raw_pytest_stdout)
+        # Run Pytest command, parsing output as it is produced
+        return self._run_command()
 
-    def _parse_output(self, raw_pytest_stdout: bytes) -> Dict[str, Any]:
+    def is_input_path(self, path: str) -> bool:
         """
         Purpose:
-            Parse the Pytest output to get standarized results for reporting
+            Whether the results can depend on a file. Tests import code and read
+            data from anywhere in the source code, so every file counts
         Args:
-            raw_pytest_stdout: raw output from the pytest command
+            path: path relative to source_code
         Returns:
+            is_input_path: always True
+        Raises:
             N/A
+        """
+
+        return True
+
+    def _new_parsed_output(self) -> Dict[str, Any]:
+        """
+        Purpose:
+            Get the empty Pytest output that results are accumulated into
+        Args:
+            N/A
+        Returns:
+            parsed_output: parsed output with every metric at zero
         Raises:
             N/A
         """
 
-        # Set up return objects
-        parsed_output = {
+        return {
             "tests": {
-                "metrics": {"error_tests": 0, "passed_tests": 0, "failed_tests": 0},
+                "metrics": {
+                    "error_tests": 0,
+                    "passed_tests": 0,
+                    "failed_tests": 0,
+                    "timed_out_tests": 0,
+                },
                 "error_tests": [],
                 "passed_tests": [],
                 "failed_tests": [],
+                "timed_out_tests": [],
                 "summary": "",
             },
             "coverage": {"metrics": {}, "details": [], "summary": ""},
+            "mode": self.mode,
         }
 
-        # Set up Regex for parsing
-        fatal_test_regex = r".*ModuleNotFoundError"
-        error_test_regex = r".*ERROR"
-        passed_test_regex = r".*PASSED +\[[ 0-9]{3}\%\]"
-        failed_test_regex = r".*FAILED +\[[ 0-9]{3}\%\]"
-        coverage_details_regex = r".*\.py.*\d{1,3}\%$"
-        coverage_totals_regex = r"TOTAL.*\d{1,3}\%$"
-
-        for output_line in raw_pytest_stdout:
+    def _parse_line(self, parsed_output: Dict[str, Any], output_line: str) -> None:
+        """
+        Purpose:
+            Parse a line of Pytest output to get standarized results for reporting
+        Args:
+            parsed_output: parsed output being accumulated
+            output_line: raw line of output from the pytest command
+        Returns:
+            N/A
+        Raises:
+            Exception: if the tests cannot be run because of missing modules
+        """
 
-            if re.match(fatal_test_regex, output_line):
+        if self.reads_reports:
+            # Results come from the JUnit XML and coverage JSON reports
+            if "ModuleNotFoundError" in output_line:
                 raise Exception(f"Pytest Cannot run without modules: {output_line}")
+            return
+
+        # Getting the Message Type
+        (message_type, _) = self.line_classifier.classify(output_line)
+
+        if message_type == "fatal":
+            raise Exception(f"Pytest Cannot run without modules: {output_line}")
+
+        # Updating Report
+        if not message_type:
+            # non-matching line
+            return
+        if message_type in ("error_tests", "passed_tests", "failed_tests"):
+            # If a test, add to passed/failed
+            parsed_output["tests"]["metrics"][message_type] += 1
+            parsed_output["tests"][message_type].append(output_line)
+        if message_type == "coverage_details":
+            # If code coverage for a file, add to coverage details
+            parsed_output["coverage"]["details"].append(output_line)
+        if message_type == "coverage_totals":
+            # If code coverage total, add as summary and to metrics
+            parsed_output["coverage"]["metrics"] = self.parse_code_coverage_line(
+                output_line
+            )
+            parsed_output["coverage"]["summary"] = output_line
 
-            # Getting the Message Type
-            message_type = None
-            if re.match(error_test_regex, output_line):
-                message_type = "error_tests"
-            elif re.match(passed_test_regex, output_line):
-                message_type = "passed_tests"
-            elif re.match(failed_test_regex, output_line):
-                message_type = "failed_tests"
-            elif re.match(coverage_details_regex, output_line):
-                message_type = "coverage_details"
-            elif re.match(coverage_totals_regex, output_line):
-                message_type = "coverage_totals"
-
-            # Updating Report
-            if not message_type:
-                # non-matching line
-                continue
-            if message_type in ("error_tests", "passed_tests", "failed_tests"):
-                # If a test, add to passed/failed
-                parsed_output["tests"]["metrics"][message_type] += 1
-                parsed_output["tests"][message_type].append(output_line)
-            if message_type == "coverage_details":
-                # If code coverage for a file, add to coverage details
-                parsed_output["coverage"]["details"].append(output_line)
-            if message_type == "coverage_totals":
-                # If code coverage total, add as summary and to metrics
-                parsed_output["coverage"]["metrics"] = self.parse_code_coverage_line(
-                    output_line
-                )
-                parsed_output["coverage"]["summary"] = output_line
-            else:
-                # non-matching line
-                continue
+    def _finalize_output(self, parsed_output: Dict[str, Any]) -> None:
+        """
+        Purpose:
+            Compute Pytest percentages and report strings once every line is parsed
+        Args:
+            parsed_output: parsed output being accumulated
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        if self.reads_reports:
+            self._parse_junit_xml(parsed_output)
+            self._parse_coverage_json(parsed_output)
+        elif parsed_output["coverage"]["summary"]:
+            parsed_output["coverage"]["metrics"]["engine"] = self.get_coverage_engine()
+        else:
+            parsed_output["coverage"]["metrics"]["engine"] = "unknown"
 
         # Calculate Percentages
         parsed_output["tests"]["metrics"]["total_tests"] = (
@@ -220,7 +551,12 @@ class Pytest(Tool):
                 parsed_output["tests"]["metrics"][f"percentage_{test_status}"] = 0
 
         # Stringify Test Items for Reporting
-        for message_type in ("error_tests", "passed_tests", "failed_tests"):
+        for message_type in (
+            "error_tests",
+            "passed_tests",
+            "failed_tests",
+            "timed_out_tests",
+        ):
             parsed_output["tests"][f"{message_type}_str"] = "\n".join(
                 parsed_output["tests"][message_type]
             )
@@ -232,7 +568,322 @@ class Pytest(Tool):
             parsed_output["coverage"]["details"]
         )
 
-        return parsed_output
+    def _parse_junit_xml(self, parsed_output: Dict[str, Any]) -> None:
+        """
+        Purpose:
+            Count and list every test from the JUnit XML report, streaming it so
+            large suites are never held in memory as a tree. Each test is counted
+            once: an error wins over a failure, skipped tests are not counted.
+            Tests the watchdog interrupted are errors, also listed with their
+            stack dumps as timed out tests.
+
+            Parallel runs report files in the order workers finish them, so their
+            tests are listed by file. Each file's tests ran in order on one worker,
+            which puts them back in the order a serial run reports them
+        Args:
+            parsed_output: parsed output being accumulated
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        parsed_output["tests"]["results"] = []
+        if not os.path.isfile(self.junit_xml_path):
+            # Pytest never finished (timed out or crashed)
+            return
+
+        test_results = []
+        for (_, junit_element) in ElementTree.iterparse(self.junit_xml_path):
+            if junit_element.tag != "testcase":
+                continue
+
+            test_result = self.get_junit_test_result(junit_element)
+            test_results.append(
+                (tuple((junit_element.get("file") or "").split("/")), test_result)
+            )
+
+            junit_element.clear()
+
+        if self.workers != 1:
+            test_results.sort(key=lambda test_result: test_result[0])
+
+        for (_, test_result) in test_results:
+            parsed_output["tests"]["results"].append(test_result)
+            test_outcome = test_result["outcome"]
+            if test_outcome != "skipped_tests":
+                parsed_output["tests"]["metrics"][test_outcome] += 1
+                parsed_output["tests"][test_outcome].append(
+                    f"{test_result['node_id']} {test_outcome.split('_')[0].upper()}"
+                )
+            if "timeout_seconds" in test_result:
+                parsed_output["tests"]["metrics"]["timed_out_tests"] += 1
+                parsed_output["tests"]["timed_out_tests"].append(
+                    f"{test_result['node_id']} TIMED OUT\n{test_result['stack_dump']}"
+                )
+
+    def _parse_coverage_json(self, parsed_output: Dict[str, Any]) -> None:
+        """
+        Purpose:
+            Read total and per file coverage, and the engine measured with, from
+            the coverage JSON report
+        Args:
+            parsed_output: parsed output being accumulated
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        parsed_output["coverage"]["metrics"] = self.parse_code_coverage_line("")
+        parsed_output["coverage"]["metrics"]["engine"] = "unknown"
+        parsed_output["coverage"]["files"] = {}
+        if not os.path.isfile(self.coverage_json_path):
+            # Pytest never finished (timed out or crashed)
+            return
+
+        with open(self.coverage_json_path, "r") as coverage_file_obj:
+            coverage_report = json.load(coverage_file_obj)
+
+        for (file_path, file_coverage) in coverage_report["files"].items():
+            parsed_output["coverage"]["files"][
+                file_path
+            ] = self.get_coverage_summary_metrics(file_coverage["summary"])
+        parsed_output["coverage"]["metrics"] = self.get_coverage_summary_metrics(
+            coverage_report["totals"]
+        )
+        parsed_output["coverage"]["metrics"]["engine"] = self.get_coverage_engine(
+            coverage_report.get("meta", {})
+        )
+
+        # Same rows as the coverage table, for the report's details
+        name_width = max([len("TOTAL")] + list(map(len, coverage_report["files"])))
+        coverage_rows = list(parsed_output["coverage"]["files"].items())
+        coverage_rows.append(("TOTAL", parsed_output["coverage"]["metrics"]))
+        for (row_name, row_metrics) in coverage_rows:
+            coverage_row = (
+                f"{row_name:<{name_width}} "
+                f"{row_metrics['statements_total']:>6} "
+                f"{row_metrics['statements_missing']:>6} "
+                f"{row_metrics['statements_percentage']:>5}%"
+            )
+            if row_name == "TOTAL":
+                parsed_output["coverage"]["summary"] = coverage_row
+            else:
+                parsed_output["coverage"]["details"].append(coverage_row)
+
+    def get_junit_test_result(
+        self, junit_element: ElementTree.Element
+    ) -> Dict[str, Any]:
+        """
+        Purpose:
+            Get a test's result from its JUnit XML testcase. A test the watchdog
+            interrupted is an error, whatever phase it was interrupted in
+        Args:
+            junit_element: the test's testcase element, with its children
+        Returns:
+            test_result: node_id, outcome and duration_seconds, plus
+                timeout_seconds and stack_dump if the watchdog interrupted it
+        Raises:
+            N/A
+        """
+
+        test_outcome = "passed_tests"
+        test_report = ""
+        for (junit_tag, junit_outcome) in self.junit_outcomes.items():
+            junit_outcome_element = junit_element.find(junit_tag)
+            if junit_outcome_element is not None:
+                test_outcome = junit_outcome
+                test_report = junit_outcome_element.text or ""
+                break
+
+        test_result = {
+            "node_id": self.get_junit_node_id(junit_element.attrib),
+            "outcome": test_outcome,
+            "duration_seconds": float(junit_element.get("time") or 0),
+        }
+        for junit_property in junit_element.iterfind("properties/property"):
+            if junit_property.get("name") == self.junit_timeout_property:
+                test_result["outcome"] = "error_tests"
+                test_result["timeout_seconds"] = float(junit_property.get("value"))
+                test_result["stack_dump"] = test_report
+
+        return test_result
+
+    def get_coverage_engine(
+        self, coverage_meta: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Purpose:
+            Get the engine coverage measured with. Its reports do not name it, so
+            it is resolved from coverage_core the way coverage does, falling back
+            to its default where the installed coverage or the interpreter cannot
+            use the engine asked for
+        Args:
+            coverage_meta: meta of the coverage JSON report, with the coverage
+                version and whether branches were measured. Without it, the
+                installed coverage is taken to read COVERAGE_CORE
+        Returns:
+            coverage_engine: one of coverage_cores
+        Raises:
+            N/A
+        """
+
+        coverage_meta = coverage_meta or {}
+        coverage_version = tuple(
+            int(version_token)
+            for version_token in re.findall(r"\d+", coverage_meta.get("version", ""))
+        )[:2]
+        if not self.coverage_core or (
+            coverage_version and coverage_version < self.coverage_core_version
+        ):
+            return self.default_coverage_core
+
+        if self.coverage_core == "sysmon" and self.python_version:
+            sysmon_python_version = self.sysmon_python_version
+            if coverage_meta.get("branch_coverage", self.coverage_branch):
+                sysmon_python_version = self.sysmon_branch_python_version
+            if self.python_version < sysmon_python_version:
+                return self.default_coverage_core
+
+        return self.coverage_core
+
+    def probe_test_interpreter(self) -> Dict[str, Any]:
+        """
+        Purpose:
+            Get details of the interpreter the tests run on, the python3 the
+            tool's shell finds rather than the grader's. Probed on first use with
+            the working directory and environment of the test run
+        Args:
+            N/A
+        Returns:
+            test_interpreter: python_version (major, minor), None if it could not
+                be run, and whether pytest-xdist is installed (xdist)
+        Raises:
+            N/A
+        """
+
+        if self.test_interpreter is not None:
+            return self.test_interpreter
+
+        (probe_stdout, _, _) = subprocess.run_subprocess_call(
+            "python3 -c 'import importlib.util, sys; "
+            'print(*sys.version_info[:2], bool(importlib.util.find_spec("xdist")))\'',
+            env=self.python_env,
+            cwd=self.source_code,
+            timeout=10,
+        )
+        version_tokens = re.findall(r"\d+", " ".join(probe_stdout))
+        self.test_interpreter = {
+            "python_version": None,
+            "xdist": "True" in " ".join(probe_stdout),
+        }
+        if len(version_tokens) >= 2:
+            self.test_interpreter["python_version"] = (
+                int(version_tokens[0]),
+                int(version_tokens[1]),
+            )
+
+        return self.test_interpreter
+
+    @classmethod
+    def get_coverage_core(
+        cls,
+        coverage_core: str,
+        coverage_branch: bool,
+        python_version: Optional[Tuple[int, int]] = None,
+    ) -> Optional[str]:
+        """
+        Purpose:
+            Resolve the coverage engine to measure with. auto picks sys.monitoring
+            where it can measure what is asked for, coverage's default otherwise:
+            the C tracer, or the Python one if the C tracer is not built. Asking
+            coverage for ctrace where it is not built exits instead
+        Args:
+            coverage_core: one of coverage_cores or auto
+            coverage_branch: whether branches are measured as well
+            python_version: (major, minor) the tests run on, None if unknown
+        Returns:
+            coverage_core: one of coverage_cores, None for coverage's default
+        Raises:
+            Exception: if the coverage engine is unknown
+        """
+
+        if coverage_core != "auto":
+            if coverage_core not in cls.coverage_cores:
+                raise Exception(f"{coverage_core} is not a known coverage engine")
+            return coverage_core
+
+        if python_version is None:
+            # Coverage picks its own default
+            return None
+
+        sysmon_python_version = cls.sysmon_python_version
+        if coverage_branch:
+            sysmon_python_version = cls.sysmon_branch_python_version
+
+        return "sysmon" if python_version >= sysmon_python_version else None
+
+    @staticmethod
+    def get_junit_node_id(testcase_attributes: Dict[str, str]) -> str:
+        """
+        Purpose:
+            Rebuild a test's pytest node id from its xunit1 testcase attributes,
+            which pytest derives by dotting the node id's path
+        Args:
+            testcase_attributes: file, classname and name of the testcase
+        Returns:
+            node_id: the test's node id, e.g. tests/test_a.py::TestA::test_b
+        Raises:
+            N/A
+        """
+
+        test_file = testcase_attributes.get("file")
+        test_class_name = testcase_attributes.get("classname", "")
+        test_name = testcase_attributes.get("name", "")
+        if not test_file:
+            return "::".join(filter(None, [test_class_name, test_name]))
+        if not test_class_name:
+            # A module that failed to collect
+            return test_file
+
+        test_module_name = re.sub(r"\.py$", "", test_file).replace("/", ".")
+        node_id_parts = [test_file]
+        if test_class_name.startswith(f"{test_module_name}."):
+            # Classes the test is nested in
+            node_id_parts.extend(
+                test_class_name.replace(f"{test_module_name}.", "", 1).split(".")
+            )
+        node_id_parts.append(test_name)
+
+        return "::".join(node_id_parts)
+
+    @staticmethod
+    def get_coverage_summary_metrics(
+        coverage_summary: Dict[str, Any]
+    ) -> Dict[str, Union[int, float]]:
+        """
+        Purpose:
+            Convert a coverage JSON summary to the metrics read from the table
+        Args:
+            coverage_summary: summary of a file or the totals from coverage JSON
+        Returns:
+            code_coverage: Code coverage details
+        Raises:
+            N/A
+        """
+
+        return {
+            "statements_total": coverage_summary["num_statements"],
+            "statements_missing": coverage_summary["missing_lines"],
+            "statements_branching": coverage_summary.get("num_branches", 0),
+            "statements_partial_branching": coverage_summary.get(
+                "num_partial_branches", 0
+            ),
+            "statements_percentage": coverage_summary.get(
+                "percent_covered_display", f"{coverage_summary['percent_covered']:.0f}",
+            ),
+        }
 
     @staticmethod
     def parse_code_coverage_line(output_line) -> Dict[str, Union[int, float]]:
@@ -0,0 +1,212 @@
+"""
+Purpose:
+    Pytest Watchdog Plugin
+
+    Limit how long each phase (setup, call, teardown) of a test may run. A phase
+    still running at the limit is interrupted and the test errors with a
+    faulthandler dump of every thread's stack, then the rest of the suite runs.
+    Load with -pgrader.pytest.pytest_watchdog and set --watchdog-timeout=SECONDS
+
+    Code stuck where the interrupt cannot reach it (inside a C call) is dumped to
+    stderr and the process exits once HANG_GRACE_PERIOD more seconds have passed.
+    That ends the run (or with pytest-xdist, only the worker), as a hang no
+    signal reaches cannot be recovered from in process
+"""
+
+# Python Library Imports
+import contextlib
+import faulthandler
+import os
+import signal
+import sys
+import tempfile
+from typing import Any, Dict, Iterator
+import pytest
+
+# Local Python Library Imports
+# N/A
+
+
+###
+# Constants
+###
+
+
+# JUnit XML testcase property recording the limit a test exceeded
+TIMEOUT_PROPERTY = "watchdog_timeout"
+
+# Seconds past the limit before a test that ignores the interrupt ends the run
+HANG_GRACE_PERIOD = 10
+
+# Copy of the real stderr, which output capturing redirects while tests run, by
+# pytest config. Kept here as config.stash is only in pytest 7+
+STDERR_FDS: Dict[Any, int] = {}
+
+
+###
+# Functions
+###
+
+
+def pytest_addoption(parser: Any) -> None:
+    """
+    Purpose:
+        Add the watchdog's options to pytest
+    Args:
+        parser: pytest option parser
+    Returns:
+        N/A
+    Raises:
+        N/A
+    """
+
+    parser.getgroup("watchdog").addoption(
+        "--watchdog-timeout",
+        type=float,
+        default=0,
+        help=(
+            "seconds each phase of a test may run for, 0 for no limit. A test "
+            "that cannot be interrupted (inside a C call) ends the run "
+            f"{HANG_GRACE_PERIOD}s after the limit"
+        ),
+    )
+
+
+def pytest_configure(config: Any) -> None:
+    """
+    Purpose:
+        Keep a copy of stderr to dump hung tests to, before capturing resumes
+    Args:
+        config: pytest config
+    Returns:
+        N/A
+    Raises:
+        N/A
+    """
+
+    STDERR_FDS[config] = os.dup(sys.__stderr__.fileno())
+
+
+def pytest_unconfigure(config: Any) -> None:
+    """
+    Purpose:
+        Close the copy of stderr
+    Args:
+        config: pytest config
+    Returns:
+        N/A
+    Raises:
+        N/A
+    """
+
+    if config in STDERR_FDS:
+        os.close(STDERR_FDS.pop(config))
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_setup(item: Any) -> Iterator[None]:
+    """
+    Purpose:
+        Limit a test's setup
+    Args:
+        item: test being run
+    Yields:
+        N/A
+    Raises:
+        N/A
+    """
+
+    with watchdog(item):
+        yield
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item: Any) -> Iterator[None]:
+    """
+    Purpose:
+        Limit a test's call
+    Args:
+        item: test being run
+    Yields:
+        N/A
+    Raises:
+        N/A
+    """
+
+    with watchdog(item):
+        yield
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_teardown(item: Any) -> Iterator[None]:
+    """
+    Purpose:
+        Limit a test's teardown
+    Args:
+        item: test being run
+    Yields:
+        N/A
+    Raises:
+        N/A
+    """
+
+    with watchdog(item):
+        yield
+
+
+@contextlib.contextmanager
+def watchdog(item: Any) -> Iterator[None]:
+    """
+    Purpose:
+        Interrupt the test if the block runs past --watchdog-timeout
+    Args:
+        item: test being run
+    Yields:
+        N/A
+    Raises:
+        N/A
+    """
+
+    timeout = item.config.getoption("watchdog_timeout")
+    if not timeout:
+        yield
+        return
+
+    previous_handler = signal.signal(
+        signal.SIGALRM, lambda signum, frame: fail_timed_out_test(item, timeout)
+    )
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    faulthandler.dump_traceback_later(
+        timeout + HANG_GRACE_PERIOD, exit=True, file=STDERR_FDS[item.config],
+    )
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        faulthandler.cancel_dump_traceback_later()
+        signal.signal(signal.SIGALRM, previous_handler)
+
+
+def fail_timed_out_test(item: Any, timeout: float) -> None:
+    """
+    Purpose:
+        Error the running test with a dump of every thread's stack, recording the
+        limit it exceeded as a TIMEOUT_PROPERTY property
+    Args:
+        item: test being run
+        timeout: seconds the phase was limited to
+    Returns:
+        N/A
+    Raises:
+        pytest.fail.Exception: always, which candidate code catching Exception
+            does not catch
+    """
+
+    # faulthandler writes straight to a file descriptor
+    with tempfile.TemporaryFile("w+") as stack_dump_file_obj:
+        faulthandler.dump_traceback(file=stack_dump_file_obj, all_threads=True)
+        stack_dump_file_obj.seek(0)
+        stack_dump = stack_dump_file_obj.read()
+
+    item.user_properties.append((TIMEOUT_PROPERTY, f"{timeout:g}"))
+    pytest.fail(f"Timed out after {timeout:g}s\n\n{stack_dump}", pytrace=False)
@@ -5,10 +5,12 @@ Purpose:
 """
 
 # Python Library Imports
-# N/A
+import json
 
 # Local Python Library Imports
+import grader.pytest.pytest
 from grader.pytest.pytest import Pytest
+from grader.subprocess.subprocess import run_subprocess_call
 
 
 ###########
@@ -16,7 +18,70 @@ from grader.pytest.pytest import Pytest
 ###########
 
 
-# N/A
+PYTEST_OUTPUT = [
+    "============================= test session starts ==============================",
+    "tests/test_example.py::test_add PASSED                                    [ 33%]",
+    "tests/test_example.py::test_sub FAILED                                    [ 66%]",
+    "tests/test_example.py::test_mul ERROR                                     [100%]",
+    "",
+    "----------- coverage: platform linux, python 3.8.5-final-0 -----------",
+    "Name                     Stmts   Miss  Cover",
+    "--------------------------------------------",
+    "example/__init__.py          0      0   100%",
+    "example/example.py          10      2    80%",
+    "--------------------------------------------",
+    "TOTAL                       10      2    80%",
+    "",
+]
+
+PYTEST_JUNIT_XML = """<?xml version="1.0" encoding="utf-8"?>
+<testsuites><testsuite name="pytest" errors="1" failures="1" skipped="1" tests="5">
+<testcase classname="example.example" name="example.example.add"
+    file="example/example.py" line="1" time="0.003" />
+<testcase classname="tests.test_example" name="test_sub"
+    file="tests/test_example.py" line="8" time="0.002">
+    <failure message="assert 1 == 3">assert 1 == 3</failure>
+</testcase>
+<testcase classname="tests.test_example" name="test_err"
+    file="tests/test_example.py" line="16" time="0.001">
+    <error message="failed on setup">RuntimeError</error>
+</testcase>
+<testcase classname="tests.test_example" name="test_skip"
+    file="tests/test_example.py" line="20" time="0.000">
+    <skipped message="unconditional skip" />
+</testcase>
+<testcase classname="tests.test_example.TestThing" name="test_p[1]"
+    file="tests/test_example.py" line="26" time="0.250" />
+</testsuite></testsuites>
+"""
+
+PYTEST_COVERAGE_JSON = {
+    "meta": {"version": "7.16.2", "branch_coverage": False},
+    "files": {
+        "example/__init__.py": {
+            "summary": {
+                "num_statements": 0,
+                "missing_lines": 0,
+                "percent_covered": 100.0,
+                "percent_covered_display": "100",
+            }
+        },
+        "example/example.py": {
+            "summary": {
+                "num_statements": 10,
+                "missing_lines": 2,
+                "percent_covered": 80.0,
+                "percent_covered_display": "80",
+            }
+        },
+    },
+    "totals": {
+        "num_statements": 10,
+        "missing_lines": 2,
+        "percent_covered": 80.0,
+        "percent_covered_display": "80",
+    },
+}
 
 
 ###########
@@ -64,6 +129,7 @@ def test_Pytest___init___base() -> int:
         "--self-contained-html",
         "--verbose",
     ]
+    assert test_pytest.timeout == 60
 
 
 def test_Pytest___init___override() -> int:
@@ -96,5 +162,491 @@ def test_Pytest___init___override() -> int:
     assert test_pytest.source_code == test_source_code
     assert test_pytest.python_package == test_python_package
     assert test_pytest.code_dir == f"{test_source_code}/{test_python_package}"
-    assert test_pytest.args == test_args
+    assert test_pytest.args == test_args + [
+        ("--html", f"{test_base_report_path}/pytest/index.html"),
+        ("--cov-report", f"html:{test_base_report_path}/pytest-cov/"),
+        ("--cov-report", "term"),
+    ]
+    assert test_args == [("test", "true")]
     assert test_pytest.flags == test_flags
+
+
+def test_Pytest___init___structured() -> int:
+    """
+    Purpose:
+        Test structured Pytest writes JUnit XML and coverage JSON instead of text
+    Args:
+        N/A
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    # Init Pytest
+    test_pytest = Pytest("./", "./report", structured=True)
+    assert ("--junitxml", "./report/pytest/junit.xml") in test_pytest.args
+    assert ("--override-ini", "junit_family=xunit1") in test_pytest.args
+    assert (
+        "--cov-report",
+        "json:./report/pytest-cov/coverage.json",
+    ) in test_pytest.args
+    assert ("--cov-report", "term") not in test_pytest.args
+    assert "--verbose" not in test_pytest.flags
+    assert ("--junitxml", "./report/pytest/junit.xml") not in Pytest.default_args
+
+
+def test_Pytest___init___parallel(monkeypatch: object) -> int:
+    """
+    Purpose:
+        Test parallel Pytest distributes test modules across xdist workers and
+        reads its results from reports, or runs serially without pytest-xdist
+    Args:
+        monkeypatch: pytest monkeypatch fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    test_interpreter = {"python_version": (3, 12), "xdist": True}
+    monkeypatch.setattr(
+        Pytest, "probe_test_interpreter", lambda test_pytest: test_interpreter
+    )
+
+    test_pytest = Pytest("./", "./report", workers=0)
+    assert "--numprocesses=auto --dist=loadfile" in test_pytest.command
+    assert ("--junitxml", "./report/pytest/junit.xml") in test_pytest.args
+    assert test_pytest.mode == "parallel (auto workers)"
+    assert test_pytest.cache_config["workers"] == 0
+    assert Pytest("./", "./report", workers=4).mode == "parallel (4 workers)"
+
+    test_pytest = Pytest("./", "./report")
+    assert test_pytest.mode == "serial"
+    assert "--dist" not in test_pytest.command
+
+    # The interpreter the tests run on does not have pytest-xdist
+    test_interpreter["xdist"] = False
+
+    test_pytest = Pytest("./", "./report", workers=4)
+    assert test_pytest.workers == 1
+    assert test_pytest.mode == "serial (pytest-xdist is not installed)"
+    assert "--numprocesses" not in test_pytest.command
+    assert ("--junitxml", "./report/pytest/junit.xml") in test_pytest.args
+
+
+###
+# _parse_output()
+###
+
+
+def test_Pytest__parse_output() -> int:
+    """
+    Purpose:
+        Test Pytest output is parsed into test results and coverage
+    Args:
+        N/A
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    # Parse Output
+    test_parsed_output = Pytest("./", "./")._parse_output(PYTEST_OUTPUT)
+    assert test_parsed_output["tests"]["metrics"]["total_tests"] == 3
+    assert test_parsed_output["tests"]["passed_tests"] == [PYTEST_OUTPUT[1]]
+    assert test_parsed_output["tests"]["failed_tests"] == [PYTEST_OUTPUT[2]]
+    assert test_parsed_output["tests"]["error_tests"] == [PYTEST_OUTPUT[3]]
+    assert test_parsed_output["coverage"]["summary"] == PYTEST_OUTPUT[11]
+    assert test_parsed_output["coverage"]["metrics"]["statements_total"] == "10"
+    assert test_parsed_output["coverage"]["metrics"]["statements_percentage"] == "80"
+    assert test_parsed_output["coverage"]["details"] == PYTEST_OUTPUT[8:10]
+
+
+def test_Pytest__parse_output_structured(tmp_path) -> int:
+    """
+    Purpose:
+        Test structured Pytest results are read from JUnit XML and coverage JSON
+    Args:
+        N/A
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    # Example Data
+    test_pytest = Pytest("./", str(tmp_path), structured=True)
+    (tmp_path / "pytest").mkdir()
+    (tmp_path / "pytest-cov").mkdir()
+    with open(test_pytest.junit_xml_path, "w") as test_junit_file_obj:
+        test_junit_file_obj.write(PYTEST_JUNIT_XML)
+    with open(test_pytest.coverage_json_path, "w") as test_coverage_file_obj:
+        json.dump(PYTEST_COVERAGE_JSON, test_coverage_file_obj)
+
+    # Parse Output, the terminal output is not used
+    test_parsed_output = test_pytest._parse_output(PYTEST_OUTPUT)
+    assert test_parsed_output["tests"]["metrics"]["total_tests"] == 4
+    assert test_parsed_output["tests"]["metrics"]["passed_tests"] == 2
+    assert test_parsed_output["tests"]["passed_tests"] == [
+        "example/example.py::example.example.add PASSED",
+        "tests/test_example.py::TestThing::test_p[1] PASSED",
+    ]
+    assert test_parsed_output["tests"]["failed_tests"] == [
+        "tests/test_example.py::test_sub FAILED"
+    ]
+    assert test_parsed_output["tests"]["error_tests"] == [
+        "tests/test_example.py::test_err ERROR"
+    ]
+    assert test_parsed_output["tests"]["results"][3] == {
+        "node_id": "tests/test_example.py::test_skip",
+        "outcome": "skipped_tests",
+        "duration_seconds": 0.0,
+    }
+    assert test_parsed_output["tests"]["results"][4]["duration_seconds"] == 0.25
+    assert test_parsed_output["coverage"]["metrics"]["statements_total"] == 10
+    assert test_parsed_output["coverage"]["metrics"]["statements_percentage"] == "80"
+    assert (
+        test_parsed_output["coverage"]["files"]["example/example.py"][
+            "statements_missing"
+        ]
+        == 2
+    )
+    assert test_parsed_output["coverage"]["details"][1].split() == [
+        "example/example.py",
+        "10",
+        "2",
+        "80%",
+    ]
+    assert test_parsed_output["coverage"]["summary"].split() == [
+        "TOTAL",
+        "10",
+        "2",
+        "80%",
+    ]
+
+
+def test_Pytest__parse_output_structured_missing(tmp_path) -> int:
+    """
+    Purpose:
+        Test structured Pytest results are empty when pytest wrote no reports
+    Args:
+        N/A
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    # Parse Output
+    test_parsed_output = Pytest("./", str(tmp_path), structured=True)._parse_output([])
+    assert test_parsed_output["tests"]["metrics"]["total_tests"] == 0
+    assert test_parsed_output["tests"]["results"] == []
+    assert test_parsed_output["coverage"]["metrics"]["statements_percentage"] == 0.0
+
+
+def test_Pytest___init___test_timeout() -> int:
+    """
+    Purpose:
+        Test Pytest with a test timeout loads the watchdog plugin and reads its
+        results from reports
+    Args:
+        N/A
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    test_pytest = Pytest("./", "./report", test_timeout=5)
+    assert "-pgrader.pytest.pytest_watchdog" in test_pytest.flags
+    assert ("--watchdog-timeout", 5) in test_pytest.args
+    assert ("--junitxml", "./report/pytest/junit.xml") in test_pytest.args
+    assert test_pytest.cache_config["test_timeout"] == 5
+    assert "PYTHONPATH" not in Pytest("./", "./report").command_env
+
+    assert "-pgrader.pytest.pytest_watchdog" not in Pytest.default_flags
+    assert "-pgrader.pytest.pytest_watchdog" not in Pytest("./", "./report").flags
+
+
+def test_Pytest_command_env_watchdog(tmp_path) -> int:
+    """
+    Purpose:
+        Test the watchdog plugin is found by the interpreter pytest runs on, with
+        the Pytest command environment and from outside the grader's directory
+    Args:
+        N/A
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    test_pytest = Pytest(str(tmp_path), str(tmp_path), test_timeout=5)
+    (test_stdout, test_stderr, _) = run_subprocess_call(
+        "python3 -c 'import importlib.util; "
+        'print(importlib.util.find_spec("grader.pytest.pytest_watchdog").origin)\'',
+        env=test_pytest.command_env,
+        cwd=str(tmp_path),
+    )
+    assert test_stdout[0] == f"{Pytest.grader_path}/grader/pytest/pytest_watchdog.py"
+    assert not any(test_stderr), test_stderr
+
+
+def test_Pytest___init___coverage() -> int:
+    """
+    Purpose:
+        Test Pytest selects the coverage engine through the environment and only
+        measures branches when asked to
+    Args:
+        N/A
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    test_pytest = Pytest("./", "./report", coverage_core="pytrace")
+    assert test_pytest.command_env == {"COVERAGE_CORE": "pytrace"}
+    assert "--cov-branch" not in test_pytest.flags
+    assert test_pytest.cache_config["coverage_core"] == "pytrace"
+
+    test_pytest = Pytest("./", "./report", coverage_branch=True)
+    assert "--cov-branch" in test_pytest.flags
+    assert "--cov-branch" not in Pytest.default_flags
+    assert test_pytest.cache_config["coverage_branch"] is True
+
+    try:
+        Pytest("./", "./report", coverage_core="fast")
+        assert False, "unknown coverage engines are rejected"
+    except Exception as test_error:
+        assert "fast is not a known coverage engine" in str(test_error)
+
+
+def test_Pytest_get_coverage_core() -> int:
+    """
+    Purpose:
+        Test auto picks sys.monitoring wherever the interpreter the tests run on
+        can measure what is asked for with it, leaving coverage to its default C
+        tracer elsewhere
+    Args:
+        N/A
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    assert Pytest.get_coverage_core("auto", False, (3, 11)) is None
+    assert Pytest.get_coverage_core("auto", False, (3, 12)) == "sysmon"
+    assert Pytest.get_coverage_core("auto", True, (3, 13)) is None
+    assert Pytest.get_coverage_core("auto", True, (3, 14)) == "sysmon"
+    assert Pytest.get_coverage_core("ctrace", False, (3, 14)) == "ctrace"
+    assert Pytest.get_coverage_core("pytrace", True, (3, 8)) == "pytrace"
+    assert Pytest.get_coverage_core("auto", False, None) is None
+
+
+def test_Pytest_probe_test_interpreter(tmp_path: object, monkeypatch: object) -> int:
+    """
+    Purpose:
+        Test the interpreter the tests run on is only probed once pytest runs,
+        from the test run's directory, and is the python3 the tool's shell runs
+        rather than the interpreter running the grader
+    Args:
+        tmp_path: pytest tmp_path fixture
+        monkeypatch: pytest monkeypatch fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    test_probes = []
+    test_run_subprocess_call = grader.pytest.pytest.subprocess.run_subprocess_call
+
+    def test_probe(command: str, env: dict, cwd: str, timeout: int) -> tuple:
+        test_probes.append(cwd)
+        return test_run_subprocess_call(command, env=env, cwd=cwd, timeout=timeout)
+
+    monkeypatch.setattr(
+        grader.pytest.pytest.subprocess, "run_subprocess_call", test_probe
+    )
+
+    test_pytest = Pytest(str(tmp_path), str(tmp_path / "report"))
+    assert test_pytest.cache_config["coverage_core"] == "auto"
+    assert test_probes == []
+
+    (test_stdout, _, _) = test_run_subprocess_call(
+        "python3 -V", env={}, cwd=str(tmp_path)
+    )
+    test_version_str = ".".join(map(str, test_pytest.python_version))
+    assert test_stdout[0].startswith(f"Python {test_version_str}.")
+    assert test_pytest.command_env.get("COVERAGE_CORE") == test_pytest.coverage_core
+    assert test_pytest.workers == 1
+    assert test_probes == [str(tmp_path)]
+
+    # Workers are only used if the interpreter the tests run on has pytest-xdist
+    (_, test_stderr, _) = test_run_subprocess_call(
+        "python3 -c 'import xdist'", env={}, cwd=str(tmp_path)
+    )
+    test_pytest = Pytest(str(tmp_path), str(tmp_path / "report"), workers=2)
+    assert test_pytest.workers == (1 if any(test_stderr) else 2)
+
+
+def test_Pytest__parse_output_parallel(tmp_path: object, monkeypatch: object) -> int:
+    """
+    Purpose:
+        Test parallel Pytest lists tests by file whatever order workers finished
+        the files in, keeping each file's tests in the order they ran
+    Args:
+        tmp_path: pytest tmp_path fixture
+        monkeypatch: pytest monkeypatch fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    monkeypatch.setattr(
+        Pytest,
+        "probe_test_interpreter",
+        lambda test_pytest: {"python_version": (3, 12), "xdist": True},
+    )
+
+    # The doctest's worker finished last
+    test_doctest_case = (
+        '<testcase classname="example.example" name="example.example.add"\n'
+        '    file="example/example.py" line="1" time="0.003" />\n'
+    )
+    test_junit_xml = PYTEST_JUNIT_XML.replace(test_doctest_case, "").replace(
+        "</testsuite>", f"{test_doctest_case}</testsuite>"
+    )
+    assert test_junit_xml != PYTEST_JUNIT_XML
+
+    test_parsed_outputs = []
+    for (test_report_name, test_workers) in [("serial", 1), ("parallel", 2)]:
+        test_pytest = Pytest(
+            "./",
+            str(tmp_path / test_report_name),
+            structured=True,
+            workers=test_workers,
+        )
+        (tmp_path / test_report_name / "pytest").mkdir(parents=True)
+        with open(test_pytest.junit_xml_path, "w") as test_junit_file_obj:
+            test_junit_file_obj.write(test_junit_xml)
+        test_parsed_outputs.append(test_pytest._parse_output([]))
+
+    (test_serial_output, test_parallel_output) = test_parsed_outputs
+    assert test_serial_output["tests"]["passed_tests"][0].startswith("tests/")
+    assert test_parallel_output["tests"]["passed_tests"] == [
+        "example/example.py::example.example.add PASSED",
+        "tests/test_example.py::TestThing::test_p[1] PASSED",
+    ]
+    test_results = test_parallel_output["tests"]["results"]
+    assert [test_result["node_id"] for test_result in test_results] == [
+        "example/example.py::example.example.add",
+        "tests/test_example.py::test_sub",
+        "tests/test_example.py::test_err",
+        "tests/test_example.py::test_skip",
+        "tests/test_example.py::TestThing::test_p[1]",
+    ]
+    assert test_parallel_output["tests"]["metrics"] == (
+        test_serial_output["tests"]["metrics"]
+    )
+    assert test_parallel_output["mode"] == "parallel (2 workers)"
+
+
+def test_Pytest__parse_output_test_timeout(tmp_path: object) -> int:
+    """
+    Purpose:
+        Test tests the watchdog interrupted are counted as errors and listed with
+        their stack dumps
+    Args:
+        tmp_path: pytest tmp_path fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    test_timed_out_case = (
+        '<testcase classname="tests.test_example" name="test_hang"\n'
+        '    file="tests/test_example.py" line="30" time="1.004">\n'
+        '    <properties><property name="watchdog_timeout" value="1" /></properties>\n'
+        '    <failure message="Timed out after 1s">Timed out after 1s\n\n'
+        "Current thread 0x00007f (most recent call first):\n"
+        '  File "tests/test_example.py", line 31 in test_hang</failure>\n'
+        "</testcase>\n"
+    )
+    test_pytest = Pytest("./", str(tmp_path), test_timeout=1)
+    (tmp_path / "pytest").mkdir()
+    with open(test_pytest.junit_xml_path, "w") as test_junit_file_obj:
+        test_junit_file_obj.write(
+            PYTEST_JUNIT_XML.replace(
+                "</testsuite>", f"{test_timed_out_case}</testsuite>"
+            )
+        )
+
+    test_parsed_output = test_pytest._parse_output([])
+
+    assert test_parsed_output["tests"]["metrics"]["error_tests"] == 2
+    assert test_parsed_output["tests"]["metrics"]["failed_tests"] == 1
+    assert test_parsed_output["tests"]["metrics"]["timed_out_tests"] == 1
+    assert test_parsed_output["tests"]["metrics"]["total_tests"] == 5
+    assert test_parsed_output["tests"]["error_tests"][-1] == (
+        "tests/test_example.py::test_hang ERROR"
+    )
+    assert test_parsed_output["tests"]["results"][-1]["timeout_seconds"] == 1
+    assert test_parsed_output["tests"]["timed_out_tests_str"] == (
+        "tests/test_example.py::test_hang TIMED OUT\n"
+        "Timed out after 1s\n\n"
+        "Current thread 0x00007f (most recent call first):\n"
+        '  File "tests/test_example.py", line 31 in test_hang'
+    )
+
+
+def test_Pytest_get_coverage_engine(monkeypatch: object) -> int:
+    """
+    Purpose:
+        Test the coverage engine is resolved from the engine asked for and the
+        coverage JSON report's meta, falling back where coverage would
+    Args:
+        monkeypatch: pytest monkeypatch fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    monkeypatch.setattr(
+        Pytest,
+        "probe_test_interpreter",
+        lambda test_pytest: {"python_version": (3, 12)},
+    )
+    test_meta = {"version": "7.16.2", "branch_coverage": False}
+
+    test_pytest = Pytest("./", "./report")
+    assert test_pytest.coverage_core == "sysmon"
+    assert test_pytest.get_coverage_engine(test_meta) == "sysmon"
+    assert test_pytest.get_coverage_engine() == "sysmon"
+    # Before COVERAGE_CORE was read
+    assert test_pytest.get_coverage_engine({"version": "7.3.4"}) == "ctrace"
+
+    # sys.monitoring cannot measure branches before Python 3.14
+    test_pytest = Pytest("./", "./report", coverage_core="sysmon")
+    test_meta["branch_coverage"] = True
+    assert test_pytest.get_coverage_engine(test_meta) == "ctrace"
+
+    test_pytest = Pytest("./", "./report", coverage_branch=True)
+    assert test_pytest.coverage_core is None
+    assert test_pytest.get_coverage_engine(test_meta) == "ctrace"
+
+    test_pytest = Pytest("./", "./report", coverage_core="pytrace")
+    assert test_pytest.get_coverage_engine(test_meta) == "pytrace"
+
+    # Coverage never reported
+    test_parsed_output = test_pytest._parse_output([])
+    assert test_parsed_output["coverage"]["metrics"]["engine"] == "unknown"
+    test_parsed_output = test_pytest._parse_output(PYTEST_OUTPUT)
+    assert test_parsed_output["coverage"]["metrics"]["engine"] == "pytrace"
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Purpose:
+    Test File for pytest_watchdog.py
+"""
+
+# Python Library Imports
+import shlex
+import sys
+import time
+from xml.etree import ElementTree
+
+# Local Python Library Imports
+from grader.pytest.pytest import Pytest
+from grader.pytest.pytest_watchdog import TIMEOUT_PROPERTY
+from grader.subprocess.subprocess import run_subprocess_call
+
+
+###########
+# Mocks/Fixtures
+###########
+
+
+WATCHDOG_TESTS = """
+import time
+
+
+def test_before():
+    assert True
+
+
+def test_sleep():
+    time.sleep(30)
+
+
+def test_after():
+    assert True
+"""
+
+
+###########
+# Tests
+###########
+
+
+###
+# watchdog()
+###
+
+
+def test_watchdog(tmp_path: object) -> int:
+    """
+    Purpose:
+        Test the plugin loads on the pytest running this suite (the pinned one in
+        the grader's environment) and errors a test past the limit, then runs
+        the rest of the suite
+    Args:
+        tmp_path: pytest tmp_path fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    (tmp_path / "test_watchdog_example.py").write_text(WATCHDOG_TESTS)
+
+    test_start_time = time.time()
+    (test_stdout, test_stderr, test_timed_out) = run_subprocess_call(
+        f"{shlex.quote(sys.executable)} -m pytest -p no:cacheprovider "
+        "-pgrader.pytest.pytest_watchdog --watchdog-timeout=1 "
+        f"--junitxml={tmp_path}/junit.xml test_watchdog_example.py",
+        env={"PYTHONPATH": Pytest.grader_path},
+        cwd=str(tmp_path),
+        timeout=25,
+    )
+    assert not test_timed_out
+    assert time.time() - test_start_time < 25
+    assert any("1 failed, 2 passed" in line for line in test_stdout), (
+        test_stdout + test_stderr
+    )
+
+    test_testcases = {
+        test_testcase.get("name"): test_testcase
+        for test_testcase in ElementTree.parse(f"{tmp_path}/junit.xml").iter("testcase")
+    }
+    test_failure = test_testcases["test_sleep"].find("failure")
+    assert "Timed out after 1s" in test_failure.get("message")
+    test_property = test_testcases["test_sleep"].find("properties/property")
+    assert test_property.attrib == {"name": TIMEOUT_PROPERTY, "value": "1"}
+    assert test_testcases["test_after"].find("failure") is None
@@ -0,0 +1,439 @@
+#!/usr/bin/env python3
+"""
+Purpose:
+    ReportBatch Class Definition
+
+    Grade a cohort of candidates from a manifest across a pool of processes
+"""
+
+# Python Library Imports
+import csv
+import json
+import os
+import pathlib
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional
+
+# Local Python Library Imports
+from grader.report.report_python import ReportPython
+
+
+###
+# Constants
+###
+
+
+# Manifest columns/keys, in CSV header order
+MANIFEST_REQUIRED_FIELDS = ("report", "candidate", "source")
+MANIFEST_OPTIONAL_FIELDS = ("package",)
+
+
+###
+# Functions
+###
+
+
+def read_batch_manifest(manifest_path: str) -> List[Dict[str, str]]:
+    """
+    Purpose:
+        Read the candidates to grade from a .csv (with a header row) or .jsonl
+        (one object per line) manifest with report, candidate, source and optionally
+        package for every candidate
+    Args:
+        manifest_path: path to the manifest file
+    Returns:
+        batch_jobs: one dict per candidate, in manifest order
+    Raises:
+        Exception: if the manifest is missing, of an unknown type, a candidate is
+            missing a required field, or two candidates share a report name
+    """
+
+    if not os.path.isfile(manifest_path):
+        raise Exception(f"{manifest_path} is not a valid path to a manifest")
+
+    with open(manifest_path, "r", newline="") as manifest_file_obj:
+        if manifest_path.endswith(".csv"):
+            manifest_rows = list(csv.DictReader(manifest_file_obj))
+        elif manifest_path.endswith((".jsonl", ".json")):
+            manifest_rows = [
+                json.loads(manifest_line)
+                for manifest_line in manifest_file_obj
+                if manifest_line.strip()
+            ]
+        else:
+            raise Exception(f"{manifest_path} is not a .csv or .jsonl manifest")
+
+    batch_jobs = []
+    report_rows = {}
+    for (row_number, manifest_row) in enumerate(manifest_rows, start=1):
+        missing_fields = [
+            field for field in MANIFEST_REQUIRED_FIELDS if not manifest_row.get(field)
+        ]
+        if missing_fields:
+            raise Exception(
+                f"Manifest entry {row_number} is missing {', '.join(missing_fields)}"
+            )
+
+        # Candidates sharing a report would grade into the same directory
+        report_name = manifest_row["report"]
+        if report_name in report_rows:
+            raise Exception(
+                f"Manifest entry {row_number} reuses report {report_name!r} of "
+                f"entry {report_rows[report_name]}"
+            )
+        report_rows[report_name] = row_number
+
+        batch_jobs.append(
+            {
+                field: manifest_row.get(field) or None
+                for field in MANIFEST_REQUIRED_FIELDS + MANIFEST_OPTIONAL_FIELDS
+            }
+        )
+
+    return batch_jobs
+
+
+def check_report_name(report_name: str, base_report_path: str = None) -> None:
+    """
+    Purpose:
+        Check a report name from a manifest or job names a directory directly in
+        base_report_path, so grading it can never write anywhere else
+    Args:
+        report_name: name of the report
+        base_report_path: path to reports to save. Defaults to only checking the
+            name itself
+    Returns:
+        N/A
+    Raises:
+        Exception: if the name is empty, has a path separator or "..", or resolves
+            (through a symlink) outside base_report_path
+    """
+
+    if (
+        not report_name
+        or report_name == "."
+        or ".." in report_name
+        or "/" in report_name
+        or os.sep in report_name
+    ):
+        raise Exception(f"Report name {report_name!r} is not a valid directory name")
+
+    if base_report_path is not None:
+        real_base_report_path = os.path.realpath(base_report_path)
+        real_report_path = os.path.realpath(f"{base_report_path}/{report_name}")
+        if os.path.dirname(real_report_path) != real_base_report_path:
+            raise Exception(
+                f"Report name {report_name!r} resolves outside {base_report_path}"
+            )
+
+
+def grade_batch_job(
+    batch_job: Dict[str, str],
+    base_report_path: str,
+    overwrite: bool = False,
+    concurrent: bool = False,
+    cache_dir: str = None,
+    warm_workers: bool = False,
+    tool_options: Optional[Dict[str, Dict[str, Any]]] = None,
+    tool_names: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Purpose:
+        Generate the report for a single manifest entry. Runs in a pool process, so
+        failures are captured in the result instead of raised
+    Args:
+        batch_job: manifest entry with report, candidate, source and package
+        base_report_path: path to reports to save
+        overwrite: whether or not to overwrite the report if it already exists
+        concurrent: run the grading tools at the same time
+        cache_dir: directory to cache tool results in
+        warm_workers: run the tools on this pool process's warm worker pool
+        tool_options: extra constructor arguments for each tool, by tool name
+        tool_names: tools to run. Defaults to every tool
+    Returns:
+        batch_result: the manifest entry with status, error, report path and timing
+    Raises:
+        N/A
+    """
+
+    batch_result = get_batch_result(batch_job)
+
+    start_time = time.time()
+    try:
+        check_report_name(batch_job["report"], base_report_path)
+        pygrade_report = ReportPython(
+            batch_job["report"],
+            batch_job["candidate"],
+            batch_job["source"],
+            batch_job["package"],
+            base_report_path=base_report_path,
+            concurrent=concurrent,
+            cache_dir=cache_dir,
+            warm_workers=warm_workers,
+            tool_options=tool_options,
+            tool_names=tool_names,
+        )
+        batch_result["report_path"] = pygrade_report.report_path
+        pygrade_report.generate_report(overwrite=overwrite)
+    except Exception as grading_error:
+        fail_batch_result(batch_result, grading_error)
+
+    batch_result["started_at"] = start_time
+    batch_result["duration_seconds"] = round(time.time() - start_time, 3)
+
+    return batch_result
+
+
+def get_batch_result(batch_job: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Purpose:
+        Get the result of a manifest entry before it is graded
+    Args:
+        batch_job: manifest entry with report, candidate, source and package
+    Returns:
+        batch_result: the manifest entry with status, error, report path and timing
+    Raises:
+        N/A
+    """
+
+    batch_result = dict(batch_job)
+    batch_result.update(
+        {
+            "status": "success",
+            "error": None,
+            "report_path": None,
+            "started_at": None,
+            "duration_seconds": None,
+        }
+    )
+
+    return batch_result
+
+
+def fail_batch_result(batch_result: Dict[str, Any], grading_error: Exception) -> None:
+    """
+    Purpose:
+        Mark a manifest entry's result as failed with the error that stopped it
+    Args:
+        batch_result: result of the manifest entry
+        grading_error: exception that stopped grading
+    Returns:
+        N/A
+    Raises:
+        N/A
+    """
+
+    batch_result["status"] = "failed"
+    batch_result["error"] = "".join(
+        traceback.format_exception_only(type(grading_error), grading_error)
+    ).strip()
+
+
+###
+# Class Definition
+###
+
+
+class ReportBatch:
+    """
+    Purpose:
+        The ReportBatch Class grades every candidate in a manifest, scheduling one
+        ReportPython per candidate on a bounded process pool
+    """
+
+    ###
+    # Reserved Methods
+    ###
+
+    def __init__(
+        self,
+        manifest_path: str,
+        base_report_path: str = f"{os.path.abspath('./')}/reports",
+        max_workers: int = None,
+        overwrite: bool = False,
+        concurrent: bool = False,
+        cache_dir: str = None,
+        warm_workers: bool = False,
+        tool_options: Optional[Dict[str, Dict[str, Any]]] = None,
+        tool_names: Optional[List[str]] = None,
+    ) -> None:
+        """
+        Purpose:
+            Constructor for a ReportBatch
+        Args:
+            manifest_path: .csv or .jsonl manifest of candidates to grade
+            base_report_path: path to reports to save. Defaults to ./reports
+            max_workers: number of candidates to grade at once. Defaults to the
+                number of cores
+            overwrite: whether or not to overwrite reports that already exist
+            concurrent: run each candidate's grading tools at the same time
+            cache_dir: directory to cache tool results in, shared by every worker
+            warm_workers: run the tools on a warm worker pool in every pool process
+            tool_options: extra constructor arguments for each tool, by tool name
+            tool_names: tools to run for every candidate. Defaults to every tool
+        Returns:
+            N/A
+        Raises:
+            Exception: If the manifest is not valid
+        """
+
+        # Batch Data
+        self.manifest_path = manifest_path
+        self.batch_jobs = read_batch_manifest(manifest_path)
+
+        # Report Data
+        self.base_report_path = base_report_path
+        self.overwrite = overwrite
+        self.concurrent = concurrent
+        self.cache_dir = cache_dir
+        self.warm_workers = warm_workers
+        self.tool_options = tool_options or {}
+        self.tool_names = tool_names
+
+        # Execution Data
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def __repr__(self) -> str:
+        """
+        Purpose:
+            String Representation for a ReportBatch
+        Args:
+            N/A
+        Returns:
+            report_batch_repr: manifest and size of the batch
+        Raises:
+            N/A
+        """
+
+        return f"<ReportBatch {self.manifest_path} ({len(self.batch_jobs)} reports)>"
+
+    ###
+    # Properties
+    ###
+
+    @property
+    def batch_summary_path(self) -> str:
+        """
+        Purpose:
+            Batch Summary Filename
+        Args:
+            N/A
+        Returns:
+            batch_summary_path: name of the batch summary file that is stored
+        Raises:
+            N/A
+        """
+
+        return f"{self.base_report_path}/batch_summary.json"
+
+    ###
+    # Batch Operations
+    ###
+
+    def run(
+        self, progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Purpose:
+            Grade every candidate in the manifest and store the batch summary
+        Args:
+            progress_callback: called after each candidate finishes with completed,
+                total, elapsed_seconds, eta_seconds and the candidate's result
+        Returns:
+            batch_summary: per candidate status and timings plus batch totals
+        Raises:
+            N/A
+        """
+
+        pathlib.Path(self.base_report_path).mkdir(parents=True, exist_ok=True)
+
+        start_time = time.time()
+        completed_jobs = 0
+        completed_results = {}
+        with ProcessPoolExecutor(max_workers=self.max_workers) as batch_executor:
+            batch_futures = {
+                batch_executor.submit(
+                    grade_batch_job,
+                    batch_job,
+                    self.base_report_path,
+                    overwrite=self.overwrite,
+                    concurrent=self.concurrent,
+                    cache_dir=self.cache_dir,
+                    warm_workers=self.warm_workers,
+                    tool_options=self.tool_options,
+                    tool_names=self.tool_names,
+                ): batch_job
+                for batch_job in self.batch_jobs
+            }
+
+            for batch_future in as_completed(batch_futures):
+                try:
+                    completed_results[batch_future] = batch_future.result()
+                except BrokenProcessPool as pool_error:
+                    # A pool process died (e.g. killed for memory), so every
+                    # entry the pool had not finished fails with it
+                    completed_results[batch_future] = get_batch_result(
+                        batch_futures[batch_future]
+                    )
+                    fail_batch_result(completed_results[batch_future], pool_error)
+
+                completed_jobs += 1
+                if progress_callback:
+                    elapsed_seconds = time.time() - start_time
+                    remaining_jobs = len(self.batch_jobs) - completed_jobs
+                    progress_callback(
+                        {
+                            "completed": completed_jobs,
+                            "total": len(self.batch_jobs),
+                            "elapsed_seconds": elapsed_seconds,
+                            "eta_seconds": (
+                                elapsed_seconds / completed_jobs * remaining_jobs
+                            ),
+                            "result": completed_results[batch_future],
+                        }
+                    )
+
+        # Keep the summary in manifest order regardless of completion order
+        batch_results = [
+            completed_results[batch_future] for batch_future in batch_futures
+        ]
+        succeeded_jobs = sum(
+            1 for batch_result in batch_results if batch_result["status"] == "success"
+        )
+
+        batch_summary = {
+            "manifest": self.manifest_path,
+            "workers": self.max_workers,
+            "total": len(batch_results),
+            "succeeded": succeeded_jobs,
+            "failed": len(batch_results) - succeeded_jobs,
+            "duration_seconds": round(time.time() - start_time, 3),
+            "reports": batch_results,
+        }
+        self.store_batch_summary(batch_summary)
+
+        return batch_summary
+
+    def store_batch_summary(self, batch_summary: Dict[str, Any]) -> None:
+        """
+        Purpose:
+            Store the batch summary
+        Args:
+            batch_summary: per candidate status and timings plus batch totals
+        Returns:
+            N/A
+        Raises:
+            Exception: if summary storing fails
+        """
+
+        with open(self.batch_summary_path, "w") as batch_summary_file_obj:
+            json.dump(
+                batch_summary,
+                batch_summary_file_obj,
+                sort_keys=True,
+                indent=2,
+                separators=(",", ": "),
+            )
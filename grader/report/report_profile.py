@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Purpose:
+    Report Profile Functions
+
+    Named grading profiles, choosing which tools a report runs and with which
+    options, args and flags. The built in profiles can be overridden, and others
+    added, from a JSON file of profiles by name
+"""
+
+# Python Library Imports
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+# Local Python Library Imports
+from grader.report.report_python import TOOL_CLASSES
+
+
+###
+# Constants
+###
+
+
+# Built in profiles. Each has the tools to run (every tool if missing) and tool
+# options by tool name: constructor arguments, except for args (merged over the
+# tool's default args by name, null to remove one) and flags (added to the
+# tool's default flags)
+DEFAULT_REPORT_PROFILES = {
+    # First pass screening: tests and the fast linters, without pylint's
+    # duplicate-code check that compares every module with every other
+    "screen": {
+        "tools": ["flake8", "pylint", "pytest"],
+        "tool_options": {"pylint": {"args": {"--disable": "duplicate-code"}}},
+    },
+    # Every tool with its defaults, as when no profile is given
+    "full": {"tools": list(TOOL_CLASSES), "tool_options": {}},
+    # Every tool, with strict type checking and branch coverage
+    "deep": {
+        "tools": list(TOOL_CLASSES),
+        "tool_options": {
+            "mypy": {"flags": ["--strict"]},
+            "pytest": {"coverage_branch": True},
+        },
+    },
+}
+
+
+###
+# Functions
+###
+
+
+def load_report_profiles(profile_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Purpose:
+        Load the grading profiles
+    Args:
+        profile_path: JSON file of profiles by name, overriding the built in
+            profiles of the same name
+    Returns:
+        report_profiles: every profile, by name
+    Raises:
+        Exception: if the profile file is missing or not a JSON object
+    """
+
+    report_profiles = dict(DEFAULT_REPORT_PROFILES)
+    if profile_path is None:
+        return report_profiles
+
+    if not os.path.isfile(profile_path):
+        raise Exception(f"{profile_path} is not a valid path to profiles")
+
+    with open(profile_path, "r") as profile_file_obj:
+        file_profiles = json.load(profile_file_obj)
+    if not isinstance(file_profiles, dict):
+        raise Exception(f"{profile_path} is not a JSON object of profiles by name")
+    report_profiles.update(file_profiles)
+
+    return report_profiles
+
+
+def get_report_profile(
+    profile_name: str, profile_path: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Purpose:
+        Get a grading profile by name, checking its tools are known
+    Args:
+        profile_name: name of the profile
+        profile_path: JSON file of profiles by name, see load_report_profiles
+    Returns:
+        report_profile: tools and tool_options of the profile
+    Raises:
+        Exception: if the profile is unknown or names an unknown tool
+    """
+
+    report_profiles = load_report_profiles(profile_path)
+    if profile_name not in report_profiles:
+        raise Exception(
+            f"Unknown profile {profile_name}, expected one of: "
+            f"{', '.join(sorted(report_profiles))}"
+        )
+
+    report_profile = {
+        "tools": list(TOOL_CLASSES),
+        "tool_options": {},
+        **report_profiles[profile_name],
+    }
+    profile_tool_names = set(report_profile["tools"]) | set(
+        report_profile["tool_options"]
+    )
+    unknown_tool_names = sorted(profile_tool_names - set(TOOL_CLASSES))
+    if unknown_tool_names:
+        raise Exception(
+            f"Profile {profile_name} has unknown tools: {', '.join(unknown_tool_names)}"
+        )
+
+    return report_profile
+
+
+def merge_tool_args(
+    tool_args: List[Tuple[str, Any]], arg_overrides: Dict[str, Any]
+) -> List[Tuple[str, Any]]:
+    """
+    Purpose:
+        Override a tool's args by name
+    Args:
+        tool_args: (arg, value) pairs of the tool
+        arg_overrides: values by arg, None to remove the arg
+    Returns:
+        merged_args: tool_args with the overridden values, any args they did not
+            have appended in order
+    Raises:
+        N/A
+    """
+
+    merged_args = [
+        (arg, arg_overrides.get(arg, value))
+        for (arg, value) in tool_args
+        if arg_overrides.get(arg, value) is not None
+    ]
+    for (arg, value) in arg_overrides.items():
+        if value is not None and arg not in dict(tool_args):
+            merged_args.append((arg, value))
+
+    return merged_args
+
+
+def get_profile_tool_options(
+    report_profile: Dict[str, Any],
+    tool_options: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Purpose:
+        Build the per tool constructor arguments of a profile, resolving its args
+        and flags against each tool's defaults
+    Args:
+        report_profile: profile from get_report_profile
+        tool_options: constructor arguments that take precedence over the
+            profile's (from the command line), by tool name
+    Returns:
+        tool_options: extra constructor arguments for each tool, by tool name
+    Raises:
+        N/A
+    """
+
+    profile_tool_options = {}
+    for (tool_name, profile_options) in report_profile["tool_options"].items():
+        tool_class = TOOL_CLASSES[tool_name]
+        profile_options = dict(profile_options)
+        if "args" in profile_options:
+            profile_options["args"] = merge_tool_args(
+                tool_class.default_args, profile_options["args"]
+            )
+        if "flags" in profile_options:
+            profile_options["flags"] = list(tool_class.default_flags) + [
+                flag
+                for flag in profile_options["flags"]
+                if flag not in tool_class.default_flags
+            ]
+        profile_tool_options[tool_name] = profile_options
+
+    for (tool_name, options) in (tool_options or {}).items():
+        profile_tool_options.setdefault(tool_name, {}).update(options)
+
+    return profile_tool_options
@@ -7,22 +7,172 @@ Purpose:
 """
 
 # Python Library Imports
+import copy
+import hashlib
 import json
 import os
 import pathlib
-from typing import Any, Dict
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 
 # Local Python Library Imports
 import grader.subprocess.subprocess as subprocess
+from grader.cache.cache import ResultCache, hash_source_tree
 from grader.artifacts.report_templates.report_python import (
+    report_python_html_section_templates,
+    report_python_html_skipped_template,
     report_python_html_template,
+    report_python_md_section_templates,
+    report_python_md_skipped_template,
     report_python_md_template,
+    report_python_sections,
 )
 from grader.flake8.flake8 import Flake8
 from grader.mypy.mypy import Mypy
 from grader.pytest.pytest import Pytest
 from grader.pylint.pylint import Pylint
 from grader.pycodestyle.pycodestyle import Pycodestyle
+from grader.tool.tool import Tool
+from grader.trace.trace import Tracer, trace_span
+from grader.worker.worker import get_warm_worker_pool
+
+
+###
+# Constants
+###
+
+
+# Tool runner classes, by tool name, in the order the tools are run
+TOOL_CLASSES = {
+    "flake8": Flake8,
+    "mypy": Mypy,
+    "pylint": Pylint,
+    "pytest": Pytest,
+    "pycodestyle": Pycodestyle,
+}
+
+# Values of the report data fields tools gained after reports were first stored,
+# by tool name, so raw data stored by an older grader still renders
+REPORT_DATA_DEFAULTS = {
+    "flake8": {"timed_out": False},
+    "mypy": {"timed_out": False},
+    "pylint": {"timed_out": False, "mode": "single process"},
+    "pytest": {
+        "timed_out": False,
+        "mode": "serial",
+        "tests": {"metrics": {"timed_out_tests": 0}, "timed_out_tests_str": "N/A"},
+        "coverage": {"metrics": {"engine": "unknown"}},
+    },
+    "pycodestyle": {"timed_out": False},
+}
+
+
+###
+# Functions
+###
+
+
+def get_report_template_hash() -> str:
+    """
+    Purpose:
+        Hash the report templates, so summaries rendered with other templates can
+        be told apart
+    Args:
+        N/A
+    Returns:
+        template_hash: sha256 of the html and md templates and their sections
+    Raises:
+        N/A
+    """
+
+    report_templates = [
+        report_python_html_template,
+        report_python_html_skipped_template,
+        report_python_md_template,
+        report_python_md_skipped_template,
+    ]
+    for (section_name, _, _) in report_python_sections:
+        report_templates.append(report_python_html_section_templates[section_name])
+        report_templates.append(report_python_md_section_templates[section_name])
+
+    template_hasher = hashlib.sha256()
+    for report_template in report_templates:
+        template_hasher.update(report_template.encode("utf-8"))
+        template_hasher.update(b"\0")
+
+    return template_hasher.hexdigest()
+
+
+def merge_report_data_defaults(
+    report_data: Dict[str, Any], report_defaults: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    Purpose:
+        Fill in the fields report data is missing, at any depth
+    Args:
+        report_data: Dict of parsed and formatted report data
+        report_defaults: default value of each field, nested like report_data
+    Returns:
+        merged_data: copy of report_data with the missing fields filled in
+    Raises:
+        N/A
+    """
+
+    merged_data = dict(report_data)
+    for (field, default_value) in report_defaults.items():
+        if field not in merged_data:
+            merged_data[field] = copy.deepcopy(default_value)
+        elif isinstance(default_value, dict) and isinstance(merged_data[field], dict):
+            merged_data[field] = merge_report_data_defaults(
+                merged_data[field], default_value
+            )
+
+    return merged_data
+
+
+def render_report_template(
+    report_data: Dict[str, Any],
+    report_template: str,
+    section_templates: Dict[str, str],
+    skipped_template: str,
+) -> str:
+    """
+    Purpose:
+        Render a report summary, with the sections of tools that were not run
+        rendered as skipped. Fields of REPORT_DATA_DEFAULTS missing from the data
+        of a tool that was run are rendered with their defaults
+    Args:
+        report_data: Dict of parsed and formatted report data
+        report_template: template of the report, with a field for each section
+        section_templates: template of each section, by section name
+        skipped_template: template of a section whose tool was not run
+    Returns:
+        report_summary: the rendered report
+    Raises:
+        KeyError: if the report data is missing a field of a tool that was run
+    """
+
+    report_data = merge_report_data_defaults(
+        report_data,
+        {
+            tool_name: tool_defaults
+            for (tool_name, tool_defaults) in REPORT_DATA_DEFAULTS.items()
+            if tool_name in report_data
+        },
+    )
+
+    report_sections = {}
+    for (section_name, section_title, tool_name) in report_python_sections:
+        if tool_name in report_data:
+            report_section = section_templates[section_name].format(**report_data)
+        else:
+            report_section = skipped_template.format(
+                section_title=section_title, tool_name=tool_name
+            )
+        report_sections[f"{section_name}_section"] = report_section
+
+    return report_template.format(**report_data, **report_sections)
 
 
 ###
@@ -43,10 +193,16 @@ class ReportPython:
     def __init__(
         self,
         report_name: str,
-        candidate_name: str,
-        source_code: str,
+        candidate_name: Optional[str],
+        source_code: Optional[str],
         python_package: str = None,
         base_report_path: str = f"{os.path.abspath('./')}/reports",
+        concurrent: bool = False,
+        max_workers: int = None,
+        cache_dir: str = None,
+        warm_workers: bool = False,
+        tool_options: Optional[Dict[str, Dict[str, Any]]] = None,
+        tool_names: Optional[List[str]] = None,
     ) -> None:
         """
         Purpose:
@@ -54,18 +210,32 @@ class ReportPython:
         Args:
             report_name: unique name for the report
             candidate_name: name of the candidate
-            source_code: path to the code to grade
+            source_code: path to the code to grade, None for a report that is only
+                rendered again from its stored raw data (see for_stored_report)
             python_package: package to assess, defaults to *
             base_report_path: path to reports to save. Defaults to ./reports
+            concurrent: run the tools at the same time instead of one after another
+            max_workers: number of tools to run at once when concurrent. Defaults
+                to one worker per tool
+            cache_dir: directory to cache tool results in. Defaults to no caching
+            warm_workers: run the tools in-process on a warm worker pool instead of
+                spawning a new interpreter for each
+            tool_options: extra constructor arguments for each tool, by tool name
+                (e.g. {"pylint": {"structured": True}})
+            tool_names: tools to run. Defaults to every tool, the sections of the
+                others are rendered as skipped
         Returns:
             N/A
         Raises:
-            Exception: If the path to code is not valid
+            Exception: If the path to code is not valid, or a tool is unknown
         """
 
         # Code Data
         self.source_code = source_code
-        if python_package:
+        if source_code is None:
+            self.code_dir = None
+            self.python_package = python_package or "*"
+        elif python_package:
             self.code_dir = f"{source_code}/{python_package}"
             self.python_package = python_package
         else:
@@ -77,8 +247,32 @@ class ReportPython:
         self.report_name = report_name
         self.candidate_name = candidate_name
 
+        # Execution Data
+        self.concurrent = concurrent
+        self.max_workers = max_workers
+        self.worker_pool = None
+        if warm_workers:
+            self.worker_pool = get_warm_worker_pool()
+        self.tool_options = tool_options or {}
+        if tool_names is None:
+            tool_names = list(TOOL_CLASSES)
+        unknown_tool_names = sorted(set(tool_names) - set(TOOL_CLASSES))
+        if unknown_tool_names:
+            raise Exception(f"Unknown tools: {', '.join(unknown_tool_names)}")
+        self.tool_names = [
+            tool_name for tool_name in TOOL_CLASSES if tool_name in tool_names
+        ]
+
+        # Trace Data, set while generating the report
+        self.tracer = None
+
+        # Cache Data
+        self.result_cache = None
+        if cache_dir:
+            self.result_cache = ResultCache(cache_dir)
+
         # Validate Code Dir Exists
-        if not os.path.isdir(self.code_dir):
+        if self.code_dir is not None and not os.path.isdir(self.code_dir):
             raise Exception(f"{self.code_dir} is not a valid path to code")
 
     def __repr__(self) -> None:
@@ -98,6 +292,29 @@ class ReportPython:
             f"{self.source_code}/{python_package})>"
         )
 
+    @classmethod
+    def for_stored_report(cls, report_path: str) -> "ReportPython":
+        """
+        Purpose:
+            Get the ReportPython of a report that has already been generated, to
+            render it again from its stored raw data without the code it graded
+        Args:
+            report_path: path of the generated report
+        Returns:
+            pygrade_report: report that can be rendered but not generated
+        Raises:
+            N/A
+        """
+
+        report_path = os.path.abspath(report_path)
+
+        return cls(
+            os.path.basename(report_path),
+            None,
+            None,
+            base_report_path=os.path.dirname(report_path),
+        )
+
     ###
     # Properties
     ###
@@ -162,11 +379,62 @@ class ReportPython:
 
         return f"{self.report_path}/report_raw_data.json"
 
+    @property
+    def report_trace_path(self):
+        """
+        Purpose:
+            Trace Filename
+        Args:
+            N/A
+        Returns:
+            report_trace_path: name of the Chrome trace-event file that is stored
+        Raises:
+            N/A
+        """
+
+        return f"{self.report_path}/report_trace.json"
+
+    @property
+    def report_render_path(self):
+        """
+        Purpose:
+            Render State Filename
+        Args:
+            N/A
+        Returns:
+            report_render_path: name of the file recording the templates the
+                summaries were rendered with
+        Raises:
+            N/A
+        """
+
+        return f"{self.report_path}/report_render.json"
+
+    @property
+    def generated_paths(self) -> Tuple[str, ...]:
+        """
+        Purpose:
+            Directories grading writes to, never part of the code being graded
+            even when they are under it
+        Args:
+            N/A
+        Returns:
+            generated_paths: the base report path and the cache directory, if any
+        Raises:
+            N/A
+        """
+
+        generated_paths = (self.base_report_path,)
+        if self.result_cache:
+            generated_paths += (self.result_cache.cache_dir,)
+
+        return generated_paths
+
     ###
     # Report Operations
     ###
 
-    def generate_report(self, overwrite: bool = False) -> None:
+    def generate_report(self, overwrite: bool = False) -> Dict[str, Any]:
         """
         Purpose:
             Generate the Full Report
@@ -175,11 +443,14 @@ class ReportPython:
         Args:
             overwrite: whether or not to overwrite the file if it already exists
         Returns:
-            N/A
+            report_data: Dict of parsed and formatted report data
         Raises:
             Exception: if report exists and overwrite is false
         """
 
+        if self.source_code is None:
+            raise Exception(f"Report {self.report_name} has no code to grade")
+
         # Ensuring path doesn't already exist
         if os.path.isdir(self.report_path) and not overwrite:
             raise Exception(f"Report {self.report_name} already exists")
@@ -187,47 +458,268 @@ class ReportPython:
         # Create the path
         pathlib.Path(self.report_path).mkdir(parents=True, exist_ok=True)
 
-        # Get Pure Report Data
-        report_data = self.get_report_data()
+        self.tracer = Tracer(f"{self.report_name} ({self.candidate_name})")
+        with self.tracer.span("generate", "report"):
+
+            # Get Pure Report Data
+            with self.tracer.span("run_tools", "report"):
+                report_data = self.get_report_data()
+
+            # Store Data. The raw data's timings stop short of writing it
+            self.store_report_summary(report_data)
+            report_data["timings"] = self.tracer.get_phase_timings()
+            self.store_report_raw_data(report_data)
+            self.store_report_render()
+
+        self.tracer.store_trace(self.report_trace_path)
+
+        return report_data
+
+    def refresh_report(
+        self, report_data: Dict[str, Any], tool_names: List[str]
+    ) -> Dict[str, Any]:
+        """
+        Purpose:
+            Re-run some of the tools of a generated report and store the report
+            again, keeping the other tools' results from report_data
+        Args:
+            report_data: Dict of parsed and formatted report data, as generated
+            tool_names: tools to run again
+        Returns:
+            report_data: the refreshed report data
+        Raises:
+            Exception: if any of the report components fail
+        """
+
+        self.tracer = Tracer(f"{self.report_name} ({self.candidate_name})")
+        with self.tracer.span("refresh", "report"):
+
+            with self.tracer.span("run_tools", "report"):
+                tool_report_data = self.get_report_data(tool_names)
+
+            report_data = dict(report_data)
+            report_data["cache"] = dict(report_data.get("cache", {}))
+            report_data["cache"].update(tool_report_data.pop("cache"))
+            report_data.update(tool_report_data)
+
+            self.store_report_summary(report_data)
+            report_data["timings"] = self.tracer.get_phase_timings()
+            self.store_report_raw_data(report_data)
+            self.store_report_render()
+
+        self.tracer.store_trace(self.report_trace_path)
+
+        return report_data
+
+    def render_report(self, force: bool = False) -> bool:
+        """
+        Purpose:
+            Render the summaries of a generated report again from its stored raw
+            data, without running any tools. Summaries that are already current
+            (rendered from the same raw data with the same templates) are kept
+        Args:
+            force: render the summaries even if they are current
+        Returns:
+            rendered: whether the summaries were rendered, False if current
+        Raises:
+            Exception: if the report has no raw data, or rendering fails
+        """
+
+        if not force and self.is_report_summary_current():
+            return False
+
+        if not os.path.isfile(self.report_raw_data_path):
+            raise Exception(f"Report {self.report_name} has no raw data to render")
+
+        with open(self.report_raw_data_path, "r") as raw_data_file_obj:
+            report_data = json.load(raw_data_file_obj)
 
-        # Store Data
         self.store_report_summary(report_data)
-        self.store_report_raw_data(report_data)
+        self.store_report_render()
+
+        return True
 
-    def get_report_data(self) -> Dict[str, Any]:
+    def is_report_summary_current(self) -> bool:
         """
         Purpose:
-            Gather Data for the report. Will run each component and get parsed data
+            Check whether the summaries were rendered with the current templates
+            from the raw data as it is stored now
         Args:
             N/A
         Returns:
-            report_data: Dict of parsed and formatted report data
+            summary_current: whether rendering again would change nothing
+        Raises:
+            N/A
+        """
+
+        try:
+            with open(self.report_render_path, "r") as render_file_obj:
+                render_state = json.load(render_file_obj)
+            raw_data_hash = self.get_report_raw_data_hash()
+        except (OSError, ValueError):
+            return False
+
+        return (
+            render_state.get("template_hash") == get_report_template_hash()
+            and render_state.get("raw_data_hash") == raw_data_hash
+            and os.path.isfile(self.report_html_summary_path)
+            and os.path.isfile(self.report_md_summary_path)
+        )
+
+    def get_tool_runners(self) -> Dict[str, Tool]:
+        """
+        Purpose:
+            Set Up a runner for every tool the report runs, set to run on this
+            report's worker pool and tracer
+        Args:
+            N/A
+        Returns:
+            tool_runners: runner for each tool, by tool name
+        Raises:
+            N/A
+        """
+
+        tool_runners = {}
+        for tool_name in self.tool_names:
+            # Pytest also stores its html/coverage reports with the report
+            tool_args = [self.source_code]
+            if tool_name == "pytest":
+                tool_args.append(self.report_path)
+            tool_runners[tool_name] = TOOL_CLASSES[tool_name](
+                *tool_args,
+                python_package=self.python_package,
+                **self.tool_options.get(tool_name, {}),
+            )
+
+        for tool_runner in tool_runners.values():
+            tool_runner.worker_pool = self.worker_pool
+            tool_runner.tracer = self.tracer
+
+        return tool_runners
+
+    def get_report_data(self, tool_names: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Purpose:
+            Gather Data for the report. Will run each component and get parsed data
+        Args:
+            tool_names: tools to run. Defaults to every tool the report runs
+        Returns:
+            report_data: Dict of parsed and formatted report data, with a section
+                for each tool run
         Raises:
             Exception: if any of the report components fail
         """
 
         # Set Up Runners
-        flake8_runner = Flake8(self.source_code, python_package=self.python_package)
-        mypy_runner = Mypy(self.source_code, python_package=self.python_package)
-        pylint_runner = Pylint(self.source_code, python_package=self.python_package)
-        pytest_runner = Pytest(
-            self.source_code, self.report_path, python_package=self.python_package
-        )
-        pycodestyle_runner = Pycodestyle(
-            self.source_code, python_package=self.python_package
+        tool_runners = self.get_tool_runners()
+        if tool_names is not None:
+            tool_runners = {
+                tool_name: tool_runner
+                for (tool_name, tool_runner) in tool_runners.items()
+                if tool_name in tool_names
+            }
+
+        # Pycodestyle derived from flake8 has to wait for flake8's results
+        derive_pycodestyle = (
+            "pycodestyle" in tool_runners
+            and "flake8" in tool_runners
+            and tool_runners["pycodestyle"].from_flake8
         )
+        if derive_pycodestyle:
+            pycodestyle_runner = tool_runners.pop("pycodestyle")
+
+        # Hash the code once for every tool's cache lookup
+        source_hash = None
+        if self.result_cache:
+            source_hash = hash_source_tree(self.source_code, self.generated_paths)
+
+        tool_results = {}
+        if self.concurrent and tool_runners:
+            # Tools only read the code and spend their time in a subprocess, so
+            # threads are enough to run them side by side
+            with ThreadPoolExecutor(
+                max_workers=self.max_workers or len(tool_runners)
+            ) as tool_executor:
+                tool_futures = {
+                    tool_name: tool_executor.submit(
+                        self.run_tool, tool_runner, source_hash
+                    )
+                    for (tool_name, tool_runner) in tool_runners.items()
+                }
+                for (tool_name, tool_future) in tool_futures.items():
+                    tool_results[tool_name] = tool_future.result()
+        else:
+            for (tool_name, tool_runner) in tool_runners.items():
+                tool_results[tool_name] = self.run_tool(tool_runner, source_hash)
+
+        if derive_pycodestyle:
+            (flake8_output, _) = tool_results["flake8"]
+            tool_results["pycodestyle"] = self.derive_pycodestyle(
+                pycodestyle_runner, tool_runners["flake8"], flake8_output, source_hash
+            )
 
-        report_data = {
-            "candidate": {"name": self.candidate_name},
-            "flake8": flake8_runner.run(),
-            "mypy": mypy_runner.run(),
-            "pylint": pylint_runner.run(),
-            "pytest": pytest_runner.run(),
-            "pycodestyle": pycodestyle_runner.run(),
-        }
+        report_data = {"candidate": {"name": self.candidate_name}, "cache": {}}
+        for (tool_name, (tool_output, cache_status)) in tool_results.items():
+            report_data[tool_name] = tool_output
+            report_data["cache"][tool_name] = cache_status
 
         return report_data
 
+    def run_tool(
+        self, tool_runner: Tool, source_hash: Optional[str] = None
+    ) -> Tuple[Dict[str, Any], str]:
+        """
+        Purpose:
+            Run a single tool, going through the result cache if there is one
+        Args:
+            tool_runner: tool to run
+            source_hash: hash of the source code, required when caching
+        Returns:
+            tool_output: parsed output from the tool
+            cache_status: "hit", "miss", "incremental (...)" or "disabled"
+        Raises:
+            Exception: if the tool fails
+        """
+
+        with trace_span(self.tracer, "execute", tool_runner.name):
+            if not self.result_cache:
+                return (tool_runner.run(), "disabled")
+
+            return self.result_cache.run_tool(tool_runner, source_hash)
+
+    def derive_pycodestyle(
+        self,
+        pycodestyle_runner: Pycodestyle,
+        flake8_runner: Flake8,
+        flake8_output: Dict[str, Any],
+        source_hash: Optional[str] = None,
+    ) -> Tuple[Dict[str, Any], str]:
+        """
+        Purpose:
+            Get the pycodestyle results from the flake8 run, running pycodestyle
+            only if they cannot be derived
+        Args:
+            pycodestyle_runner: pycodestyle to derive or run
+            flake8_runner: flake8 that was run
+            flake8_output: parsed output from flake8_runner
+            source_hash: hash of the source code, required when caching
+        Returns:
+            tool_output: parsed output for pycodestyle
+            cache_status: "derived (flake8)", or run_tool's status if pycodestyle
+                had to be run
+        Raises:
+            Exception: if pycodestyle fails
+        """
+
+        with trace_span(self.tracer, "derive", pycodestyle_runner.name):
+            pycodestyle_output = pycodestyle_runner.derive_from_flake8(
+                flake8_runner, flake8_output
+            )
+        if pycodestyle_output is None:
+            return self.run_tool(pycodestyle_runner, source_hash)
+
+        return (pycodestyle_output, "derived (flake8)")
+
     def store_report_summary(self, report_data: Dict[str, Any]) -> None:
         """
         Purpose:
@@ -240,16 +732,23 @@ class ReportPython:
             Exception: if report storing fails
         """
 
-        with open(self.report_html_summary_path, "w") as report_html_summary_file_obj:
-            report_html_summary_file_obj.write(
-                report_python_html_template.format(**report_data)
+        with trace_span(self.tracer, "render", "report"):
+            report_html_summary = render_report_template(
+                report_data,
+                report_python_html_template,
+                report_python_html_section_templates,
+                report_python_html_skipped_template,
             )
-
-        with open(self.report_md_summary_path, "w") as report_md_summary_file_obj:
-            report_md_summary_file_obj.write(
-                report_python_md_template.format(**report_data)
+            report_md_summary = render_report_template(
+                report_data,
+                report_python_md_template,
+                report_python_md_section_templates,
+                report_python_md_skipped_template,
             )
 
+        self.store_report_file(self.report_html_summary_path, report_html_summary)
+        self.store_report_file(self.report_md_summary_path, report_md_summary)
+
     def store_report_raw_data(self, report_data: Dict[str, Any]) -> None:
         """
         Purpose:
@@ -262,11 +761,67 @@ class ReportPython:
             Exception: if report storing fails
         """
 
-        with open(self.report_raw_data_path, "w") as report_raw_data_file_obj:
-            json.dump(
-                report_data,
-                report_raw_data_file_obj,
-                sort_keys=True,
-                indent=2,
-                separators=(",", ": "),
+        with trace_span(self.tracer, "write_raw_data", "report"):
+            self.store_report_file(
+                self.report_raw_data_path,
+                json.dumps(
+                    report_data, sort_keys=True, indent=2, separators=(",", ": ")
+                ),
             )
+
+    def get_report_raw_data_hash(self) -> str:
+        """
+        Purpose:
+            Hash the stored raw data
+        Args:
+            N/A
+        Returns:
+            raw_data_hash: sha256 of the raw data file
+        Raises:
+            OSError: if the raw data cannot be read
+        """
+
+        with open(self.report_raw_data_path, "rb") as raw_data_file_obj:
+            return hashlib.sha256(raw_data_file_obj.read()).hexdigest()
+
+    def store_report_render(self) -> None:
+        """
+        Purpose:
+            Record the templates and raw data the summaries were rendered from
+        Args:
+            N/A
+        Returns:
+            N/A
+        Raises:
+            Exception: if report storing fails
+        """
+
+        self.store_report_file(
+            self.report_render_path,
+            json.dumps(
+                {
+                    "template_hash": get_report_template_hash(),
+                    "raw_data_hash": self.get_report_raw_data_hash(),
+                }
+            ),
+        )
+
+    def store_report_file(self, report_file_path: str, report_file_data: str) -> None:
+        """
+        Purpose:
+            Write a report file atomically, so it is never seen half written when
+            a report is stored over an existing one
+        Args:
+            report_file_path: path of the report file
+            report_file_data: contents of the report file
+        Returns:
+            N/A
+        Raises:
+            Exception: if report storing fails
+        """
+
+        # Opened like the file itself, so it gets the same permissions
+        report_file_tmp_path = f"{report_file_path}.{uuid.uuid4().hex}.tmp"
+        with open(report_file_tmp_path, "w") as report_file_obj:
+            report_file_obj.write(report_file_data)
+        os.replace(report_file_tmp_path, report_file_path)
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Purpose:
+    ReportRender Class Definition
+
+    Render the summaries of generated reports again from their stored raw data,
+    across a pool of processes, without running any tools
+"""
+
+# Python Library Imports
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+# Local Python Library Imports
+from grader.report.report_python import ReportPython, get_report_template_hash
+
+
+###
+# Constants
+###
+
+
+# Reports handed to a pool process at a time, rendering one is quick
+RENDER_CHUNK_SIZE = 16
+
+
+###
+# Functions
+###
+
+
+def find_report_paths(base_report_path: str) -> List[str]:
+    """
+    Purpose:
+        Find the generated reports in a reports directory
+    Args:
+        base_report_path: path the reports were saved to
+    Returns:
+        report_paths: sorted paths of every report with stored raw data
+    Raises:
+        Exception: if the reports directory is missing
+    """
+
+    if not os.path.isdir(base_report_path):
+        raise Exception(f"{base_report_path} is not a valid path to reports")
+
+    report_paths = []
+    with os.scandir(base_report_path) as report_entries:
+        for report_entry in report_entries:
+            if report_entry.is_dir() and os.path.isfile(
+                f"{report_entry.path}/report_raw_data.json"
+            ):
+                report_paths.append(report_entry.path)
+
+    return sorted(report_paths)
+
+
+def render_stored_report(report_path: str, force: bool = False) -> Dict[str, Any]:
+    """
+    Purpose:
+        Render the summaries of a single report. Runs in a pool process, so
+        failures are captured in the result instead of raised
+    Args:
+        report_path: path of the generated report
+        force: render the summaries even if they are current
+    Returns:
+        render_result: the report path and name with status ("rendered",
+            "current" or "failed") and error
+    Raises:
+        N/A
+    """
+
+    render_result = {
+        "report": os.path.basename(report_path),
+        "report_path": report_path,
+        "status": "rendered",
+        "error": None,
+    }
+
+    try:
+        pygrade_report = ReportPython.for_stored_report(report_path)
+        if not pygrade_report.render_report(force=force):
+            render_result["status"] = "current"
+    except Exception as render_error:
+        render_result["status"] = "failed"
+        render_result["error"] = "".join(
+            traceback.format_exception_only(type(render_error), render_error)
+        ).strip()
+
+    return render_result
+
+
+###
+# Class Definition
+###
+
+
+class ReportRender:
+    """
+    Purpose:
+        The ReportRender Class renders every report in a reports directory again
+        with the current templates, on a bounded process pool
+    """
+
+    ###
+    # Reserved Methods
+    ###
+
+    def __init__(
+        self,
+        base_report_path: str = f"{os.path.abspath('./')}/reports",
+        report_names: Optional[List[str]] = None,
+        max_workers: int = None,
+        force: bool = False,
+    ) -> None:
+        """
+        Purpose:
+            Constructor for a ReportRender
+        Args:
+            base_report_path: path the reports were saved to. Defaults to ./reports
+            report_names: reports to render. Defaults to every report with raw data
+            max_workers: number of pool processes. Defaults to the number of cores
+            force: render the summaries even if they are current
+        Returns:
+            N/A
+        Raises:
+            Exception: If the reports directory is missing
+        """
+
+        # Report Data
+        self.base_report_path = base_report_path
+        if report_names:
+            self.report_paths = [
+                f"{base_report_path}/{report_name}" for report_name in report_names
+            ]
+        else:
+            self.report_paths = find_report_paths(base_report_path)
+        self.force = force
+
+        # Execution Data
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def __repr__(self) -> str:
+        """
+        Purpose:
+            String Representation for a ReportRender
+        Args:
+            N/A
+        Returns:
+            report_render_repr: reports directory and number of reports
+        Raises:
+            N/A
+        """
+
+        return (
+            f"<ReportRender {self.base_report_path} "
+            f"({len(self.report_paths)} reports)>"
+        )
+
+    ###
+    # Render Operations
+    ###
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Purpose:
+            Render every report that is not current
+        Args:
+            N/A
+        Returns:
+            render_summary: per report status plus totals
+        Raises:
+            N/A
+        """
+
+        start_time = time.time()
+        if self.max_workers == 1 or len(self.report_paths) <= 1:
+            render_results = [
+                render_stored_report(report_path, self.force)
+                for report_path in self.report_paths
+            ]
+        else:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as render_executor:
+                render_results = list(
+                    render_executor.map(
+                        render_stored_report,
+                        self.report_paths,
+                        [self.force] * len(self.report_paths),
+                        chunksize=RENDER_CHUNK_SIZE,
+                    )
+                )
+
+        render_summary = {
+            "base_report_path": self.base_report_path,
+            "template_hash": get_report_template_hash(),
+            "workers": self.max_workers,
+            "total": len(render_results),
+            "duration_seconds": round(time.time() - start_time, 3),
+            "reports": render_results,
+        }
+        for render_status in ("rendered", "current", "failed"):
+            render_summary[render_status] = sum(
+                1
+                for render_result in render_results
+                if render_result["status"] == render_status
+            )
+
+        return render_summary
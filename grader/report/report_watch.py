@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Purpose:
+    ReportWatch Class Definition
+
+    Keep a report up to date while the candidate's code changes, re-running only
+    the tools whose inputs changed
+"""
+
+# Python Library Imports
+import threading
+import time
+import traceback
+from typing import Any, Callable, Dict, List, Optional
+
+# Local Python Library Imports
+from grader.report.report_python import ReportPython
+from grader.watch.source_watcher import (
+    get_changed_paths,
+    get_source_snapshot,
+    get_source_watcher,
+)
+
+
+###
+# Constants
+###
+
+
+# Seconds without changes before a burst of writes is graded
+DEFAULT_DEBOUNCE_SECONDS = 0.5
+
+# Seconds between checks of whether the watch was stopped
+STOP_CHECK_INTERVAL = 1.0
+
+
+###
+# Class Definition
+###
+
+
+class ReportWatch:
+    """
+    Purpose:
+        The ReportWatch Class generates a report, then refreshes it each time the
+        source code settles after a change. Each refresh re-runs the tools whose
+        results can depend on a changed file and keeps the others' results
+    """
+
+    ###
+    # Reserved Methods
+    ###
+
+    def __init__(
+        self,
+        pygrade_report: ReportPython,
+        debounce_seconds: float = DEFAULT_DEBOUNCE_SECONDS,
+        polling: bool = False,
+    ) -> None:
+        """
+        Purpose:
+            Constructor for a ReportWatch
+        Args:
+            pygrade_report: report to generate and keep refreshing
+            debounce_seconds: seconds without changes before a burst of writes is
+                graded
+            polling: poll the source code for changes even if inotify is available
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        # Report Data
+        self.pygrade_report = pygrade_report
+        self.report_data = None
+
+        # Watch Data
+        self.debounce_seconds = debounce_seconds
+        self.polling = polling
+        self.stopping = threading.Event()
+
+    def __repr__(self) -> str:
+        """
+        Purpose:
+            String Representation for a ReportWatch
+        Args:
+            N/A
+        Returns:
+            report_watch_repr: report and code being watched
+        Raises:
+            N/A
+        """
+
+        return (
+            f"<ReportWatch {self.pygrade_report.report_name} "
+            f"({self.pygrade_report.source_code})>"
+        )
+
+    ###
+    # Watch Operations
+    ###
+
+    def run(
+        self,
+        overwrite: bool = False,
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> None:
+        """
+        Purpose:
+            Generate the report, then refresh it on every change until stopped
+        Args:
+            overwrite: whether or not to overwrite the report if it already exists
+            progress_callback: called after the report is generated and after
+                every change with the watch_result of each
+        Returns:
+            N/A
+        Raises:
+            Exception: if the report exists and overwrite is false, or the first
+                report cannot be generated. Later failures are reported through
+                progress_callback and the watch goes on
+        """
+
+        source_code = self.pygrade_report.source_code
+        generated_paths = self.pygrade_report.generated_paths
+        source_watcher = get_source_watcher(
+            source_code, polling=self.polling, excluded_paths=generated_paths
+        )
+        try:
+            source_snapshot = get_source_snapshot(source_code, generated_paths)
+            start_time = time.time()
+            self.report_data = self.pygrade_report.generate_report(overwrite=overwrite)
+            if progress_callback:
+                progress_callback(
+                    self.get_watch_result(
+                        start_time,
+                        watcher=source_watcher.name,
+                        tools=sorted(self.pygrade_report.get_tool_runners()),
+                    )
+                )
+
+            while not self.stopping.is_set():
+                if not source_watcher.wait(STOP_CHECK_INTERVAL):
+                    continue
+                # Grade once the burst of writes is over
+                while source_watcher.wait(self.debounce_seconds):
+                    pass
+
+                new_snapshot = get_source_snapshot(source_code, generated_paths)
+                changed_paths = get_changed_paths(source_snapshot, new_snapshot)
+                source_snapshot = new_snapshot
+                if changed_paths:
+                    watch_result = self.refresh(changed_paths)
+                    if progress_callback:
+                        progress_callback(watch_result)
+        finally:
+            source_watcher.close()
+
+    def refresh(self, changed_paths: List[str]) -> Dict[str, Any]:
+        """
+        Purpose:
+            Re-run the tools that can be affected by changed files and store the
+            refreshed report
+        Args:
+            changed_paths: paths relative to the source code that changed
+        Returns:
+            watch_result: changed_paths, tools re-run, status, error and timing
+        Raises:
+            N/A
+        """
+
+        start_time = time.time()
+        tool_names = self.get_affected_tools(changed_paths)
+        if not tool_names:
+            return self.get_watch_result(
+                start_time, changed_paths=changed_paths, status="unchanged"
+            )
+
+        try:
+            self.report_data = self.pygrade_report.refresh_report(
+                self.report_data, tool_names
+            )
+        except Exception as grading_error:
+            return self.get_watch_result(
+                start_time,
+                changed_paths=changed_paths,
+                tools=tool_names,
+                status="failed",
+                error="".join(
+                    traceback.format_exception_only(type(grading_error), grading_error)
+                ).strip(),
+            )
+
+        return self.get_watch_result(
+            start_time, changed_paths=changed_paths, tools=tool_names
+        )
+
+    def get_affected_tools(self, changed_paths: List[str]) -> List[str]:
+        """
+        Purpose:
+            Find the tools whose results can depend on changed files
+        Args:
+            changed_paths: paths relative to the source code that changed
+        Returns:
+            tool_names: sorted names of the tools to re-run
+        Raises:
+            N/A
+        """
+
+        tool_runners = self.pygrade_report.get_tool_runners()
+
+        return sorted(
+            tool_name
+            for (tool_name, tool_runner) in tool_runners.items()
+            if any(map(tool_runner.is_input_path, changed_paths))
+        )
+
+    def stop(self) -> None:
+        """
+        Purpose:
+            Stop watching, once the refresh in progress (if any) is done
+        Args:
+            N/A
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        self.stopping.set()
+
+    @staticmethod
+    def get_watch_result(start_time: float, **watch_result: Any) -> Dict[str, Any]:
+        """
+        Purpose:
+            Build the result of generating or refreshing the report
+        Args:
+            start_time: when the generation/refresh started
+            watch_result: fields of the result
+        Returns:
+            watch_result: changed_paths, tools, watcher, status, error and
+                duration_seconds, with defaults for the fields not given
+        Raises:
+            N/A
+        """
+
+        watch_result = {
+            "changed_paths": [],
+            "tools": [],
+            "watcher": None,
+            "status": "success",
+            "error": None,
+            **watch_result,
+        }
+        watch_result["duration_seconds"] = round(time.time() - start_time, 3)
+
+        return watch_result
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Purpose:
+    Test File for report_batch.py
+"""
+
+# Python Library Imports
+import json
+import os
+import pytest
+
+# Local Python Library Imports
+from grader.report import report_batch
+from grader.report.report_batch import (
+    ReportBatch,
+    check_report_name,
+    grade_batch_job,
+    read_batch_manifest,
+)
+
+
+###########
+# Mocks/Fixtures
+###########
+
+
+def exit_batch_job(batch_job: dict, *args: object, **kwargs: object) -> dict:
+    """
+    Purpose:
+        Stand in for grade_batch_job, killing the pool process grading the
+        "crash" report like the OOM killer would
+    Args:
+        batch_job: manifest entry
+        args: grade_batch_job's args
+        kwargs: grade_batch_job's keyword args
+    Return:
+        batch_result: the result of grading any other report
+    Raises:
+        N/A
+    """
+
+    if batch_job["report"] == "crash":
+        os._exit(1)
+
+    return grade_batch_job(batch_job, *args, **kwargs)
+
+
+###########
+# Tests: Report Batch
+###########
+
+
+###
+# read_batch_manifest()
+###
+
+
+def test_read_batch_manifest_csv(tmp_path: object) -> int:
+    """
+    Purpose:
+        Test a CSV manifest is read in order with the package optional
+    Args:
+        tmp_path: pytest tmp_path fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    # Example Data
+    test_manifest_path = tmp_path / "manifest.csv"
+    test_manifest_path.write_text(
+        "report,candidate,source,package\n"
+        "first,Mr. Test,./first,example\n"
+        "second,Ms. Test,./second,\n"
+    )
+
+    # Read Manifest
+    test_batch_jobs = read_batch_manifest(str(test_manifest_path))
+    assert test_batch_jobs == [
+        {
+            "report": "first",
+            "candidate": "Mr. Test",
+            "source": "./first",
+            "package": "example",
+        },
+        {
+            "report": "second",
+            "candidate": "Ms. Test",
+            "source": "./second",
+            "package": None,
+        },
+    ]
+
+
+def test_read_batch_manifest_duplicate_report(tmp_path: object) -> int:
+    """
+    Purpose:
+        Test a manifest grading two candidates into the same report is rejected
+    Args:
+        tmp_path: pytest tmp_path fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    # Example Data
+    test_manifest_path = tmp_path / "manifest.csv"
+    test_manifest_path.write_text(
+        "report,candidate,source\n"
+        "first,Mr. Test,./first\n"
+        "second,Ms. Test,./second\n"
+        "first,Dr. Test,./third\n"
+    )
+
+    # Read Manifest
+    with pytest.raises(Exception, match="entry 3 reuses report 'first' of entry 1"):
+        read_batch_manifest(str(test_manifest_path))
+
+
+###
+# check_report_name()
+###
+
+
+def test_check_report_name(tmp_path: object) -> int:
+    """
+    Purpose:
+        Test report names must be a directory directly in the reports directory
+    Args:
+        tmp_path: pytest tmp_path fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    # Example Data: a report symlinked out of the reports directory
+    (tmp_path / "reports").mkdir()
+    os.symlink(str(tmp_path), str(tmp_path / "reports" / "linked"))
+
+    check_report_name("first", str(tmp_path / "reports"))
+    for test_report in ["", ".", "..", "../first", "first/second", "/tmp", "a..b"]:
+        with pytest.raises(Exception, match="not a valid directory name"):
+            check_report_name(test_report, str(tmp_path / "reports"))
+    with pytest.raises(Exception, match="resolves outside"):
+        check_report_name("linked", str(tmp_path / "reports"))
+
+
+###
+# grade_batch_job()
+###
+
+
+def test_grade_batch_job_report_name(tmp_path: object) -> int:
+    """
+    Purpose:
+        Test a job whose report would be written outside the reports directory
+        fails without writing anything
+    Args:
+        tmp_path: pytest tmp_path fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    # Example Data
+    (tmp_path / "example").mkdir()
+    test_batch_job = {
+        "report": "../escaped",
+        "candidate": "Mr. Test",
+        "source": str(tmp_path / "example"),
+        "package": None,
+    }
+
+    test_batch_result = grade_batch_job(test_batch_job, str(tmp_path / "reports"))
+    assert test_batch_result["status"] == "failed"
+    assert "not a valid directory name" in test_batch_result["error"]
+    assert sorted(os.listdir(tmp_path)) == ["example"]
+
+
+###
+# run()
+###
+
+
+def test_ReportBatch_run_failed(tmp_path: object) -> int:
+    """
+    Purpose:
+        Test a candidate that cannot be graded is recorded as failed in the summary
+    Args:
+        tmp_path: pytest tmp_path fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    # Example Data
+    test_manifest_path = tmp_path / "manifest.jsonl"
+    test_manifest_path.write_text(
+        json.dumps({"report": "missing", "candidate": "Mr. Test", "source": "./nope"})
+    )
+    test_progress = []
+
+    # Run Batch
+    test_report_batch = ReportBatch(
+        str(test_manifest_path),
+        base_report_path=str(tmp_path / "reports"),
+        max_workers=1,
+    )
+    test_batch_summary = test_report_batch.run(progress_callback=test_progress.append)
+    assert test_batch_summary["total"] == 1
+    assert test_batch_summary["failed"] == 1
+    assert test_batch_summary["reports"][0]["status"] == "failed"
+    assert "not a valid path" in test_batch_summary["reports"][0]["error"]
+    assert test_progress[0]["completed"] == 1
+    with open(test_report_batch.batch_summary_path) as test_summary_file_obj:
+        assert json.load(test_summary_file_obj) == test_batch_summary
+
+
+def test_ReportBatch_run_broken_pool(tmp_path: object, monkeypatch: object) -> int:
+    """
+    Purpose:
+        Test a pool process dying fails the entries left unfinished and the batch
+        summary is still stored
+    Args:
+        tmp_path: pytest tmp_path fixture
+        monkeypatch: pytest monkeypatch fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    # Example Data
+    test_manifest_path = tmp_path / "manifest.jsonl"
+    test_manifest_path.write_text(
+        "\n".join(
+            json.dumps({"report": test_report, "candidate": "Mr. Test", "source": "./"})
+            for test_report in ("crash", "after")
+        )
+    )
+    monkeypatch.setattr(report_batch, "grade_batch_job", exit_batch_job)
+
+    # Run Batch
+    test_report_batch = ReportBatch(
+        str(test_manifest_path),
+        base_report_path=str(tmp_path / "reports"),
+        max_workers=1,
+    )
+    test_batch_summary = test_report_batch.run()
+    assert test_batch_summary["total"] == 2
+    assert test_batch_summary["failed"] == 2
+    assert [test_result["report"] for test_result in test_batch_summary["reports"]] == [
+        "crash",
+        "after",
+    ]
+    assert "BrokenProcessPool" in test_batch_summary["reports"][0]["error"]
+    assert test_batch_summary["reports"][0]["duration_seconds"] is None
+    with open(test_report_batch.batch_summary_path) as test_summary_file_obj:
+        assert json.load(test_summary_file_obj) == test_batch_summary
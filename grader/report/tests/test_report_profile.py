@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Purpose:
+    Test File for report_profile.py
+"""
+
+# Python Library Imports
+import json
+import pytest
+
+# Local Python Library Imports
+from grader.pylint.pylint import Pylint
+from grader.report.report_profile import (
+    get_profile_tool_options,
+    get_report_profile,
+    merge_tool_args,
+)
+
+
+###########
+# Mocks/Fixtures
+###########
+
+
+# N/A
+
+
+###########
+# Tests: Report Profile
+###########
+
+
+###
+# get_report_profile()
+###
+
+
+def test_get_report_profile(tmp_path: object) -> int:
+    """
+    Purpose:
+        Test built in profiles are found, overridden and added to by a profile
+        file, and unknown profiles and tools are rejected
+    Args:
+        tmp_path: pytest tmp_path fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    assert get_report_profile("screen")["tools"] == ["flake8", "pylint", "pytest"]
+
+    test_profile_path = tmp_path / "profiles.json"
+    test_profile_path.write_text(
+        json.dumps({"screen": {"tools": ["pytest"]}, "lint": {"tools": ["flake8"]}})
+    )
+    test_report_profile = get_report_profile("screen", str(test_profile_path))
+    assert test_report_profile == {"tools": ["pytest"], "tool_options": {}}
+    assert get_report_profile("lint", str(test_profile_path))["tools"] == ["flake8"]
+    assert len(get_report_profile("full", str(test_profile_path))["tools"]) == 5
+
+    with pytest.raises(Exception, match="Unknown profile"):
+        get_report_profile("lint")
+
+    test_profile_path.write_text(json.dumps({"bad": {"tools": ["pytest", "black"]}}))
+    with pytest.raises(Exception, match="unknown tools: black"):
+        get_report_profile("bad", str(test_profile_path))
+
+
+###
+# merge_tool_args()
+###
+
+
+def test_merge_tool_args() -> int:
+    """
+    Purpose:
+        Test args are overridden by name, removed by None and appended if new
+    Args:
+        N/A
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    test_merged_args = merge_tool_args(
+        [("--max-complexity", 10), ("--max-line-length", 88), ("--exclude", "tests")],
+        {"--max-line-length": 100, "--exclude": None, "--select": "E,W"},
+    )
+    assert test_merged_args == [
+        ("--max-complexity", 10),
+        ("--max-line-length", 100),
+        ("--select", "E,W"),
+    ]
+
+
+###
+# get_profile_tool_options()
+###
+
+
+def test_get_profile_tool_options() -> int:
+    """
+    Purpose:
+        Test profile args and flags are resolved against the tool's defaults and
+        the report options take precedence over the profile's
+    Args:
+        N/A
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    test_report_profile = {
+        "tools": ["pylint"],
+        "tool_options": {
+            "pylint": {
+                "args": {"--disable": "duplicate-code"},
+                "flags": ["--exit-zero"],
+                "jobs": 4,
+            }
+        },
+    }
+
+    test_tool_options = get_profile_tool_options(
+        test_report_profile, {"pylint": {"jobs": 2}, "pytest": {"workers": 2}}
+    )
+    assert test_tool_options == {
+        "pylint": {
+            "args": Pylint.default_args + [("--disable", "duplicate-code")],
+            "flags": Pylint.default_flags + ["--exit-zero"],
+            "jobs": 2,
+        },
+        "pytest": {"workers": 2},
+    }
+    assert test_report_profile["tool_options"]["pylint"]["jobs"] == 4
@@ -5,10 +5,18 @@ Purpose:
 """
 
 # Python Library Imports
-# N/A
+import json
+import pytest
 
 # Local Python Library Imports
-from grader.report.report_python import ReportPython
+import grader.report.report_python
+from grader.artifacts.report_templates.report_python import report_python_sections
+from grader.flake8.flake8 import Flake8
+from grader.mypy.mypy import Mypy
+from grader.pycodestyle.pycodestyle import Pycodestyle
+from grader.pylint.pylint import Pylint
+from grader.pytest.pytest import Pytest
+from grader.report.report_python import ReportPython, render_report_template
 
 
 ###########
@@ -16,7 +24,56 @@ from grader.report.report_python import ReportPython
 ###########
 
 
-# N/A
+def mock_tool_runs(monkeypatch: object) -> None:
+    """
+    Purpose:
+        Replace each tool's run() with one returning the tool's name
+    Args:
+        monkeypatch: pytest monkeypatch fixture
+    Return:
+        N/A
+    Raises:
+        N/A
+    """
+
+    for tool_class in (Flake8, Mypy, Pycodestyle, Pylint, Pytest):
+        monkeypatch.setattr(
+            tool_class, "run", lambda tool: {"tool": type(tool).__name__}
+        )
+
+
+def get_old_raw_data() -> dict:
+    """
+    Purpose:
+        Build report raw data as stored by a grader from before the report data
+        had timeouts, modes, timed out tests and coverage engines
+    Args:
+        N/A
+    Return:
+        old_raw_data: raw data of a report with every tool run
+    Raises:
+        N/A
+    """
+
+    old_raw_data = {"candidate": {"name": "Mr. Test"}}
+    for (tool_name, tool_class) in (
+        ("flake8", Flake8),
+        ("mypy", Mypy),
+        ("pylint", Pylint),
+        ("pycodestyle", Pycodestyle),
+    ):
+        old_raw_data[tool_name] = tool_class("./")._parse_output([])
+    old_raw_data["pylint"].pop("mode")
+    old_raw_data["pytest"] = Pytest("./", "./")._parse_output(
+        ["TOTAL                                 10      2    80%"]
+    )
+    old_raw_data["pytest"].pop("mode")
+    old_raw_data["pytest"]["tests"]["metrics"].pop("timed_out_tests")
+    old_raw_data["pytest"]["tests"].pop("timed_out_tests")
+    old_raw_data["pytest"]["tests"].pop("timed_out_tests_str")
+    old_raw_data["pytest"]["coverage"]["metrics"].pop("engine")
+
+    return old_raw_data
 
 
 ###########
@@ -53,3 +110,338 @@ def test_ReportPython___init___base() -> int:
     assert test_report_python.report_name == test_report_name
     assert test_report_python.candidate_name == test_candidate_name
     assert test_report_python.source_code == test_source_code
+
+
+###
+# get_tool_runners()
+###
+
+
+def test_ReportPython_get_tool_runners_tool_names() -> int:
+    """
+    Purpose:
+        Test ReportPython only sets up the tools it runs, and rejects unknown ones
+    Args:
+        N/A
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    test_report_python = ReportPython(
+        "test", "Mr. Test", "./", tool_names=["pytest", "flake8"]
+    )
+    assert test_report_python.tool_names == ["flake8", "pytest"]
+    assert list(test_report_python.get_tool_runners()) == ["flake8", "pytest"]
+
+    with pytest.raises(Exception, match="Unknown tools: black"):
+        ReportPython("test", "Mr. Test", "./", tool_names=["black"])
+
+
+###
+# get_report_data()
+###
+
+
+def test_ReportPython_get_report_data_concurrent(monkeypatch: object) -> int:
+    """
+    Purpose:
+        Test ReportPython gathers the same report data when tools run concurrently
+    Args:
+        monkeypatch: pytest monkeypatch fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    # Example Data
+    mock_tool_runs(monkeypatch)
+    test_report_python = ReportPython("test", "Mr. Test", "./")
+    test_report_python_concurrent = ReportPython(
+        "test", "Mr. Test", "./", concurrent=True, max_workers=2
+    )
+
+    # Get Report Data
+    test_report_data = test_report_python.get_report_data()
+    assert test_report_data["pylint"] == {"tool": "Pylint"}
+    assert test_report_data == test_report_python_concurrent.get_report_data()
+
+
+def test_ReportPython_get_report_data_pycodestyle_from_flake8(
+    monkeypatch: object,
+) -> int:
+    """
+    Purpose:
+        Test ReportPython derives pycodestyle from flake8, running it only when
+        the results cannot be derived
+    Args:
+        monkeypatch: pytest monkeypatch fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    # Example Data
+    mock_tool_runs(monkeypatch)
+    monkeypatch.setattr(
+        Pycodestyle,
+        "derive_from_flake8",
+        lambda tool, flake8_runner, flake8_output: {"derived": flake8_output},
+    )
+    test_report_python = ReportPython(
+        "test",
+        "Mr. Test",
+        "./",
+        concurrent=True,
+        tool_options={"pycodestyle": {"from_flake8": True}},
+    )
+
+    # Get Report Data
+    test_report_data = test_report_python.get_report_data()
+    assert test_report_data["pycodestyle"] == {"derived": {"tool": "Flake8"}}
+    assert test_report_data["cache"]["pycodestyle"] == "derived (flake8)"
+
+    # Fall back to running pycodestyle
+    monkeypatch.setattr(
+        Pycodestyle, "derive_from_flake8", lambda tool, *derive_args: None
+    )
+    test_report_data = test_report_python.get_report_data()
+    assert test_report_data["pycodestyle"] == {"tool": "Pycodestyle"}
+    assert test_report_data["cache"]["pycodestyle"] == "disabled"
+
+
+def test_ReportPython_get_report_data_tool_names(monkeypatch: object) -> int:
+    """
+    Purpose:
+        Test ReportPython only runs the tools asked for, running pycodestyle
+        itself when flake8 is not run to derive it from
+    Args:
+        monkeypatch: pytest monkeypatch fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    mock_tool_runs(monkeypatch)
+    test_report_python = ReportPython(
+        "test", "Mr. Test", "./", tool_options={"pycodestyle": {"from_flake8": True}},
+    )
+
+    test_report_data = test_report_python.get_report_data(["pycodestyle", "pytest"])
+    assert test_report_data == {
+        "candidate": {"name": "Mr. Test"},
+        "cache": {"pycodestyle": "disabled", "pytest": "disabled"},
+        "pycodestyle": {"tool": "Pycodestyle"},
+        "pytest": {"tool": "Pytest"},
+    }
+
+
+def test_ReportPython_get_report_data_no_tools(monkeypatch: object) -> int:
+    """
+    Purpose:
+        Test ReportPython gathers an empty report when no tool is run, running
+        tools concurrently or not
+    Args:
+        monkeypatch: pytest monkeypatch fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    mock_tool_runs(monkeypatch)
+    for test_concurrent in (False, True):
+        test_report_python = ReportPython(
+            "test", "Mr. Test", "./", concurrent=test_concurrent
+        )
+
+        test_report_data = test_report_python.get_report_data([])
+        assert test_report_data == {"candidate": {"name": "Mr. Test"}, "cache": {}}
+
+
+###
+# refresh_report()
+###
+
+
+def test_ReportPython_refresh_report(tmp_path: object, monkeypatch: object) -> int:
+    """
+    Purpose:
+        Test refreshing a report re-runs only the tools asked for and stores the
+        merged report data
+    Args:
+        tmp_path: pytest tmp_path fixture
+        monkeypatch: pytest monkeypatch fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    mock_tool_runs(monkeypatch)
+    test_summaries = []
+    monkeypatch.setattr(
+        ReportPython,
+        "store_report_summary",
+        lambda report, report_data: test_summaries.append(dict(report_data)),
+    )
+    test_report_python = ReportPython(
+        "test", "Mr. Test", "./", base_report_path=str(tmp_path)
+    )
+    (tmp_path / "test").mkdir()
+    test_report_data = {
+        "candidate": {"name": "Mr. Test"},
+        "cache": {"pylint": "hit", "pytest": "hit"},
+        "pylint": {"tool": "old"},
+        "pytest": {"tool": "old"},
+    }
+
+    test_refreshed_data = test_report_python.refresh_report(
+        test_report_data, ["pytest"]
+    )
+    assert test_refreshed_data["pylint"] == {"tool": "old"}
+    assert test_refreshed_data["pytest"] == {"tool": "Pytest"}
+    assert test_refreshed_data["cache"] == {"pylint": "hit", "pytest": "disabled"}
+    assert "timings" in test_refreshed_data
+    assert test_report_data["pytest"] == {"tool": "old"}
+
+    assert test_summaries[0]["pytest"] == {"tool": "Pytest"}
+    with open(test_report_python.report_raw_data_path) as test_raw_data_file_obj:
+        assert json.load(test_raw_data_file_obj) == test_refreshed_data
+    assert sorted(path.name for path in (tmp_path / "test").iterdir()) == [
+        "report_raw_data.json",
+        "report_render.json",
+        "report_trace.json",
+    ]
+
+
+###
+# render_report()
+###
+
+
+def test_ReportPython_render_report(tmp_path: object, monkeypatch: object) -> int:
+    """
+    Purpose:
+        Test a stored report is rendered from its raw data only when its templates
+        or raw data changed since it was last rendered
+    Args:
+        tmp_path: pytest tmp_path fixture
+        monkeypatch: pytest monkeypatch fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    test_report_module = grader.report.report_python
+    monkeypatch.setattr(
+        test_report_module, "report_python_html_template", "<b>{candidate[name]}</b>"
+    )
+    monkeypatch.setattr(
+        test_report_module, "report_python_md_template", "**{candidate[name]}**"
+    )
+    (tmp_path / "test").mkdir()
+    (tmp_path / "test" / "report_raw_data.json").write_text(
+        json.dumps({"candidate": {"name": "Mr. Test"}})
+    )
+
+    test_report_python = ReportPython.for_stored_report(str(tmp_path / "test"))
+    assert test_report_python.report_name == "test"
+    assert test_report_python.report_path == str(tmp_path / "test")
+    assert test_report_python.render_report()
+    assert (tmp_path / "test" / "report_summary.md").read_text() == "**Mr. Test**"
+    assert not test_report_python.render_report()
+    assert test_report_python.render_report(force=True)
+
+    monkeypatch.setattr(
+        test_report_module, "report_python_md_template", "# {candidate[name]}"
+    )
+    assert test_report_python.render_report()
+    assert (tmp_path / "test" / "report_summary.md").read_text() == "# Mr. Test"
+    assert not test_report_python.render_report()
+
+    (tmp_path / "test" / "report_raw_data.json").write_text(
+        json.dumps({"candidate": {"name": "Ms. Test"}})
+    )
+    assert test_report_python.render_report()
+    assert (tmp_path / "test" / "report_summary.md").read_text() == "# Ms. Test"
+
+
+def test_ReportPython_render_report_old_raw_data(tmp_path: object) -> int:
+    """
+    Purpose:
+        Test raw data stored before fields were added to the report data renders
+        with the real templates, the missing fields filled in with defaults
+    Args:
+        tmp_path: pytest tmp_path fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    # Example Data
+    (tmp_path / "test").mkdir()
+    (tmp_path / "test" / "report_raw_data.json").write_text(
+        json.dumps(get_old_raw_data())
+    )
+
+    test_report_python = ReportPython.for_stored_report(str(tmp_path / "test"))
+    assert test_report_python.render_report()
+    test_report_summary = (tmp_path / "test" / "report_summary.md").read_text()
+    assert "**Timed Out**: False" in test_report_summary
+    assert "**Mode**: single process" in test_report_summary
+    assert "**Mode**: serial" in test_report_summary
+    assert "**Timed Out Tests**: 0" in test_report_summary
+    assert "**Coverage Engine**: unknown" in test_report_summary
+    assert (tmp_path / "test" / "report_summary.html").exists()
+
+    # Stored raw data is rendered as it is, not rewritten
+    assert (
+        "mode"
+        not in json.loads((tmp_path / "test" / "report_raw_data.json").read_text())[
+            "pytest"
+        ]
+    )
+
+
+###
+# render_report_template()
+###
+
+
+def test_render_report_template() -> int:
+    """
+    Purpose:
+        Test the sections of tools that were not run are rendered as skipped
+    Args:
+        N/A
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    test_report_data = {
+        "candidate": {"name": "Mr. Test"},
+        "flake8": {"metrics": {"total": 3}},
+    }
+    test_section_templates = {
+        section_name: f"{section_name}: {{{tool_name}[metrics][total]}}\n"
+        for (section_name, _, tool_name) in report_python_sections
+    }
+
+    test_report_summary = render_report_template(
+        test_report_data,
+        "{candidate[name]}\n{tests_section}{mypy_section}{flake8_section}",
+        test_section_templates,
+        "{section_title} skipped ({tool_name})\n",
+    )
+    assert test_report_summary == (
+        "Mr. Test\nTests skipped (pytest)\nMypy skipped (mypy)\nflake8: 3\n"
+    )
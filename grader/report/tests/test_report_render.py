@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Purpose:
+    Test File for report_render.py
+"""
+
+# Python Library Imports
+import json
+
+# Local Python Library Imports
+import grader.report.report_python
+from grader.report.report_render import ReportRender, find_report_paths
+
+
+###########
+# Mocks/Fixtures
+###########
+
+
+def mock_stored_reports(tmp_path: object, candidate_names: list) -> None:
+    """
+    Purpose:
+        Store the raw data of a report for each candidate under tmp_path
+    Args:
+        tmp_path: pytest tmp_path fixture
+        candidate_names: candidates to store a report for, named after them
+    Return:
+        N/A
+    Raises:
+        N/A
+    """
+
+    for candidate_name in candidate_names:
+        (tmp_path / candidate_name).mkdir()
+        (tmp_path / candidate_name / "report_raw_data.json").write_text(
+            json.dumps({"candidate": {"name": candidate_name}})
+        )
+
+
+###########
+# Tests: Report Render
+###########
+
+
+###
+# find_report_paths()
+###
+
+
+def test_find_report_paths(tmp_path: object) -> int:
+    """
+    Purpose:
+        Test only the directories with stored raw data are found as reports
+    Args:
+        tmp_path: pytest tmp_path fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    mock_stored_reports(tmp_path, ["second", "first"])
+    (tmp_path / "partial").mkdir()
+    (tmp_path / "batch_summary.json").write_text("{}")
+
+    assert find_report_paths(str(tmp_path)) == [
+        str(tmp_path / "first"),
+        str(tmp_path / "second"),
+    ]
+
+
+###
+# run()
+###
+
+
+def test_ReportRender_run(tmp_path: object, monkeypatch: object) -> int:
+    """
+    Purpose:
+        Test every report is rendered, then skipped while it is current
+    Args:
+        tmp_path: pytest tmp_path fixture
+        monkeypatch: pytest monkeypatch fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    test_report_module = grader.report.report_python
+    monkeypatch.setattr(
+        test_report_module, "report_python_html_template", "{candidate[name]}"
+    )
+    monkeypatch.setattr(
+        test_report_module, "report_python_md_template", "{candidate[name]}"
+    )
+    mock_stored_reports(tmp_path, ["first", "second"])
+
+    test_render_summary = ReportRender(str(tmp_path), max_workers=1).run()
+    assert test_render_summary["rendered"] == 2
+    assert [
+        test_render_result["status"]
+        for test_render_result in test_render_summary["reports"]
+    ] == ["rendered", "rendered"]
+    assert (tmp_path / "second" / "report_summary.md").read_text() == "second"
+
+    test_render_summary = ReportRender(str(tmp_path), max_workers=1).run()
+    assert (test_render_summary["rendered"], test_render_summary["current"]) == (0, 2)
+
+
+def test_ReportRender_run_failed(tmp_path: object) -> int:
+    """
+    Purpose:
+        Test a report that cannot be rendered is recorded as failed by the pool
+    Args:
+        tmp_path: pytest tmp_path fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    test_render_summary = ReportRender(
+        str(tmp_path), report_names=["missing", "other"], max_workers=2
+    ).run()
+    assert test_render_summary["failed"] == 2
+    assert test_render_summary["reports"][0]["report"] == "missing"
+    assert "has no raw data" in test_render_summary["reports"][0]["error"]
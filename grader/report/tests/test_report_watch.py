@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Purpose:
+    Test File for report_watch.py
+"""
+
+# Python Library Imports
+import queue
+import threading
+
+# Local Python Library Imports
+from grader.flake8.flake8 import Flake8
+from grader.mypy.mypy import Mypy
+from grader.pycodestyle.pycodestyle import Pycodestyle
+from grader.pylint.pylint import Pylint
+from grader.pytest.pytest import Pytest
+from grader.report.report_python import ReportPython
+from grader.report.report_watch import ReportWatch
+
+
+###########
+# Mocks/Fixtures
+###########
+
+
+def mock_report_storage(monkeypatch: object) -> None:
+    """
+    Purpose:
+        Replace each tool's run() with one returning the tool's name, and skip
+        rendering the summaries from those results
+    Args:
+        monkeypatch: pytest monkeypatch fixture
+    Return:
+        N/A
+    Raises:
+        N/A
+    """
+
+    for tool_class in (Flake8, Mypy, Pycodestyle, Pylint, Pytest):
+        monkeypatch.setattr(
+            tool_class, "run", lambda tool: {"tool": type(tool).__name__}
+        )
+    monkeypatch.setattr(
+        ReportPython, "store_report_summary", lambda report, report_data: None
+    )
+
+
+###########
+# Tests: Report Watch
+###########
+
+
+###
+# get_affected_tools()
+###
+
+
+def test_ReportWatch_get_affected_tools(tmp_path: object) -> int:
+    """
+    Purpose:
+        Test test changes only re-run pytest, package changes every tool
+    Args:
+        tmp_path: pytest tmp_path fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    (tmp_path / "example").mkdir()
+    test_report_watch = ReportWatch(
+        ReportPython("test", "Mr. Test", str(tmp_path), python_package="example")
+    )
+
+    assert test_report_watch.get_affected_tools(["tests/test_module.py"]) == ["pytest"]
+    assert test_report_watch.get_affected_tools(["example/module.py"]) == [
+        "flake8",
+        "mypy",
+        "pycodestyle",
+        "pylint",
+        "pytest",
+    ]
+    assert test_report_watch.get_affected_tools(["setup.cfg"]) == [
+        "flake8",
+        "mypy",
+        "pycodestyle",
+        "pylint",
+        "pytest",
+    ]
+
+
+###
+# run()
+###
+
+
+def test_ReportWatch_run(tmp_path: object, monkeypatch: object) -> int:
+    """
+    Purpose:
+        Test the report is generated, then refreshed once per burst of changes
+        with only the affected tools
+    Args:
+        tmp_path: pytest tmp_path fixture
+        monkeypatch: pytest monkeypatch fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    mock_report_storage(monkeypatch)
+    test_source_code = tmp_path / "source"
+    (test_source_code / "example").mkdir(parents=True)
+    (test_source_code / "tests").mkdir()
+    test_report_watch = ReportWatch(
+        ReportPython(
+            "test",
+            "Mr. Test",
+            str(test_source_code),
+            python_package="example",
+            base_report_path=str(tmp_path / "reports"),
+        ),
+        debounce_seconds=0.2,
+    )
+
+    test_results = queue.Queue()
+    test_watch_thread = threading.Thread(
+        target=test_report_watch.run, kwargs={"progress_callback": test_results.put}
+    )
+    test_watch_thread.start()
+    try:
+        test_result = test_results.get(timeout=10)
+        assert test_result["status"] == "success"
+        assert test_result["watcher"] in ("inotify", "polling")
+        assert len(test_result["tools"]) == 5
+
+        # A burst of test writes is one refresh, of pytest alone
+        for test_number in range(3):
+            (test_source_code / "tests" / "test_module.py").write_text(
+                f"def test_{test_number}():\n    pass\n"
+            )
+        test_result = test_results.get(timeout=10)
+        assert test_result["changed_paths"] == ["tests/test_module.py"]
+        assert test_result["tools"] == ["pytest"]
+        assert test_result["status"] == "success"
+
+        (test_source_code / "example" / "module.py").write_text("module = 1\n")
+        test_result = test_results.get(timeout=10)
+        assert test_result["changed_paths"] == ["example/module.py"]
+        assert len(test_result["tools"]) == 5
+        assert test_results.empty()
+    finally:
+        test_report_watch.stop()
+        test_watch_thread.join()
+
+    assert test_report_watch.report_data["pytest"] == {"tool": "Pytest"}
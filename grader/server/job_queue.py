@@ -0,0 +1,276 @@
+"""
+Purpose:
+    JobQueue Class Definition
+
+    Grading jobs persisted on disk, one JSON record per job, so a report server
+    picks its queue back up after a restart
+"""
+
+# Python Library Imports
+import json
+import os
+import pathlib
+import tempfile
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+# Local Python Library Imports
+from grader.report.report_batch import (
+    MANIFEST_OPTIONAL_FIELDS,
+    MANIFEST_REQUIRED_FIELDS,
+    check_report_name,
+)
+
+
+###
+# Constants
+###
+
+
+# Job statuses, a job is never updated again once it is finished
+QUEUED_JOB_STATUS = "queued"
+RUNNING_JOB_STATUS = "running"
+FINISHED_JOB_STATUSES = ("success", "failed", "cancelled")
+
+
+###
+# Class Definition
+###
+
+
+class JobQueue:
+    """
+    Purpose:
+        The JobQueue Class holds every grading job a report server was given, in
+        submission order. Every change is written through to disk (atomically, a
+        crash never leaves a half written record) before it is visible
+    """
+
+    ###
+    # Reserved Methods
+    ###
+
+    def __init__(self, queue_dir: str) -> None:
+        """
+        Purpose:
+            Constructor for a JobQueue, loading the jobs already on disk
+        Args:
+            queue_dir: directory the job records are stored in
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        self.queue_dir = os.path.abspath(queue_dir)
+        pathlib.Path(self.jobs_dir).mkdir(parents=True, exist_ok=True)
+
+        self.queue_lock = threading.Lock()
+        self.jobs = {}
+        for job_file_name in os.listdir(self.jobs_dir):
+            if not job_file_name.endswith(".json"):
+                # Left by a crash while writing
+                continue
+            with open(f"{self.jobs_dir}/{job_file_name}", "r") as job_file_obj:
+                job_record = json.load(job_file_obj)
+            self.jobs[job_record["job_id"]] = job_record
+
+        self.next_sequence = 1 + max(
+            [job_record["sequence"] for job_record in self.jobs.values()], default=0
+        )
+
+    def __repr__(self) -> str:
+        """
+        Purpose:
+            String Representation for a JobQueue
+        Args:
+            N/A
+        Returns:
+            job_queue_repr: directory and size of the queue
+        Raises:
+            N/A
+        """
+
+        return f"<JobQueue {self.queue_dir} ({len(self.jobs)} jobs)>"
+
+    ###
+    # Properties
+    ###
+
+    @property
+    def jobs_dir(self) -> str:
+        """
+        Purpose:
+            Directory of the job records
+        Args:
+            N/A
+        Returns:
+            jobs_dir: directory with one {job_id}.json per job
+        Raises:
+            N/A
+        """
+
+        return f"{self.queue_dir}/jobs"
+
+    ###
+    # Queue Operations
+    ###
+
+    def submit(
+        self, job_fields: Dict[str, Any], base_report_path: str = None
+    ) -> Dict[str, Any]:
+        """
+        Purpose:
+            Queue a job to grade a candidate
+        Args:
+            job_fields: report, candidate, source and optionally package, like a
+                batch manifest entry, and overwrite
+            base_report_path: path the report will be saved to, the report must
+                resolve to a directory directly in it
+        Returns:
+            job_record: the queued job
+        Raises:
+            Exception: if the job is missing a required field or its report is not
+                a valid directory name
+        """
+
+        missing_fields = [
+            field for field in MANIFEST_REQUIRED_FIELDS if not job_fields.get(field)
+        ]
+        if missing_fields:
+            raise Exception(f"Job is missing {', '.join(missing_fields)}")
+        check_report_name(str(job_fields["report"]), base_report_path)
+
+        with self.queue_lock:
+            job_record = {
+                field: job_fields.get(field) or None
+                for field in MANIFEST_REQUIRED_FIELDS + MANIFEST_OPTIONAL_FIELDS
+            }
+            job_record.update(
+                {
+                    "job_id": uuid.uuid4().hex,
+                    "sequence": self.next_sequence,
+                    "status": QUEUED_JOB_STATUS,
+                    "overwrite": bool(job_fields.get("overwrite")),
+                    "submitted_at": time.time(),
+                    "started_at": None,
+                    "finished_at": None,
+                    "duration_seconds": None,
+                    "error": None,
+                    "report_path": None,
+                    "restarts": 0,
+                }
+            )
+            self.next_sequence += 1
+            self._store(job_record)
+
+        return dict(job_record)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Purpose:
+            Get a job
+        Args:
+            job_id: id of the job
+        Returns:
+            job_record: copy of the job, None if there is no such job
+        Raises:
+            N/A
+        """
+
+        with self.queue_lock:
+            job_record = self.jobs.get(job_id)
+            return dict(job_record) if job_record else None
+
+    def list_jobs(self, status: str = None) -> List[Dict[str, Any]]:
+        """
+        Purpose:
+            List jobs in submission order
+        Args:
+            status: only list jobs with this status. Defaults to every job
+        Returns:
+            job_records: copies of the jobs
+        Raises:
+            N/A
+        """
+
+        with self.queue_lock:
+            return [
+                dict(job_record)
+                for job_record in sorted(
+                    self.jobs.values(), key=lambda job_record: job_record["sequence"]
+                )
+                if status is None or job_record["status"] == status
+            ]
+
+    def update(self, job_id: str, **job_changes: Any) -> Dict[str, Any]:
+        """
+        Purpose:
+            Change and store a job that has not finished
+        Args:
+            job_id: id of the job
+            job_changes: fields to change
+        Returns:
+            job_record: copy of the changed job
+        Raises:
+            KeyError: if there is no such job
+            Exception: if the job has already finished
+        """
+
+        with self.queue_lock:
+            job_record = dict(self.jobs[job_id])
+            if job_record["status"] in FINISHED_JOB_STATUSES:
+                raise Exception(f"Job {job_id} is already {job_record['status']}")
+
+            job_record.update(job_changes)
+            self._store(job_record)
+
+        return dict(job_record)
+
+    def requeue_running(self) -> List[Dict[str, Any]]:
+        """
+        Purpose:
+            Queue jobs that were running when the server stopped again, to be
+            regraded (overwriting whatever part of the report they wrote)
+        Args:
+            N/A
+        Returns:
+            job_records: copies of the requeued jobs
+        Raises:
+            N/A
+        """
+
+        return [
+            self.update(
+                job_record["job_id"],
+                status=QUEUED_JOB_STATUS,
+                started_at=None,
+                overwrite=True,
+                restarts=job_record["restarts"] + 1,
+            )
+            for job_record in self.list_jobs(status=RUNNING_JOB_STATUS)
+        ]
+
+    def _store(self, job_record: Dict[str, Any]) -> None:
+        """
+        Purpose:
+            Write a job's record to disk, then make it visible. Called with the
+            queue lock held
+        Args:
+            job_record: the job
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        (job_fd, job_tmp_path) = tempfile.mkstemp(dir=self.jobs_dir, suffix=".tmp")
+        with os.fdopen(job_fd, "w") as job_file_obj:
+            json.dump(job_record, job_file_obj, sort_keys=True, indent=2)
+            job_file_obj.flush()
+            os.fsync(job_file_obj.fileno())
+        os.replace(job_tmp_path, f"{self.jobs_dir}/{job_record['job_id']}.json")
+
+        self.jobs[job_record["job_id"]] = job_record
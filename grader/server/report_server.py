@@ -0,0 +1,847 @@
+"""
+Purpose:
+    ReportServer Class Definition
+
+    Long running grading daemon. Jobs are submitted, checked, fetched and
+    cancelled over HTTP on a Unix domain socket and/or a localhost port, queued
+    on disk and graded on a bounded pool of job processes forked from a server
+    that has already imported the grader (and the tools, with warm workers)
+"""
+
+# Python Library Imports
+import http.server
+import json
+import multiprocessing
+import multiprocessing.connection
+import os
+import pathlib
+import signal
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Local Python Library Imports
+import grader.subprocess.subprocess as subprocess
+from grader.server.job_queue import (
+    FINISHED_JOB_STATUSES,
+    QUEUED_JOB_STATUS,
+    RUNNING_JOB_STATUS,
+    JobQueue,
+)
+from grader.worker.worker import WARM_TOOL_MODULES
+
+
+###
+# Constants
+###
+
+
+# Modules the job processes' fork server imports up front
+JOB_PRELOAD_MODULES = ("__main__", "grader.report.report_python")
+
+# Seconds between checks of the queue for jobs to start
+DISPATCH_INTERVAL = 0.2
+
+# Seconds a job process has to exit after being terminated
+JOB_TERMINATE_TIMEOUT = 10
+
+# Report file and content type served for each ?format= of a job's report
+REPORT_FORMATS = {
+    "markdown": ("report_summary.md", "text/markdown; charset=utf-8"),
+    "html": ("report_summary.html", "text/html; charset=utf-8"),
+    "raw": ("report_raw_data.json", "application/json"),
+}
+
+
+###
+# Functions
+###
+
+
+def stop_report_job(signum: int, frame: Any) -> None:
+    """
+    Purpose:
+        SIGTERM handler of a job process. Each tool runs in a session of its own
+        and concurrent tools run in threads the exit waits for, so kill the tools'
+        process groups before exiting
+    Args:
+        signum: signal received
+        frame: frame the signal interrupted
+    Returns:
+        N/A
+    Raises:
+        SystemExit: always
+    """
+
+    subprocess.stop_process_groups()
+    sys.exit(1)
+
+
+def run_report_job(
+    job_record: Dict[str, Any],
+    result_path: str,
+    base_report_path: str,
+    overwrite: bool = False,
+    concurrent: bool = False,
+    cache_dir: str = None,
+    warm_workers: bool = False,
+    tool_options: Optional[Dict[str, Dict[str, Any]]] = None,
+    tool_names: Optional[List[str]] = None,
+) -> None:
+    """
+    Purpose:
+        Grade a job in a job process and store the result for the server. Being
+        terminated (cancelled) kills the process groups of the tools it started,
+        then exits the process through the grading code
+    Args:
+        job_record: the job, with report, candidate, source, package and overwrite
+        result_path: path to store the result at
+        base_report_path: path to reports to save
+        overwrite: whether or not to overwrite the report if it already exists
+        concurrent: run the grading tools at the same time
+        cache_dir: directory to cache tool results in
+        warm_workers: run the tools on workers forked from this process
+        tool_options: extra constructor arguments for each tool, by tool name
+        tool_names: tools to run. Defaults to every tool
+    Returns:
+        N/A
+    Raises:
+        N/A
+    """
+
+    signal.signal(signal.SIGTERM, stop_report_job)
+
+    # Loaded by the fork server already, so free to import here
+    import grader.worker.worker as worker
+    from grader.report.report_batch import grade_batch_job
+
+    if warm_workers:
+        # The tool packages were preloaded into this process, fork runs from it
+        # instead of starting another fork server per job
+        worker.SHARED_WORKER_POOL = worker.WarmWorkerPool(start_method="fork")
+
+    job_result = grade_batch_job(
+        job_record,
+        base_report_path,
+        overwrite=overwrite or job_record.get("overwrite", False),
+        concurrent=concurrent,
+        cache_dir=cache_dir,
+        warm_workers=warm_workers,
+        tool_options=tool_options,
+        tool_names=tool_names,
+    )
+
+    (result_fd, result_tmp_path) = tempfile.mkstemp(
+        dir=os.path.dirname(result_path), suffix=".tmp"
+    )
+    with os.fdopen(result_fd, "w") as result_file_obj:
+        json.dump(job_result, result_file_obj)
+    os.replace(result_tmp_path, result_path)
+
+
+###
+# Class Definition
+###
+
+
+class ReportServer:
+    """
+    Purpose:
+        The ReportServer Class keeps a resident grading process. Jobs are graded
+        one process per job, at most max_workers at once, in submission order.
+        Jobs that were queued or running when the server stopped are picked back
+        up when it starts again
+    """
+
+    ###
+    # Reserved Methods
+    ###
+
+    def __init__(
+        self,
+        queue_dir: str,
+        base_report_path: str = f"{os.path.abspath('./')}/reports",
+        socket_path: str = None,
+        host: str = "127.0.0.1",
+        port: int = None,
+        max_workers: int = None,
+        overwrite: bool = False,
+        concurrent: bool = False,
+        cache_dir: str = None,
+        warm_workers: bool = False,
+        tool_options: Optional[Dict[str, Dict[str, Any]]] = None,
+        tool_names: Optional[List[str]] = None,
+        job_runner: Callable[..., None] = run_report_job,
+    ) -> None:
+        """
+        Purpose:
+            Constructor for a ReportServer
+        Args:
+            queue_dir: directory to persist the job queue in
+            base_report_path: path to reports to save. Defaults to ./reports
+            socket_path: Unix domain socket to serve the job API on
+            host: interface to serve the job API on with port
+            port: port to serve the job API on, 0 for any free port
+            max_workers: number of jobs to grade at once. Defaults to the number
+                of cores
+            overwrite: whether or not to overwrite reports that already exist
+            concurrent: run each job's grading tools at the same time
+            cache_dir: directory to cache tool results in, shared by every job
+            warm_workers: preload the tools and run them on workers forked from
+                each job process
+            tool_options: extra constructor arguments for each tool, by tool name
+            tool_names: tools to run for every job. Defaults to every tool
+            job_runner: function grading a job in a job process, like
+                run_report_job
+        Returns:
+            N/A
+        Raises:
+            Exception: if neither a socket nor a port is given
+        """
+
+        if socket_path is None and port is None:
+            raise Exception("ReportServer needs a socket path and/or a port")
+
+        # Queue Data
+        self.job_queue = JobQueue(queue_dir)
+
+        # Report Data
+        self.base_report_path = base_report_path
+        self.overwrite = overwrite
+        self.concurrent = concurrent
+        self.cache_dir = cache_dir
+        self.warm_workers = warm_workers
+        self.tool_options = tool_options or {}
+        self.tool_names = tool_names
+
+        # API Data
+        self.socket_path = socket_path
+        self.host = host
+        self.port = port
+        self.http_servers = []
+
+        # Execution Data
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.job_runner = job_runner
+        self.job_processes = {}
+        self.cancelled_job_ids = set()
+        self.jobs_lock = threading.Lock()
+        self.stopping = threading.Event()
+        self.server_threads = []
+
+        self.mp_context = multiprocessing.get_context("forkserver")
+        preload_modules = list(JOB_PRELOAD_MODULES)
+        if warm_workers:
+            preload_modules.extend(WARM_TOOL_MODULES)
+        self.mp_context.set_forkserver_preload(preload_modules)
+
+    def __repr__(self) -> str:
+        """
+        Purpose:
+            String Representation for a ReportServer
+        Args:
+            N/A
+        Returns:
+            report_server_repr: addresses and size of the server
+        Raises:
+            N/A
+        """
+
+        return (
+            f"<ReportServer {', '.join(self.addresses)} "
+            f"({self.max_workers} workers)>"
+        )
+
+    ###
+    # Properties
+    ###
+
+    @property
+    def results_dir(self) -> str:
+        """
+        Purpose:
+            Directory job processes store their results in
+        Args:
+            N/A
+        Returns:
+            results_dir: directory with one {job_id}.json per finished job process
+        Raises:
+            N/A
+        """
+
+        return f"{self.job_queue.queue_dir}/results"
+
+    @property
+    def addresses(self) -> List[str]:
+        """
+        Purpose:
+            Addresses the job API is served on
+        Args:
+            N/A
+        Returns:
+            addresses: unix:PATH and/or http://HOST:PORT, with the bound port once
+                the server has started
+        Raises:
+            N/A
+        """
+
+        addresses = []
+        if self.socket_path is not None:
+            addresses.append(f"unix:{self.socket_path}")
+        if self.port is not None:
+            addresses.append(f"http://{self.host}:{self.port}")
+
+        return addresses
+
+    ###
+    # Server Operations
+    ###
+
+    def start(self) -> None:
+        """
+        Purpose:
+            Requeue jobs interrupted by the last shutdown, then start dispatching
+            jobs and serving the job API in background threads
+        Args:
+            N/A
+        Returns:
+            N/A
+        Raises:
+            OSError: if the socket or port cannot be bound
+        """
+
+        pathlib.Path(self.base_report_path).mkdir(parents=True, exist_ok=True)
+        pathlib.Path(self.results_dir).mkdir(parents=True, exist_ok=True)
+        self.job_queue.requeue_running()
+
+        if self.socket_path is not None:
+            if os.path.exists(self.socket_path):
+                # Left by a server that did not shut down
+                os.remove(self.socket_path)
+            self.http_servers.append(
+                UnixHTTPServer(self.socket_path, ReportRequestHandler)
+            )
+        if self.port is not None:
+            tcp_server = http.server.ThreadingHTTPServer(
+                (self.host, self.port), ReportRequestHandler
+            )
+            tcp_server.daemon_threads = True
+            self.port = tcp_server.server_address[1]
+            self.http_servers.append(tcp_server)
+
+        self.server_threads = [threading.Thread(target=self.dispatch_jobs, daemon=True)]
+        for http_server in self.http_servers:
+            http_server.report_server = self
+            self.server_threads.append(
+                threading.Thread(target=http_server.serve_forever, daemon=True)
+            )
+        for server_thread in self.server_threads:
+            server_thread.start()
+
+    def shutdown(self) -> None:
+        """
+        Purpose:
+            Stop serving the job API and dispatching jobs. Running jobs are
+            terminated and left queued, to be graded again on the next start
+        Args:
+            N/A
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        self.stopping.set()
+        for http_server in self.http_servers:
+            http_server.shutdown()
+            http_server.server_close()
+        if self.socket_path is not None and os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+        for server_thread in self.server_threads:
+            server_thread.join()
+
+        with self.jobs_lock:
+            job_processes = dict(self.job_processes)
+        for (job_id, job_process) in job_processes.items():
+            self.stop_job_process(job_process)
+            self.reap_job(job_id, job_process)
+        self.job_queue.requeue_running()
+
+    ###
+    # Job Operations
+    ###
+
+    def submit_job(self, job_fields: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Purpose:
+            Queue a job
+        Args:
+            job_fields: report, candidate, source and optionally package and
+                overwrite
+        Returns:
+            job_record: the queued job
+        Raises:
+            Exception: if the job is missing a required field or its report is not
+                a valid directory name
+        """
+
+        return self.job_queue.submit(job_fields, self.base_report_path)
+
+    def cancel_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Purpose:
+            Cancel a job. A queued job is never started, a running job's process
+            (and the tools it started) is terminated
+        Args:
+            job_id: id of the job
+        Returns:
+            job_record: the job, None if there is no such job. A running job is
+                marked cancelled once its process has exited
+        Raises:
+            N/A
+        """
+
+        with self.jobs_lock:
+            job_record = self.job_queue.get(job_id)
+            if job_record is None or job_record["status"] in FINISHED_JOB_STATUSES:
+                return job_record
+
+            if job_id not in self.job_processes:
+                return self.job_queue.update(
+                    job_id, status="cancelled", finished_at=time.time()
+                )
+
+            self.cancelled_job_ids.add(job_id)
+            job_process = self.job_processes[job_id]
+
+        self.stop_job_process(job_process)
+        self.reap_job(job_id, job_process)
+
+        return self.job_queue.get(job_id)
+
+    def dispatch_jobs(self) -> None:
+        """
+        Purpose:
+            Start queued jobs in submission order whenever fewer than max_workers
+            are running, and record the results of the ones that finish, until the
+            server stops
+        Args:
+            N/A
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        while not self.stopping.is_set():
+            with self.jobs_lock:
+                job_processes = dict(self.job_processes)
+            for (job_id, job_process) in job_processes.items():
+                if job_process.exitcode is not None:
+                    self.reap_job(job_id, job_process)
+
+            with self.jobs_lock:
+                free_workers = self.max_workers - len(self.job_processes)
+                if free_workers > 0 and not self.stopping.is_set():
+                    queued_jobs = self.job_queue.list_jobs(status=QUEUED_JOB_STATUS)
+                    for job_record in queued_jobs[:free_workers]:
+                        self.start_job(job_record)
+                job_sentinels = [
+                    job_process.sentinel for job_process in self.job_processes.values()
+                ]
+
+            if job_sentinels:
+                multiprocessing.connection.wait(job_sentinels, DISPATCH_INTERVAL)
+            else:
+                self.stopping.wait(DISPATCH_INTERVAL)
+
+    def start_job(self, job_record: Dict[str, Any]) -> None:
+        """
+        Purpose:
+            Start a job process for a queued job. Called with the jobs lock held
+        Args:
+            job_record: the job
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        job_id = job_record["job_id"]
+        result_path = f"{self.results_dir}/{job_id}.json"
+        if os.path.exists(result_path):
+            os.remove(result_path)
+
+        job_record = self.job_queue.update(
+            job_id, status=RUNNING_JOB_STATUS, started_at=time.time()
+        )
+        # Not a daemon, daemonic processes cannot start the tools' processes
+        job_process = self.mp_context.Process(
+            target=self.job_runner,
+            args=(job_record, result_path, self.base_report_path),
+            kwargs={
+                "overwrite": self.overwrite,
+                "concurrent": self.concurrent,
+                "cache_dir": self.cache_dir,
+                "warm_workers": self.warm_workers,
+                "tool_options": self.tool_options,
+                "tool_names": self.tool_names,
+            },
+        )
+        job_process.start()
+        self.job_processes[job_id] = job_process
+
+    def reap_job(self, job_id: str, job_process: Any) -> None:
+        """
+        Purpose:
+            Record the outcome of a job process that has exited. A job whose
+            process was stopped by a shutdown is left running, to be requeued
+        Args:
+            job_id: id of the job
+            job_process: the job's exited process
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        job_process.join()
+        with self.jobs_lock:
+            if self.job_processes.get(job_id) is not job_process:
+                # Already reaped by another thread
+                return
+            del self.job_processes[job_id]
+
+            result_path = f"{self.results_dir}/{job_id}.json"
+            (job_status, job_changes) = self.get_job_outcome(
+                job_id, job_process.exitcode, result_path
+            )
+            if os.path.exists(result_path):
+                os.remove(result_path)
+            if job_status is None:
+                return
+
+            job_record = self.job_queue.get(job_id)
+            self.job_queue.update(
+                job_id,
+                status=job_status,
+                finished_at=time.time(),
+                duration_seconds=round(time.time() - job_record["started_at"], 3),
+                **job_changes,
+            )
+
+    def get_job_outcome(
+        self, job_id: str, exitcode: int, result_path: str
+    ) -> Tuple[Optional[str], Dict[str, Any]]:
+        """
+        Purpose:
+            Work out how a job process ended. Called with the jobs lock held
+        Args:
+            job_id: id of the job
+            exitcode: exit code of the job's process
+            result_path: path the job process stored its result at
+        Returns:
+            job_status: status to finish the job with, None to leave it running
+            job_changes: error and report_path of the job
+        Raises:
+            N/A
+        """
+
+        if job_id in self.cancelled_job_ids:
+            self.cancelled_job_ids.discard(job_id)
+            return ("cancelled", {})
+
+        if not os.path.exists(result_path):
+            if self.stopping.is_set():
+                return (None, {})
+            return ("failed", {"error": f"Job process exited with code {exitcode}"})
+
+        with open(result_path, "r") as result_file_obj:
+            job_result = json.load(result_file_obj)
+
+        return (
+            job_result["status"],
+            {"error": job_result["error"], "report_path": job_result["report_path"]},
+        )
+
+    def stop_job_process(self, job_process: Any) -> None:
+        """
+        Purpose:
+            Terminate a job process, killing it if it does not exit in time
+        Args:
+            job_process: the job's process
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        job_process.terminate()
+        job_process.join(JOB_TERMINATE_TIMEOUT)
+        if job_process.exitcode is None:
+            job_process.kill()
+            job_process.join()
+
+    def get_job_report(
+        self, job_id: str, report_format: str
+    ) -> Tuple[int, Any, Optional[str]]:
+        """
+        Purpose:
+            Get a finished job's report
+        Args:
+            job_id: id of the job
+            report_format: a REPORT_FORMATS format
+        Returns:
+            status_code: HTTP status of the response
+            response_body: report file contents, or an error dict
+            content_type: content type of the report, None for an error
+        Raises:
+            N/A
+        """
+
+        if report_format not in REPORT_FORMATS:
+            return (400, {"error": f"Unknown report format {report_format}"}, None)
+
+        job_record = self.job_queue.get(job_id)
+        if job_record is None:
+            return (404, {"error": f"No job {job_id}"}, None)
+        if job_record["status"] != "success":
+            return (409, {"error": f"Job {job_id} is {job_record['status']}"}, None)
+
+        (report_file_name, content_type) = REPORT_FORMATS[report_format]
+        report_file_path = f"{job_record['report_path']}/{report_file_name}"
+        if not os.path.isfile(report_file_path):
+            return (404, {"error": f"Job {job_id} has no {report_format} report"}, None)
+
+        with open(report_file_path, "rb") as report_file_obj:
+            return (200, report_file_obj.read(), content_type)
+
+
+class UnixHTTPServer(socketserver.ThreadingUnixStreamServer):
+    """
+    Purpose:
+        HTTP server on a Unix domain socket, a thread per request
+    """
+
+    daemon_threads = True
+
+
+class ReportRequestHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Purpose:
+        Job API of a ReportServer (self.server.report_server). Requests and
+        responses are JSON, except reports:
+
+            POST   /jobs                     submit a job
+            GET    /jobs                     list jobs
+            GET    /jobs/ID                  job status
+            GET    /jobs/ID/report?format=F  markdown (default), html or raw report
+            DELETE /jobs/ID                  cancel a job
+            POST   /jobs/ID/cancel           cancel a job
+    """
+
+    ###
+    # HTTP Methods
+    ###
+
+    def do_GET(self) -> None:
+        """
+        Purpose:
+            List jobs, get a job, or fetch its report
+        Args:
+            N/A
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        report_server = self.server.report_server
+        (path_parts, query) = self.parse_request_path()
+
+        if path_parts == ["jobs"]:
+            self.send_json(200, {"jobs": report_server.job_queue.list_jobs()})
+        elif len(path_parts) == 2 and path_parts[0] == "jobs":
+            self.send_job(report_server.job_queue.get(path_parts[1]), path_parts[1])
+        elif len(path_parts) == 3 and path_parts[0::2] == ["jobs", "report"]:
+            (status_code, response_body, content_type) = report_server.get_job_report(
+                path_parts[1], query.get("format", ["markdown"])[0]
+            )
+            if content_type is None:
+                self.send_json(status_code, response_body)
+            else:
+                self.send_body(status_code, response_body, content_type)
+        else:
+            self.send_json(404, {"error": f"No such endpoint {self.path}"})
+
+    def do_POST(self) -> None:
+        """
+        Purpose:
+            Submit or cancel a job
+        Args:
+            N/A
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        report_server = self.server.report_server
+        (path_parts, _) = self.parse_request_path()
+
+        if path_parts == ["jobs"]:
+            try:
+                content_length = int(self.headers.get("Content-Length") or 0)
+                job_fields = json.loads(self.rfile.read(content_length) or b"{}")
+                if not isinstance(job_fields, dict):
+                    raise Exception("Job must be a JSON object")
+                self.send_json(201, report_server.submit_job(job_fields))
+            except Exception as submit_error:
+                self.send_json(400, {"error": str(submit_error)})
+        elif len(path_parts) == 3 and path_parts[0::2] == ["jobs", "cancel"]:
+            self.send_job(report_server.cancel_job(path_parts[1]), path_parts[1])
+        else:
+            self.send_json(404, {"error": f"No such endpoint {self.path}"})
+
+    def do_DELETE(self) -> None:
+        """
+        Purpose:
+            Cancel a job
+        Args:
+            N/A
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        report_server = self.server.report_server
+        (path_parts, _) = self.parse_request_path()
+
+        if len(path_parts) == 2 and path_parts[0] == "jobs":
+            self.send_job(report_server.cancel_job(path_parts[1]), path_parts[1])
+        else:
+            self.send_json(404, {"error": f"No such endpoint {self.path}"})
+
+    ###
+    # Request Helpers
+    ###
+
+    def parse_request_path(self) -> Tuple[List[str], Dict[str, List[str]]]:
+        """
+        Purpose:
+            Split the request path into its parts and query
+        Args:
+            N/A
+        Returns:
+            path_parts: non-empty parts of the path
+            query: query string values by name
+        Raises:
+            N/A
+        """
+
+        parsed_url = urllib.parse.urlsplit(self.path)
+        path_parts = [
+            path_part for path_part in parsed_url.path.split("/") if path_part
+        ]
+
+        return (path_parts, urllib.parse.parse_qs(parsed_url.query))
+
+    def send_job(self, job_record: Optional[Dict[str, Any]], job_id: str) -> None:
+        """
+        Purpose:
+            Respond with a job, or 404 if there is no such job
+        Args:
+            job_record: the job, None if there is no such job
+            job_id: id of the job
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        if job_record is None:
+            self.send_json(404, {"error": f"No job {job_id}"})
+        else:
+            self.send_json(200, job_record)
+
+    def send_json(self, status_code: int, response_data: Dict[str, Any]) -> None:
+        """
+        Purpose:
+            Respond with JSON
+        Args:
+            status_code: HTTP status of the response
+            response_data: data to respond with
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        self.send_body(
+            status_code,
+            json.dumps(response_data, sort_keys=True).encode(),
+            "application/json",
+        )
+
+    def send_body(
+        self, status_code: int, response_body: bytes, content_type: str
+    ) -> None:
+        """
+        Purpose:
+            Respond with a body
+        Args:
+            status_code: HTTP status of the response
+            response_body: encoded body
+            content_type: content type of the body
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        self.send_response(status_code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(response_body)))
+        self.end_headers()
+        self.wfile.write(response_body)
+
+    ###
+    # Logging
+    ###
+
+    def address_string(self) -> str:
+        """
+        Purpose:
+            Client address for logging. Unix socket clients have none
+        Args:
+            N/A
+        Returns:
+            address: client host, or "unix"
+        Raises:
+            N/A
+        """
+
+        if isinstance(self.client_address, tuple):
+            return super().address_string()
+        return "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """
+        Purpose:
+            Do not log every request to stderr
+        Args:
+            format: message format
+            args: message args
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        pass
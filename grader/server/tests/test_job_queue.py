@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Purpose:
+    Test File for job_queue.py
+"""
+
+# Python Library Imports
+import pytest
+
+# Local Python Library Imports
+from grader.server.job_queue import JobQueue
+
+
+###########
+# Mocks/Fixtures
+###########
+
+
+# N/A
+
+
+###########
+# Tests: Job Queue
+###########
+
+
+###
+# submit()
+###
+
+
+def test_JobQueue_submit(tmp_path: object) -> int:
+    """
+    Purpose:
+        Test submitted jobs are stored in order and survive a restart
+    Args:
+        tmp_path: pytest tmp_path fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    test_job_queue = JobQueue(str(tmp_path))
+    test_first_job = test_job_queue.submit(
+        {"report": "first", "candidate": "Mr. Test", "source": "./first"}
+    )
+    test_second_job = test_job_queue.submit(
+        {
+            "report": "second",
+            "candidate": "Ms. Test",
+            "source": "./second",
+            "package": "example",
+            "overwrite": True,
+        }
+    )
+    assert test_first_job["status"] == "queued"
+    assert test_first_job["package"] is None
+    assert not test_first_job["overwrite"]
+    assert test_second_job["overwrite"]
+
+    # A new queue on the same directory picks the jobs back up
+    test_job_queue = JobQueue(str(tmp_path))
+    assert [test_job["job_id"] for test_job in test_job_queue.list_jobs()] == [
+        test_first_job["job_id"],
+        test_second_job["job_id"],
+    ]
+    assert test_job_queue.get(test_second_job["job_id"]) == test_second_job
+    assert test_job_queue.get("missing") is None
+
+    test_third_job = test_job_queue.submit(
+        {"report": "third", "candidate": "Dr. Test", "source": "./third"}
+    )
+    assert test_third_job["sequence"] == 3
+
+    with pytest.raises(Exception, match="missing candidate, source"):
+        test_job_queue.submit({"report": "fourth"})
+
+    # Reports must be a directory directly in the reports directory
+    for test_report in ["../fourth", "fourth/report", ".."]:
+        with pytest.raises(Exception, match="not a valid directory name"):
+            test_job_queue.submit(
+                {"report": test_report, "candidate": "Dr. Test", "source": "./fourth"},
+                str(tmp_path / "reports"),
+            )
+    assert len(test_job_queue.list_jobs()) == 3
+
+
+###
+# update()
+###
+
+
+def test_JobQueue_update(tmp_path: object) -> int:
+    """
+    Purpose:
+        Test jobs are updated until they finish, and running jobs are requeued
+    Args:
+        tmp_path: pytest tmp_path fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    test_job_queue = JobQueue(str(tmp_path))
+    test_jobs = [
+        test_job_queue.submit(
+            {"report": test_report, "candidate": "Mr. Test", "source": "./test"}
+        )
+        for test_report in ("first", "second")
+    ]
+    test_job_queue.update(test_jobs[0]["job_id"], status="running", started_at=1.0)
+    test_job_queue.update(test_jobs[1]["job_id"], status="success")
+
+    with pytest.raises(Exception, match="already success"):
+        test_job_queue.update(test_jobs[1]["job_id"], status="failed")
+
+    # Only the running job is requeued, to overwrite its partial report
+    test_job_queue = JobQueue(str(tmp_path))
+    test_requeued_jobs = test_job_queue.requeue_running()
+    assert [test_job["job_id"] for test_job in test_requeued_jobs] == [
+        test_jobs[0]["job_id"]
+    ]
+    assert test_requeued_jobs[0]["status"] == "queued"
+    assert test_requeued_jobs[0]["overwrite"]
+    assert test_requeued_jobs[0]["restarts"] == 1
+    assert test_requeued_jobs[0]["started_at"] is None
+    assert [
+        test_job["job_id"] for test_job in test_job_queue.list_jobs(status="queued")
+    ] == [test_jobs[0]["job_id"]]
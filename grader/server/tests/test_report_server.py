@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+"""
+Purpose:
+    Test File for report_server.py
+"""
+
+# Python Library Imports
+import http.client
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+import pytest
+
+# Local Python Library Imports
+from grader.server.report_server import ReportServer, stop_report_job
+from grader.subprocess.subprocess import run_subprocess_call
+
+
+###########
+# Mocks/Fixtures
+###########
+
+
+def fake_job_runner(
+    job_record: Dict[str, Any],
+    result_path: str,
+    base_report_path: str,
+    **job_options: Any,
+) -> None:
+    """
+    Purpose:
+        Grade a job without running any tools. Jobs with source "hang" run until
+        they are terminated, and with source "hang-tools" run tools that do
+    Args:
+        job_record: the job
+        result_path: path to store the result at
+        base_report_path: path to reports to save
+        job_options: the server's report options
+    Returns:
+        N/A
+    Raises:
+        N/A
+    """
+
+    if job_record["source"] == "hang":
+        time.sleep(60)
+    if job_record["source"] == "hang-tools":
+        # Tools that never finish on concurrent threads, like a concurrent report
+        signal.signal(signal.SIGTERM, stop_report_job)
+        with ThreadPoolExecutor(max_workers=2) as tool_executor:
+            for tool_index in range(2):
+                tool_executor.submit(
+                    run_subprocess_call,
+                    f"sleep 60 & echo $! > {result_path}.{tool_index}.pid; wait",
+                    {},
+                    base_report_path,
+                    None,
+                )
+
+    report_path = f"{base_report_path}/{job_record['report']}"
+    os.makedirs(report_path, exist_ok=True)
+    with open(f"{report_path}/report_summary.md", "w") as report_file_obj:
+        report_file_obj.write(f"# {job_record['candidate']}\n")
+
+    with open(result_path, "w") as result_file_obj:
+        json.dump(
+            {"status": "success", "error": None, "report_path": report_path},
+            result_file_obj,
+        )
+
+
+@pytest.fixture
+def report_server(tmp_path: object) -> ReportServer:
+    """
+    Purpose:
+        ReportServer on a Unix socket and a free port running fake_job_runner,
+        one job at a time, shut down after the test
+    Args:
+        tmp_path: pytest tmp_path fixture
+    Yields:
+        report_server: the started server
+    Raises:
+        N/A
+    """
+
+    test_report_server = get_report_server(tmp_path)
+    test_report_server.start()
+    yield test_report_server
+    test_report_server.shutdown()
+
+
+def get_report_server(tmp_path: object) -> ReportServer:
+    """
+    Purpose:
+        Build a ReportServer running fake_job_runner in forked processes, which
+        unlike the fork server's can import this test module
+    Args:
+        tmp_path: pytest tmp_path fixture
+    Returns:
+        report_server: the server, not started
+    Raises:
+        N/A
+    """
+
+    test_report_server = ReportServer(
+        str(tmp_path / "queue"),
+        base_report_path=str(tmp_path / "reports"),
+        socket_path=str(tmp_path / "grader.sock"),
+        port=0,
+        max_workers=1,
+        job_runner=fake_job_runner,
+    )
+    test_report_server.mp_context = multiprocessing.get_context("fork")
+
+    return test_report_server
+
+
+def send_request(
+    report_server: ReportServer,
+    method: str,
+    path: str,
+    request_data: Optional[Dict[str, Any]] = None,
+    unix: bool = False,
+) -> Tuple[int, Any]:
+    """
+    Purpose:
+        Send a request to a ReportServer's job API
+    Args:
+        report_server: the started server
+        method: HTTP method
+        path: request path
+        request_data: JSON body of the request
+        unix: send over the Unix socket instead of the port
+    Returns:
+        status_code: HTTP status of the response
+        response_data: decoded JSON response, or the raw body for other content
+    Raises:
+        N/A
+    """
+
+    if unix:
+        connection = http.client.HTTPConnection("localhost")
+        connection.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.sock.connect(report_server.socket_path)
+    else:
+        connection = http.client.HTTPConnection(report_server.host, report_server.port)
+
+    connection.request(
+        method,
+        path,
+        body=json.dumps(request_data) if request_data is not None else None,
+        headers={"Content-Type": "application/json"},
+    )
+    response = connection.getresponse()
+    response_body = response.read()
+    connection.close()
+
+    if response.getheader("Content-Type") == "application/json":
+        return (response.status, json.loads(response_body))
+    return (response.status, response_body)
+
+
+def wait_for_job(report_server: ReportServer, job_id: str, status: str) -> None:
+    """
+    Purpose:
+        Wait for a job to reach a status
+    Args:
+        report_server: the started server
+        job_id: id of the job
+        status: status to wait for
+    Returns:
+        N/A
+    Raises:
+        AssertionError: if the job does not reach the status in time
+    """
+
+    for _ in range(100):
+        if report_server.job_queue.get(job_id)["status"] == status:
+            return
+        time.sleep(0.1)
+
+    assert report_server.job_queue.get(job_id)["status"] == status
+
+
+def is_process_running(pid: int) -> bool:
+    """
+    Purpose:
+        Check a process, not necessarily a child of this one, is still running
+    Args:
+        pid: id of the process
+    Returns:
+        is_running: False if the process is gone or a zombie
+    Raises:
+        N/A
+    """
+
+    try:
+        with open(f"/proc/{pid}/stat", "r") as stat_file_obj:
+            process_stat = stat_file_obj.read()
+    except FileNotFoundError:
+        return False
+
+    # The state follows the command name, which is in parentheses
+    return process_stat.rsplit(")", 1)[1].split()[0] != "Z"
+
+
+###########
+# Tests: Report Server
+###########
+
+
+###
+# Job API
+###
+
+
+@pytest.mark.parametrize("test_unix", [False, True])
+def test_ReportServer_job_api(report_server: ReportServer, test_unix: bool) -> int:
+    """
+    Purpose:
+        Test a job is submitted, graded and its report fetched over HTTP, on the
+        port and the Unix socket
+    Args:
+        report_server: report_server fixture
+        test_unix: send requests over the Unix socket
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    (test_status, test_job) = send_request(
+        report_server,
+        "POST",
+        "/jobs",
+        {"report": "first", "candidate": "Mr. Test", "source": "./first"},
+        unix=test_unix,
+    )
+    assert test_status == 201
+    assert test_job["status"] == "queued"
+
+    wait_for_job(report_server, test_job["job_id"], "success")
+    (test_status, test_job) = send_request(
+        report_server, "GET", f"/jobs/{test_job['job_id']}", unix=test_unix
+    )
+    assert test_status == 200
+    assert test_job["status"] == "success"
+    assert test_job["report_path"] == f"{report_server.base_report_path}/first"
+
+    (test_status, test_report) = send_request(
+        report_server, "GET", f"/jobs/{test_job['job_id']}/report", unix=test_unix
+    )
+    assert (test_status, test_report) == (200, b"# Mr. Test\n")
+
+    (test_status, test_jobs) = send_request(
+        report_server, "GET", "/jobs", unix=test_unix
+    )
+    assert [test_job["report"] for test_job in test_jobs["jobs"]] == ["first"]
+
+
+def test_ReportServer_job_api_errors(report_server: ReportServer) -> int:
+    """
+    Purpose:
+        Test bad requests get JSON errors
+    Args:
+        report_server: report_server fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    (test_status, test_error) = send_request(
+        report_server, "POST", "/jobs", {"report": "first"}
+    )
+    assert test_status == 400
+    assert test_error == {"error": "Job is missing candidate, source"}
+
+    (test_status, test_error) = send_request(
+        report_server,
+        "POST",
+        "/jobs",
+        {"report": "../escaped", "candidate": "Mr. Test", "source": "./first"},
+    )
+    assert test_status == 400
+    assert test_error == {
+        "error": "Report name '../escaped' is not a valid directory name"
+    }
+
+    assert send_request(report_server, "GET", "/jobs/missing")[0] == 404
+    assert send_request(report_server, "GET", "/missing")[0] == 404
+    assert send_request(report_server, "DELETE", "/jobs/missing")[0] == 404
+
+    (_, test_job) = send_request(
+        report_server,
+        "POST",
+        "/jobs",
+        {"report": "hung", "candidate": "Mr. Test", "source": "hang"},
+    )
+    wait_for_job(report_server, test_job["job_id"], "running")
+    (test_status, test_error) = send_request(
+        report_server, "GET", f"/jobs/{test_job['job_id']}/report"
+    )
+    assert test_status == 409
+    assert test_error == {"error": f"Job {test_job['job_id']} is running"}
+    assert (
+        send_request(
+            report_server, "GET", f"/jobs/{test_job['job_id']}/report?format=pdf"
+        )[0]
+        == 400
+    )
+
+
+###
+# cancel_job()
+###
+
+
+def test_ReportServer_cancel_job(report_server: ReportServer) -> int:
+    """
+    Purpose:
+        Test running jobs are terminated and queued jobs never start when cancelled
+    Args:
+        report_server: report_server fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    (_, test_running_job) = send_request(
+        report_server,
+        "POST",
+        "/jobs",
+        {"report": "hung", "candidate": "Mr. Test", "source": "hang"},
+    )
+    (_, test_queued_job) = send_request(
+        report_server,
+        "POST",
+        "/jobs",
+        {"report": "queued", "candidate": "Ms. Test", "source": "./queued"},
+    )
+    wait_for_job(report_server, test_running_job["job_id"], "running")
+
+    (test_status, test_job) = send_request(
+        report_server, "POST", f"/jobs/{test_queued_job['job_id']}/cancel"
+    )
+    assert (test_status, test_job["status"]) == (200, "cancelled")
+
+    (test_status, test_job) = send_request(
+        report_server, "DELETE", f"/jobs/{test_running_job['job_id']}"
+    )
+    assert (test_status, test_job["status"]) == (200, "cancelled")
+    assert not report_server.job_processes
+
+    # Nothing is left to run
+    time.sleep(0.5)
+    assert not report_server.job_queue.list_jobs(status="queued")
+    assert not os.path.exists(f"{report_server.base_report_path}/queued")
+
+
+def test_ReportServer_cancel_job_tools(report_server: ReportServer) -> int:
+    """
+    Purpose:
+        Test cancelling a job running concurrent tools kills the tools, each in a
+        session of its own, without waiting for them
+    Args:
+        report_server: report_server fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    os.makedirs(report_server.base_report_path, exist_ok=True)
+    (_, test_job) = send_request(
+        report_server,
+        "POST",
+        "/jobs",
+        {"report": "hung", "candidate": "Mr. Test", "source": "hang-tools"},
+    )
+    wait_for_job(report_server, test_job["job_id"], "running")
+    test_pid_paths = [
+        f"{report_server.results_dir}/{test_job['job_id']}.json.{tool_index}.pid"
+        for tool_index in range(2)
+    ]
+    for _ in range(100):
+        if all(
+            os.path.exists(test_pid_path) and os.path.getsize(test_pid_path)
+            for test_pid_path in test_pid_paths
+        ):
+            break
+        time.sleep(0.1)
+    test_tool_pids = []
+    for test_pid_path in test_pid_paths:
+        with open(test_pid_path) as test_pid_file_obj:
+            test_tool_pids.append(int(test_pid_file_obj.read()))
+
+    test_start = time.monotonic()
+    (test_status, test_job) = send_request(
+        report_server, "DELETE", f"/jobs/{test_job['job_id']}"
+    )
+    assert (test_status, test_job["status"]) == (200, "cancelled")
+    assert time.monotonic() - test_start < 5
+
+    # The tools are gone (or dead, waiting to be reaped), not left running
+    time.sleep(0.5)
+    for test_tool_pid in test_tool_pids:
+        assert not is_process_running(test_tool_pid)
+
+
+###
+# shutdown()
+###
+
+
+def test_ReportServer_shutdown(tmp_path: object) -> int:
+    """
+    Purpose:
+        Test jobs running at shutdown are requeued and graded on the next start
+    Args:
+        tmp_path: pytest tmp_path fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    test_report_server = get_report_server(tmp_path)
+    test_report_server.start()
+    test_job = test_report_server.submit_job(
+        {"report": "hung", "candidate": "Mr. Test", "source": "hang"}
+    )
+    wait_for_job(test_report_server, test_job["job_id"], "running")
+    test_report_server.shutdown()
+    assert not os.path.exists(test_report_server.socket_path)
+
+    test_job = test_report_server.job_queue.get(test_job["job_id"])
+    assert test_job["status"] == "queued"
+    assert test_job["overwrite"]
+
+    # The restarted server regrades it (no longer hanging)
+    test_report_server = get_report_server(tmp_path)
+    test_report_server.job_queue.update(test_job["job_id"], source="./fixed")
+    test_report_server.start()
+    try:
+        wait_for_job(test_report_server, test_job["job_id"], "success")
+        assert test_report_server.job_queue.get(test_job["job_id"])["restarts"] == 1
+    finally:
+        test_report_server.shutdown()
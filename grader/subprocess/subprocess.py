@@ -4,13 +4,37 @@ Purpose:
 """
 
 # Python Library Imports
+import codecs
 import os
-import pexpect
+import selectors
+import signal
 import subprocess
-from typing import Any, Dict, List, Tuple
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Set, Tuple
 
 # Local Python Library Imports
-# N/A
+from grader.trace.trace import PhaseTimer
+
+
+###
+# Constants
+###
+
+
+# Size of a single read from a child pipe
+READ_CHUNK_SIZE = 64 * 1024
+
+# Seconds to keep reading after a timed out process group has been killed
+KILL_GRACE_PERIOD = 5
+
+# Process groups started by this process and not yet reaped, so they can all be
+# killed when the process is stopped (a cancelled report server job)
+RUNNING_PROCESS_GROUPS: Set[int] = set()
+RUNNING_PROCESS_GROUPS_LOCK = threading.Lock()
+
+# Set once the running process groups have been stopped, no more are started
+PROCESS_GROUPS_STOPPED = False
 
 
 ###
@@ -20,43 +44,389 @@ from typing import Any, Dict, List, Tuple
 
 def run_subprocess_call(
     command: str, env: Dict[str, Any], cwd: os.getcwd(), timeout: int = 60
-) -> Tuple[List[str], List[str]]:
+) -> Tuple[List[str], List[str], bool]:
 
     """
     Purpose:
-        Run a subprocess call. Check for normal errors, parse stdout and stderr
+        Run a subprocess call. Check for normal errors, parse stdout and stderr.
+
+        The command runs in its own process group. If it is still running once
+        timeout seconds have passed, the whole group (shell, interpreter and any
+        workers it started) is killed and whatever output was produced until then
+        is returned.
     Args:
         command: command to run
         env: environment variables for shell
         cwd: working directory to run command from
-        timeout: timeout for command to complete
+        timeout: timeout for command to complete. None or 0 waits forever
     Return:
         process_stdout: list of output split by newline
         process_stderr: list of output split by newline
+        timed_out: whether the command was killed for exceeding the timeout
+    Raises:
+        N/A
+    """
+
+    child_process = start_subprocess(command, env=env, cwd=cwd)
+
+    # Both pipes are drained together so a child filling one of them (pylinting
+    # flask) cannot block while we wait on the other
+    output_chunks = {"stdout": [], "stderr": []}
+    process_output_drain = ProcessOutputDrain(child_process, timeout=timeout)
+    for (stream_name, output_chunk) in process_output_drain:
+        output_chunks[stream_name].append(output_chunk)
+
+    child_process_stdout = decode_output_chunks(output_chunks["stdout"]).split("\n")
+    child_process_stderr = decode_output_chunks(output_chunks["stderr"]).split("\n")
+
+    timed_out = process_output_drain.timed_out
+
+    return (child_process_stdout, child_process_stderr, timed_out)
+
+
+def stream_subprocess_call(
+    command: str, env: Dict[str, Any], cwd: os.getcwd(), timeout: int = 60
+) -> "SubprocessLineStream":
+    """
+    Purpose:
+        Run a subprocess call, yielding decoded stdout lines while the command is
+        still running instead of returning them all once it exits
+    Args:
+        command: command to run
+        env: environment variables for shell
+        cwd: working directory to run command from
+        timeout: timeout for command to complete. None or 0 waits forever
+    Return:
+        line_stream: iterable of stdout lines. stderr_lines and timed_out are set
+            once it has been exhausted
+    Raises:
+        N/A
+    """
+
+    return SubprocessLineStream(command, env=env, cwd=cwd, timeout=timeout)
+
+
+def start_subprocess(
+    command: str, env: Dict[str, Any], cwd: os.getcwd()
+) -> subprocess.Popen:
+    """
+    Purpose:
+        Start a shell command as the leader of a new process group with stdout and
+        stderr piped back to us
+    Args:
+        command: command to run
+        env: environment variables for shell
+        cwd: working directory to run command from
+    Return:
+        child_process: the started process
+    Raises:
+        Exception: if the running process groups have been stopped
+    """
+
+    with RUNNING_PROCESS_GROUPS_LOCK:
+        if PROCESS_GROUPS_STOPPED:
+            raise Exception(f"Process is stopping, not starting {command}")
+        child_process = subprocess.Popen(
+            command,
+            cwd=cwd,
+            env=env,
+            shell=True,
+            start_new_session=True,
+            stderr=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+        RUNNING_PROCESS_GROUPS.add(child_process.pid)
+
+    return child_process
+
+
+def track_process_group(process_group: int) -> None:
+    """
+    Purpose:
+        Record a process group started by this process, see stop_process_groups
+    Args:
+        process_group: id of the group, the pid of its leader
+    Return:
+        N/A
+    Raises:
+        Exception: if the running process groups have been stopped, the group
+            is killed
+    """
+
+    with RUNNING_PROCESS_GROUPS_LOCK:
+        if PROCESS_GROUPS_STOPPED:
+            kill_process_group(process_group)
+            raise Exception("Process is stopping, killed a new process group")
+        RUNNING_PROCESS_GROUPS.add(process_group)
+
+
+def untrack_process_group(process_group: int) -> None:
+    """
+    Purpose:
+        Forget a process group once its leader has been reaped, its id can then
+        be reused
+    Args:
+        process_group: id of the group, the pid of its leader
+    Return:
+        N/A
+    Raises:
+        N/A
+    """
+
+    with RUNNING_PROCESS_GROUPS_LOCK:
+        RUNNING_PROCESS_GROUPS.discard(process_group)
+
+
+def stop_process_groups() -> None:
+    """
+    Purpose:
+        Kill every process group this process started that is still running,
+        and refuse to start any more. Threads reading the groups' output see it
+        end, so the process can exit without waiting for the commands to finish
+    Args:
+        N/A
+    Return:
+        N/A
+    Raises:
+        N/A
+    """
+
+    global PROCESS_GROUPS_STOPPED
+
+    with RUNNING_PROCESS_GROUPS_LOCK:
+        PROCESS_GROUPS_STOPPED = True
+        for process_group in RUNNING_PROCESS_GROUPS:
+            kill_process_group(process_group)
+
+
+def kill_process_group(process_group: int) -> None:
+    """
+    Purpose:
+        Kill every process in a process group. A forked leader that has not made
+        itself a group leader yet (no setsid() yet) is killed on its own
+    Args:
+        process_group: id of the group, the pid of its unreaped leader
+    Return:
+        N/A
     Raises:
-        pexpect.exceptions.TIMEOUT: if command times out
+        N/A
+    """
+
+    try:
+        os.killpg(process_group, signal.SIGKILL)
+    except ProcessLookupError:
+        try:
+            os.kill(process_group, signal.SIGKILL)
+        except ProcessLookupError:
+            # Group already exited
+            pass
+
+
+def decode_output_chunks(output_chunks: List[bytes]) -> str:
+    """
+    Purpose:
+        Join and decode raw chunks read from a child pipe
+    Args:
+        output_chunks: raw bytes in the order they were read
+    Return:
+        output: decoded output. Undecodable bytes are replaced, not raised
+    Raises:
+        N/A
+    """
+
+    return b"".join(output_chunks).decode("utf-8", errors="replace")
+
+
+###
+# Class Definition
+###
+
+
+class ProcessOutputDrain:
+    """
+    Purpose:
+        Reads stdout and stderr of a child process at the same time, yielding
+        chunks as they become available, and enforces the child's deadline.
+
+        Iterating blocks in select() (not a busy loop) while the child is quiet,
+        and reaps the child once both pipes are closed.
     """
 
-    child_process = subprocess.Popen(
-        command,
-        cwd=cwd,
-        env=env,
-        shell=True,
-        stderr=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-    )
+    def __init__(self, child_process: subprocess.Popen, timeout: int = None) -> None:
+        """
+        Purpose:
+            Constructor for a ProcessOutputDrain
+        Args:
+            child_process: process started with stdout and stderr set to PIPE
+            timeout: seconds before the process group is killed. None or 0 waits
+                forever
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        self.child_process = child_process
+        self.timeout = timeout
+        self.timed_out = False
+
+    def __iter__(self) -> Iterator[Tuple[str, bytes]]:
+        """
+        Purpose:
+            Drain the child pipes
+        Args:
+            N/A
+        Yields:
+            stream_name: "stdout" or "stderr"
+            output_chunk: raw bytes read from the stream
+        Raises:
+            N/A
+        """
+
+        deadline = None
+        if self.timeout:
+            deadline = time.monotonic() + self.timeout
+
+        selector = selectors.DefaultSelector()
+        selector.register(self.child_process.stdout, selectors.EVENT_READ, "stdout")
+        selector.register(self.child_process.stderr, selectors.EVENT_READ, "stderr")
+
+        drained = False
+        try:
+            while selector.get_map():
+
+                # Enforce the deadline even if the child never stops writing
+                if deadline is not None and time.monotonic() >= deadline:
+                    if self.timed_out:
+                        # A process outside the group still holds the pipes open
+                        break
+                    self.timed_out = True
+                    kill_process_group(self.child_process.pid)
+                    deadline = time.monotonic() + KILL_GRACE_PERIOD
+
+                select_timeout = None
+                if deadline is not None:
+                    select_timeout = max(deadline - time.monotonic(), 0)
+
+                for (selector_key, _) in selector.select(select_timeout):
+                    output_chunk = os.read(selector_key.fd, READ_CHUNK_SIZE)
+                    if not output_chunk:
+                        # EOF, the child closed its end of the pipe
+                        selector.unregister(selector_key.fileobj)
+                        selector_key.fileobj.close()
+                        continue
+
+                    yield (selector_key.data, output_chunk)
+
+            drained = True
+        finally:
+            for selector_key in list(selector.get_map().values()):
+                selector_key.fileobj.close()
+            selector.close()
+
+            # Consumer stopped early (an exception or break), don't leave the
+            # group running with nobody reading its output
+            if not drained:
+                kill_process_group(self.child_process.pid)
+                self.child_process.wait()
+                untrack_process_group(self.child_process.pid)
+
+        self.child_process.wait()
+        untrack_process_group(self.child_process.pid)
+
+
+class SubprocessLineStream:
+    """
+    Purpose:
+        Generator based variant of run_subprocess_call. Iterating starts the command
+        and yields stdout split by newline as it is produced, so only the line being
+        parsed (plus any partial line) is held in memory.
+
+        Lines are identical to run_subprocess_call's process_stdout, including the
+        trailing empty string after a final newline.
+    """
+
+    def __init__(
+        self, command: str, env: Dict[str, Any], cwd: os.getcwd(), timeout: int = 60
+    ) -> None:
+        """
+        Purpose:
+            Constructor for a SubprocessLineStream
+        Args:
+            command: command to run
+            env: environment variables for shell
+            cwd: working directory to run command from
+            timeout: timeout for command to complete. None or 0 waits forever
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        self.command = command
+        self.env = env
+        self.cwd = cwd
+        self.timeout = timeout
+
+        # Set once the stream has been exhausted
+        self.stderr_lines = []
+        self.timed_out = False
+
+        # Time spent starting the command and decoding its output
+        self.spawn_timer = PhaseTimer()
+        self.decode_timer = PhaseTimer()
+
+    def __iter__(self) -> Iterator[str]:
+        """
+        Purpose:
+            Run the command and yield its stdout line by line
+        Args:
+            N/A
+        Yields:
+            output_line: decoded stdout line, without the newline
+        Raises:
+            N/A
+        """
+
+        for output_lines in self.iter_line_chunks():
+            yield from output_lines
+
+    def iter_line_chunks(self) -> Iterator[List[str]]:
+        """
+        Purpose:
+            Run the command and yield its stdout lines a chunk at a time, as each
+            read from the command completes them
+        Args:
+            N/A
+        Yields:
+            output_lines: decoded stdout lines, without the newlines
+        Raises:
+            N/A
+        """
+
+        with self.spawn_timer:
+            child_process = start_subprocess(self.command, env=self.env, cwd=self.cwd)
+        process_output_drain = ProcessOutputDrain(child_process, timeout=self.timeout)
+
+        stdout_decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        partial_line = ""
+        stderr_chunks = []
+        for (stream_name, output_chunk) in process_output_drain:
+            if stream_name == "stderr":
+                stderr_chunks.append(output_chunk)
+                continue
 
-    # child_process.wait() did not return for large datasets (pylinting flask)
-    while child_process.poll() is not None:
-        continue
+            with self.decode_timer:
+                partial_line += stdout_decoder.decode(output_chunk)
+                output_lines = partial_line.split("\n")
+                partial_line = output_lines.pop()
+            if output_lines:
+                yield output_lines
 
-    child_process_stdout = [
-        output_line
-        for output_line in child_process.stdout.read().decode("utf-8").split("\n")
-    ]
-    child_process_stderr = [
-        output_line
-        for output_line in child_process.stderr.read().decode("utf-8").split("\n")
-    ]
+        with self.decode_timer:
+            partial_line += stdout_decoder.decode(b"", final=True)
+        yield [partial_line]
 
-    return (child_process_stdout, child_process_stderr)
+        with self.decode_timer:
+            self.stderr_lines = decode_output_chunks(stderr_chunks).split("\n")
+        self.timed_out = process_output_drain.timed_out
@@ -4,10 +4,17 @@ Purpose:
 """
 
 # Python Library Imports
-# N/A
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+import time
+import pytest
 
 # Local Python Library Imports
-import grader.subprocess.subprocess
+import grader.subprocess.subprocess as subprocess
+from grader.subprocess.subprocess import run_subprocess_call, stream_subprocess_call
 
 
 ###########
@@ -28,4 +35,231 @@ import grader.subprocess.subprocess
 ###
 
 
-# TODO
+def test_run_subprocess_call_base() -> int:
+    """
+    Purpose:
+        Test run_subprocess_call splits stdout and stderr by newline
+    Args:
+        N/A
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    # Example Data
+    test_command = "echo first; echo second; echo error 1>&2"
+
+    # Run Command
+    (test_stdout, test_stderr, test_timed_out) = run_subprocess_call(
+        command=test_command, env={}, cwd=os.getcwd()
+    )
+    assert test_stdout == ["first", "second", ""]
+    assert test_stderr == ["error", ""]
+    assert not test_timed_out
+
+
+def test_run_subprocess_call_large_output() -> int:
+    """
+    Purpose:
+        Test run_subprocess_call does not deadlock when the child fills both pipes
+    Args:
+        N/A
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    # Example Data: ~1MB on each stream, well past the OS pipe buffer
+    test_command = (
+        f'{sys.executable} -c "import sys\n'
+        "for i in range(100000):\n"
+        "    sys.stderr.write('e' * 9 + chr(10))\n"
+        "    sys.stdout.write('o' * 9 + chr(10))\""
+    )
+
+    # Run Command
+    (test_stdout, test_stderr, test_timed_out) = run_subprocess_call(
+        command=test_command, env={}, cwd=os.getcwd()
+    )
+    assert len(test_stdout) == 100001
+    assert len(test_stderr) == 100001
+    assert test_stdout[0] == "o" * 9
+    assert test_stderr[-2] == "e" * 9
+    assert not test_timed_out
+
+
+def test_run_subprocess_call_timeout() -> int:
+    """
+    Purpose:
+        Test run_subprocess_call kills the whole process group at the deadline and
+        keeps the output produced before it
+    Args:
+        N/A
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    # Example Data: background sleep holds the pipes open unless the group dies
+    test_command = "echo partial; sleep 30 & sleep 30; echo never"
+
+    # Run Command
+    test_start = time.monotonic()
+    (test_stdout, _, test_timed_out) = run_subprocess_call(
+        command=test_command, env={}, cwd=os.getcwd(), timeout=1
+    )
+    assert time.monotonic() - test_start < 10
+    assert test_timed_out
+    assert test_stdout == ["partial", ""]
+
+
+###
+# stream_subprocess_call()
+###
+
+
+def test_stream_subprocess_call_base() -> int:
+    """
+    Purpose:
+        Test stream_subprocess_call yields the same lines as run_subprocess_call
+    Args:
+        N/A
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    # Example Data: partial last line and a multibyte character
+    test_command = "printf 'first\\nsecond \\303\\251\\nthird'; echo error 1>&2"
+
+    # Run Command
+    test_stream = stream_subprocess_call(command=test_command, env={}, cwd=os.getcwd())
+    test_stdout = list(test_stream)
+    assert test_stdout == ["first", "second \u00e9", "third"]
+    assert test_stdout == run_subprocess_call(test_command, {}, os.getcwd())[0]
+    assert test_stream.stderr_lines == ["error", ""]
+    assert not test_stream.timed_out
+
+
+def test_stream_subprocess_call_incremental() -> int:
+    """
+    Purpose:
+        Test stream_subprocess_call yields lines before the command exits
+    Args:
+        N/A
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    # Example Data
+    test_command = "echo first; sleep 30"
+
+    # Run Command, only the first line is consumed before the stream is closed
+    test_start = time.monotonic()
+    test_stream = iter(
+        stream_subprocess_call(command=test_command, env={}, cwd=os.getcwd())
+    )
+    assert next(test_stream) == "first"
+    test_stream.close()
+    assert time.monotonic() - test_start < 10
+
+
+def test_stream_subprocess_call_line_chunks() -> int:
+    """
+    Purpose:
+        Test stream_subprocess_call yields the same lines a chunk at a time
+    Args:
+        N/A
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    # Example Data: a line split across two writes
+    test_command = "printf 'first\\nsec'; sleep 0.1; printf 'ond\\nthird'"
+
+    # Run Command
+    test_stream = stream_subprocess_call(command=test_command, env={}, cwd=os.getcwd())
+    test_chunks = list(test_stream.iter_line_chunks())
+    assert all(test_chunks)
+    assert [test_line for test_chunk in test_chunks for test_line in test_chunk] == [
+        "first",
+        "second",
+        "third",
+    ]
+
+
+###
+# kill_process_group()
+###
+
+
+def test_kill_process_group_not_leader() -> int:
+    """
+    Purpose:
+        Test a forked process that has not made itself a group leader yet is
+        still killed
+    Args:
+        N/A
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    # Sleeps in this process's group, like a worker before its setsid()
+    test_process = multiprocessing.Process(target=time.sleep, args=(60,))
+    test_process.start()
+
+    subprocess.kill_process_group(test_process.pid)
+    test_process.join(10)
+    assert test_process.exitcode == -signal.SIGKILL
+
+
+###
+# stop_process_groups()
+###
+
+
+def test_stop_process_groups(monkeypatch: object) -> int:
+    """
+    Purpose:
+        Test stopping kills commands running in other threads and no more start
+    Args:
+        monkeypatch: pytest monkeypatch fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    # Restored after the test, other tests start commands
+    monkeypatch.setattr(subprocess, "PROCESS_GROUPS_STOPPED", False)
+
+    # Run Command in a thread, as a concurrent report does
+    test_results = []
+    test_thread = threading.Thread(
+        target=lambda: test_results.append(
+            run_subprocess_call("sleep 60 & wait", {}, os.getcwd(), timeout=None)
+        )
+    )
+    test_start = time.monotonic()
+    test_thread.start()
+    while not subprocess.RUNNING_PROCESS_GROUPS:
+        time.sleep(0.01)
+
+    subprocess.stop_process_groups()
+    test_thread.join(10)
+    assert test_results
+    assert time.monotonic() - test_start < 10
+    assert not subprocess.RUNNING_PROCESS_GROUPS
+
+    with pytest.raises(Exception, match="Process is stopping"):
+        run_subprocess_call("true", {}, os.getcwd())
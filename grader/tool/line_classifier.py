@@ -0,0 +1,178 @@
+"""
+Purpose:
+    LineClassifier Class Definition
+
+    Classify lines of tool output with a single compiled matcher per tool
+"""
+
+# Python Library Imports
+import re
+from typing import Dict, Match, Optional, Pattern, Sequence, Tuple
+
+# Local Python Library Imports
+# N/A
+
+
+###
+# Class Definition
+###
+
+
+class LineClassifier:
+    """
+    Purpose:
+        Compiles a tool's ordered message patterns (the first one to re.match a
+        line decides its message type) into matchers that classify a line in a
+        single scan.
+
+        All patterns are joined into one alternation; re tries alternatives in
+        order, so it picks exactly what the chain of re.match calls would have.
+        Findings (path:line[:column]: code ...) also get a factored matcher that
+        reads the location prefix once and dispatches on the code's category,
+        instead of every finding pattern re-scanning the prefix. The factored
+        matcher can only disagree with the chain on lines where the prefix could
+        start at more than one place, so those lines use the alternation.
+    """
+
+    ###
+    # Reserved Methods
+    ###
+
+    def __init__(
+        self,
+        message_patterns: Sequence[Tuple[str, str]],
+        finding_prefix: Optional[str] = None,
+        finding_types: Optional[Dict[str, str]] = None,
+        finding_marker: str = ".py:",
+    ) -> None:
+        """
+        Purpose:
+            Constructor for a LineClassifier
+        Args:
+            message_patterns: (message_type, regex) in the order they are tried.
+                Patterns for finding_types must come before every other pattern
+            finding_prefix: regex for the location of a finding, up to where its
+                category starts, with path and line (and column/code where the tool
+                prints them) groups
+            finding_types: category (literal text after the prefix) to
+                message_type. finding_prefix plus a category must match a line with
+                a single finding_marker exactly when that type's pattern would
+            finding_marker: substring every finding prefix contains once
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        self.message_patterns = tuple(message_patterns)
+        self.message_types = {
+            f"pattern_{pattern_index}": message_type
+            for (pattern_index, (message_type, _)) in enumerate(message_patterns)
+        }
+        self.message_regex = self.compile_alternation(list(enumerate(message_patterns)))
+
+        self.finding_regex = None
+        self.finding_marker = finding_marker
+        self.other_regex = self.message_regex
+        if finding_prefix:
+            # Each category is a group named after its message type, and the last
+            # group to close, so the match's lastgroup is the message type
+            self.finding_regex = re.compile(
+                finding_prefix
+                + "(?:"
+                + "|".join(
+                    f"(?P<{message_type}>{re.escape(category)})"
+                    for (category, message_type) in finding_types.items()
+                )
+                + ")"
+            )
+            self.other_regex = self.compile_alternation(
+                [
+                    (pattern_index, message_pattern)
+                    for (pattern_index, message_pattern) in enumerate(message_patterns)
+                    if message_pattern[0] not in finding_types.values()
+                ]
+            )
+
+        # Bound once, classify runs for every line of output
+        self.match_message = self.message_regex.match
+        self.match_finding = self.finding_regex.match if self.finding_regex else None
+        self.match_other = self.other_regex.match if self.other_regex else None
+
+    def __repr__(self) -> str:
+        """
+        Purpose:
+            String Representation for a LineClassifier
+        Args:
+            N/A
+        Returns:
+            line_classifier_repr: the message types in order
+        Raises:
+            N/A
+        """
+
+        return f"<LineClassifier ({', '.join(self.message_types.values())})>"
+
+    ###
+    # Classification
+    ###
+
+    @staticmethod
+    def compile_alternation(
+        indexed_patterns: Sequence[Tuple[int, Tuple[str, str]]]
+    ) -> Optional[Pattern]:
+        """
+        Purpose:
+            Join patterns into one regex, each alternative in a group named after
+            its index in message_patterns
+        Args:
+            indexed_patterns: (index, (message_type, regex)) in the order to try
+        Returns:
+            alternation_regex: compiled alternation, or None if there are no
+                patterns
+        Raises:
+            N/A
+        """
+
+        if not indexed_patterns:
+            return None
+
+        return re.compile(
+            "|".join(
+                f"(?P<pattern_{pattern_index}>{pattern})"
+                for (pattern_index, (_, pattern)) in indexed_patterns
+            )
+        )
+
+    def classify(self, output_line: str) -> Tuple[Optional[str], Optional[Match]]:
+        """
+        Purpose:
+            Get the message type of a line of output
+        Args:
+            output_line: raw line of output from the tool
+        Returns:
+            message_type: type of the first pattern matching the line, or None
+            line_match: the match, with the finding_prefix groups if it is a finding
+                matched in a single scan
+        Raises:
+            N/A
+        """
+
+        if self.match_finding is not None:
+            finding_match = self.match_finding(output_line)
+            if finding_match is not None:
+                if output_line.count(self.finding_marker) == 1:
+                    return (finding_match.lastgroup, finding_match)
+                line_match = self.match_message(output_line)
+            elif self.match_other is not None:
+                # No finding pattern can match either
+                line_match = self.match_other(output_line)
+            else:
+                return (None, None)
+        else:
+            line_match = self.match_message(output_line)
+
+        if line_match is None:
+            return (None, None)
+
+        return (self.message_types[line_match.lastgroup], line_match)
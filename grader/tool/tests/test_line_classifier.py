@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Purpose:
+    Test File for line_classifier.py
+"""
+
+# Python Library Imports
+import re
+
+# Local Python Library Imports
+from grader.flake8.flake8 import Flake8
+from grader.mypy.mypy import Mypy
+from grader.pycodestyle.pycodestyle import Pycodestyle
+from grader.pylint.pylint import Pylint
+from grader.tool.line_classifier import LineClassifier
+
+
+###########
+# Mocks/Fixtures
+###########
+
+
+TEST_MESSAGE_PATTERNS = (
+    ("errors", r"^.*\.py\:\d+\:\d+\: E"),
+    ("warnings", r"^.*\.py\:\d+\:\d+\: W"),
+    ("summary", r"^[0-9]"),
+)
+
+TEST_OUTPUT_LINES = [
+    "",
+    "3       E501 line too long (99 > 88 characters)",
+    "candidate/module.py:1:1: E302 expected 2 blank lines",
+    "candidate/module.py:12:80: W291 trailing whitespace",
+    "candidate/module.py:12:80: F401 'os' imported but unused",
+    "candidate/module.py:12:80: X100 unknown",
+    "candidate/module.py:12: [E0602(undefined-variable), f] Undefined",
+    "candidate/module.py:12: [F0001(fatal), ] No module",
+    "candidate/module.py:3: error: Name 'x' is not defined",
+    "candidate/module.py:3: note: See https://mypy.rtfd.io",
+    # The prefix can start at more than one place on these lines
+    "candidate/a.py:1:1: X1 candidate/b.py:2:2: E2 nested",
+    "candidate/a.py:1: [X1] candidate/b.py:2: [W2] nested",
+    "candidate/a.py:1: x candidate/b.py:2: warning: nested",
+    "candidate/a.py:1:1: E1 candidate/b.py:2:2: W2 nested",
+    "Your code has been rated at 10.00/10",
+    "Found 3 errors in 1 file (checked 2 source files)",
+    "Success: no issues found in 2 source files",
+]
+
+
+def classify_with_chain(message_patterns, output_line):
+    """
+    Purpose:
+        Classify a line the way the parsers did before LineClassifier, with one
+        re.match per pattern in order
+    """
+
+    for (message_type, message_pattern) in message_patterns:
+        if re.match(message_pattern, output_line):
+            return message_type
+
+    return None
+
+
+###########
+# Tests: LineClassifier
+###########
+
+
+###
+# classify()
+###
+
+
+def test_LineClassifier_classify_without_findings() -> int:
+    """
+    Purpose:
+        Test classifying with only the alternation of every pattern
+    """
+
+    test_line_classifier = LineClassifier(TEST_MESSAGE_PATTERNS)
+
+    for test_output_line in TEST_OUTPUT_LINES:
+        (test_message_type, _) = test_line_classifier.classify(test_output_line)
+        assert test_message_type == classify_with_chain(
+            TEST_MESSAGE_PATTERNS, test_output_line
+        )
+
+
+def test_LineClassifier_classify_finding_groups() -> int:
+    """
+    Purpose:
+        Test a finding is classified with its location and code in one match
+    """
+
+    (test_message_type, test_match) = Flake8.line_classifier.classify(
+        "candidate/module.py:12:80: F401 'os' imported but unused"
+    )
+
+    assert test_message_type == "flakes"
+    assert test_match.group("path") == "candidate/module.py"
+    assert test_match.group("line") == "12"
+    assert test_match.group("column") == "80"
+    assert test_match.group("code") == "F401"
+
+    (test_message_type, test_match) = Pylint.line_classifier.classify(
+        "candidate/module.py:12: [C0103(invalid-name), f] Bad name"
+    )
+
+    assert test_message_type == "style_issues"
+    assert test_match.group("code") == "C0103"
+
+
+def test_LineClassifier_classify_matches_chain() -> int:
+    """
+    Purpose:
+        Test every tool's classifier agrees with its original chain of re.match
+        calls, including lines the factored finding matcher cannot decide
+    """
+
+    for test_tool_class in [Flake8, Mypy, Pycodestyle, Pylint]:
+        test_line_classifier = test_tool_class.line_classifier
+
+        for test_output_line in TEST_OUTPUT_LINES:
+            (test_message_type, _) = test_line_classifier.classify(test_output_line)
+            assert test_message_type == classify_with_chain(
+                test_line_classifier.message_patterns, test_output_line
+            ), test_output_line
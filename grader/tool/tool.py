@@ -6,12 +6,17 @@ Purpose:
 """
 
 # Python Library Imports
+import contextlib
+import fnmatch
+import glob
+import importlib.metadata
 import os
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
 # Local Python Library Imports
-# N/A
+import grader.subprocess.subprocess as subprocess
+from grader.trace.trace import PhaseTimer
 
 
 ###
@@ -25,8 +30,40 @@ class Tool:
         Abstract Base Class for Tools
     """
 
+    name = None
     default_args = []
     default_flags = []
+    default_timeout = 60
+
+    # Per-file linting: set by tools whose findings for a file depend only on
+    # that file, so results can be cached and merged file by file
+    lint_files_independently = False
+    lint_files_sorted = False
+    default_lint_exclude = []
+
+    # Configuration files every tool reads, whatever code it checks
+    config_files = (
+        ".flake8",
+        ".pylintrc",
+        "conftest.py",
+        "mypy.ini",
+        "pylintrc",
+        "pyproject.toml",
+        "pytest.ini",
+        "setup.cfg",
+        "tox.ini",
+    )
+
+    # Warm worker pool (grader.worker.worker) to run the command on instead of
+    # spawning it, set by the report when warm workers are enabled
+    worker_pool = None
+
+    # Tracer (grader.trace.trace) to record spawn/decode/parse timings on, set by
+    # the report
+    tracer = None
+
+    # Whether the last run wrote to stderr (a crash, not findings), set by run
+    failed = False
 
     ###
     # Reserved Methods
@@ -38,15 +75,18 @@ class Tool:
         python_package: str = None,
         args: Optional[Dict[str, str]] = None,
         flags: Optional[List[str]] = None,
+        timeout: Optional[int] = None,
     ) -> None:
         """
         Purpose:
-            Constructor for a Pylint
+            Constructor for a Tool
         Args:
-            source_code: code to run pylint on
+            source_code: code to run the tool on
             python_package: python_package to assess
-            args: argument overrides for pylint
-            flags: flag overrides for pylint
+            args: argument overrides for the tool
+            flags: flag overrides for the tool
+            timeout: seconds before the tool is killed, defaults to default_timeout.
+                0 waits forever
         Returns:
             N/A
         Raises:
@@ -56,6 +96,7 @@ class Tool:
         # Code Data
         self.args = args or self.default_args
         self.flags = flags or self.default_flags
+        self.timeout = self.default_timeout if timeout is None else timeout
         self.source_code = source_code
         if python_package:
             self.code_dir = f"{source_code}/{python_package}"
@@ -88,6 +129,94 @@ class Tool:
 
         pass
 
+    @property
+    def version(self) -> str:
+        """
+        Purpose:
+            The installed version of the tool
+        Args:
+            N/A
+        Returns:
+            version: package version, "unknown" if it is not installed
+        Raises:
+            N/A
+        """
+
+        try:
+            return importlib.metadata.version(self.name)
+        except (importlib.metadata.PackageNotFoundError, ValueError):
+            return "unknown"
+
+    @property
+    def cache_config(self) -> Dict[str, Any]:
+        """
+        Purpose:
+            Everything about the tool's configuration its output depends on, used
+            to key cached results
+        Args:
+            N/A
+        Returns:
+            cache_config: JSON serializable tool configuration
+        Raises:
+            N/A
+        """
+
+        return {
+            "name": self.name,
+            "version": self.version,
+            "args": self.args,
+            "flags": self.flags,
+            "python_package": self.python_package,
+        }
+
+    @property
+    def lint_exclude(self) -> List[str]:
+        """
+        Purpose:
+            The exclude patterns the tool prunes directories with, from the
+            --exclude arg (comma separated) or the tool's defaults
+        Args:
+            N/A
+        Returns:
+            lint_exclude: exclude patterns. Patterns containing a / are absolute
+        Raises:
+            N/A
+        """
+
+        exclude_value = None
+        for (arg, value) in self.args:
+            if arg == "--exclude":
+                exclude_value = str(value).strip("'\"")
+        if exclude_value is None:
+            return list(self.default_lint_exclude)
+
+        lint_exclude = []
+        for exclude_pattern in exclude_value.split(","):
+            exclude_pattern = exclude_pattern.strip()
+            if "/" in exclude_pattern:
+                exclude_pattern = os.path.abspath(
+                    os.path.join(self.source_code, exclude_pattern)
+                ).rstrip("/")
+            if exclude_pattern:
+                lint_exclude.append(exclude_pattern)
+
+        return lint_exclude
+
+    @property
+    def command_env(self) -> Dict[str, str]:
+        """
+        Purpose:
+            Environment variables the command runs with
+        Args:
+            N/A
+        Returns:
+            command_env: environment for the tool's shell
+        Raises:
+            N/A
+        """
+
+        return {}
+
     ###
     # Tool Operations
     ###
@@ -106,3 +235,293 @@ class Tool:
         """
 
         pass
+
+    def get_lint_files(self) -> List[str]:
+        """
+        Purpose:
+            List the .py files the tool would check in a full run, in the order it
+            would report them. Walks each target like the tool does (os.walk order,
+            optionally sorting files, pruning excluded directories) so a merge of
+            per-file results matches a full run line for line
+        Args:
+            N/A
+        Returns:
+            lint_files: paths relative to source_code, as the tool displays them
+        Raises:
+            N/A
+        """
+
+        lint_exclude = self.lint_exclude
+
+        def is_excluded(path: str) -> bool:
+            return self.is_lint_excluded(path, lint_exclude)
+
+        # Targets are expanded the way the shell expands python_package
+        lint_targets = sorted(
+            os.path.relpath(lint_target, self.source_code)
+            for lint_target in glob.glob(
+                os.path.join(self.source_code, self.python_package)
+            )
+        )
+
+        lint_files = []
+        for lint_target in lint_targets:
+            if is_excluded(lint_target):
+                continue
+            if not os.path.isdir(os.path.join(self.source_code, lint_target)):
+                if lint_target.endswith(".py"):
+                    lint_files.append(lint_target)
+                continue
+
+            for (dir_path, dir_names, file_names) in os.walk(
+                os.path.join(self.source_code, lint_target)
+            ):
+                relative_dir_path = os.path.relpath(dir_path, self.source_code)
+                dir_names[:] = [
+                    dir_name
+                    for dir_name in dir_names
+                    if not is_excluded(os.path.join(relative_dir_path, dir_name))
+                ]
+                if self.lint_files_sorted:
+                    file_names = sorted(file_names)
+                lint_files.extend(
+                    os.path.join(relative_dir_path, file_name)
+                    for file_name in file_names
+                    if file_name.endswith(".py")
+                )
+
+        return lint_files
+
+    def is_lint_excluded(self, path: str, lint_exclude: List[str]) -> bool:
+        """
+        Purpose:
+            Whether the tool prunes a file or directory, by name or absolute path
+        Args:
+            path: path relative to source_code
+            lint_exclude: the tool's lint_exclude
+        Returns:
+            is_excluded: True if an exclude pattern matches the path
+        Raises:
+            N/A
+        """
+
+        absolute_path = os.path.abspath(os.path.join(self.source_code, path))
+        return any(
+            fnmatch.fnmatch(os.path.basename(path), exclude_pattern)
+            or fnmatch.fnmatch(absolute_path, exclude_pattern)
+            for exclude_pattern in lint_exclude
+        )
+
+    def is_input_path(self, path: str) -> bool:
+        """
+        Purpose:
+            Whether the tool's results can depend on a file: a configuration file,
+            or a .py file under python_package that is not excluded. The file does
+            not have to exist (it may have just been removed)
+        Args:
+            path: path relative to source_code
+        Returns:
+            is_input_path: True if a change to the file can change the results
+        Raises:
+            N/A
+        """
+
+        if os.path.basename(path) in self.config_files:
+            return True
+        if not path.endswith(".py"):
+            return False
+        if not fnmatch.fnmatch(path, self.python_package) and not fnmatch.fnmatch(
+            path, f"{self.python_package}/*"
+        ):
+            return False
+
+        # The file or any directory above it may be pruned
+        lint_exclude = self.lint_exclude
+        path_parts = path.split("/")
+        return not any(
+            self.is_lint_excluded("/".join(path_parts[:part_count]), lint_exclude)
+            for part_count in range(1, len(path_parts) + 1)
+        )
+
+    def get_command(self, lint_targets: str) -> str:
+        """
+        Purpose:
+            The command to run the tool on specific targets instead of the
+            python_package. Required for tools that lint_files_independently
+        Args:
+            lint_targets: shell words naming the files/directories to check
+        Returns:
+            command: command to run
+        Raises:
+            NotImplementedError: if the tool cannot be pointed at other targets
+        """
+
+        raise NotImplementedError(f"{type(self).__name__} only runs on its package")
+
+    def stream_command(self, command: str) -> Iterable[str]:
+        """
+        Purpose:
+            Start a command for the tool, on the warm worker pool if there is one
+        Args:
+            command: command to run from the tool's source_code
+        Returns:
+            output_stream: iterable of stdout lines. stderr_lines and timed_out are
+                set once it has been exhausted
+        Raises:
+            N/A
+        """
+
+        if self.worker_pool:
+            return self.worker_pool.stream_command(
+                command=command,
+                env=self.command_env,
+                cwd=self.source_code,
+                timeout=self.timeout,
+            )
+
+        return subprocess.stream_subprocess_call(
+            command=command,
+            env=self.command_env,
+            cwd=self.source_code,
+            timeout=self.timeout,
+        )
+
+    def new_parse_timer(self) -> Any:
+        """
+        Purpose:
+            Get a timer for parsing the tool's output, a no-op unless tracing
+        Args:
+            N/A
+        Returns:
+            parse_timer: PhaseTimer, or a null context when not tracing
+        Raises:
+            N/A
+        """
+
+        return PhaseTimer() if self.tracer else contextlib.nullcontext()
+
+    def trace_command(
+        self, output_stream: Iterable[str], parse_timer: Any = None
+    ) -> None:
+        """
+        Purpose:
+            Add a finished command's spawn and decode timers, and the timer of
+            parsing its output, to the trace
+        Args:
+            output_stream: exhausted stream from stream_command
+            parse_timer: new_parse_timer the output was parsed under, if any
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        if not self.tracer:
+            return
+
+        self.tracer.add_timer("spawn", self.name, output_stream.spawn_timer)
+        self.tracer.add_timer("decode", self.name, output_stream.decode_timer)
+        if parse_timer is not None:
+            self.tracer.add_timer("parse", self.name, parse_timer)
+
+    def _run_command(self) -> Dict[str, Any]:
+        """
+        Purpose:
+            Run the tool's command and parse its output line by line while the tool
+            is still running
+        Args:
+            N/A
+        Returns:
+            parsed_output: parsed output from the tool
+        Raises:
+            N/A
+        """
+
+        output_stream = self.stream_command(self.command)
+
+        # Parsing is timed a chunk of lines at a time, and only when tracing
+        parse_timer = self.new_parse_timer()
+        parsed_output = self._new_parsed_output()
+        for output_lines in output_stream.iter_line_chunks():
+            with parse_timer:
+                for output_line in output_lines:
+                    self._parse_line(parsed_output, output_line)
+        with parse_timer:
+            self._finalize_output(parsed_output)
+
+        self.trace_command(output_stream, parse_timer)
+
+        # Output is partial if the tool was killed at its deadline
+        parsed_output["timed_out"] = output_stream.timed_out
+        self.failed = any(output_stream.stderr_lines)
+
+        return parsed_output
+
+    ###
+    # Output Parsing
+    ###
+
+    def _parse_output(self, raw_stdout: List[str]) -> Dict[str, Any]:
+        """
+        Purpose:
+            Parse already captured output to get standarized results for reporting
+        Args:
+            raw_stdout: raw output from the tool, split by newline
+        Returns:
+            parsed_output: parsed output from the tool
+        Raises:
+            N/A
+        """
+
+        parsed_output = self._new_parsed_output()
+        for output_line in raw_stdout:
+            self._parse_line(parsed_output, output_line)
+        self._finalize_output(parsed_output)
+
+        return parsed_output
+
+    @abstractmethod
+    def _new_parsed_output(self) -> Dict[str, Any]:
+        """
+        Purpose:
+            Get the empty parsed output that lines are accumulated into
+        Args:
+            N/A
+        Returns:
+            parsed_output: parsed output with every metric at zero
+        Raises:
+            N/A
+        """
+
+        pass
+
+    @abstractmethod
+    def _parse_line(self, parsed_output: Dict[str, Any], output_line: str) -> None:
+        """
+        Purpose:
+            Update the parsed output with a single line of tool output
+        Args:
+            parsed_output: parsed output being accumulated
+            output_line: line of raw tool output
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        pass
+
+    @abstractmethod
+    def _finalize_output(self, parsed_output: Dict[str, Any]) -> None:
+        """
+        Purpose:
+            Compute totals and report strings once every line has been parsed
+        Args:
+            parsed_output: parsed output being accumulated
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        pass
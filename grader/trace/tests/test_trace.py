@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Purpose:
+    Test File for trace.py
+"""
+
+# Python Library Imports
+import json
+
+# Local Python Library Imports
+from grader.trace.trace import PhaseTimer, Tracer, trace_span
+
+
+###########
+# Mocks/Fixtures
+###########
+
+
+# N/A
+
+
+###########
+# Tests: Tracer
+###########
+
+
+###
+# Tracer.span()
+###
+
+
+def test_Tracer_span(tmp_path: object) -> int:
+    """
+    Purpose:
+        Test spans and phase timers become trace events and timing table rows
+    Args:
+        tmp_path: pytest tmp_path fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    test_tracer = Tracer("test")
+    with test_tracer.span("execute", "pylint", cache="miss"):
+        test_phase_timer = PhaseTimer()
+        for _ in range(3):
+            with test_phase_timer:
+                pass
+        test_tracer.add_timer("parse", "pylint", test_phase_timer)
+        test_tracer.add_timer("decode", "pylint", PhaseTimer())
+    with trace_span(test_tracer, "render", "report"):
+        pass
+
+    # Not tracing is a no-op
+    with trace_span(None, "render", "report"):
+        pass
+
+    test_phase_timings = test_tracer.get_phase_timings()
+    assert sorted(test_phase_timings) == ["pylint", "report"]
+    assert sorted(test_phase_timings["pylint"]) == ["execute", "parse"]
+    assert test_phase_timings["pylint"]["parse"]["calls"] == 3
+    assert test_phase_timings["report"]["render"]["calls"] == 1
+    assert (
+        test_phase_timings["pylint"]["parse"]["seconds"]
+        <= test_phase_timings["pylint"]["execute"]["seconds"]
+    )
+
+    test_trace_path = f"{tmp_path}/trace.json"
+    test_tracer.store_trace(test_trace_path)
+    with open(test_trace_path) as test_trace_file_obj:
+        test_trace_document = json.load(test_trace_file_obj)
+
+    test_trace_events = test_trace_document["traceEvents"]
+    assert test_trace_events[0]["ph"] == "M"
+    assert [test_event["name"] for test_event in test_trace_events[1:]] == [
+        "execute",
+        "parse",
+        "render",
+    ]
+    assert test_trace_events[1]["args"] == {"cache": "miss"}
+    assert test_trace_events[2]["args"] == {"calls": 3}
+    assert all(test_event["ph"] == "X" for test_event in test_trace_events[1:])
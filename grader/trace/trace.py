@@ -0,0 +1,323 @@
+"""
+Purpose:
+    Tracer Class Definition
+
+    Times the phases of grading a report and stores them as a Chrome trace-event
+    file (load in chrome://tracing or https://ui.perfetto.dev)
+"""
+
+# Python Library Imports
+import contextlib
+import json
+import os
+import threading
+import time
+from typing import Any, ContextManager, Dict, Iterator, Optional
+
+# Local Python Library Imports
+# N/A
+
+
+###
+# Functions
+###
+
+
+def trace_span(
+    tracer: Optional["Tracer"], name: str, category: str, **args: Any
+) -> ContextManager[None]:
+    """
+    Purpose:
+        Time a block as a span on tracer, or do nothing if there is no tracer
+    Args:
+        tracer: tracer to record the span on, None when not tracing
+        name: name of the phase
+        category: what the phase belongs to, a tool name or "report"
+        args: extra details to show on the span
+    Returns:
+        span_context: context manager timing the block
+    Raises:
+        N/A
+    """
+
+    if tracer is None:
+        return contextlib.nullcontext()
+
+    return tracer.span(name, category, **args)
+
+
+###
+# Class Definition
+###
+
+
+class PhaseTimer:
+    """
+    Purpose:
+        Adds up the time spent in a phase that is entered many times, interleaved
+        with other work (decoding chunks, parsing lines). Cheap enough to always
+        use, and only turned into a trace event if there is a tracer
+    """
+
+    def __init__(self) -> None:
+        """
+        Purpose:
+            Constructor for a PhaseTimer
+        Args:
+            N/A
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        self.seconds = 0.0
+        self.calls = 0
+        self.started_at = None
+        self.finished_at = None
+
+    def __enter__(self) -> "PhaseTimer":
+        """
+        Purpose:
+            Start timing one call of the phase
+        Args:
+            N/A
+        Returns:
+            phase_timer: this timer
+        Raises:
+            N/A
+        """
+
+        self.call_started_at = time.perf_counter()
+        if self.started_at is None:
+            self.started_at = self.call_started_at
+
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """
+        Purpose:
+            Stop timing one call of the phase
+        Args:
+            exc_info: exception raised in the block, if any
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        self.finished_at = time.perf_counter()
+        self.seconds += self.finished_at - self.call_started_at
+        self.calls += 1
+
+
+class Tracer:
+    """
+    Purpose:
+        Collects timed spans for a single report, from any thread, as Chrome
+        trace-event "complete" events plus a per-phase timing table
+    """
+
+    ###
+    # Reserved Methods
+    ###
+
+    def __init__(self, trace_name: str) -> None:
+        """
+        Purpose:
+            Constructor for a Tracer
+        Args:
+            trace_name: name shown for the process in the trace viewer
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        self.trace_name = trace_name
+        self.trace_events = []
+        self.phase_timings = {}
+
+        self.process_id = os.getpid()
+        self.started_at = time.perf_counter()
+        self.events_lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        """
+        Purpose:
+            String Representation for a Tracer
+        Args:
+            N/A
+        Returns:
+            tracer_repr: name and size of the trace
+        Raises:
+            N/A
+        """
+
+        return f"<Tracer {self.trace_name} ({len(self.trace_events)} events)>"
+
+    ###
+    # Recording
+    ###
+
+    @contextlib.contextmanager
+    def span(self, name: str, category: str, **args: Any) -> Iterator[None]:
+        """
+        Purpose:
+            Time a block as a span
+        Args:
+            name: name of the phase
+            category: what the phase belongs to, a tool name or "report"
+            args: extra details to show on the span
+        Yields:
+            N/A
+        Raises:
+            N/A
+        """
+
+        span_started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_event(
+                name,
+                category,
+                span_started_at,
+                time.perf_counter() - span_started_at,
+                **args,
+            )
+
+    def add_timer(self, name: str, category: str, phase_timer: PhaseTimer) -> None:
+        """
+        Purpose:
+            Record a PhaseTimer. Its calls are summed into one span that ends when
+            the last call did, since the individual calls are interleaved with the
+            tool's own work
+        Args:
+            name: name of the phase
+            category: what the phase belongs to, a tool name or "report"
+            phase_timer: timer that has been used at least once
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        if not phase_timer.calls:
+            return
+
+        self.add_event(
+            name,
+            category,
+            phase_timer.finished_at - phase_timer.seconds,
+            phase_timer.seconds,
+            calls=phase_timer.calls,
+        )
+
+    def add_event(
+        self, name: str, category: str, started_at: float, seconds: float, **args: Any
+    ) -> None:
+        """
+        Purpose:
+            Record a span that has already finished
+        Args:
+            name: name of the phase
+            category: what the phase belongs to, a tool name or "report"
+            started_at: time.perf_counter() when the span started
+            seconds: length of the span
+            args: extra details to show on the span. calls counts towards the
+                timing table (defaults to 1)
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        trace_event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": round((started_at - self.started_at) * 1e6, 3),
+            "dur": round(seconds * 1e6, 3),
+            "pid": self.process_id,
+            "tid": threading.get_native_id(),
+            "args": args,
+        }
+
+        with self.events_lock:
+            self.trace_events.append(trace_event)
+            phase_timing = self.phase_timings.setdefault(category, {}).setdefault(
+                name, {"calls": 0, "seconds": 0.0}
+            )
+            phase_timing["calls"] += args.get("calls", 1)
+            phase_timing["seconds"] += seconds
+
+    ###
+    # Output
+    ###
+
+    def get_phase_timings(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Purpose:
+            Get the timing table recorded so far
+        Args:
+            N/A
+        Returns:
+            phase_timings: calls and seconds for every phase, by category
+        Raises:
+            N/A
+        """
+
+        with self.events_lock:
+            return {
+                category: {
+                    name: {
+                        "calls": phase_timing["calls"],
+                        "seconds": round(phase_timing["seconds"], 6),
+                    }
+                    for (name, phase_timing) in sorted(category_timings.items())
+                }
+                for (category, category_timings) in sorted(self.phase_timings.items())
+            }
+
+    def get_trace_document(self) -> Dict[str, Any]:
+        """
+        Purpose:
+            Get the Chrome trace-event document recorded so far
+        Args:
+            N/A
+        Returns:
+            trace_document: trace events in the JSON Object Format
+        Raises:
+            N/A
+        """
+
+        process_name_event = {
+            "name": "process_name",
+            "ph": "M",
+            "pid": self.process_id,
+            "args": {"name": self.trace_name},
+        }
+
+        with self.events_lock:
+            trace_events = sorted(self.trace_events, key=lambda event: event["ts"])
+
+        return {
+            "traceEvents": [process_name_event] + trace_events,
+            "displayTimeUnit": "ms",
+        }
+
+    def store_trace(self, trace_path: str) -> None:
+        """
+        Purpose:
+            Store the trace as a Chrome trace-event JSON file
+        Args:
+            trace_path: file to store the trace in
+        Returns:
+            N/A
+        Raises:
+            Exception: if trace storing fails
+        """
+
+        with open(trace_path, "w") as trace_file_obj:
+            json.dump(self.get_trace_document(), trace_file_obj)
@@ -0,0 +1,404 @@
+"""
+Purpose:
+    Source Watcher Class Definitions
+
+    Wait for files under a source tree to change, with inotify on Linux and by
+    polling anywhere else. Watchers only say something may have changed; which
+    files did is worked out by comparing snapshots of the tree, so events for
+    tool and VCS state (skipped by the source tree walk) never count
+"""
+
+# Python Library Imports
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Local Python Library Imports
+from grader.cache.cache import get_real_paths, get_source_dir_names, walk_source_tree
+
+
+###
+# Constants
+###
+
+
+# inotify(7) event masks
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_ISDIR = 0x40000000
+INOTIFY_WATCH_MASK = (
+    IN_MODIFY
+    | IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+)
+
+# struct inotify_event header: wd, mask, cookie, len (of the name that follows)
+INOTIFY_EVENT_HEADER = struct.Struct("iIII")
+
+# Seconds between snapshots when polling
+DEFAULT_POLL_INTERVAL = 1.0
+
+
+###
+# Functions
+###
+
+
+def get_source_snapshot(
+    source_code: str, excluded_paths: Iterable[str] = ()
+) -> Dict[str, Tuple[int, int]]:
+    """
+    Purpose:
+        Snapshot the files of a source tree, skipping tool and VCS state like
+        the result cache's source hash does
+    Args:
+        source_code: path to the code to snapshot
+        excluded_paths: directories to skip, wherever they are under source_code
+    Returns:
+        source_snapshot: (modification time in ns, size) by path relative to
+            source_code
+    Raises:
+        N/A
+    """
+
+    source_snapshot = {}
+    for (relative_path, file_path) in walk_source_tree(source_code, excluded_paths):
+        try:
+            file_stat = os.stat(file_path)
+        except OSError:
+            # Removed while walking
+            continue
+        source_snapshot[relative_path] = (file_stat.st_mtime_ns, file_stat.st_size)
+
+    return source_snapshot
+
+
+def get_changed_paths(
+    old_snapshot: Dict[str, Tuple[int, int]], new_snapshot: Dict[str, Tuple[int, int]]
+) -> List[str]:
+    """
+    Purpose:
+        Compare two snapshots of a source tree
+    Args:
+        old_snapshot: earlier get_source_snapshot
+        new_snapshot: later get_source_snapshot
+    Returns:
+        changed_paths: sorted paths added, removed or modified in between
+    Raises:
+        N/A
+    """
+
+    return sorted(
+        relative_path
+        for relative_path in set(old_snapshot) | set(new_snapshot)
+        if old_snapshot.get(relative_path) != new_snapshot.get(relative_path)
+    )
+
+
+def get_source_watcher(
+    source_code: str, polling: bool = False, excluded_paths: Iterable[str] = ()
+) -> "SourceWatcher":
+    """
+    Purpose:
+        Get a watcher for a source tree, inotify if the platform has it
+    Args:
+        source_code: path to the code to watch
+        polling: poll even if inotify is available
+        excluded_paths: directories not to watch, wherever they are under
+            source_code
+    Returns:
+        source_watcher: an InotifyWatcher, or a PollingWatcher
+    Raises:
+        N/A
+    """
+
+    if not polling:
+        try:
+            return InotifyWatcher(source_code, excluded_paths=excluded_paths)
+        except (AttributeError, OSError):
+            # No inotify in this libc, or out of inotify instances/watches
+            pass
+
+    return PollingWatcher(source_code, excluded_paths=excluded_paths)
+
+
+###
+# Class Definition
+###
+
+
+class SourceWatcher:
+    """
+    Purpose:
+        Base Class for Source Watchers
+    """
+
+    # Name the watcher is reported as
+    name = None
+
+    def __init__(self, source_code: str, excluded_paths: Iterable[str] = ()) -> None:
+        """
+        Purpose:
+            Constructor for a SourceWatcher
+        Args:
+            source_code: path to the code to watch
+            excluded_paths: directories not to watch, wherever they are under
+                source_code
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        self.source_code = source_code
+        self.excluded_paths = tuple(excluded_paths)
+
+    def __repr__(self) -> str:
+        """
+        Purpose:
+            String Representation for a SourceWatcher
+        Args:
+            N/A
+        Returns:
+            source_watcher_repr: kind of watcher and the code it watches
+        Raises:
+            N/A
+        """
+
+        return f"<{type(self).__name__} {self.source_code}>"
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Purpose:
+            Wait for the source tree to change
+        Args:
+            timeout: seconds to wait, None to wait until it changes
+        Returns:
+            changed: whether something under the tree may have changed
+        Raises:
+            NotImplementedError: always, implemented by each watcher
+        """
+
+        raise NotImplementedError(f"{type(self).__name__} cannot wait")
+
+    def close(self) -> None:
+        """
+        Purpose:
+            Stop watching
+        Args:
+            N/A
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        pass
+
+
+class PollingWatcher(SourceWatcher):
+    """
+    Purpose:
+        Watches a source tree by taking a snapshot every poll_interval seconds
+    """
+
+    name = "polling"
+
+    def __init__(
+        self,
+        source_code: str,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        excluded_paths: Iterable[str] = (),
+    ) -> None:
+        """
+        Purpose:
+            Constructor for a PollingWatcher
+        Args:
+            source_code: path to the code to watch
+            poll_interval: seconds between snapshots
+            excluded_paths: directories not to watch, wherever they are under
+                source_code
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        super().__init__(source_code, excluded_paths=excluded_paths)
+
+        self.poll_interval = poll_interval
+        self.source_snapshot = get_source_snapshot(source_code, self.excluded_paths)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Purpose:
+            Poll until the source tree differs from the last snapshot
+        Args:
+            timeout: seconds to wait, None to wait until it changes
+        Returns:
+            changed: whether the tree changed
+        Raises:
+            N/A
+        """
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait_seconds = self.poll_interval
+            if deadline is not None:
+                wait_seconds = min(wait_seconds, max(deadline - time.monotonic(), 0))
+            time.sleep(wait_seconds)
+
+            source_snapshot = get_source_snapshot(self.source_code, self.excluded_paths)
+            if source_snapshot != self.source_snapshot:
+                self.source_snapshot = source_snapshot
+                return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+
+
+class InotifyWatcher(SourceWatcher):
+    """
+    Purpose:
+        Watches every directory of a source tree (other than tool and VCS state)
+        with Linux inotify, through libc
+    """
+
+    name = "inotify"
+
+    def __init__(self, source_code: str, excluded_paths: Iterable[str] = ()) -> None:
+        """
+        Purpose:
+            Constructor for an InotifyWatcher
+        Args:
+            source_code: path to the code to watch
+            excluded_paths: directories not to watch, wherever they are under
+                source_code
+        Returns:
+            N/A
+        Raises:
+            AttributeError: if libc has no inotify
+            OSError: if inotify cannot be set up
+        """
+
+        super().__init__(source_code, excluded_paths=excluded_paths)
+        self.excluded_real_paths = get_real_paths(self.excluded_paths)
+
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.inotify_fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.inotify_fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        # Watch descriptor to the directory it watches
+        self.watched_dirs = {}
+        try:
+            self.add_watches(source_code)
+        except OSError:
+            self.close()
+            raise
+
+    def add_watches(self, dir_path: str) -> None:
+        """
+        Purpose:
+            Watch a directory and every directory below it
+        Args:
+            dir_path: directory to watch
+        Returns:
+            N/A
+        Raises:
+            OSError: if a directory cannot be watched (other than being removed)
+        """
+
+        for (watch_dir_path, dir_names, _) in os.walk(dir_path):
+            dir_names[:] = get_source_dir_names(
+                watch_dir_path, dir_names, self.excluded_real_paths
+            )
+            watch_descriptor = self.libc.inotify_add_watch(
+                self.inotify_fd, os.fsencode(watch_dir_path), INOTIFY_WATCH_MASK
+            )
+            if watch_descriptor < 0:
+                watch_errno = ctypes.get_errno()
+                if os.path.isdir(watch_dir_path):
+                    raise OSError(watch_errno, f"Cannot watch {watch_dir_path}")
+                continue
+            self.watched_dirs[watch_descriptor] = watch_dir_path
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Purpose:
+            Wait for inotify events, watching directories created meanwhile
+        Args:
+            timeout: seconds to wait, None to wait until it changes
+        Returns:
+            changed: whether there were any events
+        Raises:
+            N/A
+        """
+
+        (ready_fds, _, _) = select.select([self.inotify_fd], [], [], timeout)
+        if not ready_fds:
+            return False
+
+        try:
+            event_data = os.read(self.inotify_fd, 64 * 1024)
+        except BlockingIOError:
+            return False
+
+        event_offset = 0
+        while event_offset + INOTIFY_EVENT_HEADER.size <= len(event_data):
+            event_header = INOTIFY_EVENT_HEADER.unpack_from(event_data, event_offset)
+            (watch_descriptor, event_mask, _, name_length) = event_header
+            name_start = event_offset + INOTIFY_EVENT_HEADER.size
+            name_end = name_start + name_length
+            event_offset = name_end
+
+            event_name = os.fsdecode(event_data[name_start:name_end].rstrip(b"\0"))
+            if (
+                event_mask & IN_ISDIR
+                and event_mask & (IN_CREATE | IN_MOVED_TO)
+                and watch_descriptor in self.watched_dirs
+                and get_source_dir_names(
+                    self.watched_dirs[watch_descriptor],
+                    [event_name],
+                    self.excluded_real_paths,
+                )
+            ):
+                try:
+                    self.add_watches(
+                        os.path.join(self.watched_dirs[watch_descriptor], event_name)
+                    )
+                except OSError:
+                    # Out of watches, its files are still found by snapshots
+                    pass
+
+        return True
+
+    def close(self) -> None:
+        """
+        Purpose:
+            Stop watching, closing the inotify instance
+        Args:
+            N/A
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        if self.inotify_fd >= 0:
+            os.close(self.inotify_fd)
+            self.inotify_fd = -1
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Purpose:
+    Test File for source_watcher.py
+"""
+
+# Python Library Imports
+import sys
+import pytest
+
+# Local Python Library Imports
+from grader.watch.source_watcher import (
+    InotifyWatcher,
+    PollingWatcher,
+    get_changed_paths,
+    get_source_snapshot,
+    get_source_watcher,
+)
+
+
+###########
+# Mocks/Fixtures
+###########
+
+
+# N/A
+
+
+###########
+# Tests: Source Watcher
+###########
+
+
+###
+# get_changed_paths()
+###
+
+
+def test_get_changed_paths(tmp_path: object) -> int:
+    """
+    Purpose:
+        Test added, removed and edited files are changed, tool state is not
+    Args:
+        tmp_path: pytest tmp_path fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    (tmp_path / "example").mkdir()
+    (tmp_path / "example" / "kept.py").write_text("kept = 1\n")
+    (tmp_path / "example" / "edited.py").write_text("edited = 1\n")
+    (tmp_path / "removed.py").write_text("removed = 1\n")
+    test_old_snapshot = get_source_snapshot(str(tmp_path))
+    assert sorted(test_old_snapshot) == [
+        "example/edited.py",
+        "example/kept.py",
+        "removed.py",
+    ]
+
+    (tmp_path / "example" / "edited.py").write_text("edited = 22\n")
+    (tmp_path / "removed.py").unlink()
+    (tmp_path / "added.py").write_text("added = 1\n")
+    (tmp_path / "__pycache__").mkdir()
+    (tmp_path / "__pycache__" / "added.pyc").write_text("")
+    (tmp_path / ".coverage").write_text("")
+
+    assert get_changed_paths(test_old_snapshot, get_source_snapshot(str(tmp_path))) == [
+        "added.py",
+        "example/edited.py",
+        "removed.py",
+    ]
+
+
+###
+# wait()
+###
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux")
+def test_InotifyWatcher_wait(tmp_path: object) -> int:
+    """
+    Purpose:
+        Test inotify wakes up on writes, including in directories created after it
+        started watching, but not in excluded directories
+    Args:
+        tmp_path: pytest tmp_path fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    (tmp_path / "reports").mkdir()
+    test_watcher = get_source_watcher(
+        str(tmp_path), excluded_paths=[str(tmp_path / "reports")]
+    )
+    assert isinstance(test_watcher, InotifyWatcher)
+    try:
+        assert not test_watcher.wait(0.1)
+
+        (tmp_path / "reports" / "report_data.json").write_text("{}")
+        assert not test_watcher.wait(0.1)
+
+        (tmp_path / "example").mkdir()
+        assert test_watcher.wait(1)
+        while test_watcher.wait(0.1):
+            pass
+
+        (tmp_path / "example" / "module.py").write_text("module = 1\n")
+        assert test_watcher.wait(1)
+    finally:
+        test_watcher.close()
+
+
+def test_PollingWatcher_wait(tmp_path: object) -> int:
+    """
+    Purpose:
+        Test polling wakes up once the tree differs from its last snapshot, not
+        for excluded directories
+    Args:
+        tmp_path: pytest tmp_path fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    test_watcher = get_source_watcher(
+        str(tmp_path), polling=True, excluded_paths=[str(tmp_path / "reports")]
+    )
+    assert isinstance(test_watcher, PollingWatcher)
+    test_watcher.poll_interval = 0.05
+
+    assert not test_watcher.wait(0.1)
+    (tmp_path / "reports").mkdir()
+    (tmp_path / "reports" / "report_data.json").write_text("{}")
+    assert not test_watcher.wait(0.1)
+    (tmp_path / "module.py").write_text("module = 1\n")
+    assert test_watcher.wait(1)
+    assert not test_watcher.wait(0.1)
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Purpose:
+    Test File for worker.py
+"""
+
+# Python Library Imports
+import json
+
+# Local Python Library Imports
+from grader.subprocess.subprocess import SubprocessLineStream
+from grader.worker.worker import (
+    WarmCommandCall,
+    WarmWorkerPool,
+    get_warm_worker_pool,
+    parse_module_command,
+)
+
+
+###########
+# Mocks/Fixtures
+###########
+
+
+# N/A
+
+
+###########
+# Tests: Warm Worker Pool
+###########
+
+
+###
+# parse_module_command()
+###
+
+
+def test_parse_module_command(tmp_path: object) -> int:
+    """
+    Purpose:
+        Test module commands are split and globbed like the shell would
+    Args:
+        tmp_path: pytest tmp_path fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    (tmp_path / "b.py").write_text("")
+    (tmp_path / "a.py").write_text("")
+
+    test_command = "python3 -m flake8  --max-line-length=88 --exclude='a b' *.py"
+    assert parse_module_command(test_command, str(tmp_path)) == [
+        "flake8",
+        "--max-line-length=88",
+        "--exclude=a b",
+        "a.py",
+        "b.py",
+    ]
+
+    # Unmatched globs are passed through as is
+    assert parse_module_command("python3 -m mypy *.pyi", str(tmp_path)) == [
+        "mypy",
+        "*.pyi",
+    ]
+
+    # Absolute globs expand to absolute paths
+    assert parse_module_command(f"python3 -m mypy {tmp_path}/*.py", "/") == [
+        "mypy",
+        f"{tmp_path}/a.py",
+        f"{tmp_path}/b.py",
+    ]
+
+    # Anything but a plain module run is left to the shell
+    assert parse_module_command("flake8 .", str(tmp_path)) is None
+    assert parse_module_command("python3 -m mypy . | sort", str(tmp_path)) is None
+
+
+###
+# WarmWorkerPool.stream_command()
+###
+
+
+def test_WarmWorkerPool_stream_command(tmp_path: object) -> int:
+    """
+    Purpose:
+        Test a module command run on a warm worker matches running it in a shell
+    Args:
+        tmp_path: pytest tmp_path fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    (tmp_path / "test.json").write_text(json.dumps({"b": 1, "a": [1, 2]}))
+    test_command = "python3 -m json.tool --sort-keys *.json"
+
+    output_stream = get_warm_worker_pool().stream_command(
+        test_command, env={}, cwd=str(tmp_path)
+    )
+    assert isinstance(output_stream, WarmCommandCall)
+    assert list(output_stream) == [
+        "{",
+        '    "a": [',
+        "        1,",
+        "        2",
+        "    ],",
+        '    "b": 1',
+        "}",
+        "",
+    ]
+    assert output_stream.stderr_lines == [""]
+    assert not output_stream.timed_out
+
+    # Commands that need the shell still get one
+    output_stream = get_warm_worker_pool().stream_command(
+        "echo test | cat", env={}, cwd=str(tmp_path)
+    )
+    assert isinstance(output_stream, SubprocessLineStream)
+    assert list(output_stream) == ["test", ""]
+
+
+def test_WarmWorkerPool_stream_command_timeout(tmp_path: object) -> int:
+    """
+    Purpose:
+        Test a warm run is killed at its deadline and keeps its error output
+    Args:
+        tmp_path: pytest tmp_path fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    output_stream = get_warm_worker_pool().stream_command(
+        "python3 -m timeit -n 1 -r 1 'import time; time.sleep(30)'",
+        env={},
+        cwd=str(tmp_path),
+        timeout=1,
+    )
+    assert list(output_stream) == [""]
+    assert output_stream.timed_out
+
+    output_stream = get_warm_worker_pool().stream_command(
+        "python3 -m not_a_module", env={}, cwd=str(tmp_path)
+    )
+    assert list(output_stream) == [""]
+    assert "No module named not_a_module" in "\n".join(output_stream.stderr_lines)
+    assert not output_stream.timed_out
+
+
+def test_WarmWorkerPool_stream_command_fork(tmp_path: object) -> int:
+    """
+    Purpose:
+        Test a pool forking runs straight from this process, as report server jobs
+        do, runs them like the fork server
+    Args:
+        tmp_path: pytest tmp_path fixture
+    Return:
+        test_results: 0 for pass, -1 for fail
+    Raises:
+        N/A
+    """
+
+    test_worker_pool = WarmWorkerPool(max_workers=1, start_method="fork")
+    assert test_worker_pool.mp_context.get_start_method() == "fork"
+
+    (tmp_path / "test.json").write_text(json.dumps({"a": 1}))
+    output_stream = test_worker_pool.stream_command(
+        "python3 -m json.tool test.json", env={}, cwd=str(tmp_path)
+    )
+    assert isinstance(output_stream, WarmCommandCall)
+    assert list(output_stream) == ["{", '    "a": 1', "}", ""]
+    assert not output_stream.timed_out
@@ -0,0 +1,389 @@
+"""
+Purpose:
+    WarmWorkerPool Class Definition
+
+    Runs `python3 -m <tool>` commands in-process in children forked from a server
+    that has already imported the tool packages
+"""
+
+# Python Library Imports
+import glob
+import multiprocessing
+import os
+import runpy
+import shlex
+import signal
+import sys
+import tempfile
+import threading
+from typing import Any, Dict, Iterator, List, Optional
+
+# Local Python Library Imports
+import grader.subprocess.subprocess as subprocess
+from grader.trace.trace import PhaseTimer
+
+
+###
+# Constants
+###
+
+
+# Modules imported once by the fork server, so forked tool runs start warm
+WARM_TOOL_MODULES = (
+    "astroid",
+    "flake8.main.application",
+    "mypy.main",
+    "pycodestyle",
+    "pylint.lint",
+    "pytest",
+)
+
+
+# Pool shared by every report in this process, see get_warm_worker_pool
+SHARED_WORKER_POOL = None
+SHARED_WORKER_POOL_LOCK = threading.Lock()
+
+
+###
+# Functions
+###
+
+
+def get_warm_worker_pool() -> "WarmWorkerPool":
+    """
+    Purpose:
+        Get the process wide WarmWorkerPool, creating it on first use so every
+        report graded by this process shares one warm fork server
+    Args:
+        N/A
+    Returns:
+        worker_pool: the shared pool
+    Raises:
+        N/A
+    """
+
+    global SHARED_WORKER_POOL
+
+    with SHARED_WORKER_POOL_LOCK:
+        if SHARED_WORKER_POOL is None:
+            SHARED_WORKER_POOL = WarmWorkerPool()
+
+    return SHARED_WORKER_POOL
+
+
+def parse_module_command(command: str, cwd: str) -> Optional[List[str]]:
+    """
+    Purpose:
+        Turn a `python3 -m <module> ...` shell command into the argv the module
+        would see, expanding globs like the shell would
+    Args:
+        command: shell command to parse
+        cwd: working directory globs are expanded in
+    Returns:
+        module_argv: module name followed by its arguments, or None if the command
+            is not a plain `python3 -m` command
+    Raises:
+        N/A
+    """
+
+    try:
+        command_words = shlex.split(command)
+    except ValueError:
+        return None
+
+    if command_words[:2] != ["python3", "-m"] or len(command_words) < 3:
+        return None
+    if any(word in ("|", "&&", "||", ";", ">", "<") for word in command_words):
+        return None
+
+    module_argv = []
+    for command_word in command_words[2:]:
+        if any(glob_char in command_word for glob_char in "*?["):
+            # Absolute patterns stay absolute, like the shell would leave them
+            glob_matches = sorted(
+                glob_match
+                if os.path.isabs(command_word)
+                else os.path.relpath(glob_match, cwd)
+                for glob_match in glob.glob(os.path.join(cwd, command_word))
+            )
+            if glob_matches:
+                module_argv.extend(glob_matches)
+                continue
+        module_argv.append(command_word)
+
+    return module_argv
+
+
+def run_module_in_child(
+    module_argv: List[str],
+    env: Dict[str, Any],
+    cwd: str,
+    stdout_path: str,
+    stderr_path: str,
+) -> None:
+    """
+    Purpose:
+        Entrypoint of a forked tool run: become `python3 -m <module> ...` with
+        stdout/stderr sent to files. Runs in its own process group so a timeout
+        kills anything the tool starts
+    Args:
+        module_argv: module name followed by its arguments
+        env: environment variables for the tool
+        cwd: working directory to run the tool from
+        stdout_path: file to write stdout to
+        stderr_path: file to write stderr to
+    Returns:
+        N/A
+    Raises:
+        N/A
+    """
+
+    os.setsid()
+    # Handlers of a process the run was forked straight from do not apply
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    os.chdir(cwd)
+    os.environ.clear()
+    os.environ.update({key: str(value) for (key, value) in env.items()})
+
+    # `python3 -m` puts the working directory, then PYTHONPATH, on sys.path
+    python_path = [path for path in env.get("PYTHONPATH", "").split(os.pathsep) if path]
+    sys.path[0:0] = [os.getcwd()] + python_path
+
+    # Redirect at the fd level so output from C extensions and children is kept
+    for (output_path, output_fd) in ((stdout_path, 1), (stderr_path, 2)):
+        output_file_fd = os.open(output_path, os.O_WRONLY | os.O_TRUNC)
+        os.dup2(output_file_fd, output_fd)
+        os.close(output_file_fd)
+    # Runs forked straight from a process may inherit streams it had replaced
+    sys.stdout = os.fdopen(1, "w", closefd=False)
+    sys.stderr = os.fdopen(2, "w", closefd=False)
+
+    sys.argv = [module_argv[0]] + module_argv[1:]
+    exit_code = 0
+    try:
+        runpy.run_module(module_argv[0], run_name="__main__", alter_sys=True)
+    except SystemExit as module_exit:
+        exit_code = module_exit.code if isinstance(module_exit.code, int) else 1
+    finally:
+        for output_stream in (sys.stdout, sys.stderr):
+            # Some tools close the stream themselves once they are done with it
+            if not output_stream.closed:
+                output_stream.flush()
+
+    # Skip interpreter teardown, nothing from the tool needs cleaning up
+    os._exit(exit_code)
+
+
+###
+# Class Definition
+###
+
+
+class WarmWorkerPool:
+    """
+    Purpose:
+        Runs tool commands in-process instead of spawning `python3 -m <tool>`
+        through a shell. A fork server imports the tool packages once, and each run
+        is a fresh child forked from it, so runs pay neither interpreter startup
+        nor tool imports and still cannot leak state into one another.
+
+        Output is collected once the tool exits rather than streamed.
+    """
+
+    ###
+    # Reserved Methods
+    ###
+
+    def __init__(
+        self,
+        max_workers: int = None,
+        preload_modules: List[str] = WARM_TOOL_MODULES,
+        start_method: str = "forkserver",
+    ) -> None:
+        """
+        Purpose:
+            Constructor for a WarmWorkerPool
+        Args:
+            max_workers: number of tool runs at once. Defaults to the number of cores
+            preload_modules: modules the fork server imports up front
+            start_method: "forkserver", or "fork" to fork runs from this process
+                when it has already imported the tool packages itself (the
+                preload_modules are then not used)
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.preload_modules = list(preload_modules)
+
+        self.mp_context = multiprocessing.get_context(start_method)
+        if start_method == "forkserver":
+            # __main__ too, otherwise every forked run re-imports the entrypoint
+            self.mp_context.set_forkserver_preload(["__main__"] + self.preload_modules)
+        self.worker_slots = threading.BoundedSemaphore(self.max_workers)
+
+    def __repr__(self) -> str:
+        """
+        Purpose:
+            String Representation for a WarmWorkerPool
+        Args:
+            N/A
+        Returns:
+            worker_pool_repr: size of the pool
+        Raises:
+            N/A
+        """
+
+        return f"<WarmWorkerPool ({self.max_workers} workers)>"
+
+    ###
+    # Pool Operations
+    ###
+
+    def stream_command(
+        self, command: str, env: Dict[str, Any], cwd: str, timeout: int = 60
+    ) -> "WarmCommandCall":
+        """
+        Purpose:
+            Run a tool command on a warm worker. Drop-in for
+            subprocess.stream_subprocess_call; commands that are not a plain
+            `python3 -m <tool>` still go through a shell
+        Args:
+            command: command to run
+            env: environment variables for the tool
+            cwd: working directory to run the tool from
+            timeout: timeout for the tool to complete. None or 0 waits forever
+        Returns:
+            line_stream: iterable of stdout lines. stderr_lines and timed_out are set
+                once it has been exhausted
+        Raises:
+            N/A
+        """
+
+        module_argv = parse_module_command(command, cwd)
+        if module_argv is None:
+            return subprocess.stream_subprocess_call(
+                command=command, env=env, cwd=cwd, timeout=timeout
+            )
+
+        return WarmCommandCall(self, module_argv, env=env, cwd=cwd, timeout=timeout)
+
+
+class WarmCommandCall:
+    """
+    Purpose:
+        A single tool run on a WarmWorkerPool, iterable like a
+        subprocess.SubprocessLineStream
+    """
+
+    def __init__(
+        self,
+        worker_pool: WarmWorkerPool,
+        module_argv: List[str],
+        env: Dict[str, Any],
+        cwd: str,
+        timeout: int = 60,
+    ) -> None:
+        """
+        Purpose:
+            Constructor for a WarmCommandCall
+        Args:
+            worker_pool: pool to run on
+            module_argv: module name followed by its arguments
+            env: environment variables for the tool
+            cwd: working directory to run the tool from
+            timeout: timeout for the tool to complete. None or 0 waits forever
+        Returns:
+            N/A
+        Raises:
+            N/A
+        """
+
+        self.worker_pool = worker_pool
+        self.module_argv = module_argv
+        self.env = env
+        self.cwd = os.path.abspath(cwd)
+        self.timeout = timeout
+
+        # Set once the call has been exhausted
+        self.stderr_lines = []
+        self.timed_out = False
+
+        # Time spent forking the tool and decoding its output
+        self.spawn_timer = PhaseTimer()
+        self.decode_timer = PhaseTimer()
+
+    def __iter__(self) -> Iterator[str]:
+        """
+        Purpose:
+            Run the tool and yield its stdout line by line
+        Args:
+            N/A
+        Yields:
+            output_line: decoded stdout line, without the newline
+        Raises:
+            N/A
+        """
+
+        for output_lines in self.iter_line_chunks():
+            yield from output_lines
+
+    def iter_line_chunks(self) -> Iterator[List[str]]:
+        """
+        Purpose:
+            Run the tool and yield its stdout lines, in a single chunk as the tool's
+            output is read once it has finished
+        Args:
+            N/A
+        Yields:
+            output_lines: decoded stdout lines, without the newlines
+        Raises:
+            N/A
+        """
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            stdout_path = f"{output_dir}/stdout"
+            stderr_path = f"{output_dir}/stderr"
+            for output_path in (stdout_path, stderr_path):
+                open(output_path, "wb").close()
+
+            with self.worker_pool.worker_slots:
+                tool_process = self.worker_pool.mp_context.Process(
+                    target=run_module_in_child,
+                    args=(
+                        self.module_argv,
+                        self.env,
+                        self.cwd,
+                        stdout_path,
+                        stderr_path,
+                    ),
+                    daemon=True,
+                )
+                with self.spawn_timer:
+                    tool_process.start()
+                try:
+                    subprocess.track_process_group(tool_process.pid)
+                    tool_process.join(self.timeout or None)
+                    if tool_process.is_alive():
+                        self.timed_out = True
+                        subprocess.kill_process_group(tool_process.pid)
+                        tool_process.join()
+                except BaseException:
+                    # Interrupted (a cancelled report server job), take the tool too
+                    subprocess.kill_process_group(tool_process.pid)
+                    raise
+                finally:
+                    subprocess.untrack_process_group(tool_process.pid)
+
+            with open(stdout_path, "rb") as stdout_file_obj, self.decode_timer:
+                stdout_lines = subprocess.decode_output_chunks(
+                    [stdout_file_obj.read()]
+                ).split("\n")
+            with open(stderr_path, "rb") as stderr_file_obj, self.decode_timer:
+                self.stderr_lines = subprocess.decode_output_chunks(
+                    [stderr_file_obj.read()]
+                ).split("\n")
+
+        yield stdout_lines
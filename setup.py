@@ -130,8 +130,6 @@ def main() -> None:
             "Intended Audience :: Developers",
             "Programming Language :: Python",
             "Programming Language :: Python :: 3",
-            "Programming Language :: Python :: 3.6",
-            "Programming Language :: Python :: 3.7",
             "Programming Language :: Python :: 3.8",
             "Programming Language :: Python :: 3.9",
             "Framework :: Pytest",
@@ -145,7 +143,7 @@ def main() -> None:
         name="haystack-auto-grader",
         packages=packages,
         project_urls={},
-        python_requires=">3.6",
+        python_requires=">=3.8",
         scripts=[
             "./grader/bin/grader_python",
             # TODO, other languages